@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Benchmark: AnticipatoryLiquidityManager fleet-wide prediction sweep.
+
+Builds nodes with 50/200/500 channels (each with two weeks of hourly flow
+samples) and times get_all_predictions(), reporting how many
+listpeerchannels calls the sweep made.
+
+With --cold, flow history is stored in a real SQLite HiveDatabase and the
+cold-start pattern detection is timed both per channel (one history query
+each) and in batch mode (detect_all_patterns, hour-of-week slot aggregates
+for the whole node computed in SQLite).
+
+Usage:
+    python3 benchmarks/bench_anticipatory_predictions.py [--sizes 50,200,500] [--rounds 3]
+    python3 benchmarks/bench_anticipatory_predictions.py --cold [--sizes 300]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.anticipatory_liquidity import AnticipatoryLiquidityManager  # noqa: E402
+from modules.database import HiveDatabase  # noqa: E402
+
+
+HISTORY_DAYS = 14
+
+
+class _Database:
+    def __init__(self, samples_by_channel):
+        self._samples = samples_by_channel
+
+    def record_flow_sample(self, **kwargs):
+        pass
+
+    def get_flow_samples(self, channel_id=None, days=HISTORY_DAYS, **kwargs):
+        return self._samples.get(channel_id, [])
+
+
+def build_manager(n_channels: int, seed: int = 42):
+    """Create a manager over a synthetic node with n_channels channels."""
+    rng = random.Random(seed)
+    now = int(time.time())
+    channels = []
+    samples = {}
+    for i in range(n_channels):
+        scid = f"{800000 + i}x1x0"
+        capacity_msat = rng.choice([2, 5, 10]) * 1_000_000_000
+        channels.append({
+            "short_channel_id": scid,
+            "peer_id": f"03{i:064x}",
+            "state": "CHANNELD_NORMAL",
+            "total_msat": capacity_msat,
+            "to_us_msat": int(capacity_msat * rng.random()),
+        })
+        bias = rng.uniform(-20000, 20000)
+        rows = []
+        for h in range(HISTORY_DAYS * 24):
+            ts = now - h * 3600
+            net = int(bias + rng.gauss(0, 30000))
+            rows.append({
+                "channel_id": scid,
+                "hour": time.localtime(ts).tm_hour,
+                "day_of_week": time.localtime(ts).tm_wday,
+                "inbound_sats": max(0, net),
+                "outbound_sats": max(0, -net),
+                "net_flow_sats": net,
+                "timestamp": ts,
+            })
+        samples[scid] = rows
+
+    plugin = MagicMock()
+    plugin.rpc.listpeerchannels.return_value = {"channels": channels}
+    manager = AnticipatoryLiquidityManager(
+        database=_Database(samples), plugin=plugin, our_id="02" + "0" * 64
+    )
+    return manager, plugin
+
+
+def bench(n_channels: int, rounds: int) -> dict:
+    manager, plugin = build_manager(n_channels)
+
+    # Warm pattern caches so rounds measure the steady-state sweep
+    manager.get_all_predictions(min_risk=0.0)
+    plugin.rpc.listpeerchannels.reset_mock()
+
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        predictions = manager.get_all_predictions(min_risk=0.0)
+    sweep_ms = (time.perf_counter() - t0) / rounds * 1000
+
+    return {
+        "channels": n_channels,
+        "sweep_ms": round(sweep_ms, 2),
+        "per_channel_us": round(sweep_ms / n_channels * 1000, 1),
+        "rpc_calls_per_sweep": plugin.rpc.listpeerchannels.call_count / rounds,
+        "predictions": len(predictions),
+    }
+
+
+def bench_cold(n_channels: int) -> dict:
+    template, plugin = build_manager(n_channels)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database = HiveDatabase(os.path.join(tmpdir, "bench.db"), MagicMock())
+        database.initialize()
+        conn = database._get_connection()
+        conn.executemany(
+            "INSERT INTO flow_samples (channel_id, hour, day_of_week, inbound_sats, "
+            "outbound_sats, net_flow_sats, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (r["channel_id"], r["hour"], r["day_of_week"], r["inbound_sats"],
+                 r["outbound_sats"], r["net_flow_sats"], r["timestamp"])
+                for rows in template.database._samples.values() for r in rows
+            ]
+        )
+
+        def fresh():
+            return AnticipatoryLiquidityManager(
+                database=database, plugin=plugin, our_id="02" + "0" * 64
+            )
+
+        manager = fresh()
+        t0 = time.perf_counter()
+        for ch in plugin.rpc.listpeerchannels.return_value["channels"]:
+            manager.detect_patterns(ch["short_channel_id"])
+        per_channel_ms = (time.perf_counter() - t0) * 1000
+
+        manager = fresh()
+        t0 = time.perf_counter()
+        patterns = manager.detect_all_patterns()
+        batch_ms = (time.perf_counter() - t0) * 1000
+
+    return {
+        "channels": n_channels,
+        "per_channel_ms": round(per_channel_ms, 1),
+        "batch_ms": round(batch_ms, 1),
+        "speedup": round(per_channel_ms / batch_ms, 2) if batch_ms else 0,
+        "patterns": sum(len(p) for p in patterns.values()),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="50,200,500")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--cold", action="store_true",
+                        help="time cold-start pattern detection against SQLite")
+    args = parser.parse_args()
+
+    if args.cold:
+        print(f"{'channels':>8} {'per_ch_ms':>10} {'batch_ms':>10} {'speedup':>8} {'patterns':>9}")
+        for size in (int(s) for s in args.sizes.split(",")):
+            r = bench_cold(size)
+            print(f"{r['channels']:>8} {r['per_channel_ms']:>10} {r['batch_ms']:>10} "
+                  f"{r['speedup']:>8} {r['patterns']:>9}")
+        return
+
+    print(f"{'channels':>8} {'sweep_ms':>10} {'per_ch_us':>10} {'rpcs':>6} {'preds':>6}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        r = bench(size, args.rounds)
+        print(f"{r['channels']:>8} {r['sweep_ms']:>10} {r['per_channel_us']:>10} "
+              f"{r['rpc_calls_per_sweep']:>6} {r['predictions']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,627 @@
+#!/usr/bin/env python3
+"""
+Benchmark: coordination-layer hot paths on synthetic fleets.
+
+Builds fleets of 5/25/100 members over a public network of 1k-50k external
+peers (real SQLite HiveDatabase, mocked RPC) and times:
+- custommsg: messages/sec per message type through the on_custommsg path
+  (hex decode, magic peek, deserialize, validation, signing payload,
+  membership check, module handler; checkmessage is mocked)
+- full_sync: StateManager.apply_full_sync with one state per member
+- ssp_solve: SSPSolver.solve on the fleet rebalancing network
+- planner_cycle: Planner.run_cycle (cold: includes network cache refresh)
+- fee_profiles: FeeIntelligenceManager.aggregate_fee_profiles (full and
+  incremental)
+- detect_patterns: AnticipatoryLiquidityManager.detect_patterns per channel
+  and detect_all_patterns
+
+cl-hive.py itself cannot be imported outside lightningd, so the custommsg
+bench replays the same steps its handlers perform against the modules.
+
+Results are written as JSON. --compare prints the change of every timing
+against an earlier results file and exits non-zero on a regression.
+
+Usage:
+    python3 benchmarks/bench_fleet.py [--members 5,25,100] [--externals 1000,10000,50000]
+        [--benches custommsg,full_sync,...] [--output results.json]
+    python3 benchmarks/bench_fleet.py --compare baseline.json [--threshold 0.2] [--min-ms 1]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.anticipatory_liquidity import AnticipatoryLiquidityManager  # noqa: E402
+from modules.database import HiveDatabase  # noqa: E402
+from modules.fee_intelligence import FeeIntelligenceManager  # noqa: E402
+from modules.gossip import GossipManager  # noqa: E402
+from modules.mcf_solver import MAX_MCF_NODES, MCFNetwork, SSPSolver  # noqa: E402
+from modules.planner import Planner  # noqa: E402
+from modules.protocol import (  # noqa: E402
+    HiveMessageType, MAX_MESSAGE_BYTES, MAX_PEERS_IN_SNAPSHOT,
+    compute_states_hash, deserialize, get_full_sync_signing_payload,
+    get_gossip_signing_payload, get_state_hash_signing_payload,
+    is_hive_message, serialize, validate_full_sync, validate_gossip,
+    validate_state_hash,
+)
+from modules.rate_limiter import RateLimiter  # noqa: E402
+from modules.state_manager import StateManager  # noqa: E402
+
+
+BENCHES = ("custommsg", "full_sync", "ssp_solve", "planner_cycle",
+           "fee_profiles", "detect_patterns")
+
+TOPOLOGY_PER_MEMBER = 40      # external peers each member has channels with
+PUBLIC_DEGREE = 4             # public channels per external peer
+MEMBER_MESH_DEGREE = 3        # hive-internal channels per member
+FEE_REPORTS_PER_MEMBER = 500  # external peers each member reports fees for
+PATTERN_CHANNELS = 100        # local channels for detect_patterns
+PATTERN_HISTORY_DAYS = 14
+CUSTOMMSG_COUNT = 2000        # messages replayed per message type
+SIGNATURE = "d" * 104
+
+
+def _member_id(i: int) -> str:
+    return f"02{i:064x}"
+
+
+def _external_id(i: int) -> str:
+    return f"03{i:064x}"
+
+
+# =============================================================================
+# SYNTHETIC FLEET
+# =============================================================================
+
+class SyntheticFleet:
+    """Members, external peers, public channels and a populated database."""
+
+    def __init__(self, n_members: int, n_externals: int, tmpdir: str, seed: int = 42):
+        self.rng = random.Random(seed)
+        self.n_members = n_members
+        self.n_externals = n_externals
+        self.members = [_member_id(i) for i in range(n_members)]
+        self.externals = [_external_id(i) for i in range(n_externals)]
+        self.our_pubkey = self.members[0]
+        self.now = int(time.time())
+        self._version = 0
+
+        self.topology = {
+            m: self.rng.sample(self.externals, min(TOPOLOGY_PER_MEMBER, n_externals))
+            for m in self.members
+        }
+        self.plugin = MagicMock()
+        self.plugin.rpc.checkmessage.side_effect = self._checkmessage
+        self.database = HiveDatabase(os.path.join(tmpdir, "bench.db"), self.plugin)
+        self.database.initialize()
+        for m in self.members:
+            self.database.add_member(m, tier="member", joined_at=self.now - 86400 * 30)
+
+    def _checkmessage(self, message, signature):
+        # The signer is not recoverable from the fake signature; report the
+        # sender the signed payload claims (JSON, or "TYPE:<pubkey>:...")
+        if message.startswith("{"):
+            claimed = json.loads(message).get("sender_id")
+        else:
+            claimed = message.split(":")[1]
+        return {"verified": True, "pubkey": claimed}
+
+    def next_version(self) -> int:
+        """Strictly increasing state version, so every bench's states apply."""
+        self._version += 1
+        return self._version
+
+    def state_dict(self, member: str, version: int) -> Dict[str, Any]:
+        capacity = 10_000_000 * TOPOLOGY_PER_MEMBER
+        return {
+            "peer_id": member,
+            "capacity_sats": capacity,
+            "available_sats": capacity // 2,
+            "fee_policy": {"base_fee": 1000, "fee_rate": 100},
+            "topology": self.topology[member],
+            "version": version,
+            "last_update": self.now,
+            "state_hash": "",
+        }
+
+    def listchannels(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Public network: externals meshed among themselves plus member channels."""
+        channels = []
+        scid = 0
+
+        def add(a, b, capacity_sats):
+            nonlocal scid
+            scid += 1
+            short_id = f"{700000 + scid // 1000}x{scid % 1000}x0"
+            for src, dst in ((a, b), (b, a)):
+                channels.append({
+                    "source": src, "destination": dst, "short_channel_id": short_id,
+                    "amount_msat": capacity_sats * 1000, "active": True,
+                })
+
+        for i, peer in enumerate(self.externals):
+            for _ in range(PUBLIC_DEGREE // 2):
+                other = self.externals[self.rng.randrange(self.n_externals)]
+                if other != peer:
+                    add(peer, other, self.rng.choice([2, 5, 10, 20]) * 1_000_000)
+        for member, peers in self.topology.items():
+            for peer in peers:
+                add(member, peer, 10_000_000)
+        return {"channels": channels}
+
+
+def _timed(fn: Callable[[], Any], rounds: int = 1) -> float:
+    """Mean wall time of fn() in milliseconds."""
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - t0) / rounds * 1000
+
+
+# =============================================================================
+# BENCHES
+# =============================================================================
+
+def bench_custommsg(fleet: SyntheticFleet) -> Dict[str, Any]:
+    """Messages/sec per type through decode, validation and module handler."""
+    state_manager = StateManager(fleet.database, fleet.plugin)
+    gossip_mgr = GossipManager(state_manager, fleet.plugin)
+    fee_intel_mgr = FeeIntelligenceManager(fleet.database, fleet.plugin, fleet.our_pubkey)
+    fee_intel_mgr._fee_intel_snapshot_rate = RateLimiter(max_count=10 ** 9, period_seconds=1)
+    rpc = fleet.plugin.rpc
+    senders = fleet.members[1:] or fleet.members
+
+    def handle_gossip(peer_id, payload):
+        if not validate_gossip(payload):
+            return False
+        sender_id = payload["sender_id"]
+        signing = get_gossip_signing_payload(payload)
+        if rpc.checkmessage(signing, payload["signature"])["pubkey"] != sender_id:
+            return False
+        if not fleet.database.get_member(sender_id):
+            return False
+        return gossip_mgr.process_gossip(sender_id, payload)
+
+    def handle_state_hash(peer_id, payload):
+        if not validate_state_hash(payload):
+            return False
+        signing = get_state_hash_signing_payload(payload)
+        rpc.checkmessage(signing, payload["signature"])
+        return gossip_mgr.process_state_hash(peer_id, payload)
+
+    def handle_full_sync(peer_id, payload):
+        if not validate_full_sync(payload):
+            return False
+        signing = get_full_sync_signing_payload(payload)
+        rpc.checkmessage(signing, payload["signature"])
+        if compute_states_hash(payload["states"]) != payload["fleet_hash"]:
+            return False
+        if not fleet.database.get_member(peer_id):
+            return False
+        return gossip_mgr.process_full_sync(peer_id, payload)
+
+    def handle_fee_intel(peer_id, payload):
+        result = fee_intel_mgr.handle_fee_intelligence_snapshot(peer_id, payload, rpc)
+        return result.get("success", False)
+
+    handlers = {
+        HiveMessageType.GOSSIP: handle_gossip,
+        HiveMessageType.STATE_HASH: handle_state_hash,
+        HiveMessageType.FULL_SYNC: handle_full_sync,
+        HiveMessageType.FEE_INTELLIGENCE_SNAPSHOT: handle_fee_intel,
+    }
+
+    def on_custommsg(peer_id: str, payload: str) -> bool:
+        if len(payload) > MAX_MESSAGE_BYTES * 2:
+            return False
+        data = bytes.fromhex(payload)
+        if not is_hive_message(data):
+            return False
+        msg_type, msg_payload = deserialize(data)
+        if msg_type is None:
+            return False
+        return handlers[msg_type](peer_id, msg_payload)
+
+    # Build the wire messages
+    full_sync_states = []
+    for member in fleet.members:
+        candidate = full_sync_states + [fleet.state_dict(member, 1)]
+        probe = {"sender_id": fleet.our_pubkey, "fleet_hash": compute_states_hash(candidate),
+                 "timestamp": fleet.now, "signature": SIGNATURE, "states": candidate}
+        if len(serialize(HiveMessageType.FULL_SYNC, probe)) > MAX_MESSAGE_BYTES:
+            break
+        full_sync_states = candidate
+
+    def make(msg_type: HiveMessageType, i: int):
+        sender = senders[i % len(senders)]
+        if msg_type == HiveMessageType.GOSSIP:
+            payload = fleet.state_dict(sender, fleet.next_version())
+            payload.update(sender_id=sender, timestamp=fleet.now, signature=SIGNATURE)
+        elif msg_type == HiveMessageType.STATE_HASH:
+            payload = {"sender_id": sender, "fleet_hash": state_manager.calculate_fleet_hash(),
+                       "peer_count": fleet.n_members,
+                       "timestamp": fleet.now, "signature": SIGNATURE}
+        elif msg_type == HiveMessageType.FULL_SYNC:
+            version = fleet.next_version()
+            states = [dict(s, version=version) for s in full_sync_states]
+            payload = {"sender_id": sender, "fleet_hash": compute_states_hash(states),
+                       "timestamp": fleet.now, "signature": SIGNATURE, "states": states}
+        else:
+            peers = fleet.rng.sample(fleet.externals, min(MAX_PEERS_IN_SNAPSHOT, fleet.n_externals))
+            payload = {"reporter_id": sender, "timestamp": fleet.now, "signature": SIGNATURE,
+                       "peers": [{"peer_id": p, "our_fee_ppm": 100 + j % 400, "their_fee_ppm": 50,
+                                  "forward_count": 3, "forward_volume_sats": 300_000,
+                                  "revenue_sats": 30, "flow_direction": "balanced",
+                                  "utilization_pct": 0.4} for j, p in enumerate(peers)]}
+        return sender, serialize(msg_type, payload).hex()
+
+    result: Dict[str, Any] = {"full_sync_states_per_msg": len(full_sync_states)}
+    for msg_type in handlers:
+        count = CUSTOMMSG_COUNT
+        if msg_type in (HiveMessageType.FULL_SYNC, HiveMessageType.FEE_INTELLIGENCE_SNAPSHOT):
+            count = CUSTOMMSG_COUNT // 10
+        messages = [make(msg_type, i) for i in range(count)]
+        accepted = 0
+        t0 = time.perf_counter()
+        for peer_id, hex_payload in messages:
+            if on_custommsg(peer_id, hex_payload):
+                accepted += 1
+        elapsed = time.perf_counter() - t0
+        name = msg_type.name.lower()
+        result[f"{name}_msgs_per_sec"] = round(count / elapsed, 1)
+        result[f"{name}_us"] = round(elapsed / count * 1e6, 1)
+        result[f"{name}_accepted"] = accepted
+    return result
+
+
+def bench_full_sync(fleet: SyntheticFleet, rounds: int) -> Dict[str, Any]:
+    """StateManager.apply_full_sync with every member's state."""
+    timings = []
+    updated = 0
+    for _ in range(rounds):
+        state_manager = StateManager(fleet.database, fleet.plugin)
+        version = fleet.next_version()
+        batch = [fleet.state_dict(m, version) for m in fleet.members]
+        t0 = time.perf_counter()
+        updated = state_manager.apply_full_sync(batch)
+        timings.append((time.perf_counter() - t0) * 1000)
+    return {
+        "apply_full_sync_ms": round(min(timings), 2),
+        "states": fleet.n_members,
+        "updated": updated,
+    }
+
+
+def bench_ssp_solve(fleet: SyntheticFleet, rounds: int) -> Dict[str, Any]:
+    """
+    SSPSolver.solve on members, their external peers and rebalance needs.
+
+    MCF networks are capped at MAX_MCF_NODES, so each member contributes only
+    as many of its external peers as fit; the network does not grow with
+    the external peer count.
+    """
+    rng = random.Random(7)
+    externals_per_member = min(
+        TOPOLOGY_PER_MEMBER, max(0, (MAX_MCF_NODES - 2 - fleet.n_members) // fleet.n_members)
+    )
+
+    def build() -> MCFNetwork:
+        network = MCFNetwork()
+        for i, member in enumerate(fleet.members):
+            # A third of members have excess outbound, a third need it
+            supply = 0
+            if i % 3 == 0:
+                supply = 2_000_000
+            elif i % 3 == 1:
+                supply = -2_000_000
+            network.add_node(member, supply=supply, is_fleet_member=True)
+        for i, member in enumerate(fleet.members):
+            for k in range(1, MEMBER_MESH_DEGREE + 1):
+                other = fleet.members[(i + k) % fleet.n_members]
+                if other != member:
+                    network.add_edge(member, other, 5_000_000, 0, is_hive_internal=True)
+                    network.add_edge(other, member, 5_000_000, 0, is_hive_internal=True)
+            for peer in fleet.topology[member][:externals_per_member]:
+                network.add_edge(member, peer, rng.randint(1, 10) * 1_000_000,
+                                 rng.randint(10, 500))
+                network.add_edge(peer, member, rng.randint(1, 10) * 1_000_000,
+                                 rng.randint(10, 500))
+        network.setup_super_source_sink()
+        return network
+
+    timings = []
+    total_flow = total_cost = iterations = 0
+    for _ in range(rounds):
+        network = build()
+        solver = SSPSolver(network)
+        t0 = time.perf_counter()
+        total_flow, total_cost, _ = solver.solve()
+        timings.append((time.perf_counter() - t0) * 1000)
+        iterations = solver.iterations
+    return {
+        "solve_ms": round(min(timings), 2),
+        "nodes": network.get_node_count(),
+        "edges": network.get_edge_count(),
+        "iterations": iterations,
+        "total_flow": total_flow,
+        "total_cost": total_cost,
+    }
+
+
+def bench_planner_cycle(fleet: SyntheticFleet, rounds: int) -> Dict[str, Any]:
+    """Planner.run_cycle over the synthetic public network."""
+    listchannels = fleet.listchannels()
+    plugin = MagicMock()
+    plugin.rpc.listchannels.return_value = listchannels
+    plugin.rpc.listfunds.return_value = {
+        "outputs": [{"status": "confirmed", "amount_msat": 100_000_000_000}],
+        "channels": [],
+    }
+    plugin.rpc.listpeerchannels.return_value = {"channels": []}
+
+    state_manager = StateManager(fleet.database, plugin)
+    version = fleet.next_version()
+    state_manager.apply_full_sync([fleet.state_dict(m, version) for m in fleet.members])
+
+    cfg = MagicMock()
+    cfg.market_share_cap_pct = 0.20
+    cfg.governance_mode = "advisor"
+    cfg.planner_enable_expansions = True
+    cfg.planner_min_channel_sats = 1_000_000
+    cfg.planner_max_channel_sats = 50_000_000
+    cfg.planner_default_channel_sats = 5_000_000
+    cfg.expansion_pause_threshold = 3
+    cfg.planner_safety_reserve_sats = 500_000
+    cfg.planner_fee_buffer_sats = 100_000
+
+    planner = Planner(
+        state_manager=state_manager, database=fleet.database, bridge=MagicMock(),
+        clboss_bridge=MagicMock(), plugin=plugin
+    )
+
+    timings = []
+    errors = 0
+    for r in range(rounds):
+        plugin.log.reset_mock()
+        t0 = time.perf_counter()
+        planner.run_cycle(cfg, now=fleet.now + r, run_id=f"bench{r}")
+        timings.append((time.perf_counter() - t0) * 1000)
+        errors += sum(
+            1 for call in plugin.log.call_args_list
+            if "cycle error" in str(call.args[0]) or "refresh failed" in str(call.args[0])
+        )
+    stats = planner.get_planner_stats()
+    return {
+        "run_cycle_ms": round(min(timings), 2),
+        "first_cycle_ms": round(timings[0], 2),
+        "network_channels": stats["network_cache_channels"],
+        "network_nodes": stats["network_cache_size"],
+        "cycle_errors": errors,
+    }
+
+
+def bench_fee_profiles(fleet: SyntheticFleet, rounds: int) -> Dict[str, Any]:
+    """aggregate_fee_profiles, full pass and after a 1% incremental update."""
+    manager = FeeIntelligenceManager(fleet.database, fleet.plugin, fleet.our_pubkey)
+    conn = fleet.database._get_connection()
+    conn.execute("DELETE FROM fee_intelligence")
+    rng = random.Random(11)
+    rows = []
+    for member in fleet.members:
+        peers = rng.sample(fleet.externals, min(FEE_REPORTS_PER_MEMBER, fleet.n_externals))
+        for peer in peers:
+            rows.append((member, peer, fleet.now - rng.randint(0, 3600 * 12),
+                         rng.randint(10, 1000), rng.randint(10, 1000), rng.randint(0, 50),
+                         rng.randint(0, 5_000_000), rng.randint(0, 5000),
+                         rng.choice(["source", "sink", "balanced"]), rng.random(), SIGNATURE,
+                         rng.randint(-50, 50), rng.uniform(-0.2, 0.2), 7))
+    with fleet.database.transaction():
+        conn.executemany("""
+            INSERT INTO fee_intelligence (reporter_id, target_peer_id, timestamp,
+                our_fee_ppm, their_fee_ppm, forward_count, forward_volume_sats,
+                revenue_sats, flow_direction, utilization_pct, signature,
+                last_fee_change_ppm, volume_delta_pct, days_observed)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+
+    full_ms = min(_timed(lambda: manager.aggregate_fee_profiles(full=True)) for _ in range(rounds))
+    profiles = manager.aggregate_fee_profiles(full=True)
+
+    reported = list({r[1] for r in rows})
+    dirty = rng.sample(reported, max(1, len(reported) // 100))
+    incremental = []
+    for _ in range(rounds):
+        manager.mark_peers_dirty(dirty)
+        incremental.append(_timed(manager.aggregate_fee_profiles))
+    return {
+        "full_ms": round(full_ms, 2),
+        "incremental_ms": round(min(incremental), 2),
+        "reports": len(rows),
+        "profiles": profiles,
+        "dirty_peers": len(dirty),
+    }
+
+
+def bench_detect_patterns(fleet: SyntheticFleet) -> Dict[str, Any]:
+    """detect_patterns per channel vs detect_all_patterns on SQLite history."""
+    rng = random.Random(13)
+    conn = fleet.database._get_connection()
+    conn.execute("DELETE FROM flow_samples")
+    channels = []
+    rows = []
+    for i in range(PATTERN_CHANNELS):
+        scid = f"{800000 + i}x1x0"
+        channels.append(scid)
+        bias = rng.uniform(-20000, 20000)
+        for h in range(PATTERN_HISTORY_DAYS * 24):
+            ts = fleet.now - h * 3600
+            lt = time.localtime(ts)
+            net = int(bias + rng.gauss(0, 30000))
+            rows.append((scid, lt.tm_hour, lt.tm_wday, max(0, net), max(0, -net), net, ts))
+    with fleet.database.transaction():
+        conn.executemany(
+            "INSERT INTO flow_samples (channel_id, hour, day_of_week, inbound_sats, "
+            "outbound_sats, net_flow_sats, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+        )
+
+    def fresh():
+        return AnticipatoryLiquidityManager(
+            database=fleet.database, plugin=fleet.plugin, our_id=fleet.our_pubkey
+        )
+
+    manager = fresh()
+    per_channel_ms = _timed(lambda: [manager.detect_patterns(c) for c in channels])
+    manager = fresh()
+    patterns: Dict[str, Any] = {}
+    batch_ms = _timed(lambda: patterns.update(manager.detect_all_patterns()))
+    return {
+        "per_channel_ms": round(per_channel_ms, 2),
+        "batch_ms": round(batch_ms, 2),
+        "channels": len(channels),
+        "patterns": sum(len(p) for p in patterns.values()),
+    }
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+def run_scenario(n_members: int, n_externals: int, benches: List[str],
+                 rounds: int) -> List[Dict[str, Any]]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        fleet = SyntheticFleet(n_members, n_externals, tmpdir)
+        for name in benches:
+            if name == "custommsg":
+                metrics = bench_custommsg(fleet)
+            elif name == "full_sync":
+                metrics = bench_full_sync(fleet, rounds)
+            elif name == "ssp_solve":
+                metrics = bench_ssp_solve(fleet, rounds)
+            elif name == "planner_cycle":
+                metrics = bench_planner_cycle(fleet, rounds)
+            elif name == "fee_profiles":
+                metrics = bench_fee_profiles(fleet, rounds)
+            else:
+                metrics = bench_detect_patterns(fleet)
+            results.append({
+                "bench": name, "members": n_members, "externals": n_externals,
+                "metrics": metrics,
+            })
+            print(f"{name:>16} members={n_members:<4} externals={n_externals:<6} "
+                  + " ".join(f"{k}={v}" for k, v in metrics.items()), flush=True)
+    return results
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def _is_timing(metric: str) -> bool:
+    return metric.endswith("_ms") or metric.endswith("_us")
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float,
+            min_ms: float) -> int:
+    """
+    Print each timing relative to the baseline run.
+
+    Throughput metrics (*_per_sec) are inverted so that for every row a
+    positive change means slower. Timings whose baseline is below min_ms are
+    shown but never flagged (too noisy).
+
+    Returns:
+        Number of metrics that regressed by more than threshold
+    """
+    def index(run):
+        return {(r["bench"], r["members"], r["externals"]): r["metrics"] for r in run["results"]}
+
+    base = index(baseline)
+    regressions = 0
+    print(f"\nComparing {current['revision']} against {baseline.get('revision', '?')}")
+    for key, metrics in index(current).items():
+        if key not in base:
+            continue
+        for metric, value in metrics.items():
+            old = base[key].get(metric)
+            if not isinstance(old, (int, float)) or not old or not value:
+                continue
+            noisy = False
+            if _is_timing(metric):
+                change = value / old - 1
+                noisy = old < (min_ms if metric.endswith("_ms") else min_ms * 1000)
+            elif metric.endswith("_per_sec"):
+                change = old / value - 1
+            else:
+                continue
+            flag = ""
+            if change > threshold and not noisy:
+                flag = "  REGRESSION"
+                regressions += 1
+            print(f"{key[0]:>16} m={key[1]:<4} e={key[2]:<6} {metric:<32} "
+                  f"{old:>12} -> {value:<12} {change:+.1%}{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--members", default="5,25,100")
+    parser.add_argument("--externals", default="1000,10000,50000")
+    parser.add_argument("--benches", default=",".join(BENCHES))
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--output", help="write results JSON to this file")
+    parser.add_argument("--compare", help="results JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative slowdown reported as a regression (default 0.2)")
+    parser.add_argument("--min-ms", type=float, default=1.0,
+                        help="ignore regressions in timings below this baseline (default 1.0)")
+    args = parser.parse_args()
+
+    benches = [b for b in args.benches.split(",") if b]
+    unknown = set(benches) - set(BENCHES)
+    if unknown:
+        parser.error(f"unknown benches: {', '.join(sorted(unknown))}")
+
+    results = []
+    for n_members in (int(s) for s in args.members.split(",")):
+        for n_externals in (int(s) for s in args.externals.split(",")):
+            results.extend(run_scenario(n_members, n_externals, benches, args.rounds))
+
+    run = {
+        "revision": _git_revision(),
+        "timestamp": int(time.time()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(run, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(run, baseline, args.threshold, args.min_ms):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: FleetRebalanceRouter path search on synthetic fleets.
+
+Builds fleets of 10/50/100 members where each member has channels to a
+random sample of a shared external peer pool, then times:
+- member adjacency graph build (once per topology version)
+- find_fleet_path (BFS)
+- find_hub_aware_fleet_path (Yen's k-shortest paths + hub re-ranking)
+
+Usage:
+    python3 benchmarks/bench_fleet_router.py [--sizes 10,50,100] [--queries 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.cost_reduction import FleetRebalanceRouter  # noqa: E402
+
+
+PEERS_PER_MEMBER = 40
+EXTERNAL_POOL_PER_MEMBER = 8  # external pool size = members * this
+
+
+class _StateManager:
+    def __init__(self, states):
+        self._states = states
+
+    def get_all_peer_states(self):
+        return self._states
+
+
+def build_router(n_members: int, seed: int = 42):
+    """Create a router over a synthetic fleet and its hub scores."""
+    rng = random.Random(seed)
+    pool = [f"03{i:064x}" for i in range(n_members * EXTERNAL_POOL_PER_MEMBER)]
+    states = []
+    for i in range(n_members):
+        state = MagicMock()
+        state.peer_id = f"02{i:064x}"
+        state.topology = rng.sample(pool, min(PEERS_PER_MEMBER, len(pool)))
+        states.append(state)
+
+    plugin = MagicMock()
+    router = FleetRebalanceRouter(plugin=plugin, state_manager=_StateManager(states))
+    hub_scores = {s.peer_id: rng.random() for s in states}
+    router.get_member_hub_scores = lambda: hub_scores
+    return router, pool, rng
+
+
+def bench(n_members: int, queries: int) -> dict:
+    router, pool, rng = build_router(n_members)
+
+    t0 = time.perf_counter()
+    router._get_member_graph()
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    pairs = [tuple(rng.sample(pool, 2)) for _ in range(queries)]
+
+    t0 = time.perf_counter()
+    for src, dst in pairs:
+        router.find_fleet_path(src, dst, 1_000_000)
+    bfs_us = (time.perf_counter() - t0) / queries * 1e6
+
+    t0 = time.perf_counter()
+    found = 0
+    for src, dst in pairs:
+        if router.find_hub_aware_fleet_path(src, dst, 1_000_000):
+            found += 1
+    hub_us = (time.perf_counter() - t0) / queries * 1e6
+
+    return {
+        "members": n_members,
+        "graph_build_ms": round(build_ms, 2),
+        "find_fleet_path_us": round(bfs_us, 1),
+        "find_hub_aware_fleet_path_us": round(hub_us, 1),
+        "paths_found": found,
+        "queries": queries,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10,50,100")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'members':>8} {'build_ms':>10} {'bfs_us':>10} {'hub_us':>10} {'found':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        r = bench(size, args.queries)
+        print(f"{r['members']:>8} {r['graph_build_ms']:>10} {r['find_fleet_path_us']:>10} "
+              f"{r['find_hub_aware_fleet_path_us']:>10} {r['paths_found']:>8}")
+
+
+if __name__ == "__main__":
+    main()
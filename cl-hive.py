@@ -100,10 +100,19 @@ from modules.anticipatory_liquidity import AnticipatoryLiquidityManager
 from modules.task_manager import TaskManager
 from modules.splice_manager import SpliceManager
 from modules.relay import RelayManager
+from modules.rate_limiter import RateLimiter
+from modules.forward_pipeline import ForwardEventPipeline
+from modules.perf_metrics import PerfMetrics, SamplingProfiler
+from modules.metrics_exporter import (
+    MetricsExporter, find_rate_limiters, write_forward_pipeline, write_mcf_health,
+    write_pending_actions, write_perf_metrics, write_rate_limiters, write_relay_stats,
+)
 from modules import network_metrics
 from modules.rpc_commands import (
     HiveContext,
     status as rpc_status,
+    perf as rpc_perf,
+    perf_profile as rpc_perf_profile,
     get_config as rpc_get_config,
     members as rpc_members,
     vpn_status as rpc_vpn_status,
@@ -195,6 +204,11 @@ plugin = Plugin()
 
 shutdown_event = threading.Event()
 
+# Hot-path latency histograms (loops, RPC, custommsg, database). Created at
+# import so RPC methods can be wrapped before init(); see hive-perf.
+# Loop iterations that bail out early with `continue` are not recorded.
+perf_metrics = PerfMetrics()
+
 # =============================================================================
 # THREAD-SAFE RPC WRAPPER
 # =============================================================================
@@ -234,7 +248,9 @@ class ThreadSafeRpcProxy:
         if callable(original_method):
             def thread_safe_method(*args, **kwargs):
                 # X-01: Use timeout to prevent indefinite blocking
+                wait_timer = perf_metrics.timer("lock", "rpc")
                 acquired = RPC_LOCK.acquire(timeout=RPC_LOCK_TIMEOUT_SECONDS)
+                wait_timer.stop()
                 if not acquired:
                     raise RpcLockTimeoutError(
                         f"RPC lock acquisition timed out after {RPC_LOCK_TIMEOUT_SECONDS}s"
@@ -254,7 +270,9 @@ class ThreadSafeRpcProxy:
         If kwargs are provided, they are merged with payload (kwargs take precedence).
         """
         # X-01: Use timeout to prevent indefinite blocking
+        wait_timer = perf_metrics.timer("lock", "rpc")
         acquired = RPC_LOCK.acquire(timeout=RPC_LOCK_TIMEOUT_SECONDS)
+        wait_timer.stop()
         if not acquired:
             raise RpcLockTimeoutError(
                 f"RPC lock acquisition timed out after {RPC_LOCK_TIMEOUT_SECONDS}s"
@@ -332,6 +350,9 @@ strategic_positioning_mgr: Optional[StrategicPositioningManager] = None
 anticipatory_liquidity_mgr: Optional[AnticipatoryLiquidityManager] = None
 task_mgr: Optional[TaskManager] = None
 splice_mgr: Optional[SpliceManager] = None
+forward_pipeline: Optional[ForwardEventPipeline] = None
+perf_profiler: Optional[SamplingProfiler] = None
+metrics_exporter: Optional[MetricsExporter] = None
 relay_mgr: Optional[RelayManager] = None
 our_pubkey: Optional[str] = None
 
@@ -433,105 +454,6 @@ def _save_fee_tracking_state() -> None:
 # RATE LIMITER (Security Enhancement)
 # =============================================================================
 
-class RateLimiter:
-    """
-    Token bucket rate limiter for gossip message flooding prevention.
-
-    Tracks message rates per sender and rejects messages that exceed
-    the configured rate. Uses a sliding window approach.
-    """
-
-    def __init__(self, max_per_minute: int = 10, window_seconds: int = 60):
-        """
-        Initialize the rate limiter.
-
-        Args:
-            max_per_minute: Maximum messages allowed per window
-            window_seconds: Size of the sliding window in seconds
-        """
-        self._max_messages = max_per_minute
-        self._window = window_seconds
-        self._timestamps: Dict[str, list] = {}  # peer_id -> list of timestamps
-        self._lock = threading.Lock()
-
-    def is_allowed(self, peer_id: str) -> bool:
-        """
-        Check if a message from this peer is allowed.
-
-        Args:
-            peer_id: The sender's pubkey
-
-        Returns:
-            True if allowed, False if rate limited
-        """
-        now = time.time()
-        cutoff = now - self._window
-
-        with self._lock:
-            # Get or create timestamp list for this peer
-            if peer_id not in self._timestamps:
-                self._timestamps[peer_id] = []
-
-            # Remove old timestamps outside the window
-            self._timestamps[peer_id] = [
-                ts for ts in self._timestamps[peer_id] if ts > cutoff
-            ]
-
-            # Check if under limit
-            if len(self._timestamps[peer_id]) >= self._max_messages:
-                return False
-
-            # Record this message
-            self._timestamps[peer_id].append(now)
-            return True
-
-    def get_stats(self, peer_id: str = None) -> Dict[str, Any]:
-        """Get rate limiter statistics."""
-        now = time.time()
-        cutoff = now - self._window
-
-        with self._lock:
-            if peer_id:
-                timestamps = self._timestamps.get(peer_id, [])
-                recent = [ts for ts in timestamps if ts > cutoff]
-                return {
-                    "peer_id": peer_id,
-                    "messages_in_window": len(recent),
-                    "max_per_window": self._max_messages,
-                    "window_seconds": self._window,
-                }
-
-            # Overall stats
-            total_peers = len(self._timestamps)
-            total_messages = sum(
-                len([ts for ts in timestamps if ts > cutoff])
-                for timestamps in self._timestamps.values()
-            )
-            return {
-                "tracked_peers": total_peers,
-                "total_messages_in_window": total_messages,
-                "max_per_peer": self._max_messages,
-                "window_seconds": self._window,
-            }
-
-    def cleanup(self) -> int:
-        """Remove stale entries. Returns number of peers cleaned."""
-        now = time.time()
-        cutoff = now - self._window
-        cleaned = 0
-
-        with self._lock:
-            stale_peers = [
-                peer_id for peer_id, timestamps in self._timestamps.items()
-                if not any(ts > cutoff for ts in timestamps)
-            ]
-            for peer_id in stale_peers:
-                del self._timestamps[peer_id]
-                cleaned += 1
-
-        return cleaned
-
-
 # Global rate limiter for PEER_AVAILABLE messages
 peer_available_limiter: Optional[RateLimiter] = None
 
@@ -610,6 +532,8 @@ def _get_hive_context() -> HiveContext:
     _rationalization_mgr = rationalization_mgr if 'rationalization_mgr' in globals() else None
     _strategic_positioning_mgr = strategic_positioning_mgr if 'strategic_positioning_mgr' in globals() else None
     _anticipatory_liquidity_mgr = anticipatory_liquidity_mgr if 'anticipatory_liquidity_mgr' in globals() else None
+    _forward_pipeline = forward_pipeline if 'forward_pipeline' in globals() else None
+    _perf_profiler = perf_profiler if 'perf_profiler' in globals() else None
 
     # Create a log wrapper that calls plugin.log
     def _log(msg: str, level: str = 'info'):
@@ -636,6 +560,9 @@ def _get_hive_context() -> HiveContext:
         rationalization_mgr=_rationalization_mgr,
         strategic_positioning_mgr=_strategic_positioning_mgr,
         anticipatory_manager=_anticipatory_liquidity_mgr,
+        forward_pipeline=_forward_pipeline,
+        perf_metrics=perf_metrics,
+        perf_profiler=_perf_profiler,
         our_id=_our_pubkey or "",
         log=_log,
     )
@@ -865,6 +792,25 @@ plugin.add_option(
     dynamic=True
 )
 
+# Metrics exporter options are NOT dynamic (listeners start at init)
+plugin.add_option(
+    name='hive-metrics-port',
+    default='0',
+    description='Serve OpenMetrics on http://<hive-metrics-bind>:<port>/metrics (0 = disabled)'
+)
+
+plugin.add_option(
+    name='hive-metrics-bind',
+    default='127.0.0.1',
+    description='Bind address for the OpenMetrics HTTP listener'
+)
+
+plugin.add_option(
+    name='hive-metrics-socket',
+    default='',
+    description='Unix socket path to serve OpenMetrics on (empty = disabled)'
+)
+
 
 # =============================================================================
 # CONFIG RELOAD SUPPORT
@@ -1005,7 +951,7 @@ def init(options: Dict[str, Any], configuration: Dict[str, Any], plugin: Plugin,
     5. Verify cl-revenue-ops dependency
     6. Set up signal handlers for graceful shutdown
     """
-    global database, config, safe_plugin, handshake_mgr, state_manager, gossip_mgr, intent_mgr, our_pubkey, bridge, vpn_transport, relay_mgr
+    global database, config, safe_plugin, handshake_mgr, state_manager, gossip_mgr, intent_mgr, our_pubkey, bridge, vpn_transport, relay_mgr, perf_profiler
     
     plugin.log("cl-hive: Initializing Swarm Intelligence layer...")
     
@@ -1045,6 +991,13 @@ def init(options: Dict[str, Any], configuration: Dict[str, Any], plugin: Plugin,
     database = HiveDatabase(config.db_path, safe_plugin)
     database.initialize()
     plugin.log(f"cl-hive: Database initialized at {config.db_path}")
+
+    # Time every database method for hive-perf
+    instrumented = perf_metrics.instrument(database, "db")
+    perf_profiler = SamplingProfiler(
+        log=lambda msg, level: safe_plugin.log(f"cl-hive: {msg}", level=level)
+    )
+    plugin.log(f"cl-hive: Performance metrics enabled ({instrumented} database methods)", level='debug')
     
     # Initialize handshake manager
     handshake_mgr = HandshakeManager(
@@ -1417,6 +1370,8 @@ def init(options: Dict[str, Any], configuration: Dict[str, Any], plugin: Plugin,
         gossip_mgr=gossip_mgr
     )
     fee_coordination_mgr.set_our_pubkey(our_pubkey)
+    # New markers (local deposits and gossip) invalidate planner candidates
+    fee_coordination_mgr.stigmergic_coord.subscribe_markers(planner.on_marker_deposited)
     plugin.log("cl-hive: Fee coordination manager initialized (Phase 2)")
 
     # Initialize Cost Reduction Manager (Phase 3 - Cost Reduction)
@@ -1480,6 +1435,9 @@ def init(options: Dict[str, Any], configuration: Dict[str, Any], plugin: Plugin,
     )
     plugin.log("cl-hive: Anticipatory liquidity manager initialized (Phase 7.1)")
 
+    # Share the anticipatory prediction memo with yield velocity predictions
+    yield_metrics_mgr.set_prediction_cache(anticipatory_liquidity_mgr.prediction_cache)
+
     # Initialize Task Manager (Phase 10 - Task Delegation Protocol)
     global task_mgr
     task_mgr = TaskManager(
@@ -1517,11 +1475,26 @@ def init(options: Dict[str, Any], configuration: Dict[str, Any], plugin: Plugin,
     )
     plugin.log("cl-hive: Planner linked to yield optimization modules (slime mold mode)")
 
+    # Start forward event pipeline (batched forward_event processing)
+    global forward_pipeline
+    forward_pipeline = _init_forward_pipeline()
+    forward_pipeline_thread = threading.Thread(
+        target=forward_pipeline.run,
+        args=(shutdown_event,),
+        name="cl-hive-forward-pipeline",
+        daemon=True
+    )
+    forward_pipeline_thread.start()
+    plugin.log("cl-hive: Forward event pipeline thread started")
+
     # Initialize rate limiter for PEER_AVAILABLE messages (Security Enhancement)
     global peer_available_limiter
-    peer_available_limiter = RateLimiter(max_per_minute=10, window_seconds=60)
+    peer_available_limiter = RateLimiter(max_count=10, period_seconds=60)
     plugin.log("cl-hive: Rate limiter initialized (10 msg/min per peer)")
 
+    # Start OpenMetrics exporter (disabled unless a port or socket is set)
+    _start_metrics_exporter(options)
+
     # Sync fee policies for existing members (Phase 4 integration)
     if bridge and bridge.status == BridgeStatus.ENABLED:
         _sync_member_policies(plugin)
@@ -1656,6 +1629,7 @@ def on_custommsg(peer_id: str, payload: str, plugin: Plugin, **kwargs):
             return {"result": "continue"}
 
     # Dispatch based on message type
+    handler_timer = perf_metrics.timer("custommsg", msg_type.name)
     try:
         if msg_type == HiveMessageType.HELLO:
             return handle_hello(peer_id, msg_payload, plugin)
@@ -1784,6 +1758,8 @@ def on_custommsg(peer_id: str, payload: str, plugin: Plugin, **kwargs):
     except Exception as e:
         plugin.log(f"cl-hive: Error handling {msg_type.name}: {e}", level='warn')
         return {"result": "continue"}
+    finally:
+        handler_timer.stop()
 
 
 def handle_hello(peer_id: str, payload: Dict, plugin: Plugin) -> Dict:
@@ -2785,64 +2761,161 @@ def on_peer_disconnected(**kwargs):
 
 @plugin.subscribe("forward_event")
 def on_forward_event(forward_event: Dict, plugin: Plugin, **kwargs):
-    """Track forwarding events for contribution, leech detection, and route probing."""
-    status = forward_event.get("status", "unknown")
-    fee_msat = forward_event.get("fee_msat", 0)
+    """
+    Queue forwarding events for contribution, leech detection, and route probing.
+
+    Processing happens in micro-batches on the forward pipeline thread
+    (see _init_forward_pipeline), not on the notification thread.
+    """
+    if forward_pipeline:
+        forward_pipeline.submit(forward_event)
 
-    # Handle contribution tracking
+
+def _start_metrics_exporter(options: Dict[str, Any]) -> None:
+    """Serve plugin internals in OpenMetrics format if configured."""
+    global metrics_exporter
+    port = int(options.get('hive-metrics-port', '0') or 0)
+    socket_path = options.get('hive-metrics-socket', '')
+    if not port and not socket_path:
+        return
+
+    def _log(msg: str, level: str = "info"):
+        safe_plugin.log(f"cl-hive: {msg}", level=level)
+
+    rate_limiters = find_rate_limiters({
+        "peer_available": peer_available_limiter,
+        "fee_intelligence": fee_intel_mgr,
+        "liquidity": liquidity_coord,
+        "peer_reputation": peer_reputation_mgr,
+        "routing": routing_map,
+        "task": task_mgr,
+        "splice": splice_mgr,
+    })
+    collectors = [
+        lambda w: write_perf_metrics(w, perf_metrics),
+        lambda w: write_rate_limiters(w, rate_limiters),
+        lambda w: write_pending_actions(w, database),
+    ]
+    if relay_mgr:
+        collectors.append(lambda w: write_relay_stats(w, relay_mgr))
+    if cost_reduction_mgr:
+        collectors.append(lambda w: write_mcf_health(w, cost_reduction_mgr))
+    if forward_pipeline:
+        collectors.append(lambda w: write_forward_pipeline(w, forward_pipeline))
+
+    metrics_exporter = MetricsExporter(collectors, log=_log)
+    try:
+        if port:
+            metrics_exporter.start_http(port, host=options.get('hive-metrics-bind', '127.0.0.1'))
+        if socket_path:
+            metrics_exporter.start_unix(socket_path)
+    except OSError as e:
+        _log(f"Metrics exporter failed to start: {e}", level='warn')
+
+
+def _init_forward_pipeline() -> ForwardEventPipeline:
+    """
+    Create the forward event pipeline and register its batch consumers.
+
+    All consumers of a batch share one listfunds lookup; the database writes
+    are committed in one transaction and the fee report broadcast runs after
+    the commit.
+    """
+    def _log(msg: str, level: str = "info"):
+        if safe_plugin:
+            safe_plugin.log(f"cl-hive: {msg}", level=level)
+
+    pipeline = ForwardEventPipeline(
+        context_factory=_forward_channel_peers,
+        transaction=database.transaction,
+        log=_log
+    )
+    pipeline.add_consumer("contribution", _forward_batch_contribution)
+    pipeline.add_consumer("route_probe", _forward_batch_route_probes)
+    pipeline.add_consumer("pool_revenue", _forward_batch_pool_revenue)
+    pipeline.add_consumer("fee_coordination", _forward_batch_fee_coordination)
+    pipeline.add_consumer("fee_gossip", _forward_batch_fee_gossip, after_commit=True)
+    return pipeline
+
+
+def _forward_channel_peers() -> Dict[str, str]:
+    """Map short_channel_id -> peer_id for our channels (one listfunds call)."""
+    if not safe_plugin:
+        return {}
+    funds = safe_plugin.rpc.listfunds()
+    return {
+        ch["short_channel_id"]: ch.get("peer_id", "")
+        for ch in funds.get("channels", [])
+        if ch.get("short_channel_id")
+    }
+
+
+def _settled_fee_sats(forward_event: Dict) -> int:
+    """Fee earned by a settled forward in whole sats (0 otherwise)."""
+    if forward_event.get("status", "unknown") != "settled":
+        return 0
+    return forward_event.get("fee_msat", 0) // 1000
+
+
+def _forward_batch_contribution(events: List[Dict], channel_peers: Optional[Dict[str, str]]):
+    """Handle contribution tracking for a batch of forwards."""
     if contribution_mgr:
-        try:
-            contribution_mgr.handle_forward_event({"forward_event": forward_event})
-        except Exception as e:
-            if safe_plugin:
-                safe_plugin.log(f"Forward event handling error: {e}", level="warn")
+        contribution_mgr.handle_forward_batch(events, channel_peers)
 
-    # Generate route probe data from successful forwards (Phase 7.4)
-    if routing_map and database and our_pubkey:
-        try:
-            if status == "settled":
-                _record_forward_as_route_probe(forward_event)
-        except Exception as e:
-            if safe_plugin:
-                safe_plugin.log(f"Route probe from forward error: {e}", level="debug")
 
-    # Record routing revenue to pool (Phase 0 - Collective Economics)
-    if routing_pool and our_pubkey:
-        try:
-            if status == "settled":
-                fee_msat = forward_event.get("fee_msat", 0)
-                fee_sats = fee_msat // 1000
-                if fee_msat > 0 and fee_sats > 0:
-                    routing_pool.record_revenue(
-                        member_id=our_pubkey,
-                        amount_sats=fee_sats,
-                        channel_id=forward_event.get("out_channel"),
-                        payment_hash=forward_event.get("payment_hash")
-                    )
-                    # Broadcast fee report to hive (real-time settlement)
-                    _update_and_broadcast_fees(fee_sats)
-        except Exception as e:
-            if safe_plugin:
-                safe_plugin.log(f"Pool revenue recording error: {e}", level="debug")
+def _forward_batch_route_probes(events: List[Dict], channel_peers: Optional[Dict[str, str]]):
+    """Generate route probe data from successful forwards (Phase 7.4)."""
+    if not (routing_map and database and our_pubkey) or channel_peers is None:
+        return
+    for forward_event in events:
+        if forward_event.get("status", "unknown") == "settled":
+            _record_forward_as_route_probe(forward_event, channel_peers)
+
+
+def _forward_batch_pool_revenue(events: List[Dict], channel_peers: Optional[Dict[str, str]]):
+    """Record routing revenue to pool (Phase 0 - Collective Economics)."""
+    if not (routing_pool and our_pubkey):
+        return
+    for forward_event in events:
+        fee_sats = _settled_fee_sats(forward_event)
+        if fee_sats > 0:
+            routing_pool.record_revenue(
+                member_id=our_pubkey,
+                amount_sats=fee_sats,
+                channel_id=forward_event.get("out_channel"),
+                payment_hash=forward_event.get("payment_hash")
+            )
 
-    # Update fee coordination systems (pheromones + stigmergic markers)
-    if fee_coordination_mgr and our_pubkey:
-        try:
-            _record_forward_for_fee_coordination(forward_event, status)
-        except Exception as e:
-            if safe_plugin:
-                safe_plugin.log(f"Fee coordination recording error: {e}", level="debug")
 
+def _forward_batch_fee_coordination(events: List[Dict], channel_peers: Optional[Dict[str, str]]):
+    """Update fee coordination systems (pheromones + stigmergic markers)."""
+    if not (fee_coordination_mgr and our_pubkey) or channel_peers is None:
+        return
+    for forward_event in events:
+        _record_forward_for_fee_coordination(
+            forward_event, forward_event.get("status", "unknown"), channel_peers
+        )
 
-def _update_and_broadcast_fees(new_fee_sats: int):
+
+def _forward_batch_fee_gossip(events: List[Dict], channel_peers: Optional[Dict[str, str]]):
+    """Broadcast fee report to hive (real-time settlement), once per batch."""
+    if not (routing_pool and our_pubkey):
+        return
+    fees = [fee for fee in map(_settled_fee_sats, events) if fee > 0]
+    if fees:
+        _update_and_broadcast_fees(sum(fees), forward_count=len(fees))
+
+
+def _update_and_broadcast_fees(new_fee_sats: int, forward_count: int = 1):
     """
     Update local fee tracking and broadcast to hive if threshold met.
 
-    Called on each settled forward to maintain real-time fee gossip
-    for accurate settlement calculations.
+    Called for each batch of settled forwards to maintain real-time fee
+    gossip for accurate settlement calculations.
 
     Args:
-        new_fee_sats: Fees earned from this forward
+        new_fee_sats: Fees earned from these forwards
+        forward_count: Number of forwards that earned them
     """
     global _local_fees_earned_sats, _local_fees_forward_count
     global _local_fees_period_start, _local_fees_last_broadcast
@@ -2867,7 +2940,7 @@ def _update_and_broadcast_fees(new_fee_sats: int):
 
         # Update local tracking
         _local_fees_earned_sats += new_fee_sats
-        _local_fees_forward_count += 1
+        _local_fees_forward_count += forward_count
 
         # Check if we should broadcast - cumulative change since last broadcast
         cumulative_fee_change = _local_fees_earned_sats - _local_fees_last_broadcast_amount
@@ -3012,7 +3085,7 @@ def _broadcast_fee_report(fees_earned: int, forward_count: int,
             safe_plugin.log(f"cl-hive: Fee report broadcast error: {e}", level="warn")
 
 
-def _record_forward_as_route_probe(forward_event: Dict):
+def _record_forward_as_route_probe(forward_event: Dict, channel_peers: Dict[str, str]):
     """
     Record a settled forward as route probe data.
 
@@ -3031,12 +3104,8 @@ def _record_forward_as_route_probe(forward_event: Dict):
         if not in_channel or not out_channel:
             return
 
-        # Get peer IDs for the channels
-        funds = safe_plugin.rpc.listfunds()
-        channels = {ch.get("short_channel_id"): ch for ch in funds.get("channels", [])}
-
-        in_peer = channels.get(in_channel, {}).get("peer_id", "")
-        out_peer = channels.get(out_channel, {}).get("peer_id", "")
+        in_peer = channel_peers.get(in_channel, "")
+        out_peer = channel_peers.get(out_channel, "")
 
         if not in_peer or not out_peer:
             return
@@ -3060,7 +3129,8 @@ def _record_forward_as_route_probe(forward_event: Dict):
         pass  # Silently ignore errors in route probe recording
 
 
-def _record_forward_for_fee_coordination(forward_event: Dict, status: str):
+def _record_forward_for_fee_coordination(forward_event: Dict, status: str,
+                                         channel_peers: Dict[str, str]):
     """
     Record a forward event for fee coordination (pheromones + stigmergic markers).
 
@@ -3080,12 +3150,8 @@ def _record_forward_for_fee_coordination(forward_event: Dict, status: str):
         if not out_channel:
             return
 
-        # Get peer IDs for the channels
-        funds = safe_plugin.rpc.listfunds()
-        channels = {ch.get("short_channel_id"): ch for ch in funds.get("channels", [])}
-
-        in_peer = channels.get(in_channel, {}).get("peer_id", "") if in_channel else ""
-        out_peer = channels.get(out_channel, {}).get("peer_id", "")
+        in_peer = channel_peers.get(in_channel, "") if in_channel else ""
+        out_peer = channel_peers.get(out_channel, "")
 
         if not out_peer:
             return
@@ -3501,10 +3567,8 @@ def _sync_member_policies(plugin: Plugin) -> None:
     if not database or not bridge or bridge.status != BridgeStatus.ENABLED:
         return
 
-    members = database.get_all_members()
-    synced = 0
-
-    for member in members:
+    policies = {}
+    for member in database.get_all_members():
         peer_id = member["peer_id"]
         tier = member.get("tier")
 
@@ -3514,21 +3578,22 @@ def _sync_member_policies(plugin: Plugin) -> None:
 
         # Determine if this peer should have HIVE strategy
         # Both admin and member tiers get HIVE strategy
-        is_hive_member = tier in (MembershipTier.MEMBER.value,)
+        policies[peer_id] = tier in (MembershipTier.MEMBER.value,)
 
-        try:
-            # Use bypass_rate_limit=True for startup sync
-            success = bridge.set_hive_policy(peer_id, is_member=is_hive_member, bypass_rate_limit=True)
-            if success:
-                synced += 1
-                plugin.log(
-                    f"cl-hive: Synced policy for {peer_id[:16]}... "
-                    f"({'hive' if is_hive_member else 'dynamic'})",
-                    level='debug'
-                )
-        except Exception as e:
+    try:
+        # Batched on the bridge connection; bypass rate limit for startup sync
+        results = bridge.set_hive_policies(policies, bypass_rate_limit=True)
+    except Exception as e:
+        plugin.log(f"cl-hive: Failed to sync fee policies: {e}", level='debug')
+        results = {}
+
+    synced = 0
+    for peer_id, success in results.items():
+        if success:
+            synced += 1
             plugin.log(
-                f"cl-hive: Failed to sync policy for {peer_id[:16]}...: {e}",
+                f"cl-hive: Synced policy for {peer_id[:16]}... "
+                f"({'hive' if policies[peer_id] else 'dynamic'})",
                 level='debug'
             )
 
@@ -4306,6 +4371,10 @@ def handle_peer_available(peer_id: str, payload: Dict, plugin: Plugin) -> Dict:
         reason=reason
     )
 
+    # Quality inputs changed - re-score this target before the next cycle
+    if planner:
+        planner.invalidate_candidate(target_peer_id)
+
     # =========================================================================
     # Evaluate expansion opportunities (only for close events)
     # =========================================================================
@@ -7609,6 +7678,7 @@ def intent_monitor_loop():
     MONITOR_INTERVAL = 5  # seconds
     
     while not shutdown_event.is_set():
+        iteration_timer = perf_metrics.timer("loop", "intent_monitor_loop")
         try:
             if intent_mgr and database and config:
                 process_ready_intents()
@@ -7617,6 +7687,8 @@ def intent_monitor_loop():
             if safe_plugin:
                 safe_plugin.log(f"Intent monitor error: {e}", level='warn')
         
+        iteration_timer.stop()
+
         # Wait for next iteration or shutdown
         shutdown_event.wait(MONITOR_INTERVAL)
 
@@ -7725,6 +7797,7 @@ def membership_maintenance_loop():
     PRESENCE_WINDOW_SECONDS = 30 * 86400
 
     while not shutdown_event.is_set():
+        iteration_timer = perf_metrics.timer("loop", "membership_maintenance_loop")
         try:
             if database:
                 # Phase 5: Membership data pruning
@@ -7751,6 +7824,7 @@ def membership_maintenance_loop():
             if safe_plugin:
                 safe_plugin.log(f"Membership maintenance error: {e}", level='warn')
 
+        iteration_timer.stop()
         shutdown_event.wait(MAINTENANCE_INTERVAL)
 
 
@@ -7764,6 +7838,9 @@ PLANNER_MIN_INTERVAL_SECONDS = 300  # 5 minutes minimum
 # Jitter range to prevent all Hive nodes waking simultaneously
 PLANNER_JITTER_SECONDS = 300  # ±5 minutes
 
+# Candidate table refresh interval between planner cycles
+PLANNER_CANDIDATE_REFRESH_SECONDS = 60
+
 
 def planner_loop():
     """
@@ -7778,11 +7855,15 @@ def planner_loop():
     - Enforces hard minimum interval (300s) to prevent Intent Storms
     - Adds random jitter to prevent simultaneous wake-up across swarm
     - Respects shutdown_event for graceful termination
+
+    Between cycles, the expansion candidate table is refreshed every
+    PLANNER_CANDIDATE_REFRESH_SECONDS so a cycle only reads ranked scores.
     """
     # Run first cycle immediately on startup (for testing)
     first_run = True
 
     while not shutdown_event.is_set():
+        iteration_timer = perf_metrics.timer("loop", "planner_loop")
         try:
             if planner and config:
                 # Take config snapshot at cycle start (determinism)
@@ -7815,6 +7896,8 @@ def planner_loop():
             if safe_plugin:
                 safe_plugin.log(f"Planner loop error: {e}", level='warn')
 
+        iteration_timer.stop()
+
         # Calculate next sleep interval
         if first_run:
             first_run = False
@@ -7829,8 +7912,20 @@ def planner_loop():
         else:
             sleep_time = 3600  # Default 1 hour if config unavailable
 
-        # Wait for next cycle or shutdown
-        shutdown_event.wait(sleep_time)
+        # Wait for next cycle or shutdown, refreshing candidates meanwhile
+        deadline = time.time() + sleep_time
+        while not shutdown_event.wait(
+            max(0, min(PLANNER_CANDIDATE_REFRESH_SECONDS, deadline - time.time()))
+        ):
+            if time.time() >= deadline:
+                break
+            if planner and config:
+                try:
+                    with perf_metrics.timer("loop", "planner_candidate_refresh"):
+                        planner.refresh_candidates(config.snapshot(), refresh_network=True)
+                except Exception as e:
+                    if safe_plugin:
+                        safe_plugin.log(f"Planner candidate refresh error: {e}", level='warn')
 
 
 # =============================================================================
@@ -7861,6 +7956,7 @@ def fee_intelligence_loop():
     shutdown_event.wait(60)
 
     while not shutdown_event.is_set():
+        iteration_timer = perf_metrics.timer("loop", "fee_intelligence_loop")
         try:
             if not fee_intel_mgr or not database or not safe_plugin or not our_pubkey:
                 shutdown_event.wait(60)
@@ -7869,7 +7965,8 @@ def fee_intelligence_loop():
             # Step 1: Collect and broadcast our fee intelligence
             _broadcast_our_fee_intelligence()
 
-            # Step 2: Aggregate all received fee intelligence
+            # Step 2: Aggregate fee intelligence (peers with new reports only,
+            # periodic full pass)
             try:
                 updated = fee_intel_mgr.aggregate_fee_profiles()
                 if updated > 0:
@@ -8077,6 +8174,8 @@ def fee_intelligence_loop():
             if safe_plugin:
                 safe_plugin.log(f"cl-hive: Fee intelligence loop error: {e}", level='warn')
 
+        iteration_timer.stop()
+
         # Wait for next cycle
         shutdown_event.wait(FEE_INTELLIGENCE_INTERVAL)
 
@@ -8110,6 +8209,7 @@ def settlement_loop():
     shutdown_event.wait(120)
 
     while not shutdown_event.is_set():
+        iteration_timer = perf_metrics.timer("loop", "settlement_loop")
         try:
             if not settlement_mgr or not database or not state_manager or not safe_plugin or not our_pubkey:
                 shutdown_event.wait(60)
@@ -8279,6 +8379,8 @@ def settlement_loop():
             if safe_plugin:
                 safe_plugin.log(f"SETTLEMENT: Loop error: {e}", level='warn')
 
+        iteration_timer.stop()
+
         # Wait for next cycle
         shutdown_event.wait(SETTLEMENT_CHECK_INTERVAL)
 
@@ -8468,6 +8570,7 @@ def gossip_loop():
     shutdown_event.wait(30)
 
     while not shutdown_event.is_set():
+        iteration_timer = perf_metrics.timer("loop", "gossip_loop")
         try:
             if not gossip_mgr or not safe_plugin or not database or not our_pubkey:
                 shutdown_event.wait(60)
@@ -8566,6 +8669,8 @@ def gossip_loop():
             if safe_plugin:
                 safe_plugin.log(f"cl-hive: Gossip loop error: {e}", level='warn')
 
+        iteration_timer.stop()
+
         # Wait for next cycle (5 minutes default)
         shutdown_event.wait(DEFAULT_HEARTBEAT_INTERVAL)
 
@@ -8592,6 +8697,7 @@ def mcf_optimization_loop():
     shutdown_event.wait(60)
 
     while not shutdown_event.is_set():
+        iteration_timer = perf_metrics.timer("loop", "mcf_optimization_loop")
         try:
             if not cost_reduction_mgr or not safe_plugin or not database or not our_pubkey:
                 shutdown_event.wait(60)
@@ -8626,6 +8732,8 @@ def mcf_optimization_loop():
             if safe_plugin:
                 safe_plugin.log(f"cl-hive: MCF optimization loop error: {e}", level='warn')
 
+        iteration_timer.stop()
+
         # Wait for next cycle (10 minutes)
         shutdown_event.wait(MCF_CYCLE_INTERVAL)
 
@@ -9338,6 +9446,9 @@ def _broadcast_our_temporal_patterns():
         members = database.get_all_members()
         member_ids = {m.get("peer_id") for m in members}
 
+        # Refresh patterns for every channel (one history query for the node)
+        anticipatory_liquidity_mgr.detect_all_patterns()
+
         # Get shareable temporal patterns (excluding hive members)
         shareable_patterns = anticipatory_liquidity_mgr.get_shareable_patterns(
             min_confidence=MIN_TEMPORAL_PATTERN_CONFIDENCE,
@@ -9926,6 +10037,46 @@ def hive_status(plugin: Plugin):
     return rpc_status(_get_hive_context())
 
 
+@plugin.method("hive-perf")
+def hive_perf(plugin: Plugin, category: str = None, limit: int = None, reset: bool = False):
+    """
+    Get hot-path latency histograms.
+
+    Reports count, mean, p50/p95/p99 and max per background loop
+    iteration, RPC command, custommsg handler and database method.
+
+    Args:
+        category: Only one category (loop, rpc, custommsg, db)
+        limit: Top N entries per category by total time
+        reset: Clear the histograms after reading
+
+    Returns:
+        Dict with timing summaries per category and profiler status.
+    """
+    return rpc_perf(_get_hive_context(), category=category, limit=limit, reset=reset)
+
+
+@plugin.method("hive-perf-profile")
+def hive_perf_profile(plugin: Plugin, duration: int = 30, interval_ms: float = 10,
+                      filename: str = None):
+    """
+    Start an on-demand stack-sampling profile of all plugin threads.
+
+    Args:
+        duration: Seconds to sample (max 600, default 30)
+        interval_ms: Milliseconds between samples (default 10)
+        filename: Output file name in the hive database directory
+                  (default: cl-hive-profile-<timestamp>.txt); only earlier
+                  profiles are overwritten
+
+    Returns:
+        Profiler status with the output path; the file is written when
+        sampling ends (see hive-perf for progress).
+    """
+    return rpc_perf_profile(_get_hive_context(), duration=duration,
+                            interval_ms=interval_ms, filename=filename)
+
+
 @plugin.method("hive-report-period-costs")
 def hive_report_period_costs(plugin: Plugin, rebalance_costs_sats: int):
     """
@@ -11525,7 +11676,7 @@ def hive_aggregate_fees(plugin: Plugin):
     if not fee_intel_mgr:
         return {"error": "Fee intelligence manager not initialized"}
 
-    updated_count = fee_intel_mgr.aggregate_fee_profiles()
+    updated_count = fee_intel_mgr.aggregate_fee_profiles(full=True)
 
     return {
         "status": "ok",
@@ -11784,7 +11935,7 @@ def hive_trigger_all(plugin: Plugin):
         results["fee_broadcast"] = f"error: {e}"
 
     try:
-        updated = fee_intel_mgr.aggregate_fee_profiles()
+        updated = fee_intel_mgr.aggregate_fee_profiles(full=True)
         results["profiles_aggregated"] = updated
     except Exception as e:
         results["profiles_aggregated"] = f"error: {e}"
@@ -16195,4 +16346,12 @@ def hive_splice_abort(plugin: Plugin, session_id: str):
 # MAIN
 # =============================================================================
 
+def _instrument_rpc_methods() -> None:
+    """Time every hive-* RPC command in perf_metrics (category "rpc")."""
+    for name, method in plugin.methods.items():
+        if name.startswith("hive-"):
+            method.func = perf_metrics.wrap("rpc", name, method.func)
+
+
+_instrument_rpc_methods()
 plugin.run()
@@ -17,13 +17,18 @@ Actual rebalancing is done by cl-revenue-ops based on these predictions.
 Author: Lightning Goats Team
 """
 
+import bisect
 import math
+import threading
 import time
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from .kalman_bank import KalmanFilterBank
+from .prediction_cache import PredictionCache
 
 if TYPE_CHECKING:
     from .database import HiveDatabase
@@ -38,12 +43,15 @@ PATTERN_WINDOW_DAYS = 14              # Days of history to analyze
 MIN_PATTERN_SAMPLES = 10              # Minimum observations for confidence
 PATTERN_CONFIDENCE_THRESHOLD = 0.60   # Minimum confidence to act on pattern
 PATTERN_STRENGTH_THRESHOLD = 1.3      # 30% above average = significant pattern
+FLOW_RECALIBRATION_SECONDS = 86400    # Rebuild flow histograms from the database daily
 
 # Kalman velocity integration settings
 KALMAN_VELOCITY_TTL_SECONDS = 3600    # Kalman data valid for 1 hour
 KALMAN_MIN_CONFIDENCE = 0.3           # Minimum confidence to use Kalman data
 KALMAN_MIN_REPORTERS = 1              # Minimum reporters for consensus
 KALMAN_UNCERTAINTY_SCALING = 1.5      # Scale factor for uncertainty in confidence
+LOCAL_KALMAN_MIN_UPDATES = 3          # Filter steps before trusting our own estimate
+LOCAL_KALMAN_MAX_AGE_SECONDS = 3 * 3600  # Our own estimate valid this long after last step
 
 # Prediction settings
 PREDICTION_HORIZONS = [6, 12, 24]     # Hours to look ahead
@@ -58,6 +66,7 @@ SATURATION_PCT_THRESHOLD = 0.80       # >80% local = saturation risk
 # Fleet coordination
 MAX_PREDICTIONS_PER_CHANNEL = 5       # Max predictions cached per channel
 PREDICTION_STALE_HOURS = 1            # Refresh predictions hourly
+CHANNEL_SNAPSHOT_TTL_SECONDS = 30     # Reuse one listpeerchannels result this long
 
 # =============================================================================
 # INTRA-DAY PATTERN DETECTION SETTINGS (Kalman-Enhanced)
@@ -270,6 +279,148 @@ class HourlyFlowSample:
     timestamp: int
 
 
+class FlowMoments:
+    """
+    Running count / sum / sum|x| / sum(x^2) of net flow for a set of buckets.
+
+    Samples can be added and removed exactly (integer sats), so the moments
+    always describe the current pattern window without rescanning it.
+    """
+
+    __slots__ = ("count", "total", "total_abs", "total_sq")
+
+    def __init__(self, buckets: int):
+        self.count = [0] * buckets
+        self.total = [0] * buckets
+        self.total_abs = [0] * buckets
+        self.total_sq = [0] * buckets
+
+    def copy(self) -> "FlowMoments":
+        moments = FlowMoments(0)
+        moments.count = list(self.count)
+        moments.total = list(self.total)
+        moments.total_abs = list(self.total_abs)
+        moments.total_sq = list(self.total_sq)
+        return moments
+
+    def add(self, bucket: int, net_flow_sats: int, sign: int = 1) -> None:
+        self.count[bucket] += sign
+        self.total[bucket] += sign * net_flow_sats
+        self.total_abs[bucket] += sign * abs(net_flow_sats)
+        self.total_sq[bucket] += sign * net_flow_sats * net_flow_sats
+
+    def mean(self, bucket: int) -> float:
+        n = self.count[bucket]
+        return self.total[bucket] / n if n else 0.0
+
+    def mean_abs(self, bucket: int) -> float:
+        n = self.count[bucket]
+        return self.total_abs[bucket] / n if n else 0.0
+
+    def mean_abs_deviation(self, bucket: int) -> float:
+        """
+        Mean absolute deviation from the bucket mean, estimated from the
+        variance as sigma * sqrt(2/pi) (exact for normally distributed flow).
+        """
+        n = self.count[bucket]
+        if not n:
+            return 0.0
+        mean = self.total[bucket] / n
+        variance = max(0.0, self.total_sq[bucket] / n - mean * mean)
+        return math.sqrt(variance) * _MAD_PER_SIGMA
+
+
+_MAD_PER_SIGMA = math.sqrt(2 / math.pi)
+
+
+class FlowHistogram:
+    """
+    Hour-of-day (24), day-of-week (7) and hour-of-week (168) flow moments
+    for one channel, covering the samples currently in its pattern window.
+    """
+
+    __slots__ = ("overall", "hourly", "daily", "slots")
+
+    def __init__(self):
+        self.overall = FlowMoments(1)
+        self.hourly = FlowMoments(24)
+        self.daily = FlowMoments(7)
+        self.slots = FlowMoments(7 * 24)
+
+    @classmethod
+    def from_samples(cls, samples: List[HourlyFlowSample]) -> "FlowHistogram":
+        """
+        Build from a sample list.
+
+        Accumulates only the 168 hour-of-week slots per sample; the hourly,
+        daily and overall moments are then summed from the slots.
+        """
+        histogram = cls()
+        slots = histogram.slots
+        count, total, total_abs, total_sq = (
+            slots.count, slots.total, slots.total_abs, slots.total_sq
+        )
+        for sample in samples:
+            i = sample.day_of_week * 24 + sample.hour
+            flow = sample.net_flow_sats
+            count[i] += 1
+            total[i] += flow
+            total_abs[i] += flow if flow >= 0 else -flow
+            total_sq[i] += flow * flow
+
+        histogram._sum_slots()
+        return histogram
+
+    @classmethod
+    def from_slot_moments(cls, rows) -> "FlowHistogram":
+        """
+        Build from pre-aggregated hour-of-week slots.
+
+        Args:
+            rows: (channel_id, slot, count, sum, sum_abs, sum_sq) tuples as
+                  returned by HiveDatabase.get_flow_slot_moments()
+        """
+        histogram = cls()
+        slots = histogram.slots
+        for _, i, n, flow_sum, flow_abs, flow_sq in rows:
+            slots.count[i] = n
+            slots.total[i] = flow_sum
+            slots.total_abs[i] = flow_abs
+            slots.total_sq[i] = flow_sq
+
+        histogram._sum_slots()
+        return histogram
+
+    def _sum_slots(self) -> None:
+        """Derive the hourly, daily and overall moments from the slots."""
+        for name in FlowMoments.__slots__:
+            column = getattr(self.slots, name)
+            daily = [sum(column[day * 24:(day + 1) * 24]) for day in range(7)]
+            setattr(self.daily, name, daily)
+            setattr(self.hourly, name, [sum(column[hour::24]) for hour in range(24)])
+            getattr(self.overall, name)[0] = sum(daily)
+
+    def add(self, sample: HourlyFlowSample, sign: int = 1) -> None:
+        flow = sample.net_flow_sats
+        self.overall.add(0, flow, sign)
+        self.hourly.add(sample.hour, flow, sign)
+        self.daily.add(sample.day_of_week, flow, sign)
+        self.slots.add(sample.day_of_week * 24 + sample.hour, flow, sign)
+
+    def remove(self, sample: HourlyFlowSample) -> None:
+        self.add(sample, sign=-1)
+
+    def copy(self) -> "FlowHistogram":
+        histogram = FlowHistogram.__new__(FlowHistogram)
+        for name in FlowHistogram.__slots__:
+            setattr(histogram, name, getattr(self, name).copy())
+        return histogram
+
+    @property
+    def sample_count(self) -> int:
+        return self.overall.count[0]
+
+
 @dataclass
 class KalmanVelocityReport:
     """
@@ -502,7 +653,8 @@ class AnticipatoryLiquidityManager:
         database: 'HiveDatabase',
         plugin=None,
         state_manager=None,
-        our_id: str = None
+        our_id: str = None,
+        prediction_cache: Optional[PredictionCache] = None
     ):
         """
         Initialize the AnticipatoryLiquidityManager.
@@ -512,16 +664,35 @@ class AnticipatoryLiquidityManager:
             plugin: Plugin instance for RPC and logging
             state_manager: StateManager for fleet state queries
             our_id: Our node's pubkey
+            prediction_cache: Shared prediction memo (created if not given)
         """
         self.database = database
         self.plugin = plugin
         self.state_manager = state_manager
         self.our_id = our_id
 
+        # Memoized predictions, invalidated per channel on new flow samples,
+        # Kalman reports and balance changes
+        self.prediction_cache = prediction_cache or PredictionCache()
+
         # In-memory caches
         self._pattern_cache: Dict[str, List[TemporalPattern]] = {}
         self._prediction_cache: Dict[str, LiquidityPrediction] = {}
         self._flow_history: Dict[str, List[HourlyFlowSample]] = defaultdict(list)
+        # Sample timestamps parallel to _flow_history, for bisect lookups
+        self._flow_timestamps: Dict[str, List[int]] = defaultdict(list)
+
+        # Guards _flow_history, _flow_timestamps, the histograms and their
+        # calibration times; updated from RPC threads and background loops
+        self._flow_lock = threading.RLock()
+
+        # Running hour/day/hour-of-week moments for the pattern window,
+        # rebuilt from the database every FLOW_RECALIBRATION_SECONDS.
+        # _flow_window_loaded_at tracks when _flow_history last held the
+        # complete window (batch calibration only loads expiring samples).
+        self._flow_histograms: Dict[str, FlowHistogram] = {}
+        self._flow_calibrated_at: Dict[str, int] = {}
+        self._flow_window_loaded_at: Dict[str, int] = {}
 
         # Cache timestamps
         self._pattern_cache_time: Dict[str, int] = {}
@@ -532,6 +703,15 @@ class AnticipatoryLiquidityManager:
         self._kalman_velocities: Dict[str, List[KalmanVelocityReport]] = defaultdict(list)
         # Peer-to-channel mapping for queries by peer_id
         self._peer_to_channels: Dict[str, Set[str]] = defaultdict(set)
+        # Our own per-channel Kalman filters, stepped on each channel snapshot
+        self._kalman_bank = KalmanFilterBank()
+
+        # Channel snapshot from a single listpeerchannels call
+        # Key: channel_id, Value: parsed channel info (see _parse_channel)
+        self._channel_snapshot: Dict[str, Dict[str, Any]] = {}
+        self._channel_snapshot_time: float = 0
+        self._channel_snapshot_fetches: int = 0
+        self._last_sweep_seconds: float = 0.0
 
     def _log(self, message: str, level: str = "debug") -> None:
         """Log a message if plugin is available."""
@@ -584,18 +764,29 @@ class AnticipatoryLiquidityManager:
             timestamp=ts
         )
 
-        # Add to in-memory history
-        self._flow_history[channel_id].append(sample)
+        with self._flow_lock:
+            # Add to in-memory history (kept in timestamp order)
+            history = self._flow_history[channel_id]
+            timestamps = self._flow_timestamps[channel_id]
+            if timestamps and ts < timestamps[-1]:
+                pos = bisect.bisect_right(timestamps, ts)
+                timestamps.insert(pos, ts)
+                history.insert(pos, sample)
+            else:
+                timestamps.append(ts)
+                history.append(sample)
+
+            histogram = self._flow_histograms.get(channel_id)
+            if histogram is not None:
+                histogram.add(sample)
 
-        # Trim old samples (keep PATTERN_WINDOW_DAYS)
-        cutoff = ts - (PATTERN_WINDOW_DAYS * 24 * 3600)
-        self._flow_history[channel_id] = [
-            s for s in self._flow_history[channel_id]
-            if s.timestamp > cutoff
-        ]
+            # Trim old samples (keep PATTERN_WINDOW_DAYS)
+            self._expire_flow_samples(channel_id, ts - (PATTERN_WINDOW_DAYS * 24 * 3600))
 
-        # Persist to database
-        self._persist_flow_sample(sample)
+            # Persist while holding the lock so a concurrent reload from the
+            # database cannot miss a sample that is already in memory
+            self._persist_flow_sample(sample)
+        self.prediction_cache.invalidate(channel_id)
 
     def _persist_flow_sample(self, sample: HourlyFlowSample) -> None:
         """Persist flow sample to database."""
@@ -622,31 +813,211 @@ class AnticipatoryLiquidityManager:
         Returns:
             List of historical flow samples
         """
-        try:
-            rows = self.database.get_flow_samples(
-                channel_id=channel_id,
-                days=PATTERN_WINDOW_DAYS
-            )
+        with self._flow_lock:
+            try:
+                rows = self.database.get_flow_samples(
+                    channel_id=channel_id,
+                    days=PATTERN_WINDOW_DAYS
+                )
+
+                samples = [self._sample_from_row(row) for row in rows]
+                self._set_flow_window(channel_id, samples)
+                return list(samples)
+
+            except Exception as e:
+                self._log(f"Failed to load flow history: {e}", level="debug")
+                return list(self._flow_history.get(channel_id, []))
+
+    def calibrate_flow_history(self, channel_ids: Optional[Set[str]] = None) -> int:
+        """
+        Load pattern-window history for many channels with one query.
+
+        Channels in channel_ids that have no stored samples get an empty
+        window, so they are not re-queried one by one until the next
+        recalibration.
+
+        Args:
+            channel_ids: Channels to calibrate (None = every channel with samples)
 
-            samples = []
+        Returns:
+            Number of channels calibrated
+        """
+        with self._flow_lock:
+            try:
+                rows = self.database.get_all_flow_samples(days=PATTERN_WINDOW_DAYS)
+            except Exception as e:
+                self._log(f"Failed to load fleet flow history: {e}", level="debug")
+                return 0
+
+            by_channel: Dict[str, List[HourlyFlowSample]] = defaultdict(list)
             for row in rows:
-                samples.append(HourlyFlowSample(
-                    channel_id=row["channel_id"],
-                    hour=row["hour"],
-                    day_of_week=row["day_of_week"],
-                    inbound_sats=row["inbound_sats"],
-                    outbound_sats=row["outbound_sats"],
-                    net_flow_sats=row["net_flow_sats"],
-                    timestamp=row["timestamp"]
-                ))
+                if channel_ids is None or row["channel_id"] in channel_ids:
+                    by_channel[row["channel_id"]].append(self._sample_from_row(row))
 
-            # Update in-memory cache
-            self._flow_history[channel_id] = samples
-            return samples
+            targets = set(by_channel) if channel_ids is None else set(channel_ids)
+            now = int(time.time())
+            for channel_id in targets:
+                self._set_flow_window(channel_id, by_channel.get(channel_id, []), now)
+            return len(targets)
 
+    def calibrate_flow_histograms(self, channel_ids: Optional[Set[str]] = None) -> int:
+        """
+        Rebuild flow histograms for many channels from SQL aggregates.
+
+        The hour-of-week moments come from one GROUP BY query, so no
+        per-sample rows are materialised. Only samples that leave the
+        pattern window before the next recalibration are loaded, so they
+        can still be expired exactly; the full sample window is loaded on
+        demand by _get_flow_window().
+
+        Args:
+            channel_ids: Channels to calibrate (None = every channel with samples)
+
+        Returns:
+            Number of channels calibrated
+        """
+        with self._flow_lock:
+            return self._calibrate_flow_histograms(channel_ids)
+
+    def _calibrate_flow_histograms(self, channel_ids: Optional[Set[str]]) -> int:
+        """calibrate_flow_histograms() body; caller holds _flow_lock."""
+        now = int(time.time())
+        cutoff = now - PATTERN_WINDOW_DAYS * 24 * 3600
+        horizon = cutoff + FLOW_RECALIBRATION_SECONDS
+        try:
+            slot_rows = self.database.get_flow_slot_moments(since=cutoff)
+            expiring_rows = self.database.get_flow_samples_between(cutoff, horizon)
         except Exception as e:
-            self._log(f"Failed to load flow history: {e}", level="debug")
-            return self._flow_history.get(channel_id, [])
+            self._log(f"Failed to load fleet flow moments: {e}", level="debug")
+            return 0
+
+        slots_by_channel: Dict[str, List[Tuple]] = defaultdict(list)
+        for row in slot_rows:
+            if channel_ids is None or row[0] in channel_ids:
+                slots_by_channel[row[0]].append(row)
+        expiring: Dict[str, List[HourlyFlowSample]] = defaultdict(list)
+        for row in expiring_rows:
+            if row["channel_id"] in slots_by_channel:
+                expiring[row["channel_id"]].append(self._sample_from_row(row))
+
+        targets = set(slots_by_channel) if channel_ids is None else set(channel_ids)
+        for channel_id in targets:
+            # Samples newer than the horizon that we recorded ourselves stay
+            # in memory; they are in the aggregates and expire exactly once.
+            samples = expiring.get(channel_id, [])
+            samples.sort(key=lambda s: s.timestamp)
+            samples.extend(
+                s for s in self._flow_history.get(channel_id, []) if s.timestamp > horizon
+            )
+            self._flow_history[channel_id] = samples
+            self._flow_timestamps[channel_id] = [s.timestamp for s in samples]
+            self._flow_histograms[channel_id] = FlowHistogram.from_slot_moments(
+                slots_by_channel.get(channel_id, [])
+            )
+            self._flow_calibrated_at[channel_id] = now
+            self._flow_window_loaded_at.pop(channel_id, None)
+        return len(targets)
+
+    @staticmethod
+    def _sample_from_row(row: Dict[str, Any]) -> HourlyFlowSample:
+        return HourlyFlowSample(
+            channel_id=row["channel_id"],
+            hour=row["hour"],
+            day_of_week=row["day_of_week"],
+            inbound_sats=row["inbound_sats"],
+            outbound_sats=row["outbound_sats"],
+            net_flow_sats=row["net_flow_sats"],
+            timestamp=row["timestamp"]
+        )
+
+    def _set_flow_window(
+        self,
+        channel_id: str,
+        samples: List[HourlyFlowSample],
+        now: int = None
+    ) -> None:
+        """
+        Replace in-memory history with database rows and rebuild the
+        histogram. Caller holds _flow_lock.
+        """
+        samples.sort(key=lambda s: s.timestamp)
+        now = now or int(time.time())
+        self._flow_history[channel_id] = samples
+        self._flow_timestamps[channel_id] = [s.timestamp for s in samples]
+        self._flow_histograms[channel_id] = FlowHistogram.from_samples(samples)
+        self._flow_calibrated_at[channel_id] = now
+        self._flow_window_loaded_at[channel_id] = now
+
+    def _channels_needing_calibration(
+        self,
+        channel_ids,
+        now: int = None,
+        full_window: bool = False
+    ) -> Set[str]:
+        """Channels whose histogram (or, with full_window, sample window) is stale."""
+        now = now or int(time.time())
+        calibrated_at = self._flow_window_loaded_at if full_window else self._flow_calibrated_at
+        return {
+            cid for cid in channel_ids
+            if now - calibrated_at.get(cid, 0) >= FLOW_RECALIBRATION_SECONDS
+        }
+
+    def _expire_flow_samples(self, channel_id: str, cutoff: int) -> None:
+        """
+        Drop samples at or before cutoff from history and histogram.
+        Caller holds _flow_lock.
+        """
+        history = self._flow_history.get(channel_id)
+        if not history or history[0].timestamp > cutoff:
+            return
+
+        timestamps = self._flow_timestamps[channel_id]
+        keep_from = bisect.bisect_right(timestamps, cutoff)
+        histogram = self._flow_histograms.get(channel_id)
+        if histogram is not None:
+            for sample in history[:keep_from]:
+                histogram.remove(sample)
+        del history[:keep_from]
+        del timestamps[:keep_from]
+
+    def _get_flow_window(self, channel_id: str, now: int = None) -> List[HourlyFlowSample]:
+        """
+        Get the channel's pattern-window samples, keeping its histogram current.
+
+        Reads the database only when the channel has not been calibrated yet
+        or its last calibration is older than FLOW_RECALIBRATION_SECONDS;
+        otherwise samples recorded since then are already in memory.
+        """
+        now = now or int(time.time())
+        with self._flow_lock:
+            loaded_at = self._flow_window_loaded_at.get(channel_id)
+            if loaded_at is None or now - loaded_at >= FLOW_RECALIBRATION_SECONDS:
+                return self.load_flow_history(channel_id)
+
+            self._expire_flow_samples(channel_id, now - PATTERN_WINDOW_DAYS * 24 * 3600)
+            return list(self._flow_history.get(channel_id, []))
+
+    def get_flow_histogram(self, channel_id: str) -> Optional[FlowHistogram]:
+        """
+        Get the hour/day flow histogram for a channel's pattern window.
+
+        Unlike _get_flow_window(), a histogram rebuilt by
+        calibrate_flow_histograms() is used as is, without loading samples.
+        Returns a snapshot, so later samples do not change it while in use.
+        """
+        now = int(time.time())
+        with self._flow_lock:
+            calibrated_at = self._flow_calibrated_at.get(channel_id)
+            if calibrated_at is None or now - calibrated_at >= FLOW_RECALIBRATION_SECONDS:
+                samples = self.load_flow_history(channel_id)
+            else:
+                self._expire_flow_samples(channel_id, now - PATTERN_WINDOW_DAYS * 24 * 3600)
+                samples = self._flow_history.get(channel_id, [])
+            histogram = self._flow_histograms.get(channel_id)
+            if histogram is None:
+                histogram = FlowHistogram.from_samples(samples)
+                self._flow_histograms[channel_id] = histogram
+            return histogram.copy()
 
     # =========================================================================
     # PATTERN DETECTION
@@ -680,12 +1051,12 @@ class AnticipatoryLiquidityManager:
             if cache_age < PREDICTION_STALE_HOURS * 3600:
                 return self._pattern_cache[channel_id]
 
-        # Load history
-        samples = self.load_flow_history(channel_id)
-        if len(samples) < MIN_PATTERN_SAMPLES:
+        histogram = self.get_flow_histogram(channel_id)
+        sample_count = histogram.sample_count
+        if sample_count < MIN_PATTERN_SAMPLES:
             self._log(
                 f"Insufficient samples for {channel_id[:12]}... "
-                f"({len(samples)} < {MIN_PATTERN_SAMPLES})",
+                f"({sample_count} < {MIN_PATTERN_SAMPLES})",
                 level="debug"
             )
             return []
@@ -693,15 +1064,15 @@ class AnticipatoryLiquidityManager:
         patterns = []
 
         # Detect hourly patterns
-        hourly_patterns = self._detect_hourly_patterns(channel_id, samples)
+        hourly_patterns = self._detect_hourly_patterns(channel_id, histogram)
         patterns.extend(hourly_patterns)
 
         # Detect daily patterns
-        daily_patterns = self._detect_daily_patterns(channel_id, samples)
+        daily_patterns = self._detect_daily_patterns(channel_id, histogram)
         patterns.extend(daily_patterns)
 
         # Detect combined patterns (specific hours on specific days)
-        combined_patterns = self._detect_combined_patterns(channel_id, samples)
+        combined_patterns = self._detect_combined_patterns(channel_id, histogram)
         patterns.extend(combined_patterns)
 
         # Cache results
@@ -710,116 +1081,112 @@ class AnticipatoryLiquidityManager:
 
         self._log(
             f"Detected {len(patterns)} patterns for {channel_id[:12]}... "
-            f"from {len(samples)} samples",
+            f"from {sample_count} samples",
             level="debug"
         )
 
         return patterns
 
-    def _detect_hourly_patterns(
+    def detect_all_patterns(
         self,
-        channel_id: str,
-        samples: List[HourlyFlowSample]
-    ) -> List[TemporalPattern]:
-        """
-        Detect hour-of-day patterns.
-
-        Identifies hours with significantly above-average flow in either direction.
+        force_refresh: bool = False
+    ) -> Dict[str, List[TemporalPattern]]:
         """
-        patterns = []
-
-        # Group by hour
-        hourly_flows: Dict[int, List[int]] = defaultdict(list)
-        for sample in samples:
-            hourly_flows[sample.hour].append(sample.net_flow_sats)
-
-        # Calculate overall average
-        all_flows = [s.net_flow_sats for s in samples]
-        if not all_flows:
-            return patterns
-
-        overall_avg = sum(abs(f) for f in all_flows) / len(all_flows)
-        if overall_avg == 0:
-            return patterns
-
-        # Find significant deviations
-        for hour, flows in hourly_flows.items():
-            if len(flows) < 3:  # Need at least 3 samples per hour
-                continue
+        Detect temporal patterns for every channel in one pass.
 
-            avg_flow = sum(flows) / len(flows)
-            avg_magnitude = sum(abs(f) for f in flows) / len(flows)
+        Channel history that needs (re)calibration is read with a single
+        query for the whole node instead of one query per channel, and
+        channel -> peer mappings are refreshed from the channel snapshot so
+        the results can be shared with the fleet.
 
-            # Determine direction
-            if avg_flow > 0:
-                direction = FlowDirection.INBOUND
-            elif avg_flow < 0:
-                direction = FlowDirection.OUTBOUND
-            else:
-                direction = FlowDirection.BALANCED
+        Args:
+            force_refresh: Force recalculation even if cached
 
-            # Calculate intensity (relative to overall)
-            intensity = avg_magnitude / overall_avg if overall_avg > 0 else 1.0
+        Returns:
+            Dict of channel_id -> detected patterns
+        """
+        snapshot = self.get_channel_snapshot()
+        if snapshot:
+            channel_ids = set(snapshot)
+            self.update_channel_peer_mappings([
+                {"short_channel_id": cid, "peer_id": info["peer_id"]}
+                for cid, info in snapshot.items()
+            ])
+        else:
+            channel_ids = set(self._flow_calibrated_at)
 
-            # Calculate confidence based on consistency
-            if avg_magnitude > 0:
-                consistency = 1.0 - (
-                    sum(abs(f - avg_flow) for f in flows) /
-                    (len(flows) * avg_magnitude)
-                )
-            else:
-                consistency = 0.0
+        stale = self._channels_needing_calibration(channel_ids)
+        if stale or not channel_ids:
+            self.calibrate_flow_histograms(stale if channel_ids else None)
+            channel_ids = channel_ids or set(self._flow_calibrated_at)
 
-            confidence = min(1.0, max(0.0, consistency * (len(flows) / MIN_PATTERN_SAMPLES)))
+        return {
+            cid: self.detect_patterns(cid, force_refresh=force_refresh)
+            for cid in channel_ids
+        }
 
-            # Only keep significant patterns
-            if intensity >= PATTERN_STRENGTH_THRESHOLD and confidence >= PATTERN_CONFIDENCE_THRESHOLD:
-                patterns.append(TemporalPattern(
-                    channel_id=channel_id,
-                    hour_of_day=hour,
-                    day_of_week=None,  # All days
-                    direction=direction,
-                    intensity=intensity,
-                    confidence=confidence,
-                    samples=len(flows),
-                    avg_flow_sats=int(abs(avg_flow))
-                ))
+    def _detect_hourly_patterns(
+        self,
+        channel_id: str,
+        histogram: FlowHistogram
+    ) -> List[TemporalPattern]:
+        """
+        Detect hour-of-day patterns.
 
-        return patterns
+        Identifies hours with significantly above-average flow in either direction.
+        """
+        return self._detect_bucket_patterns(
+            channel_id, histogram, histogram.hourly,
+            min_samples=3,  # Need at least 3 samples per hour
+            full_confidence_samples=MIN_PATTERN_SAMPLES,
+            slot=lambda bucket: (bucket, None)  # All days
+        )
 
     def _detect_daily_patterns(
         self,
         channel_id: str,
-        samples: List[HourlyFlowSample]
+        histogram: FlowHistogram
     ) -> List[TemporalPattern]:
         """
         Detect day-of-week patterns.
 
         Identifies days with significantly different flow than average.
         """
-        patterns = []
-
-        # Group by day of week
-        daily_flows: Dict[int, List[int]] = defaultdict(list)
-        for sample in samples:
-            daily_flows[sample.day_of_week].append(sample.net_flow_sats)
+        return self._detect_bucket_patterns(
+            channel_id, histogram, histogram.daily,
+            min_samples=5,  # Need at least 5 samples per day
+            full_confidence_samples=20,
+            slot=lambda bucket: (None, bucket)  # All hours
+        )
 
-        # Calculate overall average
-        all_flows = [s.net_flow_sats for s in samples]
-        if not all_flows:
-            return patterns
+    def _detect_bucket_patterns(
+        self,
+        channel_id: str,
+        histogram: FlowHistogram,
+        moments: FlowMoments,
+        min_samples: int,
+        full_confidence_samples: int,
+        slot: Callable[[int], Tuple[Optional[int], Optional[int]]]
+    ) -> List[TemporalPattern]:
+        """Find hour or day buckets whose flow deviates strongly from the average."""
+        patterns = []
 
-        overall_avg = sum(abs(f) for f in all_flows) / len(all_flows)
+        overall_avg = histogram.overall.mean_abs(0)
         if overall_avg == 0:
             return patterns
 
-        # Find significant deviations
-        for day, flows in daily_flows.items():
-            if len(flows) < 5:  # Need at least 5 samples per day
+        for bucket, n in enumerate(moments.count):
+            if n < min_samples:
                 continue
 
-            avg_flow = sum(flows) / len(flows)
-            avg_magnitude = sum(abs(f) for f in flows) / len(flows)
+            # Calculate intensity (relative to overall); weak buckets are
+            # dropped before the more expensive consistency estimate
+            avg_magnitude = moments.mean_abs(bucket)
+            intensity = avg_magnitude / overall_avg
+            if intensity < PATTERN_STRENGTH_THRESHOLD:
+                continue
+
+            avg_flow = moments.mean(bucket)
 
             # Determine direction
             if avg_flow > 0:
@@ -829,30 +1196,25 @@ class AnticipatoryLiquidityManager:
             else:
                 direction = FlowDirection.BALANCED
 
-            # Calculate intensity
-            intensity = avg_magnitude / overall_avg if overall_avg > 0 else 1.0
-
-            # Calculate confidence
+            # Calculate confidence based on consistency
             if avg_magnitude > 0:
-                consistency = 1.0 - (
-                    sum(abs(f - avg_flow) for f in flows) /
-                    (len(flows) * avg_magnitude)
-                )
+                consistency = 1.0 - moments.mean_abs_deviation(bucket) / avg_magnitude
             else:
                 consistency = 0.0
 
-            confidence = min(1.0, max(0.0, consistency * (len(flows) / 20)))
+            confidence = min(1.0, max(0.0, consistency * (n / full_confidence_samples)))
 
             # Only keep significant patterns
-            if intensity >= PATTERN_STRENGTH_THRESHOLD and confidence >= PATTERN_CONFIDENCE_THRESHOLD:
+            if confidence >= PATTERN_CONFIDENCE_THRESHOLD:
+                hour_of_day, day_of_week = slot(bucket)
                 patterns.append(TemporalPattern(
                     channel_id=channel_id,
-                    hour_of_day=None,  # All hours
-                    day_of_week=day,
+                    hour_of_day=hour_of_day,
+                    day_of_week=day_of_week,
                     direction=direction,
                     intensity=intensity,
                     confidence=confidence,
-                    samples=len(flows),
+                    samples=n,
                     avg_flow_sats=int(abs(avg_flow))
                 ))
 
@@ -861,7 +1223,7 @@ class AnticipatoryLiquidityManager:
     def _detect_combined_patterns(
         self,
         channel_id: str,
-        samples: List[HourlyFlowSample]
+        histogram: FlowHistogram
     ) -> List[TemporalPattern]:
         """
         Detect combined hour+day patterns.
@@ -870,28 +1232,21 @@ class AnticipatoryLiquidityManager:
         """
         patterns = []
 
-        # Group by (day, hour)
-        slot_flows: Dict[Tuple[int, int], List[int]] = defaultdict(list)
-        for sample in samples:
-            key = (sample.day_of_week, sample.hour)
-            slot_flows[key].append(sample.net_flow_sats)
-
-        # Calculate overall average
-        all_flows = [s.net_flow_sats for s in samples]
-        if not all_flows:
-            return patterns
-
-        overall_avg = sum(abs(f) for f in all_flows) / len(all_flows)
+        overall_avg = histogram.overall.mean_abs(0)
         if overall_avg == 0:
             return patterns
 
-        # Find significant deviations (need at least 2 samples per slot)
-        for (day, hour), flows in slot_flows.items():
-            if len(flows) < 2:
+        # Find significant deviations (need at least 2 samples per slot).
+        # Combined patterns need a higher intensity threshold, checked
+        # first as sum|x| >= threshold * n since most slots fail it.
+        slots = histogram.slots
+        min_total_abs = PATTERN_STRENGTH_THRESHOLD * 1.5 * overall_avg
+        for index, (n, total_abs) in enumerate(zip(slots.count, slots.total_abs)):
+            if n < 2 or total_abs < min_total_abs * n:
                 continue
 
-            avg_flow = sum(flows) / len(flows)
-            avg_magnitude = sum(abs(f) for f in flows) / len(flows)
+            avg_flow = slots.mean(index)
+            avg_magnitude = total_abs / n
 
             # Determine direction
             if avg_flow > 0:
@@ -902,15 +1257,14 @@ class AnticipatoryLiquidityManager:
                 continue  # Skip balanced slots
 
             # Calculate intensity (must be significantly higher)
-            intensity = avg_magnitude / overall_avg if overall_avg > 0 else 1.0
-
-            # Combined patterns need higher threshold
+            intensity = avg_magnitude / overall_avg
             if intensity < PATTERN_STRENGTH_THRESHOLD * 1.5:
                 continue
 
             # Confidence is lower due to fewer samples
-            confidence = min(0.8, len(flows) / 4)  # Cap at 0.8 for combined
+            confidence = min(0.8, n / 4)  # Cap at 0.8 for combined
 
+            day, hour = divmod(index, 24)
             patterns.append(TemporalPattern(
                 channel_id=channel_id,
                 hour_of_day=hour,
@@ -918,7 +1272,7 @@ class AnticipatoryLiquidityManager:
                 direction=direction,
                 intensity=intensity,
                 confidence=confidence,
-                samples=len(flows),
+                samples=n,
                 avg_flow_sats=int(abs(avg_flow))
             ))
 
@@ -957,7 +1311,7 @@ class AnticipatoryLiquidityManager:
                 return cached.get('patterns', [])
 
         # Load flow history
-        samples = self.load_flow_history(channel_id)
+        samples = self._get_flow_window(channel_id, now)
         if len(samples) < MIN_PATTERN_SAMPLES:
             return []
 
@@ -1142,6 +1496,17 @@ class AnticipatoryLiquidityManager:
         Returns:
             IntraDayForecast or None if insufficient data
         """
+        return self.prediction_cache.get_or_compute(
+            "intraday_forecast", channel_id, current_local_pct,
+            lambda: self._intraday_forecast(channel_id, current_local_pct)
+        )
+
+    def _intraday_forecast(
+        self,
+        channel_id: str,
+        current_local_pct: float
+    ) -> Optional[IntraDayForecast]:
+        """Compute an intra-day forecast (uncached, see get_intraday_forecast)."""
         patterns = self.detect_intraday_patterns(channel_id)
         if not patterns:
             return None
@@ -1380,15 +1745,34 @@ class AnticipatoryLiquidityManager:
         Returns:
             LiquidityPrediction or None if insufficient data
         """
-        # Get current state if not provided
         if current_local_pct is None or capacity_sats is None:
+            # Resolve live state before the lookup: a snapshot refresh
+            # invalidates changed channels, which must not race the memo
+            horizon = (hours_ahead, peer_id)
             channel_info = self._get_channel_info(channel_id)
             if not channel_info:
                 return None
             current_local_pct = channel_info.get("local_pct", 0.5)
             capacity_sats = channel_info.get("capacity_sats", 0)
             peer_id = peer_id or channel_info.get("peer_id", "")
+        else:
+            horizon = (hours_ahead, current_local_pct, capacity_sats, peer_id)
+        return self.prediction_cache.get_or_compute(
+            "predict_liquidity", channel_id, horizon,
+            lambda: self._predict_liquidity(
+                channel_id, hours_ahead, current_local_pct, capacity_sats, peer_id
+            )
+        )
 
+    def _predict_liquidity(
+        self,
+        channel_id: str,
+        hours_ahead: int,
+        current_local_pct: float,
+        capacity_sats: int,
+        peer_id: Optional[str]
+    ) -> LiquidityPrediction:
+        """Compute a liquidity prediction (uncached, see predict_liquidity)."""
         # Get patterns
         patterns = self.detect_patterns(channel_id)
 
@@ -1535,6 +1919,11 @@ class AnticipatoryLiquidityManager:
         if kalman_velocity is not None:
             return kalman_velocity
 
+        # Then our own filter, stepped from channel balance snapshots
+        local_velocity = self._get_local_kalman_velocity(channel_id)
+        if local_velocity is not None:
+            return local_velocity
+
         # Fall back to simple net flow calculation
         return self._calculate_simple_velocity(channel_id, capacity_sats)
 
@@ -1548,7 +1937,8 @@ class AnticipatoryLiquidityManager:
 
         This is the fallback when no Kalman data is available.
         """
-        samples = self._flow_history.get(channel_id, [])
+        with self._flow_lock:
+            samples = list(self._flow_history.get(channel_id, []))
         if len(samples) < 2 or capacity_sats == 0:
             return 0.0
 
@@ -1572,6 +1962,20 @@ class AnticipatoryLiquidityManager:
 
         return velocity_pct
 
+    def _get_local_kalman_velocity(self, channel_id: str) -> Optional[float]:
+        """
+        Get velocity from our own Kalman filter for the channel.
+
+        Returns None until the filter has been stepped LOCAL_KALMAN_MIN_UPDATES
+        times, or if it has not been stepped for LOCAL_KALMAN_MAX_AGE_SECONDS.
+        """
+        bank = self._kalman_bank
+        if bank.updates(channel_id) < LOCAL_KALMAN_MIN_UPDATES:
+            return None
+        if int(time.time()) - bank.updated_at(channel_id) > LOCAL_KALMAN_MAX_AGE_SECONDS:
+            return None
+        return bank.velocity(channel_id)[0]
+
     def _get_kalman_consensus_velocity(
         self,
         channel_id: str
@@ -1794,37 +2198,96 @@ class AnticipatoryLiquidityManager:
 
         return "_".join(parts) if parts else "unknown"
 
-    def _get_channel_info(self, channel_id: str) -> Optional[Dict]:
-        """Get channel info from RPC."""
-        if not self.plugin:
+    @staticmethod
+    def _parse_channel(ch: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Parse one listpeerchannels entry into the channel info dict."""
+        scid = ch.get("short_channel_id")
+        if not scid:
             return None
 
+        total = ch.get("total_msat", 0)
+        if isinstance(total, str):
+            total = int(total.replace("msat", ""))
+        total_sats = total // 1000
+
+        local = ch.get("to_us_msat", 0)
+        if isinstance(local, str):
+            local = int(local.replace("msat", ""))
+        local_sats = local // 1000
+
+        return {
+            "channel_id": scid,
+            "peer_id": ch.get("peer_id", ""),
+            "state": ch.get("state", ""),
+            "capacity_sats": total_sats,
+            "local_sats": local_sats,
+            "local_pct": local_sats / total_sats if total_sats > 0 else 0.5
+        }
+
+    def get_channel_snapshot(self, force: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Get parsed info for all our channels from one listpeerchannels call.
+
+        The result is reused for CHANNEL_SNAPSHOT_TTL_SECONDS so that
+        per-channel lookups (and a fleet-wide prediction sweep) don't each
+        pay for a full listpeerchannels round-trip.
+
+        Args:
+            force: Re-fetch even if the cached snapshot is still fresh
+
+        Returns:
+            Dict of channel_id -> channel info (empty if RPC unavailable)
+        """
+        if not self.plugin:
+            return {}
+
+        now = time.time()
+        if (not force and self._channel_snapshot_time
+                and now - self._channel_snapshot_time < CHANNEL_SNAPSHOT_TTL_SECONDS):
+            return self._channel_snapshot
+
         try:
             channels = self.plugin.rpc.listpeerchannels()
-            for ch in channels.get("channels", []):
-                scid = ch.get("short_channel_id")
-                if scid == channel_id:
-                    total = ch.get("total_msat", 0)
-                    if isinstance(total, str):
-                        total = int(total.replace("msat", ""))
-                    total_sats = total // 1000
-
-                    local = ch.get("to_us_msat", 0)
-                    if isinstance(local, str):
-                        local = int(local.replace("msat", ""))
-                    local_sats = local // 1000
-
-                    return {
-                        "channel_id": scid,
-                        "peer_id": ch.get("peer_id", ""),
-                        "capacity_sats": total_sats,
-                        "local_sats": local_sats,
-                        "local_pct": local_sats / total_sats if total_sats > 0 else 0.5
-                    }
         except Exception as e:
-            self._log(f"Failed to get channel info: {e}", level="debug")
+            self._log(f"Failed to get channel snapshot: {e}", level="debug")
+            return self._channel_snapshot
 
-        return None
+        snapshot = {}
+        for ch in channels.get("channels", []):
+            try:
+                info = self._parse_channel(ch)
+            except (TypeError, ValueError):
+                continue
+            if info:
+                snapshot[info["channel_id"]] = info
+
+        previous = self._channel_snapshot
+        for channel_id, info in snapshot.items():
+            before = previous.get(channel_id)
+            if (before is None or before["local_sats"] != info["local_sats"]
+                    or before["state"] != info["state"]):
+                self.prediction_cache.invalidate(channel_id)
+
+        self._channel_snapshot = snapshot
+        self._channel_snapshot_time = now
+        self._channel_snapshot_fetches += 1
+        self._observe_balances(snapshot, int(now))
+        return snapshot
+
+    def _observe_balances(self, snapshot: Dict[str, Dict[str, Any]], timestamp: int) -> None:
+        """Step the local Kalman filter bank with a fresh set of balances."""
+        self._kalman_bank.update_batch(
+            {
+                cid: info["local_pct"] for cid, info in snapshot.items()
+                if info["state"] == "CHANNELD_NORMAL" and info["capacity_sats"] > 0
+            },
+            timestamp
+        )
+        self._kalman_bank.retain(snapshot)
+
+    def _get_channel_info(self, channel_id: str) -> Optional[Dict]:
+        """Get channel info from the shared channel snapshot."""
+        return self.get_channel_snapshot().get(channel_id)
 
     # =========================================================================
     # FLEET COORDINATION
@@ -1850,25 +2313,35 @@ class AnticipatoryLiquidityManager:
         if not self.plugin:
             return predictions
 
-        try:
-            channels = self.plugin.rpc.listpeerchannels()
-            for ch in channels.get("channels", []):
-                scid = ch.get("short_channel_id")
-                if not scid:
-                    continue
-
-                # Skip non-normal channels
-                if ch.get("state") != "CHANNELD_NORMAL":
-                    continue
+        # One RPC for the whole sweep; each prediction gets its balance
+        # from the snapshot instead of re-listing channels.
+        start = time.time()
+        snapshot = self.get_channel_snapshot(force=True)
+        stale = self._channels_needing_calibration(snapshot, full_window=True)
+        if len(stale) > 1:
+            self.calibrate_flow_history(stale)
+        for scid, info in snapshot.items():
+            # Skip non-normal channels
+            if info["state"] != "CHANNELD_NORMAL":
+                continue
 
-                pred = self.predict_liquidity(scid, hours_ahead=hours_ahead)
-                if pred:
-                    max_risk = max(pred.depletion_risk, pred.saturation_risk)
-                    if max_risk >= min_risk:
-                        predictions.append(pred)
+            try:
+                pred = self.predict_liquidity(
+                    scid,
+                    hours_ahead=hours_ahead,
+                    current_local_pct=info["local_pct"],
+                    capacity_sats=info["capacity_sats"],
+                    peer_id=info["peer_id"]
+                )
+            except Exception as e:
+                self._log(f"Prediction failed for {scid}: {e}", level="debug")
+                continue
 
-        except Exception as e:
-            self._log(f"Failed to get all predictions: {e}", level="debug")
+            if pred:
+                max_risk = max(pred.depletion_risk, pred.saturation_risk)
+                if max_risk >= min_risk:
+                    predictions.append(pred)
+        self._last_sweep_seconds = time.time() - start
 
         # Sort by risk
         predictions.sort(
@@ -1979,11 +2452,17 @@ class AnticipatoryLiquidityManager:
 
     def get_status(self) -> Dict[str, Any]:
         """Get manager status for diagnostics."""
+        with self._flow_lock:
+            total_flow_samples = sum(len(s) for s in self._flow_history.values())
         return {
             "active": True,
             "channels_with_patterns": len(self._pattern_cache),
             "channels_with_predictions": len(self._prediction_cache),
-            "total_flow_samples": sum(len(s) for s in self._flow_history.values()),
+            "channel_snapshot_size": len(self._channel_snapshot),
+            "channel_snapshot_fetches": self._channel_snapshot_fetches,
+            "prediction_cache": self.prediction_cache.get_stats(),
+            "last_sweep_seconds": round(self._last_sweep_seconds, 4),
+            "total_flow_samples": total_flow_samples,
             "pattern_window_days": PATTERN_WINDOW_DAYS,
             "prediction_stale_hours": PREDICTION_STALE_HOURS,
             "min_pattern_samples": MIN_PATTERN_SAMPLES,
@@ -2298,6 +2777,8 @@ class AnticipatoryLiquidityManager:
         if peer_id:
             self._peer_to_channels[peer_id].add(channel_id)
 
+        self.prediction_cache.invalidate(channel_id)
+
         self._log(
             f"Received Kalman velocity for {channel_id[:12]}... from {reporter_id[:12]}...: "
             f"v={velocity_pct_per_hour:.4%}/hr, u={uncertainty:.4f}",
@@ -2389,6 +2870,11 @@ class AnticipatoryLiquidityManager:
             "channels_with_data": channels_with_data,
             "channels_with_consensus": channels_with_consensus,
             "unique_peers": len(self._peer_to_channels),
+            "local_filters": len(self._kalman_bank),
+            "local_filters_ready": sum(
+                1 for channel_id in self._channel_snapshot
+                if self._get_local_kalman_velocity(channel_id) is not None
+            ),
             "ttl_seconds": KALMAN_VELOCITY_TTL_SECONDS,
             "min_confidence": KALMAN_MIN_CONFIDENCE,
             "min_reporters": KALMAN_MIN_REPORTERS
@@ -14,16 +14,16 @@ This prevents cascading failures when a dependency hangs or crashes.
 Author: Lightning Goats Team
 """
 
-import json
 import re
-import shutil
-import subprocess
 import time
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from pyln.client import RpcError
+
+from .rpc_socket import UnixRpcClient, resolve_socket_path
+
 # =============================================================================
 # CONSTANTS
 # =============================================================================
@@ -32,6 +32,8 @@ from pyln.client import RpcError
 MAX_FAILURES = 3          # Consecutive failures before opening circuit
 RESET_TIMEOUT = 60        # Seconds to wait before probing (OPEN -> HALF_OPEN)
 RPC_TIMEOUT = 5           # Timeout for RPC calls (seconds)
+POLICY_BATCH_SIZE = 25    # revenue-policy calls pipelined per batch
+POLICY_BATCH_TIMEOUT = 30  # Timeout for one batch of policy calls (seconds)
 HALF_OPEN_SUCCESS_THRESHOLD = 3  # Consecutive successes needed to close circuit (Issue #10)
 
 # Minimum required version of cl-revenue-ops
@@ -224,13 +226,15 @@ class Bridge:
         self._clboss_available = False
         self._clboss_unignore_supported = True
 
-        self._rpc_socket_path = self._resolve_rpc_socket()
-        self._use_subprocess = bool(
-            self._rpc_socket_path and shutil.which("lightning-cli")
-        )
-        if not self._use_subprocess:
+        # Own persistent connection to lightningd: never waits on RPC_LOCK
+        # and enforces RPC_TIMEOUT per call
+        self._rpc_socket_path = resolve_socket_path(self.rpc)
+        self._socket_rpc: Optional[UnixRpcClient] = None
+        if self._rpc_socket_path:
+            self._socket_rpc = UnixRpcClient(self._rpc_socket_path, timeout=RPC_TIMEOUT)
+        else:
             self._log(
-                "Bridge RPC timeout disabled: lightning-cli or rpc socket unavailable",
+                "Bridge RPC timeout disabled: rpc socket unavailable",
                 level="warn"
             )
         
@@ -243,22 +247,6 @@ class Bridge:
         self._daily_rebalance_sats = 0  # Aggregate rebalance amount today
         self._daily_rebalance_reset = 0  # Timestamp of last daily reset
 
-    def _resolve_rpc_socket(self) -> Optional[str]:
-        """Resolve the Core Lightning RPC socket path if available."""
-        if hasattr(self.rpc, "get_socket_path"):
-            path = self.rpc.get_socket_path()
-            if isinstance(path, str) and path:
-                return path
-        if hasattr(self.rpc, "socket_path"):
-            path = self.rpc.socket_path
-            if isinstance(path, str) and path:
-                return path
-        if hasattr(self.rpc, "_rpc") and hasattr(self.rpc._rpc, "socket_path"):
-            path = self.rpc._rpc.socket_path
-            if isinstance(path, str) and path:
-                return path
-        return None
-    
     def _log(self, msg: str, level: str = "info") -> None:
         """Log a message if plugin is available."""
         if self.plugin:
@@ -421,49 +409,14 @@ class Bridge:
     # SAFE CALL WRAPPER
     # =========================================================================
 
-    def _call_via_lightning_cli(self, method: str, payload: Optional[Dict[str, Any]]) -> Dict[str, Any]:
-        """Execute an RPC call via lightning-cli with a hard timeout.
-
-        Uses -k (keyword args) format to properly pass named parameters
-        to CLN methods.
-        """
-        if not self._rpc_socket_path:
-            raise BridgeDisabledError("RPC socket path unavailable")
-
-        # Use -k for keyword args format: key=value
-        cmd = ["lightning-cli", "--rpc-file", self._rpc_socket_path, "-k", method]
-        if payload:
-            for key, value in payload.items():
-                # Handle different value types
-                if value is None:
-                    continue
-                elif isinstance(value, bool):
-                    cmd.append(f"{key}={str(value).lower()}")
-                elif isinstance(value, (dict, list)):
-                    cmd.append(f"{key}={json.dumps(value, separators=(',', ':'))}")
-                else:
-                    cmd.append(f"{key}={value}")
-
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=RPC_TIMEOUT,
-            check=False
-        )
-
-        if result.returncode != 0:
-            err_msg = (result.stderr or result.stdout or "").strip()
-            raise RpcError(method, payload or {}, err_msg or "RPC error")
+    def _call_via_socket(self, method: str, payload: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Execute an RPC call on the Bridge's own socket connection with a hard timeout."""
+        return self._socket_rpc.call(method, self._socket_params(payload), timeout=RPC_TIMEOUT)
 
-        output = result.stdout.strip()
-        if not output:
-            return {}
-
-        try:
-            return json.loads(output)
-        except json.JSONDecodeError as exc:
-            raise RpcError(method, payload or {}, f"Invalid JSON response: {exc}")
+    @staticmethod
+    def _socket_params(payload: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Drop unset parameters so the callee applies its defaults."""
+        return {k: v for k, v in (payload or {}).items() if v is not None}
 
     def _call_direct(self, method: str, payload: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         """Execute an RPC call directly via the RPC proxy."""
@@ -497,20 +450,13 @@ class Bridge:
             raise CircuitOpenError(f"Circuit {cb.name} is OPEN")
         
         try:
-            if self._use_subprocess:
-                result = self._call_via_lightning_cli(method, payload)
+            if self._socket_rpc:
+                result = self._call_via_socket(method, payload)
             else:
                 result = self._call_direct(method, payload)
 
             cb.record_success()
             return result
-        except subprocess.TimeoutExpired:
-            cb.record_failure()
-            self._log(
-                f"RPC call {method} timed out after {RPC_TIMEOUT}s",
-                level='warn'
-            )
-            raise TimeoutError(f"RPC call {method} timed out after {RPC_TIMEOUT}s")
         except RpcError as e:
             cb.record_failure()
             self._log(f"RPC call {method} failed: {e}", level='warn')
@@ -519,6 +465,10 @@ class Bridge:
             cb.record_failure()
             self._log(f"RPC call {method} timed out: {e}", level='warn')
             raise
+        except ConnectionError as e:
+            cb.record_failure()
+            self._log(f"RPC call {method} failed: {e}", level='warn')
+            raise
         except Exception as e:
             self._log(f"RPC call {method} failed: {e}", level='warn')
             raise
@@ -561,21 +511,7 @@ class Bridge:
                 return False
 
         try:
-            if is_member:
-                # Set HIVE strategy with rebalancing enabled
-                result = self.safe_call("revenue-policy", {
-                    "action": "set",
-                    "peer_id": peer_id,
-                    "strategy": "hive",
-                    "rebalance": "enabled"
-                })
-            else:
-                # Revert to dynamic strategy
-                result = self.safe_call("revenue-policy", {
-                    "action": "set",
-                    "peer_id": peer_id,
-                    "strategy": "dynamic"
-                })
+            result = self.safe_call("revenue-policy", self._policy_payload(peer_id, is_member))
 
             success = result.get("status") == "success"
             if success:
@@ -593,6 +529,108 @@ class Bridge:
             self._log(f"Failed to set policy for {peer_id[:16]}...: {e}", level='warn')
             return False
     
+    @staticmethod
+    def _policy_payload(peer_id: str, is_member: bool) -> Dict[str, Any]:
+        """revenue-policy parameters for a member (HIVE) or non-member (dynamic)."""
+        if is_member:
+            # HIVE strategy with rebalancing enabled
+            return {
+                "action": "set",
+                "peer_id": peer_id,
+                "strategy": "hive",
+                "rebalance": "enabled"
+            }
+        # Revert to dynamic strategy
+        return {
+            "action": "set",
+            "peer_id": peer_id,
+            "strategy": "dynamic"
+        }
+
+    def set_hive_policies(self, policies: Dict[str, bool],
+                          bypass_rate_limit: bool = False) -> Dict[str, bool]:
+        """
+        Set Hive fee policy for many peers (e.g. startup policy sync).
+
+        With the socket client, revenue-policy calls are pipelined in
+        batches of POLICY_BATCH_SIZE on the Bridge's connection instead of
+        one round trip each. Without it, falls back to set_hive_policy()
+        per peer.
+
+        Args:
+            policies: peer_id -> is_member
+            bypass_rate_limit: Skip rate limiting (use sparingly, e.g., initial setup)
+
+        Returns:
+            peer_id -> True if the policy was set successfully
+        """
+        results = {peer_id: False for peer_id in policies}
+        if self._status == BridgeStatus.DISABLED:
+            self._log(f"Cannot set {len(policies)} policies: Bridge disabled")
+            return results
+
+        if not self._socket_rpc:
+            for peer_id, is_member in policies.items():
+                results[peer_id] = self.set_hive_policy(
+                    peer_id, is_member, bypass_rate_limit=bypass_rate_limit
+                )
+            return results
+
+        # Security: Rate limit policy changes per peer (Issue #27)
+        now = time.time()
+        pending: List[Tuple[str, bool]] = []
+        for peer_id, is_member in policies.items():
+            if not bypass_rate_limit:
+                last_change = self._policy_last_change.get(peer_id, 0)
+                if now - last_change < POLICY_RATE_LIMIT_SECONDS:
+                    self._log(
+                        f"Rate limited: Cannot change policy for {peer_id[:16]}...",
+                        level='debug'
+                    )
+                    continue
+            pending.append((peer_id, is_member))
+
+        cb = self._revenue_ops_cb
+        for start in range(0, len(pending), POLICY_BATCH_SIZE):
+            batch = pending[start:start + POLICY_BATCH_SIZE]
+            if not cb.is_available():
+                self._log(
+                    f"Circuit open, skipped policy for {len(pending) - start} peers"
+                )
+                break
+
+            try:
+                replies = self._socket_rpc.call_batch(
+                    [("revenue-policy", self._policy_payload(peer_id, is_member))
+                     for peer_id, is_member in batch],
+                    timeout=POLICY_BATCH_TIMEOUT
+                )
+            except (TimeoutError, ConnectionError) as e:
+                cb.record_failure()
+                self._log(f"Policy batch failed: {e}", level='warn')
+                continue
+            except Exception as e:
+                self._log(f"Policy batch failed: {e}", level='warn')
+                continue
+
+            for (peer_id, is_member), reply in zip(batch, replies):
+                if isinstance(reply, Exception):
+                    cb.record_failure()
+                    self._log(f"Failed to set policy for {peer_id[:16]}...: {reply}", level='warn')
+                    continue
+                cb.record_success()
+                if isinstance(reply, dict) and reply.get("status") == "success":
+                    self._policy_last_change[peer_id] = now
+                    results[peer_id] = True
+                else:
+                    self._log(f"Policy set returned: {reply}", level='warn')
+
+        self._log(
+            f"Set policy for {sum(results.values())}/{len(policies)} peers",
+            level='debug'
+        )
+        return results
+
     def _get_channel_scid(self, peer_id: str) -> Optional[str]:
         """
         Get the Short Channel ID for a channel with a peer.
@@ -852,6 +890,7 @@ class Bridge:
         """Get bridge statistics including security limits."""
         return {
             "status": self._status.value,
+            "rpc_client": self._socket_rpc.get_stats() if self._socket_rpc else None,
             "revenue_ops": {
                 "version": self._revenue_ops_version,
                 "circuit_breaker": self._revenue_ops_cb.get_stats()
@@ -5,7 +5,7 @@ Tracks forwarding events for contribution ratio and anti-leech signals.
 """
 
 import time
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 
 CHANNEL_MAP_REFRESH_SECONDS = 300
@@ -166,46 +166,72 @@ class ContributionManager:
 
     def handle_forward_event(self, payload: Dict[str, Any]) -> None:
         """Process a forward_event notification safely."""
+        self.handle_forward_batch([payload])
+
+    def handle_forward_batch(self, payloads: List[Dict[str, Any]],
+                             channel_map: Optional[Dict[str, str]] = None) -> None:
+        """
+        Process a batch of forward_event notifications.
+
+        Args:
+            payloads: forward_event payloads
+            channel_map: short_channel_id -> peer_id map shared by the batch;
+                channels missing from it fall back to our own cached map
+
+        Leech status is checked once per touched peer, after the whole batch
+        has been recorded.
+        """
+        touched: Set[str] = set()
+        for payload in payloads:
+            touched.update(self._record_forward(payload, channel_map))
+        for peer_id in touched:
+            self.check_leech_status(peer_id)
+
+    def _record_forward(self, payload: Dict[str, Any],
+                        channel_map: Optional[Dict[str, str]]) -> List[str]:
+        """Record contributions for one forward; returns the peers recorded."""
         if not isinstance(payload, dict):
-            return
+            return []
         if payload.get("status") not in (None, "settled"):
-            return
+            return []
 
         in_channel = payload.get("in_channel")
         out_channel = payload.get("out_channel")
         if not in_channel or not out_channel:
-            return
+            return []
 
         in_msat = self._parse_msat(payload.get("in_msat"))
         out_msat = self._parse_msat(payload.get("out_msat"))
         if in_msat is None or out_msat is None:
-            return
+            return []
         amount_msat = min(in_msat, out_msat)
         if amount_msat <= 0 or amount_msat > MAX_EVENT_MSAT:
-            return
+            return []
 
-        in_peer = self._lookup_peer(str(in_channel))
-        out_peer = self._lookup_peer(str(out_channel))
+        in_peer = (channel_map or {}).get(str(in_channel)) or self._lookup_peer(str(in_channel))
+        out_peer = (channel_map or {}).get(str(out_channel)) or self._lookup_peer(str(out_channel))
         if not in_peer and not out_peer:
-            return
+            return []
 
         amount_sats = amount_msat // 1000
         if amount_sats <= 0:
-            return
+            return []
 
+        recorded = []
         if in_peer and in_peer != out_peer:
             member = self.db.get_member(in_peer)
             if member and member.get("tier") in ("member", "neophyte"):
                 if self._allow_record(in_peer):
                     self.db.record_contribution(in_peer, "forwarded", amount_sats)
-                    self.check_leech_status(in_peer)
+                    recorded.append(in_peer)
 
         if out_peer and out_peer != in_peer:
             member = self.db.get_member(out_peer)
             if member and member.get("tier") in ("member", "neophyte"):
                 if self._allow_record(out_peer):
                     self.db.record_contribution(out_peer, "received", amount_sats)
-                    self.check_leech_status(out_peer)
+                    recorded.append(out_peer)
+        return recorded
 
     def get_contribution_stats(self, peer_id: str, window_days: int = 30) -> Dict[str, Any]:
         stats = self.db.get_contribution_stats(peer_id, window_days=window_days)
@@ -13,11 +13,12 @@ reactively when desperate and fees are high.
 Author: Lightning Goats Team
 """
 
+import heapq
 import time
 import math
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Set, Tuple
-from collections import defaultdict
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set, Tuple
+from collections import ChainMap, defaultdict, deque
 
 from . import network_metrics
 from .mcf_solver import (
@@ -55,6 +56,8 @@ FLEET_FEE_DISCOUNT_PCT = 0.50       # Fleet members charge 50% less internally
 CIRCULAR_FLOW_WINDOW_HOURS = 24     # Look back 24 hours
 MIN_CIRCULAR_AMOUNT_SATS = 100000   # Minimum amount to flag circular flow
 CIRCULAR_FLOW_RATIO_THRESHOLD = 0.8  # 80% flow ratio indicates circular
+CIRCULAR_FLOW_MAX_CYCLE_LENGTH = 6  # Max members in an enumerated cycle
+MAX_CIRCULAR_CYCLES = 200           # Cap on cycles enumerated per detection run
 
 # Rebalance outcome tracking
 REBALANCE_HISTORY_HOURS = 72        # Track rebalances for 72 hours
@@ -64,6 +67,10 @@ HIGH_HUB_SCORE_THRESHOLD = 0.6      # Score above this is "high" hub potential
 PREFER_HUB_SCORE_BONUS = 1.2        # 20% preference bonus for high-hub peers
 HUB_SCORE_WEIGHT_IN_PATH = 0.3      # 30% weight for hub score in path selection
 
+# Fleet path search
+FLEET_PATH_MAX_DEPTH = 4            # Max fleet members in a rebalance path
+FLEET_PATH_K_CANDIDATES = 8         # Candidate paths (Yen's k) for hub-aware selection
+
 
 # =============================================================================
 # DATA CLASSES
@@ -402,6 +409,145 @@ class PredictiveRebalancer:
             return None
 
 
+# =============================================================================
+# FLEET PATH SEARCH
+# =============================================================================
+
+# Virtual source node for multi-source path search ("" is never a pubkey)
+_FLEET_PATH_SOURCE = ""
+
+
+def _bounded_shortest_path(
+    adjacency: Dict[str, List[str]],
+    node_cost: Dict[str, float],
+    start: str,
+    targets: Set[str],
+    max_members: int,
+    banned_nodes: Set[str],
+    banned_edges: Set[Tuple[str, str]],
+    start_cost: float = 0.0,
+    start_members: int = 0
+) -> Optional[Tuple[float, List[str]]]:
+    """
+    Hop-bounded shortest path (A*) over a node-weighted member graph.
+
+    Entering a member costs node_cost[member]. The search stops at the
+    first target popped from the heap (lowest total cost).
+
+    Args:
+        adjacency: member -> sorted neighbor list (source maps to start members)
+        node_cost: member -> non-negative cost of routing through it
+        start: Node to search from
+        targets: Members that terminate a path
+        max_members: Maximum members in a complete path
+        banned_nodes: Nodes that may not be entered
+        banned_edges: (from, to) edges that may not be used
+        start_cost: Cost already accumulated before `start`
+        start_members: Members already on the path (including `start`)
+
+    Returns:
+        (total_cost, path from start to target) or None if unreachable
+    """
+    # A* with an admissible heuristic: any non-target still has to enter at
+    # least one target, so the cheapest target cost is a lower bound.
+    min_target_cost = min((node_cost.get(t, 1.0) for t in targets), default=0.0)
+
+    def estimate(node: str) -> float:
+        return 0.0 if node in targets else min_target_cost
+
+    heap: List[Tuple[float, float, int, List[str]]] = [
+        (start_cost + estimate(start), start_cost, start_members, [start])
+    ]
+    settled: Set[Tuple[str, int]] = set()
+
+    while heap:
+        _, cost, members, path = heapq.heappop(heap)
+        node = path[-1]
+
+        state = (node, members)
+        if state in settled:
+            continue
+        settled.add(state)
+
+        if node in targets and node != _FLEET_PATH_SOURCE:
+            return cost, path
+        if members >= max_members:
+            continue
+
+        next_members = members + 1
+        for nxt in adjacency.get(node, ()):
+            if nxt in banned_nodes or (nxt, next_members) in settled:
+                continue
+            if nxt in path or (node, nxt) in banned_edges:
+                continue
+            next_cost = cost + node_cost.get(nxt, 1.0)
+            heapq.heappush(heap, (next_cost + estimate(nxt), next_cost, next_members, path + [nxt]))
+
+    return None
+
+
+def _k_shortest_paths(
+    adjacency: Dict[str, List[str]],
+    node_cost: Dict[str, float],
+    targets: Set[str],
+    k: int,
+    max_members: int
+) -> List[Tuple[float, List[str]]]:
+    """
+    Yen's k-shortest loopless paths from the virtual source to any target.
+
+    Returns:
+        Up to k (cost, member_path) tuples in ascending cost order;
+        member paths exclude the virtual source
+    """
+    first = _bounded_shortest_path(
+        adjacency, node_cost, _FLEET_PATH_SOURCE, targets,
+        max_members, set(), set()
+    )
+    if not first:
+        return []
+
+    accepted: List[Tuple[float, List[str]]] = [first]
+    candidates: List[Tuple[float, List[str]]] = []
+    seen = {tuple(first[1])}
+
+    while len(accepted) < k:
+        _, prev_path = accepted[-1]
+
+        for i in range(len(prev_path) - 1):
+            spur_node = prev_path[i]
+            root = prev_path[:i + 1]
+
+            banned_edges = {
+                (path[i], path[i + 1])
+                for _, path in accepted
+                if len(path) > i + 1 and path[:i + 1] == root
+            }
+            banned_nodes = set(root[:-1])
+            root_cost = sum(node_cost.get(n, 1.0) for n in root[1:])
+
+            spur = _bounded_shortest_path(
+                adjacency, node_cost, spur_node, targets, max_members,
+                banned_nodes, banned_edges,
+                start_cost=root_cost, start_members=i
+            )
+            if not spur:
+                continue
+
+            cost, spur_path = spur
+            full_path = root[:-1] + spur_path
+            key = tuple(full_path)
+            if key not in seen:
+                seen.add(key)
+                heapq.heappush(candidates, (cost, full_path))
+
+        if not candidates:
+            break
+        accepted.append(heapq.heappop(candidates))
+
+    return [(cost, path[1:]) for cost, path in accepted]
+
+
 # =============================================================================
 # FLEET REBALANCE ROUTER
 # =============================================================================
@@ -433,6 +579,12 @@ class FleetRebalanceRouter:
         self._topology_cache: Dict[str, Set[str]] = {}  # member -> connected peers
         self._topology_cache_time: float = 0
         self._topology_cache_ttl: float = 300  # 5 minutes
+        self._topology_version: int = 0  # Bumped when rebuilt topology changes
+
+        # Member adjacency graph derived from topology (rebuilt per version)
+        self._member_adjacency: Dict[str, List[str]] = {}  # member -> members sharing a peer
+        self._peer_index: Dict[str, Set[str]] = {}  # external peer -> members with channel
+        self._member_graph_version: int = -1
 
     def set_our_pubkey(self, pubkey: str) -> None:
         """Set our node's pubkey."""
@@ -470,10 +622,51 @@ class FleetRebalanceRouter:
             except Exception as e:
                 self._log(f"Error getting fleet topology: {e}", level="debug")
 
+        if topology != self._topology_cache:
+            self._topology_version += 1
         self._topology_cache = topology
         self._topology_cache_time = now
         return topology
 
+    def _get_member_graph(self) -> Tuple[Dict[str, List[str]], Dict[str, Set[str]]]:
+        """
+        Get the member adjacency graph for the current topology version.
+
+        Two members are adjacent when they share at least one external peer.
+        Built once per topology version from an inverted peer -> members
+        index, instead of intersecting peer sets for every member pair on
+        every search.
+
+        Returns:
+            (member adjacency with sorted neighbor lists, peer -> members index)
+        """
+        topology = self._get_fleet_topology()
+        if self._member_graph_version == self._topology_version:
+            return self._member_adjacency, self._peer_index
+
+        peer_index: Dict[str, Set[str]] = defaultdict(set)
+        for member, peers in topology.items():
+            for peer in peers:
+                peer_index[peer].add(member)
+
+        neighbors: Dict[str, Set[str]] = {member: set() for member in topology}
+        fleet_size = len(topology)
+        for sharing in peer_index.values():
+            if len(sharing) < 2:
+                continue
+            for member in sharing:
+                member_neighbors = neighbors[member]
+                if len(member_neighbors) < fleet_size:
+                    member_neighbors.update(sharing)
+
+        self._member_adjacency = {
+            member: sorted(n for n in nbrs if n != member)
+            for member, nbrs in neighbors.items()
+        }
+        self._peer_index = dict(peer_index)
+        self._member_graph_version = self._topology_version
+        return self._member_adjacency, self._peer_index
+
     def _get_fleet_members(self) -> List[str]:
         """Get list of fleet member pubkeys."""
         if not self.state_manager:
@@ -501,38 +694,26 @@ class FleetRebalanceRouter:
         Returns:
             FleetPath if found, None otherwise
         """
-        topology = self._get_fleet_topology()
-        members = set(topology.keys())
+        adjacency, peer_index = self._get_member_graph()
 
-        if not members:
+        if not adjacency:
             return None
 
         # BFS to find shortest path through fleet members
-        # Start: our node connected to from_peer
+        # Start: any fleet member connected to from_peer
         # End: any fleet member connected to to_peer
-
-        # Find members connected to from_peer
-        start_members = []
-        for member, peers in topology.items():
-            if from_peer in peers:
-                start_members.append(member)
-
+        start_members = sorted(peer_index.get(from_peer, ()))
         if not start_members:
             return None
 
-        # Find members connected to to_peer
-        end_members = set()
-        for member, peers in topology.items():
-            if to_peer in peers:
-                end_members.add(member)
-
+        end_members = peer_index.get(to_peer, set())
         if not end_members:
             return None
 
         # If same member connects both peers, direct path
-        direct = set(start_members) & end_members
+        direct = sorted(set(start_members) & end_members)
         if direct:
-            member = list(direct)[0]
+            member = direct[0]
             return FleetPath(
                 path=[member],
                 hops=1,
@@ -541,16 +722,12 @@ class FleetRebalanceRouter:
                 reliability_score=0.9
             )
 
-        # BFS for shortest path
-        visited = set()
-        queue = [(m, [m]) for m in start_members]
+        # BFS for shortest path over the member adjacency graph
+        visited = set(start_members)
+        queue = deque((m, [m]) for m in start_members)
 
         while queue:
-            current, path = queue.pop(0)
-
-            if current in visited:
-                continue
-            visited.add(current)
+            current, path = queue.popleft()
 
             # Check if we reached an end member
             if current in end_members:
@@ -562,13 +739,10 @@ class FleetRebalanceRouter:
                     reliability_score=max(0.5, 1.0 - 0.1 * len(path))
                 )
 
-            # Add neighbors (other fleet members this member is connected to)
-            current_peers = topology.get(current, set())
-            for member, member_peers in topology.items():
-                if member not in visited and member != current:
-                    # Check if there's a connection
-                    if current_peers & member_peers:  # Shared peers
-                        queue.append((member, path + [member]))
+            for member in adjacency.get(current, ()):
+                if member not in visited:
+                    visited.add(member)
+                    queue.append((member, path + [member]))
 
         return None
 
@@ -727,7 +901,12 @@ class FleetRebalanceRouter:
         hubs.sort(key=lambda h: h["hub_score"], reverse=True)
         return hubs
 
-    def _score_path_with_hub_bonus(self, path: List[str], amount_sats: int) -> float:
+    def _score_path_with_hub_bonus(
+        self,
+        path: List[str],
+        amount_sats: int,
+        hub_scores: Optional[Dict[str, float]] = None
+    ) -> float:
         """
         Score a fleet path considering hub scores of members.
 
@@ -736,6 +915,7 @@ class FleetRebalanceRouter:
         Args:
             path: List of member pubkeys in the path
             amount_sats: Amount being routed
+            hub_scores: Pre-fetched hub scores (fetched if not provided)
 
         Returns:
             Combined score (lower is better for routing)
@@ -743,7 +923,8 @@ class FleetRebalanceRouter:
         if not path:
             return float('inf')
 
-        hub_scores = self.get_member_hub_scores()
+        if hub_scores is None:
+            hub_scores = self.get_member_hub_scores()
 
         # Base cost component
         cost = self._estimate_fleet_cost(amount_sats, len(path))
@@ -781,31 +962,28 @@ class FleetRebalanceRouter:
         Returns:
             FleetPath optimized for hub routing, or None
         """
-        topology = self._get_fleet_topology()
-        members = set(topology.keys())
+        adjacency, _ = self._get_member_graph()
 
-        if not members:
+        if not adjacency:
             return None
 
-        # Find all candidate paths (limit search to reasonable depth)
-        all_paths = self._find_all_fleet_paths(from_peer, to_peer, max_depth=4)
+        hub_scores = self.get_member_hub_scores()
+
+        # Find the k best candidate paths (limit search to reasonable depth)
+        candidate_paths = self._find_k_best_fleet_paths(
+            from_peer, to_peer, amount_sats, hub_scores,
+            k=FLEET_PATH_K_CANDIDATES, max_depth=FLEET_PATH_MAX_DEPTH
+        )
 
-        if not all_paths:
+        if not candidate_paths:
             # Fall back to regular path finding
             return self.find_fleet_path(from_peer, to_peer, amount_sats)
 
-        # Score each path with hub bonus
-        scored_paths = []
-        for path in all_paths:
-            score = self._score_path_with_hub_bonus(path, amount_sats)
-            scored_paths.append((path, score))
-
-        # Sort by score (lower is better)
-        scored_paths.sort(key=lambda x: x[1])
-
-        # Return best path
-        best_path = scored_paths[0][0]
-        hub_scores = self.get_member_hub_scores()
+        # Re-rank candidates with the exact hub-aware score (lower is better)
+        best_path = min(
+            candidate_paths,
+            key=lambda path: self._score_path_with_hub_bonus(path, amount_sats, hub_scores)
+        )
         avg_hub = sum(hub_scores.get(m, 0.0) for m in best_path) / len(best_path)
 
         return FleetPath(
@@ -816,63 +994,43 @@ class FleetRebalanceRouter:
             reliability_score=max(0.5, min(0.95, 0.8 + avg_hub * 0.2))  # Hub score boosts reliability
         )
 
-    def _find_all_fleet_paths(
+    def _find_k_best_fleet_paths(
         self,
         from_peer: str,
         to_peer: str,
-        max_depth: int = 4
+        amount_sats: int,
+        hub_scores: Dict[str, float],
+        k: int = FLEET_PATH_K_CANDIDATES,
+        max_depth: int = FLEET_PATH_MAX_DEPTH
     ) -> List[List[str]]:
         """
-        Find all fleet paths between peers up to max_depth.
+        Find the k best fleet paths between peers using Yen's algorithm.
 
-        Returns multiple paths for hub-aware selection.
-        """
-        topology = self._get_fleet_topology()
-        all_paths = []
+        Each member on a path costs its share of the hub-aware score
+        (per-hop fee plus hub penalty), so the additive path cost tracks
+        _score_path_with_hub_bonus closely. Paths stop at the first member
+        connected to to_peer, and contain at most max_depth members.
 
-        # Find members connected to from_peer
-        start_members = []
-        for member, peers in topology.items():
-            if from_peer in peers:
-                start_members.append(member)
+        Returns:
+            Up to k member paths, best first
+        """
+        adjacency, peer_index = self._get_member_graph()
 
-        if not start_members:
+        start_members = sorted(peer_index.get(from_peer, ()))
+        end_members = peer_index.get(to_peer, set())
+        if not start_members or not end_members:
             return []
 
-        # Find members connected to to_peer
-        end_members = set()
-        for member, peers in topology.items():
-            if to_peer in peers:
-                end_members.add(member)
-
-        if not end_members:
-            return []
-
-        # DFS to find all paths
-        def dfs(current: str, path: List[str], visited: Set[str]):
-            if len(path) > max_depth:
-                return
+        cost_per_hop = self._estimate_fleet_cost(amount_sats, 1) / max(1, amount_sats)
+        node_cost = {
+            member: (1 - HUB_SCORE_WEIGHT_IN_PATH) * cost_per_hop
+                    + HUB_SCORE_WEIGHT_IN_PATH * (1.0 - hub_scores.get(member, 0.0))
+            for member in adjacency
+        }
 
-            if current in end_members:
-                all_paths.append(list(path))
-                return
-
-            current_peers = topology.get(current, set())
-            for member, member_peers in topology.items():
-                if member not in visited and member != current:
-                    # Check if connected
-                    if current_peers & member_peers:
-                        visited.add(member)
-                        path.append(member)
-                        dfs(member, path, visited)
-                        path.pop()
-                        visited.discard(member)
-
-        # Search from each start member
-        for start in start_members:
-            dfs(start, [start], {start})
-
-        return all_paths
+        search_graph = ChainMap({_FLEET_PATH_SOURCE: start_members}, adjacency)
+        paths = _k_shortest_paths(search_graph, node_cost, end_members, k, max_depth)
+        return [path for _, path in paths]
 
     def get_hub_enhanced_rebalance_path(
         self,
@@ -947,6 +1105,180 @@ class FleetRebalanceRouter:
         return result
 
 
+# =============================================================================
+# CYCLE ENUMERATION
+# =============================================================================
+
+def _strongly_connected_components(
+    nodes: List[str],
+    adjacency: Dict[str, List[str]]
+) -> List[List[str]]:
+    """
+    Tarjan's strongly connected components (iterative, linear time).
+
+    Args:
+        nodes: Nodes to consider (edges leaving this set are ignored)
+        adjacency: node -> successor list
+
+    Returns:
+        List of components, each a list of nodes
+    """
+    node_set = set(nodes)
+    index_of: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    components: List[List[str]] = []
+    counter = 0
+
+    for root in nodes:
+        if root in index_of:
+            continue
+        index_of[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(adjacency.get(root, ())))]
+
+        while work:
+            node, successors = work[-1]
+            advanced = False
+            for succ in successors:
+                if succ not in node_set:
+                    continue
+                if succ not in index_of:
+                    index_of[succ] = lowlink[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(adjacency.get(succ, ()))))
+                    advanced = True
+                    break
+                if succ in on_stack:
+                    lowlink[node] = min(lowlink[node], index_of[succ])
+            if advanced:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index_of[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    return components
+
+
+def _bounded_cycles_through(
+    start: str,
+    adjacency: Dict[str, List[str]],
+    allowed: Set[str],
+    length_bound: int
+) -> Iterator[List[str]]:
+    """
+    Enumerate elementary cycles through `start` with at most `length_bound` nodes.
+
+    Johnson-style search restricted to `allowed`, using length-aware
+    blocking (Gupta & Suzumura) so the bound does not break correctness:
+    each node carries a lock (the path length it may be re-entered below),
+    relaxed when a cycle is found further down the search.
+    """
+    path = [start]
+    lock: Dict[str, int] = {start: 0}
+    blocked_by: Dict[str, Set[str]] = defaultdict(set)
+
+    def successors(node: str) -> List[str]:
+        return [w for w in adjacency.get(node, ()) if w in allowed]
+
+    stack = [iter(successors(start))]
+    blen = [length_bound]
+
+    while stack:
+        for w in stack[-1]:
+            if w == start:
+                yield list(path)
+                blen[-1] = 1
+            elif len(path) < lock.get(w, length_bound):
+                stack.append(iter(successors(w)))
+                blen.append(length_bound)
+                lock[w] = len(path)
+                path.append(w)
+                break
+        else:
+            stack.pop()
+            v = path.pop()
+            bl = blen.pop()
+            if blen:
+                blen[-1] = min(blen[-1], bl)
+            if bl < length_bound:
+                relax = [(bl, v)]
+                while relax:
+                    bl_u, u = relax.pop()
+                    if lock.get(u, length_bound) < length_bound - bl_u + 1:
+                        lock[u] = length_bound - bl_u + 1
+                        relax.extend((bl_u + 1, w) for w in blocked_by[u] if w not in path)
+            else:
+                for w in successors(v):
+                    blocked_by[w].add(v)
+
+
+def _enumerate_elementary_cycles(
+    adjacency: Dict[str, List[str]],
+    length_bound: int,
+    max_cycles: int,
+    component_filter=None
+) -> List[List[str]]:
+    """
+    Enumerate elementary cycles (Johnson's outer loop over SCCs).
+
+    Nodes outside any non-trivial strongly connected component cannot be on
+    a cycle, so they are dropped up front. Each SCC is searched from its
+    first node, which is then removed before the SCC is re-decomposed.
+
+    Args:
+        adjacency: node -> successor list (no self-loops)
+        length_bound: Maximum nodes per cycle
+        max_cycles: Stop after this many cycles
+        component_filter: Optional predicate on an SCC's node set; SCCs for
+            which it returns False are skipped (e.g. too little flow)
+
+    Returns:
+        List of cycles (node lists, first node not repeated)
+    """
+    cycles: List[List[str]] = []
+    pending = [
+        c for c in _strongly_connected_components(sorted(adjacency), adjacency)
+        if len(c) > 1
+    ]
+
+    while pending and len(cycles) < max_cycles:
+        component = sorted(pending.pop())
+        allowed = set(component)
+        if component_filter is not None and not component_filter(allowed):
+            continue
+
+        start = component[0]
+        for cycle in _bounded_cycles_through(start, adjacency, allowed, length_bound):
+            cycles.append(cycle)
+            if len(cycles) >= max_cycles:
+                break
+
+        rest = component[1:]
+        pending.extend(
+            c for c in _strongly_connected_components(rest, adjacency)
+            if len(c) > 1
+        )
+
+    return cycles
+
+
 # =============================================================================
 # CIRCULAR FLOW DETECTOR
 # =============================================================================
@@ -976,10 +1308,15 @@ class CircularFlowDetector:
         self.plugin = plugin
         self.state_manager = state_manager
 
-        # Track rebalance outcomes
-        self._rebalance_history: List[RebalanceOutcome] = []
+        # Track rebalance outcomes (time-ordered)
+        self._rebalance_history: Deque[RebalanceOutcome] = deque()
         self._max_history_size = 1000
 
+        # Sliding-window aggregate for the default detection window:
+        # outcomes still inside the window, and from_peer -> to_peer -> totals
+        self._window_outcomes: Deque[RebalanceOutcome] = deque()
+        self._window_flows: Dict[str, Dict[str, List[int]]] = {}
+
     def _log(self, message: str, level: str = "debug") -> None:
         """Log a message if plugin is available."""
         if self.plugin:
@@ -1028,10 +1365,52 @@ class CircularFlowDetector:
         )
 
         self._rebalance_history.append(outcome)
+        self._window_outcomes.append(outcome)
+        self._add_to_window(outcome, 1)
+
+        # Trim history if too large (O(1) per evicted entry)
+        while len(self._rebalance_history) > self._max_history_size:
+            evicted = self._rebalance_history.popleft()
+            if self._window_outcomes and self._window_outcomes[0] is evicted:
+                self._window_outcomes.popleft()
+                self._add_to_window(evicted, -1)
+
+    def _add_to_window(self, outcome: RebalanceOutcome, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) an outcome from the window aggregate."""
+        targets = self._window_flows.setdefault(outcome.from_peer, {})
+        totals = targets.setdefault(outcome.to_peer, [0, 0, 0])
+        totals[0] += sign * outcome.amount_sats
+        totals[1] += sign * outcome.cost_sats
+        totals[2] += sign
+        if totals[2] <= 0:
+            del targets[outcome.to_peer]
+            if not targets:
+                del self._window_flows[outcome.from_peer]
+
+    def _get_window_flows(self, window_hours: float) -> Dict[str, Dict[str, List[int]]]:
+        """
+        Get aggregated flows (from -> to -> [amount, cost, count]) in a window.
+
+        The default detection window is maintained incrementally: expired
+        outcomes are evicted from the left of the window deque. Other window
+        sizes are aggregated from the history on demand.
+        """
+        cutoff = time.time() - (window_hours * 3600)
 
-        # Trim history if too large
-        if len(self._rebalance_history) > self._max_history_size:
-            self._rebalance_history = self._rebalance_history[-self._max_history_size:]
+        if window_hours == CIRCULAR_FLOW_WINDOW_HOURS:
+            while self._window_outcomes and self._window_outcomes[0].timestamp < cutoff:
+                self._add_to_window(self._window_outcomes.popleft(), -1)
+            return self._window_flows
+
+        flows: Dict[str, Dict[str, List[int]]] = {}
+        for outcome in self._rebalance_history:
+            if outcome.timestamp < cutoff:
+                continue
+            totals = flows.setdefault(outcome.from_peer, {}).setdefault(outcome.to_peer, [0, 0, 0])
+            totals[0] += outcome.amount_sats
+            totals[1] += outcome.cost_sats
+            totals[2] += 1
+        return flows
 
     def detect_circular_flows(
         self,
@@ -1040,6 +1419,12 @@ class CircularFlowDetector:
         """
         Detect circular flow patterns in recent rebalances.
 
+        Finds strongly connected components of the recent flow graph, then
+        enumerates elementary cycles (Johnson's algorithm) up to
+        CIRCULAR_FLOW_MAX_CYCLE_LENGTH members. Components whose total
+        internal flow is below MIN_CIRCULAR_AMOUNT_SATS cannot contain a
+        reportable cycle and are skipped.
+
         Args:
             window_hours: How far back to look
 
@@ -1048,97 +1433,73 @@ class CircularFlowDetector:
         """
         circular_flows = []
 
-        # Filter to recent rebalances
-        cutoff = time.time() - (window_hours * 3600)
-        recent = [r for r in self._rebalance_history if r.timestamp >= cutoff]
-
-        if len(recent) < 2:
+        flows = self._get_window_flows(window_hours)
+        if sum(len(targets) for targets in flows.values()) < 2:
             return circular_flows
 
-        # Build flow graph: peer -> peer -> amount
-        flow_graph: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
-        cost_graph: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
-
-        for outcome in recent:
-            flow_graph[outcome.from_peer][outcome.to_peer] += outcome.amount_sats
-            cost_graph[outcome.from_peer][outcome.to_peer] += outcome.cost_sats
+        # Flow graph: peer -> peers with positive flow (self-loops ignored)
+        adjacency: Dict[str, List[str]] = {}
+        for from_p, targets in flows.items():
+            successors = sorted(
+                to_p for to_p, totals in targets.items()
+                if totals[0] > 0 and to_p != from_p
+            )
+            if successors:
+                adjacency[from_p] = successors
+
+        def has_enough_flow(component: Set[str]) -> bool:
+            internal = 0
+            for from_p in component:
+                for to_p, totals in flows.get(from_p, {}).items():
+                    if to_p in component:
+                        internal += totals[0]
+            return internal >= MIN_CIRCULAR_AMOUNT_SATS
+
+        cycles = _enumerate_elementary_cycles(
+            adjacency,
+            length_bound=CIRCULAR_FLOW_MAX_CYCLE_LENGTH,
+            max_cycles=MAX_CIRCULAR_CYCLES,
+            component_filter=has_enough_flow
+        )
 
-        # Detect cycles using DFS
         visited_cycles = set()
-
-        for start_peer in flow_graph:
-            cycles = self._find_cycles(flow_graph, start_peer, [], set())
-
-            for cycle in cycles:
-                cycle_key = tuple(sorted(cycle))
-                if cycle_key in visited_cycles:
-                    continue
-                visited_cycles.add(cycle_key)
-
-                # Calculate cycle metrics
-                total_amount = 0
-                total_cost = 0
-                cycle_count = 0
-
-                for i in range(len(cycle)):
-                    from_p = cycle[i]
-                    to_p = cycle[(i + 1) % len(cycle)]
-
-                    amount = flow_graph[from_p][to_p]
-                    cost = cost_graph[from_p][to_p]
-
-                    if amount > 0:
-                        total_amount += amount
-                        total_cost += cost
-                        cycle_count += 1
-
-                # Only report significant circular flows
-                if total_amount >= MIN_CIRCULAR_AMOUNT_SATS:
-                    circular_flows.append(CircularFlow(
-                        members=cycle,
-                        total_amount_sats=total_amount,
-                        total_cost_sats=total_cost,
-                        cycle_count=cycle_count,
-                        detection_window_hours=window_hours,
-                        recommendation=self._get_circular_flow_recommendation(
-                            cycle, total_amount, total_cost
-                        )
-                    ))
+        for cycle in cycles:
+            cycle_key = tuple(sorted(cycle))
+            if cycle_key in visited_cycles:
+                continue
+            visited_cycles.add(cycle_key)
+
+            # Calculate cycle metrics
+            total_amount = 0
+            total_cost = 0
+            cycle_count = 0
+
+            for i in range(len(cycle)):
+                from_p = cycle[i]
+                to_p = cycle[(i + 1) % len(cycle)]
+
+                amount, cost, _ = flows[from_p][to_p]
+
+                if amount > 0:
+                    total_amount += amount
+                    total_cost += cost
+                    cycle_count += 1
+
+            # Only report significant circular flows
+            if total_amount >= MIN_CIRCULAR_AMOUNT_SATS:
+                circular_flows.append(CircularFlow(
+                    members=cycle,
+                    total_amount_sats=total_amount,
+                    total_cost_sats=total_cost,
+                    cycle_count=cycle_count,
+                    detection_window_hours=window_hours,
+                    recommendation=self._get_circular_flow_recommendation(
+                        cycle, total_amount, total_cost
+                    )
+                ))
 
         return circular_flows
 
-    def _find_cycles(
-        self,
-        graph: Dict[str, Dict[str, int]],
-        current: str,
-        path: List[str],
-        visited: Set[str]
-    ) -> List[List[str]]:
-        """
-        Find cycles in the flow graph using DFS.
-        """
-        cycles = []
-
-        if current in path:
-            # Found a cycle
-            cycle_start = path.index(current)
-            cycle = path[cycle_start:] + [current]
-            if len(cycle) >= 3:  # At least 3 nodes for meaningful cycle
-                cycles.append(cycle[:-1])  # Remove duplicate end node
-            return cycles
-
-        if current in visited:
-            return cycles
-
-        visited.add(current)
-        path.append(current)
-
-        for neighbor in graph.get(current, {}):
-            if graph[current][neighbor] > 0:  # Has flow
-                cycles.extend(self._find_cycles(graph, neighbor, path.copy(), visited.copy()))
-
-        return cycles
-
     def _get_circular_flow_recommendation(
         self,
         cycle: List[str],
@@ -1682,6 +2043,17 @@ class CostReductionManager:
 
         return self._mcf_coordinator.get_status()
 
+    def get_mcf_health_metrics(self) -> Optional[Dict[str, Any]]:
+        """
+        Get MCF solver health counters for metrics export.
+
+        Returns:
+            Health metrics dict, or None if MCF is not running
+        """
+        if not self._mcf_coordinator or not self._mcf_enabled:
+            return None
+        return self._mcf_coordinator.get_health_metrics()
+
     def get_mcf_assignments(self) -> List[Dict[str, Any]]:
         """
         Get our pending MCF assignments.
@@ -11,6 +11,14 @@ Handles SQLite persistence for:
 Thread Safety:
 - Uses threading.local() to provide each thread with its own SQLite connection
 - Prevents race conditions during concurrent writes
+
+Membership Cache:
+- hive_members and hive_bans are mirrored in memory (write-through) so the
+  per-message sender checks are dict lookups instead of SQLite queries
+- Every membership/ban change bumps a version counter and notifies
+  subscribers registered with subscribe_membership()
+- Inside transaction(), notifications are deferred until COMMIT; on
+  ROLLBACK the in-memory mirrors are dropped and reloaded from disk
 """
 
 import sqlite3
@@ -19,7 +27,8 @@ import time
 import json
 import threading
 import hashlib
-from typing import Dict, List, Optional, Any, Tuple
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from pathlib import Path
 
 
@@ -51,6 +60,24 @@ class HiveDatabase:
         self.plugin = plugin
         # Thread-local storage for connections
         self._local = threading.local()
+
+        # Write-through membership cache (loaded lazily from hive_members /
+        # hive_bans). All writes to those tables go through this class.
+        self._members_lock = threading.RLock()
+        self._member_cache: Optional[Dict[str, Dict[str, Any]]] = None
+        self._member_list_cache: Optional[List[Dict[str, Any]]] = None
+        self._ban_cache: Optional[Dict[str, Optional[int]]] = None
+        self._membership_version = 0
+        self._membership_hash_cache: Optional[Tuple[int, str]] = None
+        self._membership_listeners: List[Callable[[str, str, Optional[Dict[str, Any]]], None]] = []
+
+        # In-memory mirror of contribution_daily: peer_id -> day -> [forwarded, received]
+        self._contribution_lock = threading.Lock()
+        self._contribution_days: Optional[Dict[str, Dict[int, List[int]]]] = None
+        self._contribution_rows: Optional[int] = None
+        # Bumped whenever the mirror is reset, so a writer can tell that the
+        # row count was reloaded while its INSERT ran outside the lock
+        self._contribution_epoch = 0
         
     def _get_connection(self) -> sqlite3.Connection:
         """
@@ -81,7 +108,50 @@ class HiveDatabase:
                 level='debug'
             )
         return self._local.conn
-    
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group the writes made by this thread into one transaction.
+
+        Used to commit a batch of per-event writes at once instead of one
+        autocommit per statement. Nested use joins the outer transaction.
+        Rolls back if the block raises.
+
+        Membership notifications are held until the outermost COMMIT. On
+        ROLLBACK they are dropped, and the membership and contribution
+        mirrors are reset so they reload from disk.
+        """
+        conn = self._get_connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.membership_events = []
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self._reset_write_through_caches()
+            raise
+        finally:
+            events, self._local.membership_events = self._local.membership_events, None
+        for event, peer_id, changes in events:
+            self._notify_membership(event, peer_id, changes)
+
+    def _reset_write_through_caches(self) -> None:
+        """Drop in-memory mirrors that may hold rolled-back writes."""
+        with self._members_lock:
+            self._member_cache = None
+            self._ban_cache = None
+            self._bump_membership_version()
+        with self._contribution_lock:
+            self._contribution_days = None
+            self._contribution_rows = None
+            self._contribution_epoch += 1
+
     def initialize(self):
         """Create database tables if they don't exist."""
         conn = self._get_connection()
@@ -172,6 +242,31 @@ class HiveDatabase:
             ON contribution_ledger(peer_id, timestamp)
         """)
 
+        # Daily per-peer contribution totals, maintained by
+        # record_contribution. Contribution stats and leech checks read these
+        # (mirrored in memory); the raw ledger is kept for audit.
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS contribution_daily (
+                peer_id TEXT NOT NULL,
+                day INTEGER NOT NULL,
+                forwarded_sats INTEGER NOT NULL DEFAULT 0,
+                received_sats INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (peer_id, day)
+            )
+        """)
+
+        # Backfill rollups for contributions recorded before the table existed
+        if (conn.execute("SELECT 1 FROM contribution_daily LIMIT 1").fetchone() is None
+                and conn.execute("SELECT 1 FROM contribution_ledger LIMIT 1").fetchone() is not None):
+            conn.execute("""
+                INSERT INTO contribution_daily (peer_id, day, forwarded_sats, received_sats)
+                SELECT peer_id, timestamp / 86400,
+                       SUM(CASE WHEN direction = 'forwarded' THEN amount_sats ELSE 0 END),
+                       SUM(CASE WHEN direction = 'received' THEN amount_sats ELSE 0 END)
+                FROM contribution_ledger
+                GROUP BY peer_id, timestamp / 86400
+            """)
+
         # =====================================================================
         # PROMOTION VOUCHES TABLE
         # =====================================================================
@@ -429,6 +524,49 @@ class HiveDatabase:
             ON peer_events(reporter_id, timestamp DESC)
         """)
 
+        # Index for window-boundary scans across all peers
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_peer_events_ts
+            ON peer_events(timestamp)
+        """)
+
+        # Daily per-peer/per-reporter rollups of peer_events, maintained by
+        # store_peer_event. Summaries read whole days from here instead of
+        # scanning every raw event. Columns mirror _PEER_EVENT_AGGREGATES.
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS peer_event_daily (
+                peer_id TEXT NOT NULL,
+                reporter_id TEXT NOT NULL,
+                day INTEGER NOT NULL,
+                event_count INTEGER NOT NULL DEFAULT 0,
+                open_count INTEGER NOT NULL DEFAULT 0,
+                close_count INTEGER NOT NULL DEFAULT 0,
+                remote_close_count INTEGER NOT NULL DEFAULT 0,
+                local_close_count INTEGER NOT NULL DEFAULT 0,
+                mutual_close_count INTEGER NOT NULL DEFAULT 0,
+                revenue_sum INTEGER NOT NULL DEFAULT 0,
+                rebalance_sum INTEGER NOT NULL DEFAULT 0,
+                pnl_sum INTEGER NOT NULL DEFAULT 0,
+                forward_sum INTEGER NOT NULL DEFAULT 0,
+                routing_sum REAL NOT NULL DEFAULT 0,
+                routing_n INTEGER NOT NULL DEFAULT 0,
+                profit_sum REAL NOT NULL DEFAULT 0,
+                profit_n INTEGER NOT NULL DEFAULT 0,
+                duration_sum INTEGER NOT NULL DEFAULT 0,
+                duration_n INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (peer_id, reporter_id, day)
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_peer_event_daily_day
+            ON peer_event_daily(day)
+        """)
+
+        # Backfill rollups for events stored before the table existed
+        if (conn.execute("SELECT 1 FROM peer_event_daily LIMIT 1").fetchone() is None
+                and conn.execute("SELECT 1 FROM peer_events LIMIT 1").fetchone() is not None):
+            self.rebuild_peer_event_rollups()
+
         # =====================================================================
         # BUDGET TRACKING TABLE (Phase 6 - Autonomous Mode Limits)
         # =====================================================================
@@ -872,6 +1010,12 @@ class HiveDatabase:
             "CREATE INDEX IF NOT EXISTS idx_flow_samples_day "
             "ON flow_samples(day_of_week)"
         )
+        # Covering index for get_flow_slot_moments(): groups by slot
+        # without a temp b-tree and without touching the table
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_flow_samples_slot "
+            "ON flow_samples(channel_id, day_of_week, hour, timestamp, net_flow_sats)"
+        )
 
         # =====================================================================
         # TEMPORAL PATTERNS TABLE (Phase 7.1 - Anticipatory Liquidity)
@@ -1041,6 +1185,100 @@ class HiveDatabase:
     # MEMBERSHIP OPERATIONS
     # =========================================================================
     
+    def _load_membership_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Load hive_members and hive_bans into memory (lock must be held)."""
+        if self._member_cache is None:
+            conn = self._get_connection()
+            rows = conn.execute("SELECT * FROM hive_members ORDER BY rowid").fetchall()
+            self._member_cache = {row['peer_id']: dict(row) for row in rows}
+            self._member_list_cache = None
+            bans = conn.execute("SELECT peer_id, expires_at FROM hive_bans").fetchall()
+            self._ban_cache = {row['peer_id']: row['expires_at'] for row in bans}
+        return self._member_cache
+
+    def _refresh_cached_member(self, conn: sqlite3.Connection, peer_id: str) -> None:
+        """
+        Re-read one member row into the cache after a write (lock must be held).
+
+        Writers run their SQL before taking _members_lock, so a thread that
+        holds a transaction never waits on a thread that holds the lock.
+        Re-reading instead of applying the caller's values keeps the cache
+        equal to the database when writes to the same peer race.
+        """
+        if self._member_cache is None:
+            return
+        row = conn.execute(
+            "SELECT * FROM hive_members WHERE peer_id = ?", (peer_id,)
+        ).fetchone()
+        if row:
+            self._member_cache[peer_id] = dict(row)
+        else:
+            self._member_cache.pop(peer_id, None)
+
+    def _refresh_cached_ban(self, conn: sqlite3.Connection, peer_id: str) -> None:
+        """Re-read one ban row into the cache after a write (lock must be held)."""
+        if self._ban_cache is None:
+            return
+        row = conn.execute(
+            "SELECT expires_at FROM hive_bans WHERE peer_id = ?", (peer_id,)
+        ).fetchone()
+        if row:
+            self._ban_cache[peer_id] = row['expires_at']
+        else:
+            self._ban_cache.pop(peer_id, None)
+
+    def _bump_membership_version(self) -> None:
+        """Invalidate derived membership views (lock must be held)."""
+        self._membership_version += 1
+        self._member_list_cache = None
+
+    def _membership_changed(self, event: str, peer_id: str,
+                            changes: Optional[Dict[str, Any]] = None) -> None:
+        """Notify subscribers of a membership change once it is committed."""
+        pending = getattr(self._local, 'membership_events', None)
+        if pending is not None:
+            pending.append((event, peer_id, changes))
+            return
+        self._notify_membership(event, peer_id, changes)
+
+    def _notify_membership(self, event: str, peer_id: str,
+                           changes: Optional[Dict[str, Any]]) -> None:
+        with self._members_lock:
+            listeners = list(self._membership_listeners)
+        for callback in listeners:
+            try:
+                callback(event, peer_id, changes)
+            except Exception as e:
+                self.plugin.log(
+                    f"HiveDatabase: membership listener failed for {event}: {e}",
+                    level='warn'
+                )
+
+    def subscribe_membership(
+        self,
+        callback: Callable[[str, str, Optional[Dict[str, Any]]], None]
+    ) -> None:
+        """
+        Register a callback for membership and ban changes.
+
+        The callback is invoked after the change is committed, outside any
+        database lock, as callback(event, peer_id, changes) where event is one
+        of 'added', 'updated', 'removed', 'banned', 'unbanned' and changes is
+        the new row ('added'), the updated fields ('updated') or None.
+        """
+        with self._members_lock:
+            self._membership_listeners.append(callback)
+
+    def unsubscribe_membership(self, callback) -> None:
+        """Remove a callback registered with subscribe_membership()."""
+        with self._members_lock:
+            if callback in self._membership_listeners:
+                self._membership_listeners.remove(callback)
+
+    def get_membership_version(self) -> int:
+        """Get the membership version (incremented on every member/ban change)."""
+        return self._membership_version
+
     def add_member(self, peer_id: str, tier: str = 'neophyte', 
                    joined_at: Optional[int] = None,
                    promoted_at: Optional[int] = None) -> bool:
@@ -1064,26 +1302,33 @@ class HiveDatabase:
                 INSERT INTO hive_members (peer_id, tier, joined_at, promoted_at, last_seen)
                 VALUES (?, ?, ?, ?, ?)
             """, (peer_id, tier, joined_at or now, promoted_at, now))
-            return True
         except sqlite3.IntegrityError:
             return False  # Already exists
+        row = conn.execute(
+            "SELECT * FROM hive_members WHERE peer_id = ?", (peer_id,)
+        ).fetchone()
+        member = dict(row)
+        with self._members_lock:
+            self._refresh_cached_member(conn, peer_id)
+            self._bump_membership_version()
+        self._membership_changed('added', peer_id, member)
+        return True
     
     def get_member(self, peer_id: str) -> Optional[Dict[str, Any]]:
         """Get member info by peer_id."""
-        conn = self._get_connection()
-        row = conn.execute(
-            "SELECT * FROM hive_members WHERE peer_id = ?",
-            (peer_id,)
-        ).fetchone()
-        return dict(row) if row else None
+        with self._members_lock:
+            member = self._load_membership_cache().get(peer_id)
+            return dict(member) if member else None
     
     def get_all_members(self) -> List[Dict[str, Any]]:
         """Get all Hive members."""
-        conn = self._get_connection()
-        rows = conn.execute(
-            "SELECT * FROM hive_members ORDER BY tier, joined_at"
-        ).fetchall()
-        return [dict(row) for row in rows]
+        with self._members_lock:
+            if self._member_list_cache is None:
+                self._member_list_cache = sorted(
+                    self._load_membership_cache().values(),
+                    key=lambda m: (m['tier'], m['joined_at'])
+                )
+            return [dict(m) for m in self._member_list_cache]
 
     def get_membership_hash(self) -> str:
         """
@@ -1096,21 +1341,24 @@ class HiveDatabase:
         Returns:
             Hex-encoded SHA256 hash of membership state
         """
-        conn = self._get_connection()
-        rows = conn.execute(
-            "SELECT peer_id, tier FROM hive_members ORDER BY peer_id"
-        ).fetchall()
+        with self._members_lock:
+            version = self._membership_version
+            if self._membership_hash_cache and self._membership_hash_cache[0] == version:
+                return self._membership_hash_cache[1]
 
-        # Build list of (peer_id, tier) tuples
-        member_tuples = [(row['peer_id'], row['tier']) for row in rows]
+            # Build list of (peer_id, tier) tuples
+            member_tuples = sorted(
+                (peer_id, m['tier']) for peer_id, m in self._load_membership_cache().items()
+            )
 
-        # Serialize to canonical JSON
-        json_str = json.dumps(member_tuples, sort_keys=True, separators=(',', ':'))
+            # Serialize to canonical JSON
+            json_str = json.dumps(member_tuples, sort_keys=True, separators=(',', ':'))
 
-        # Calculate SHA256
-        hash_hex = hashlib.sha256(json_str.encode('utf-8')).hexdigest()
+            # Calculate SHA256
+            hash_hex = hashlib.sha256(json_str.encode('utf-8')).hexdigest()
 
-        return hash_hex
+            self._membership_hash_cache = (version, hash_hex)
+            return hash_hex
 
     def update_member(self, peer_id: str, **kwargs) -> bool:
         """
@@ -1134,7 +1382,13 @@ class HiveDatabase:
             f"UPDATE hive_members SET {set_clause} WHERE peer_id = ?",
             values
         )
-        return result.rowcount > 0
+        if result.rowcount <= 0:
+            return False
+        with self._members_lock:
+            self._refresh_cached_member(conn, peer_id)
+            self._bump_membership_version()
+        self._membership_changed('updated', peer_id, updates)
+        return True
     
     def remove_member(self, peer_id: str) -> bool:
         """Remove a member from the Hive."""
@@ -1143,15 +1397,21 @@ class HiveDatabase:
             "DELETE FROM hive_members WHERE peer_id = ?",
             (peer_id,)
         )
-        return result.rowcount > 0
+        if result.rowcount <= 0:
+            return False
+        with self._members_lock:
+            self._refresh_cached_member(conn, peer_id)
+            self._bump_membership_version()
+        self._membership_changed('removed', peer_id)
+        return True
     
     def get_member_count_by_tier(self) -> Dict[str, int]:
         """Get count of members by tier."""
-        conn = self._get_connection()
-        rows = conn.execute(
-            "SELECT tier, COUNT(*) as count FROM hive_members GROUP BY tier"
-        ).fetchall()
-        return {row['tier']: row['count'] for row in rows}
+        counts: Dict[str, int] = {}
+        with self._members_lock:
+            for member in self._load_membership_cache().values():
+                counts[member['tier']] = counts.get(member['tier'], 0) + 1
+        return counts
     
     # =========================================================================
     # INTENT LOCK OPERATIONS
@@ -1336,11 +1596,30 @@ class HiveDatabase:
     # P5-03: Absolute cap on contribution ledger rows to prevent unbounded DB growth
     MAX_CONTRIBUTION_ROWS = 500000
 
+    def _load_contribution_days(self) -> Dict[str, Dict[int, List[int]]]:
+        """Load contribution_daily into memory (lock must be held)."""
+        if self._contribution_days is None:
+            conn = self._get_connection()
+            rows = conn.execute("""
+                SELECT peer_id, day, forwarded_sats, received_sats
+                FROM contribution_daily
+            """).fetchall()
+            days: Dict[str, Dict[int, List[int]]] = {}
+            for row in rows:
+                days.setdefault(row['peer_id'], {})[row['day']] = [
+                    row['forwarded_sats'], row['received_sats']
+                ]
+            self._contribution_days = days
+        return self._contribution_days
+
     def record_contribution(self, peer_id: str, direction: str,
                             amount_sats: int) -> bool:
         """
         Record a forwarding event for contribution tracking.
 
+        Appends to the raw ledger and adds the amount to the peer's daily
+        totals (in memory and in contribution_daily).
+
         P5-03: Rejects inserts if ledger exceeds MAX_CONTRIBUTION_ROWS.
 
         Args:
@@ -1353,47 +1632,77 @@ class HiveDatabase:
         """
         conn = self._get_connection()
 
-        # P5-03: Check absolute row limit before inserting
-        row = conn.execute("SELECT COUNT(*) as cnt FROM contribution_ledger").fetchone()
-        if row and row['cnt'] >= self.MAX_CONTRIBUTION_ROWS:
-            self.plugin.log(
-                f"HiveDatabase: Contribution ledger at cap ({self.MAX_CONTRIBUTION_ROWS}), rejecting insert",
-                level='warn'
-            )
-            return False
+        with self._contribution_lock:
+            # P5-03: Check absolute row limit before inserting. The count is
+            # read once and then tracked, not recounted on every forward.
+            if self._contribution_rows is None:
+                row = conn.execute("SELECT COUNT(*) as cnt FROM contribution_ledger").fetchone()
+                self._contribution_rows = row['cnt'] if row else 0
+            if self._contribution_rows >= self.MAX_CONTRIBUTION_ROWS:
+                self.plugin.log(
+                    f"HiveDatabase: Contribution ledger at cap ({self.MAX_CONTRIBUTION_ROWS}), rejecting insert",
+                    level='warn'
+                )
+                return False
+            epoch = self._contribution_epoch
 
         now = int(time.time())
+        day = now // 86400
+        forwarded = amount_sats if direction == 'forwarded' else 0
+        received = amount_sats if direction == 'received' else 0
 
+        # The writes run outside _contribution_lock so a thread holding a
+        # transaction (which calls back in here) never waits on this lock
+        # while we wait on its database lock.
         conn.execute("""
             INSERT INTO contribution_ledger (peer_id, direction, amount_sats, timestamp)
             VALUES (?, ?, ?, ?)
         """, (peer_id, direction, amount_sats, now))
+        conn.execute("""
+            INSERT INTO contribution_daily (peer_id, day, forwarded_sats, received_sats)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(peer_id, day) DO UPDATE SET
+                forwarded_sats = forwarded_sats + excluded.forwarded_sats,
+                received_sats = received_sats + excluded.received_sats
+        """, (peer_id, day, forwarded, received))
+
+        with self._contribution_lock:
+            if self._contribution_epoch != epoch:
+                self._contribution_rows = None  # Reloaded meanwhile; recount
+            elif self._contribution_rows is not None:
+                self._contribution_rows += 1
+            if self._contribution_days is not None:
+                # Re-read rather than add, in case the mirror was loaded
+                # after our write committed and already includes it
+                row = conn.execute("""
+                    SELECT forwarded_sats, received_sats FROM contribution_daily
+                    WHERE peer_id = ? AND day = ?
+                """, (peer_id, day)).fetchone()
+                if row:
+                    self._contribution_days.setdefault(peer_id, {})[day] = [
+                        row['forwarded_sats'], row['received_sats']
+                    ]
         return True
 
     def get_contribution_stats(self, peer_id: str, window_days: int = 30) -> Dict[str, int]:
         """
         Get contribution totals within the window.
+
+        Computed from the in-memory daily totals, at day granularity: the
+        window covers the last window_days days plus the partial day in
+        which it starts.
         
         Returns:
             Dict with forwarded and received totals in sats
         """
-        conn = self._get_connection()
-        cutoff = int(time.time()) - (window_days * 86400)
-        
-        rows = conn.execute("""
-            SELECT direction, SUM(amount_sats) as total
-            FROM contribution_ledger
-            WHERE peer_id = ? AND timestamp > ?
-            GROUP BY direction
-        """, (peer_id, cutoff)).fetchall()
-        
+        cutoff_day = (int(time.time()) - window_days * 86400) // 86400
         forwarded = 0
         received = 0
-        for row in rows:
-            if row['direction'] == 'forwarded':
-                forwarded = row['total'] or 0
-            elif row['direction'] == 'received':
-                received = row['total'] or 0
+        with self._contribution_lock:
+            for day, totals in self._load_contribution_days().get(peer_id, {}).items():
+                if day >= cutoff_day:
+                    forwarded += totals[0]
+                    received += totals[1]
         
         return {"forwarded": forwarded, "received": received}
     
@@ -1411,23 +1720,9 @@ class HiveDatabase:
         Returns:
             Contribution ratio (default 1.0 if no data)
         """
-        conn = self._get_connection()
-        cutoff = int(time.time()) - (window_days * 86400)
-        
-        rows = conn.execute("""
-            SELECT direction, SUM(amount_sats) as total
-            FROM contribution_ledger
-            WHERE peer_id = ? AND timestamp > ?
-            GROUP BY direction
-        """, (peer_id, cutoff)).fetchall()
-        
-        forwarded = 0
-        received = 0
-        for row in rows:
-            if row['direction'] == 'forwarded':
-                forwarded = row['total'] or 0
-            elif row['direction'] == 'received':
-                received = row['total'] or 0
+        stats = self.get_contribution_stats(peer_id, window_days=window_days)
+        forwarded = stats["forwarded"]
+        received = stats["received"]
         
         if received == 0:
             return 1.0 if forwarded == 0 else float('inf')
@@ -1435,13 +1730,31 @@ class HiveDatabase:
         return forwarded / received
     
     def prune_old_contributions(self, older_than_days: int = 45) -> int:
-        """Remove contribution records older than specified days."""
+        """Remove contribution records (raw and daily) older than specified days."""
         conn = self._get_connection()
         cutoff = int(time.time()) - (older_than_days * 86400)
+        cutoff_day = cutoff // 86400
         result = conn.execute(
             "DELETE FROM contribution_ledger WHERE timestamp < ?",
             (cutoff,)
         )
+        conn.execute(
+            "DELETE FROM contribution_daily WHERE day < ?",
+            (cutoff_day,)
+        )
+        with self._contribution_lock:
+            if result.rowcount:
+                # Recount on the next insert; the tracked count may have
+                # been loaded after the DELETE committed
+                self._contribution_rows = None
+                self._contribution_epoch += 1
+            if self._contribution_days is not None:
+                for peer_id in list(self._contribution_days):
+                    peer_days = self._contribution_days[peer_id]
+                    for day in [d for d in peer_days if d < cutoff_day]:
+                        del peer_days[day]
+                    if not peer_days:
+                        del self._contribution_days[peer_id]
         return result.rowcount
 
     # =========================================================================
@@ -1801,13 +2114,11 @@ class HiveDatabase:
         now = int(time.time())
 
         # Get all members
-        members = conn.execute(
-            "SELECT peer_id FROM hive_members"
-        ).fetchall()
+        with self._members_lock:
+            peer_ids = list(self._load_membership_cache())
 
         updated = 0
-        for row in members:
-            peer_id = row['peer_id']
+        for peer_id in peer_ids:
             presence = self.get_presence(peer_id)
 
             if not presence:
@@ -1842,8 +2153,14 @@ class HiveDatabase:
                 "UPDATE hive_members SET uptime_pct = ? WHERE peer_id = ?",
                 (uptime_pct, peer_id)
             )
+            with self._members_lock:
+                self._refresh_cached_member(conn, peer_id)
             updated += 1
 
+        if updated:
+            with self._members_lock:
+                self._bump_membership_version()
+
         return updated
 
     # =========================================================================
@@ -1907,21 +2224,22 @@ class HiveDatabase:
                 INSERT INTO hive_bans (peer_id, reason, reporter, signature, banned_at, expires_at)
                 VALUES (?, ?, ?, ?, ?, ?)
             """, (peer_id, reason, reporter, signature, now, expires))
-            return True
         except sqlite3.IntegrityError:
             return False
+        with self._members_lock:
+            self._refresh_cached_ban(conn, peer_id)
+            self._bump_membership_version()
+        self._membership_changed('banned', peer_id)
+        return True
     
     def is_banned(self, peer_id: str) -> bool:
         """Check if a peer is banned."""
-        conn = self._get_connection()
-        now = int(time.time())
-        
-        row = conn.execute("""
-            SELECT 1 FROM hive_bans 
-            WHERE peer_id = ? AND (expires_at IS NULL OR expires_at > ?)
-        """, (peer_id, now)).fetchone()
-        
-        return row is not None
+        with self._members_lock:
+            self._load_membership_cache()
+            if peer_id not in self._ban_cache:
+                return False
+            expires_at = self._ban_cache[peer_id]
+        return expires_at is None or expires_at > int(time.time())
     
     def get_ban_info(self, peer_id: str) -> Optional[Dict]:
         """Get ban details for a peer."""
@@ -1939,7 +2257,13 @@ class HiveDatabase:
             "DELETE FROM hive_bans WHERE peer_id = ?",
             (peer_id,)
         )
-        return result.rowcount > 0
+        if result.rowcount <= 0:
+            return False
+        with self._members_lock:
+            self._refresh_cached_ban(conn, peer_id)
+            self._bump_membership_version()
+        self._membership_changed('unbanned', peer_id)
+        return True
     
     def get_all_bans(self) -> List[Dict]:
         """Get all active bans."""
@@ -2202,6 +2526,24 @@ class HiveDatabase:
 
         return row['cnt'] if row else 0
 
+    def count_pending_actions_by_type(self) -> Dict[str, int]:
+        """
+        Count unexpired pending actions awaiting approval, by action type.
+
+        Returns:
+            Dict of action_type -> count
+        """
+        conn = self._get_connection()
+        now = int(time.time())
+
+        rows = conn.execute("""
+            SELECT action_type, COUNT(*) as cnt FROM pending_actions
+            WHERE status = 'pending' AND expires_at > ?
+            GROUP BY action_type
+        """, (now,)).fetchall()
+
+        return {row['action_type']: row['cnt'] for row in rows}
+
     def has_recent_action_for_channel(
         self,
         channel_id: str,
@@ -2578,26 +2920,42 @@ class HiveDatabase:
         Returns:
             ID of the inserted event, or -1 on failure
         """
-        conn = self._get_connection()
         try:
-            cursor = conn.execute("""
-                INSERT INTO peer_events (
+            with self.transaction() as conn:
+                cursor = conn.execute("""
+                    INSERT INTO peer_events (
+                        peer_id, reporter_id, event_type, timestamp, channel_id,
+                        capacity_sats, duration_days, total_revenue_sats,
+                        total_rebalance_cost_sats, net_pnl_sats, forward_count,
+                        forward_volume_sats, our_fee_ppm, their_fee_ppm,
+                        routing_score, profitability_score, our_funding_sats,
+                        their_funding_sats, opener, closer, reason
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
                     peer_id, reporter_id, event_type, timestamp, channel_id,
                     capacity_sats, duration_days, total_revenue_sats,
                     total_rebalance_cost_sats, net_pnl_sats, forward_count,
                     forward_volume_sats, our_fee_ppm, their_fee_ppm,
                     routing_score, profitability_score, our_funding_sats,
                     their_funding_sats, opener, closer, reason
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                peer_id, reporter_id, event_type, timestamp, channel_id,
-                capacity_sats, duration_days, total_revenue_sats,
-                total_rebalance_cost_sats, net_pnl_sats, forward_count,
-                forward_volume_sats, our_fee_ppm, their_fee_ppm,
-                routing_score, profitability_score, our_funding_sats,
-                their_funding_sats, opener, closer, reason
-            ))
-            event_id = cursor.lastrowid
+                ))
+                event_id = cursor.lastrowid
+
+                # Fold the event into its daily rollup row
+                rollup_fields = ", ".join(self._PEER_EVENT_ROLLUP_FIELDS)
+                rollup_updates = ", ".join(
+                    f"{field} = {field} + excluded.{field}"
+                    for field in self._PEER_EVENT_ROLLUP_FIELDS
+                )
+                conn.execute(f"""
+                    INSERT INTO peer_event_daily (peer_id, reporter_id, day, {rollup_fields})
+                    SELECT peer_id, reporter_id, timestamp / 86400,
+                           {self._PEER_EVENT_AGGREGATES}
+                    FROM peer_events WHERE id = ?
+                    GROUP BY peer_id, reporter_id
+                    ON CONFLICT(peer_id, reporter_id, day) DO UPDATE SET {rollup_updates}
+                """, (event_id,))
+
             self.plugin.log(
                 f"Stored peer event: {event_type} for {peer_id[:16]}... "
                 f"from {reporter_id[:16]}... (id={event_id})",
@@ -2646,6 +3004,134 @@ class HiveDatabase:
         rows = conn.execute(query, params).fetchall()
         return [dict(row) for row in rows]
 
+    # Conditional aggregates per (peer, reporter) group. Close events are
+    # any event_type ending in '_close'; scores/durations only count when
+    # non-zero (matches the truthiness filter of the original Python code).
+    # The same expressions maintain the peer_event_daily rollups.
+    _PEER_EVENT_AGGREGATES = """
+        COUNT(*) AS event_count,
+        SUM(event_type = 'channel_open') AS open_count,
+        SUM(substr(event_type, -6) = '_close') AS close_count,
+        SUM(substr(event_type, -6) = '_close' AND closer = 'remote') AS remote_close_count,
+        SUM(substr(event_type, -6) = '_close' AND closer = 'local') AS local_close_count,
+        SUM(substr(event_type, -6) = '_close' AND closer = 'mutual') AS mutual_close_count,
+        COALESCE(SUM(CASE WHEN substr(event_type, -6) = '_close' THEN total_revenue_sats END), 0) AS revenue_sum,
+        COALESCE(SUM(CASE WHEN substr(event_type, -6) = '_close' THEN total_rebalance_cost_sats END), 0) AS rebalance_sum,
+        COALESCE(SUM(CASE WHEN substr(event_type, -6) = '_close' THEN net_pnl_sats END), 0) AS pnl_sum,
+        COALESCE(SUM(CASE WHEN substr(event_type, -6) = '_close' THEN forward_count END), 0) AS forward_sum,
+        TOTAL(CASE WHEN routing_score != 0 THEN routing_score END) AS routing_sum,
+        COUNT(CASE WHEN routing_score != 0 THEN 1 END) AS routing_n,
+        TOTAL(CASE WHEN profitability_score != 0 THEN profitability_score END) AS profit_sum,
+        COUNT(CASE WHEN profitability_score != 0 THEN 1 END) AS profit_n,
+        COALESCE(SUM(CASE WHEN substr(event_type, -6) = '_close' AND duration_days != 0
+                          THEN duration_days END), 0) AS duration_sum,
+        COUNT(CASE WHEN substr(event_type, -6) = '_close' AND duration_days != 0
+                   THEN 1 END) AS duration_n
+    """
+
+    _PEER_EVENT_ROLLUP_FIELDS = (
+        "event_count", "open_count", "close_count", "remote_close_count",
+        "local_close_count", "mutual_close_count", "revenue_sum",
+        "rebalance_sum", "pnl_sum", "forward_sum", "routing_sum", "routing_n",
+        "profit_sum", "profit_n", "duration_sum", "duration_n",
+    )
+
+    # Max bound parameters per IN (...) query (SQLite default limit is 999)
+    _SUMMARY_BATCH_SIZE = 500
+
+    @staticmethod
+    def _empty_peer_event_summary(peer_id: str) -> Dict[str, Any]:
+        """Summary for a peer with no events in the window."""
+        return {
+            "peer_id": peer_id,
+            "event_count": 0,
+            "open_count": 0,
+            "close_count": 0,
+            "remote_close_count": 0,
+            "local_close_count": 0,
+            "mutual_close_count": 0,
+            "total_revenue_sats": 0,
+            "total_rebalance_cost_sats": 0,
+            "total_net_pnl_sats": 0,
+            "total_forward_count": 0,
+            "avg_routing_score": 0.5,
+            "avg_profitability_score": 0.5,
+            "avg_duration_days": 0,
+            "reporters": []
+        }
+
+    @staticmethod
+    def _combine_peer_event_groups(rows) -> Dict[str, Dict[str, Any]]:
+        """
+        Fold per-(peer, reporter) aggregate rows into per-peer summaries.
+
+        Args:
+            rows: Rows with peer_id, reporter_id and the rollup fields
+
+        Returns:
+            Dict of peer_id -> summary (same shape as get_peer_event_summary)
+        """
+        acc: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            peer_id = row['peer_id']
+            a = acc.get(peer_id)
+            if a is None:
+                a = acc[peer_id] = {
+                    "event_count": 0, "open_count": 0, "close_count": 0,
+                    "remote_close_count": 0, "local_close_count": 0,
+                    "mutual_close_count": 0, "revenue_sum": 0, "rebalance_sum": 0,
+                    "pnl_sum": 0, "forward_sum": 0, "routing_sum": 0.0,
+                    "routing_n": 0, "profit_sum": 0.0, "profit_n": 0,
+                    "duration_sum": 0, "duration_n": 0, "reporter_scores": {},
+                }
+            for key in ("event_count", "open_count", "close_count",
+                        "remote_close_count", "local_close_count",
+                        "mutual_close_count", "revenue_sum", "rebalance_sum",
+                        "pnl_sum", "forward_sum", "routing_sum", "routing_n",
+                        "profit_sum", "profit_n", "duration_sum", "duration_n"):
+                a[key] += row[key] or 0
+
+            # Per-reporter scores for disagreement detection
+            reporter = a["reporter_scores"].setdefault(row['reporter_id'], {
+                "event_count": 0, "routing_sum": 0.0, "routing_n": 0,
+                "profit_sum": 0.0, "profit_n": 0,
+            })
+            reporter["event_count"] += row['event_count']
+            reporter["routing_sum"] += row['routing_sum'] or 0.0
+            reporter["routing_n"] += row['routing_n']
+            reporter["profit_sum"] += row['profit_sum'] or 0.0
+            reporter["profit_n"] += row['profit_n']
+
+        summaries = {}
+        for peer_id, a in acc.items():
+            reporter_scores = {
+                reporter_id: {
+                    "event_count": r["event_count"],
+                    "avg_routing_score": r["routing_sum"] / r["routing_n"] if r["routing_n"] else 0.5,
+                    "avg_profitability_score": r["profit_sum"] / r["profit_n"] if r["profit_n"] else 0.5,
+                }
+                for reporter_id, r in a["reporter_scores"].items()
+            }
+            summaries[peer_id] = {
+                "peer_id": peer_id,
+                "event_count": a["event_count"],
+                "open_count": a["open_count"],
+                "close_count": a["close_count"],
+                "remote_close_count": a["remote_close_count"],
+                "local_close_count": a["local_close_count"],
+                "mutual_close_count": a["mutual_close_count"],
+                "total_revenue_sats": a["revenue_sum"],
+                "total_rebalance_cost_sats": a["rebalance_sum"],
+                "total_net_pnl_sats": a["pnl_sum"],
+                "total_forward_count": a["forward_sum"],
+                "avg_routing_score": a["routing_sum"] / a["routing_n"] if a["routing_n"] else 0.5,
+                "avg_profitability_score": a["profit_sum"] / a["profit_n"] if a["profit_n"] else 0.5,
+                "avg_duration_days": a["duration_sum"] / a["duration_n"] if a["duration_n"] else 0,
+                "reporters": list(reporter_scores),
+                "reporter_scores": reporter_scores
+            }
+        return summaries
+
     def get_peer_event_summary(self, peer_id: str, days: int = 90) -> Dict[str, Any]:
         """
         Get aggregated event statistics for a peer.
@@ -2673,85 +3159,78 @@ class HiveDatabase:
             - avg_duration_days: Average channel duration
             - reporters: List of unique hive members who reported
         """
-        conn = self._get_connection()
-        cutoff = int(time.time()) - (days * 86400)
+        summary = self.get_peer_event_summaries([peer_id], days=days).get(peer_id)
+        return summary or self._empty_peer_event_summary(peer_id)
 
-        # Get all events for this peer
-        rows = conn.execute("""
-            SELECT * FROM peer_events
-            WHERE peer_id = ? AND timestamp > ?
-            ORDER BY timestamp DESC
-        """, (peer_id, cutoff)).fetchall()
+    def get_peer_event_summaries(self, peer_ids: Optional[List[str]] = None,
+                                 days: int = 90) -> Dict[str, Dict[str, Any]]:
+        """
+        Get aggregated event statistics for many peers in one pass.
 
-        events = [dict(row) for row in rows]
+        Whole days inside the window are read from the peer_event_daily
+        rollups (at most one row per peer/reporter/day); only the partial
+        day at the start of the window is aggregated from raw peer_events.
 
-        if not events:
-            return {
-                "peer_id": peer_id,
-                "event_count": 0,
-                "open_count": 0,
-                "close_count": 0,
-                "remote_close_count": 0,
-                "local_close_count": 0,
-                "mutual_close_count": 0,
-                "total_revenue_sats": 0,
-                "total_rebalance_cost_sats": 0,
-                "total_net_pnl_sats": 0,
-                "total_forward_count": 0,
-                "avg_routing_score": 0.5,
-                "avg_profitability_score": 0.5,
-                "avg_duration_days": 0,
-                "reporters": []
-            }
+        Args:
+            peer_ids: Peers to summarize (None = every peer with events)
+            days: Only include events from last N days (default: 90)
 
-        # Aggregate statistics
-        open_events = [e for e in events if e['event_type'] == 'channel_open']
-        close_events = [e for e in events if e['event_type'].endswith('_close')]
-        remote_closes = [e for e in close_events if e.get('closer') == 'remote']
-        local_closes = [e for e in close_events if e.get('closer') == 'local']
-        mutual_closes = [e for e in close_events if e.get('closer') == 'mutual']
-
-        total_revenue = sum(e.get('total_revenue_sats', 0) for e in close_events)
-        total_rebalance = sum(e.get('total_rebalance_cost_sats', 0) for e in close_events)
-        total_pnl = sum(e.get('net_pnl_sats', 0) for e in close_events)
-        total_forwards = sum(e.get('forward_count', 0) for e in close_events)
-
-        routing_scores = [e.get('routing_score', 0.5) for e in events if e.get('routing_score')]
-        profit_scores = [e.get('profitability_score', 0.5) for e in events if e.get('profitability_score')]
-        durations = [e.get('duration_days', 0) for e in close_events if e.get('duration_days')]
-
-        reporters = list(set(e['reporter_id'] for e in events))
-
-        # Calculate per-reporter scores for disagreement detection
-        reporter_scores = {}
-        for reporter_id in reporters:
-            reporter_events = [e for e in events if e['reporter_id'] == reporter_id]
-            r_routing = [e.get('routing_score', 0.5) for e in reporter_events if e.get('routing_score')]
-            r_profit = [e.get('profitability_score', 0.5) for e in reporter_events if e.get('profitability_score')]
-            reporter_scores[reporter_id] = {
-                "event_count": len(reporter_events),
-                "avg_routing_score": sum(r_routing) / len(r_routing) if r_routing else 0.5,
-                "avg_profitability_score": sum(r_profit) / len(r_profit) if r_profit else 0.5,
-            }
+        Returns:
+            Dict of peer_id -> summary (see get_peer_event_summary).
+            Peers without events in the window are omitted.
+        """
+        conn = self._get_connection()
+        cutoff = int(time.time()) - (days * 86400)
+        cutoff_day = cutoff // 86400
+        rollup_sums = ", ".join(
+            f"SUM({field}) AS {field}" for field in self._PEER_EVENT_ROLLUP_FIELDS
+        )
 
-        return {
-            "peer_id": peer_id,
-            "event_count": len(events),
-            "open_count": len(open_events),
-            "close_count": len(close_events),
-            "remote_close_count": len(remote_closes),
-            "local_close_count": len(local_closes),
-            "mutual_close_count": len(mutual_closes),
-            "total_revenue_sats": total_revenue,
-            "total_rebalance_cost_sats": total_rebalance,
-            "total_net_pnl_sats": total_pnl,
-            "total_forward_count": total_forwards,
-            "avg_routing_score": sum(routing_scores) / len(routing_scores) if routing_scores else 0.5,
-            "avg_profitability_score": sum(profit_scores) / len(profit_scores) if profit_scores else 0.5,
-            "avg_duration_days": sum(durations) / len(durations) if durations else 0,
-            "reporters": reporters,
-            "reporter_scores": reporter_scores
-        }
+        def _query(peer_filter: str, peer_params: tuple) -> List[sqlite3.Row]:
+            return conn.execute(f"""
+                SELECT peer_id, reporter_id, {rollup_sums}
+                FROM peer_event_daily
+                WHERE {peer_filter} day > ?
+                GROUP BY peer_id, reporter_id
+                UNION ALL
+                SELECT peer_id, reporter_id, {self._PEER_EVENT_AGGREGATES}
+                FROM peer_events
+                WHERE {peer_filter} timestamp > ? AND timestamp < ?
+                GROUP BY peer_id, reporter_id
+            """, (*peer_params, cutoff_day,
+                  *peer_params, cutoff, (cutoff_day + 1) * 86400)).fetchall()
+
+        if peer_ids is None:
+            return self._combine_peer_event_groups(_query("", ()))
+
+        rows = []
+        unique_ids = list(dict.fromkeys(peer_ids))
+        for i in range(0, len(unique_ids), self._SUMMARY_BATCH_SIZE):
+            batch = tuple(unique_ids[i:i + self._SUMMARY_BATCH_SIZE])
+            placeholders = ','.join('?' * len(batch))
+            rows.extend(_query(f"peer_id IN ({placeholders}) AND", batch))
+        return self._combine_peer_event_groups(rows)
+
+    def rebuild_peer_event_rollups(self) -> int:
+        """
+        Recompute the peer_event_daily rollups from raw peer_events.
+
+        Used to backfill rollups for events stored before the table existed.
+
+        Returns:
+            Number of rollup rows written
+        """
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM peer_event_daily")
+            cursor = conn.execute(f"""
+                INSERT INTO peer_event_daily
+                    (peer_id, reporter_id, day, {", ".join(self._PEER_EVENT_ROLLUP_FIELDS)})
+                SELECT peer_id, reporter_id, timestamp / 86400,
+                       {self._PEER_EVENT_AGGREGATES}
+                FROM peer_events
+                GROUP BY peer_id, reporter_id, timestamp / 86400
+            """)
+        return cursor.rowcount
 
     def get_recent_channel_events(self, event_types: List[str] = None,
                                    days: int = 7, limit: int = 100) -> List[Dict[str, Any]]:
@@ -2803,10 +3282,14 @@ class HiveDatabase:
         conn = self._get_connection()
         cutoff = int(time.time()) - (days * 86400)
 
+        cutoff_day = cutoff // 86400
+
         rows = conn.execute("""
-            SELECT DISTINCT peer_id FROM peer_events
-            WHERE timestamp > ?
-        """, (cutoff,)).fetchall()
+            SELECT peer_id FROM peer_event_daily WHERE day > ?
+            UNION
+            SELECT peer_id FROM peer_events
+            WHERE timestamp > ? AND timestamp < ?
+        """, (cutoff_day, cutoff, (cutoff_day + 1) * 86400)).fetchall()
 
         return [row['peer_id'] for row in rows]
 
@@ -2829,6 +3312,10 @@ class HiveDatabase:
             (cutoff,)
         )
         deleted = result.rowcount
+        conn.execute(
+            "DELETE FROM peer_event_daily WHERE day < ?",
+            (cutoff // 86400,)
+        )
         if deleted > 0:
             self.plugin.log(f"Pruned {deleted} old peer events", level='info')
         return deleted
@@ -3459,6 +3946,36 @@ class HiveDatabase:
         """, (target_peer_id, cutoff)).fetchall()
         return [dict(row) for row in rows]
 
+    def get_fee_intelligence_for_peers(
+        self,
+        target_peer_ids: List[str],
+        max_age_hours: int = 24
+    ) -> List[Dict[str, Any]]:
+        """
+        Get recent fee intelligence reports for a set of external peers.
+
+        Args:
+            target_peer_ids: External peers to get reports for
+            max_age_hours: Maximum age of reports in hours
+
+        Returns:
+            List of fee intelligence reports, grouped by target peer
+        """
+        conn = self._get_connection()
+        cutoff = int(time.time()) - (max_age_hours * 3600)
+        reports = []
+        unique_ids = list(dict.fromkeys(target_peer_ids))
+        for i in range(0, len(unique_ids), self._SUMMARY_BATCH_SIZE):
+            batch = unique_ids[i:i + self._SUMMARY_BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            rows = conn.execute(f"""
+                SELECT * FROM fee_intelligence
+                WHERE target_peer_id IN ({placeholders}) AND timestamp >= ?
+                ORDER BY target_peer_id, timestamp DESC
+            """, (*batch, cutoff)).fetchall()
+            reports.extend(dict(row) for row in rows)
+        return reports
+
     def get_fee_intelligence_by_reporter(
         self,
         reporter_id: str,
@@ -3556,33 +4073,61 @@ class HiveDatabase:
             optimal_fee_estimate: Recommended optimal fee
             confidence: Confidence score (0-1)
         """
-        conn = self._get_connection()
+        self.update_peer_fee_profiles([{
+            "peer_id": peer_id,
+            "reporter_count": reporter_count,
+            "avg_fee_charged": avg_fee_charged,
+            "min_fee_charged": min_fee_charged,
+            "max_fee_charged": max_fee_charged,
+            "total_hive_volume": total_hive_volume,
+            "total_hive_revenue": total_hive_revenue,
+            "avg_utilization": avg_utilization,
+            "estimated_elasticity": estimated_elasticity,
+            "optimal_fee_estimate": optimal_fee_estimate,
+            "confidence": confidence,
+        }])
+
+    def update_peer_fee_profiles(self, profiles: List[Dict[str, Any]]) -> None:
+        """
+        Upsert many aggregated fee profiles in a single transaction.
+
+        Args:
+            profiles: Dicts with the update_peer_fee_profile arguments
+                      (estimated_elasticity, optimal_fee_estimate and
+                      confidence are optional)
+        """
+        if not profiles:
+            return
         now = int(time.time())
-        conn.execute("""
-            INSERT INTO peer_fee_profiles (
-                peer_id, reporter_count, avg_fee_charged, min_fee_charged,
-                max_fee_charged, total_hive_volume, total_hive_revenue,
-                avg_utilization, estimated_elasticity, optimal_fee_estimate,
-                last_update, confidence
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(peer_id) DO UPDATE SET
-                reporter_count = excluded.reporter_count,
-                avg_fee_charged = excluded.avg_fee_charged,
-                min_fee_charged = excluded.min_fee_charged,
-                max_fee_charged = excluded.max_fee_charged,
-                total_hive_volume = excluded.total_hive_volume,
-                total_hive_revenue = excluded.total_hive_revenue,
-                avg_utilization = excluded.avg_utilization,
-                estimated_elasticity = excluded.estimated_elasticity,
-                optimal_fee_estimate = excluded.optimal_fee_estimate,
-                last_update = excluded.last_update,
-                confidence = excluded.confidence
-        """, (
-            peer_id, reporter_count, avg_fee_charged, min_fee_charged,
-            max_fee_charged, total_hive_volume, total_hive_revenue,
-            avg_utilization, estimated_elasticity, optimal_fee_estimate,
-            now, confidence
-        ))
+        rows = [(
+            p["peer_id"], p["reporter_count"], p["avg_fee_charged"],
+            p["min_fee_charged"], p["max_fee_charged"], p["total_hive_volume"],
+            p["total_hive_revenue"], p["avg_utilization"],
+            p.get("estimated_elasticity", 0.0), p.get("optimal_fee_estimate", 0),
+            now, p.get("confidence", 0.5)
+        ) for p in profiles]
+
+        with self.transaction() as conn:
+            conn.executemany("""
+                INSERT INTO peer_fee_profiles (
+                    peer_id, reporter_count, avg_fee_charged, min_fee_charged,
+                    max_fee_charged, total_hive_volume, total_hive_revenue,
+                    avg_utilization, estimated_elasticity, optimal_fee_estimate,
+                    last_update, confidence
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(peer_id) DO UPDATE SET
+                    reporter_count = excluded.reporter_count,
+                    avg_fee_charged = excluded.avg_fee_charged,
+                    min_fee_charged = excluded.min_fee_charged,
+                    max_fee_charged = excluded.max_fee_charged,
+                    total_hive_volume = excluded.total_hive_volume,
+                    total_hive_revenue = excluded.total_hive_revenue,
+                    avg_utilization = excluded.avg_utilization,
+                    estimated_elasticity = excluded.estimated_elasticity,
+                    optimal_fee_estimate = excluded.optimal_fee_estimate,
+                    last_update = excluded.last_update,
+                    confidence = excluded.confidence
+            """, rows)
 
     def get_peer_fee_profile(self, peer_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -4781,6 +5326,50 @@ class HiveDatabase:
 
         return [dict(row) for row in rows]
 
+    def get_flow_samples_between(self, since: int, until: int) -> List[Dict[str, Any]]:
+        """
+        Get all flow samples with since < timestamp <= until.
+
+        Args:
+            since: Exclusive lower timestamp bound
+            until: Inclusive upper timestamp bound
+
+        Returns:
+            List of flow sample dicts
+        """
+        conn = self._get_connection()
+        rows = conn.execute("""
+            SELECT * FROM flow_samples
+            WHERE timestamp > ? AND timestamp <= ?
+        """, (since, until)).fetchall()
+
+        return [dict(row) for row in rows]
+
+    def get_flow_slot_moments(self, since: int) -> List[Tuple[str, int, int, int, int, int]]:
+        """
+        Aggregate flow samples into hour-of-week slots per channel.
+
+        Only one row per (channel, hour, day of week) is returned, so batch
+        pattern detection does not have to materialise every sample.
+
+        Args:
+            since: Exclusive lower timestamp bound
+
+        Returns:
+            List of (channel_id, slot, count, sum, sum_abs, sum_sq) tuples over
+            net_flow_sats, where slot = day_of_week * 24 + hour
+        """
+        cursor = self._get_connection().cursor()
+        cursor.row_factory = None  # Plain tuples: one row per channel slot
+        return cursor.execute("""
+            SELECT channel_id, day_of_week * 24 + hour, COUNT(*),
+                   SUM(net_flow_sats), SUM(ABS(net_flow_sats)),
+                   SUM(net_flow_sats * net_flow_sats)
+            FROM flow_samples
+            WHERE timestamp > ?
+            GROUP BY channel_id, day_of_week, hour
+        """, (since,)).fetchall()
+
     def prune_old_flow_samples(self, days_to_keep: int = 30) -> int:
         """
         Remove old flow samples to limit database growth.
@@ -16,7 +16,7 @@ import math
 import time
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from . import network_metrics
 
@@ -1014,6 +1014,9 @@ class StigmergicCoordinator:
         # Route markers (in-memory, also persisted via gossip)
         self._markers: Dict[Tuple[str, str], List[RouteMarker]] = defaultdict(list)
 
+        # Callbacks notified of every stored marker (local or gossip)
+        self._marker_listeners: List[Callable[[RouteMarker], None]] = []
+
     def set_our_pubkey(self, pubkey: str) -> None:
         self.our_pubkey = pubkey
 
@@ -1021,6 +1024,20 @@ class StigmergicCoordinator:
         if self.plugin:
             self.plugin.log(f"cl-hive: [Stigmergy] {msg}", level=level)
 
+    def subscribe_markers(self, callback: Callable[[RouteMarker], None]) -> None:
+        """
+        Register a callback invoked as callback(marker) whenever a marker is
+        deposited locally or received from gossip.
+        """
+        self._marker_listeners.append(callback)
+
+    def _notify_marker(self, marker: RouteMarker) -> None:
+        for callback in list(self._marker_listeners):
+            try:
+                callback(marker)
+            except Exception as e:
+                self._log(f"Marker listener failed: {e}", level="warn")
+
     def deposit_marker(
         self,
         source: str,
@@ -1058,6 +1075,7 @@ class StigmergicCoordinator:
             level="debug"
         )
 
+        self._notify_marker(marker)
         return marker
 
     def _prune_markers(self, key: Tuple[str, str]) -> None:
@@ -1150,12 +1168,13 @@ class StigmergicCoordinator:
             key = (marker.source_peer_id, marker.destination_peer_id)
             self._markers[key].append(marker)
             self._prune_markers(key)
-
-            return marker
         except (KeyError, TypeError) as e:
             self._log(f"Invalid marker data: {e}", level="debug")
             return None
 
+        self._notify_marker(marker)
+        return marker
+
     def get_all_markers(self) -> List[RouteMarker]:
         """Get all active markers."""
         result = []
@@ -1680,6 +1699,8 @@ class TimeBasedFeeAdjuster:
 
         # Cache: channel_id -> (adjustment, timestamp)
         self._adjustment_cache: Dict[str, Tuple[TimeFeeAdjustment, float]] = {}
+        # Shared prediction memo (from the anticipatory manager, if any)
+        self.prediction_cache = getattr(anticipatory_mgr, "prediction_cache", None)
 
         # Enabled flag (can be toggled via config)
         self.enabled = TIME_FEE_ADJUSTMENT_ENABLED
@@ -1690,6 +1711,9 @@ class TimeBasedFeeAdjuster:
     def set_anticipatory_manager(self, mgr: Any) -> None:
         """Set or update the anticipatory liquidity manager."""
         self.anticipatory_mgr = mgr
+        # Share its prediction memo so adjustments are dropped with the
+        # channel's other predictions when new flow data arrives
+        self.prediction_cache = getattr(mgr, "prediction_cache", None)
 
     def _log(self, msg: str, level: str = "info") -> None:
         if self.plugin:
@@ -1748,13 +1772,34 @@ class TimeBasedFeeAdjuster:
         Returns:
             TimeFeeAdjustment with recommended fee and reasoning
         """
+        current_hour, current_day = self._get_current_time_context()
+
+        if self.prediction_cache is not None and self.enabled and self.anticipatory_mgr:
+            # ttl 0 forces a recompute that still refreshes the memo
+            return self.prediction_cache.get_or_compute(
+                "time_adjustment", channel_id, (current_hour, current_day, base_fee),
+                lambda: self._compute_time_adjustment(
+                    channel_id, base_fee, current_hour, current_day
+                ),
+                ttl_seconds=TIME_FEE_CACHE_TTL_HOURS * 3600 if use_cache else 0
+            )
+
         # Check cache
         if use_cache:
             cached = self._get_cached_adjustment(channel_id)
             if cached and cached.base_fee_ppm == base_fee:
                 return cached
 
-        current_hour, current_day = self._get_current_time_context()
+        return self._compute_time_adjustment(channel_id, base_fee, current_hour, current_day)
+
+    def _compute_time_adjustment(
+        self,
+        channel_id: str,
+        base_fee: int,
+        current_hour: int,
+        current_day: int
+    ) -> TimeFeeAdjustment:
+        """Compute a time adjustment (uncached, see get_time_adjustment)."""
 
         # Default no-adjustment result
         no_adjustment = TimeFeeAdjustment(
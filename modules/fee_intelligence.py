@@ -9,9 +9,10 @@ Implements cooperative fee coordination through:
 Author: Lightning Goats Team
 """
 
+import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
 
 from modules.protocol import (
     HiveMessageType,
@@ -25,6 +26,7 @@ from modules.protocol import (
     HEALTH_REPORT_RATE_LIMIT,
     MAX_PEERS_IN_SNAPSHOT,
 )
+from modules.rate_limiter import RateLimiter
 
 
 # =============================================================================
@@ -42,6 +44,11 @@ MIN_FEE_PPM = 1
 MAX_FEE_PPM = 5000
 DEFAULT_BASE_FEE = 100
 
+# Fee profile aggregation window and full re-aggregation interval.
+# Between full passes only peers with new reports are recomputed.
+FEE_PROFILE_WINDOW_HOURS = 24
+FEE_PROFILE_FULL_REFRESH_SECONDS = 6 * 3600
+
 # Health tier thresholds
 HEALTH_THRIVING = 75
 HEALTH_HEALTHY = 50
@@ -125,61 +132,20 @@ class FeeIntelligenceManager:
         self.plugin = plugin
         self.our_pubkey = our_pubkey
 
-        # Rate limiting: {sender_id: [timestamp, ...]}
-        self._fee_intel_snapshot_rate: Dict[str, List[int]] = {}
-        self._health_report_rate: Dict[str, List[int]] = {}
+        # Rate limiting (per sender)
+        self._fee_intel_snapshot_rate = RateLimiter(*FEE_INTELLIGENCE_SNAPSHOT_RATE_LIMIT)
+        self._health_report_rate = RateLimiter(*HEALTH_REPORT_RATE_LIMIT)
+
+        # Incremental aggregation: peers with reports since the last pass
+        self._dirty_lock = threading.Lock()
+        self._dirty_peers: Set[str] = set()
+        self._last_full_aggregation: float = 0.0
 
     def _log(self, msg: str, level: str = "info") -> None:
         """Log a message if plugin is available."""
         if self.plugin:
             self.plugin.log(f"[FeeIntelligenceManager] {msg}", level=level)
 
-    # =========================================================================
-    # RATE LIMITING
-    # =========================================================================
-
-    def _check_rate_limit(
-        self,
-        sender_id: str,
-        rate_dict: Dict[str, List[int]],
-        limit: Tuple[int, int]
-    ) -> bool:
-        """
-        Check if sender is within rate limit.
-
-        Args:
-            sender_id: Sender's peer ID
-            rate_dict: Rate tracking dictionary
-            limit: (max_count, period_seconds) tuple
-
-        Returns:
-            True if within limit, False if rate limited
-        """
-        max_count, period = limit
-        now = int(time.time())
-        cutoff = now - period
-
-        # Get sender's history, filter old entries
-        history = rate_dict.get(sender_id, [])
-        history = [t for t in history if t > cutoff]
-        rate_dict[sender_id] = history
-
-        if len(history) >= max_count:
-            return False
-
-        return True
-
-    def _record_message(
-        self,
-        sender_id: str,
-        rate_dict: Dict[str, List[int]]
-    ) -> None:
-        """Record a message for rate limiting."""
-        now = int(time.time())
-        if sender_id not in rate_dict:
-            rate_dict[sender_id] = []
-        rate_dict[sender_id].append(now)
-
     # =========================================================================
     # FEE INTELLIGENCE CREATION
     # =========================================================================
@@ -276,9 +242,7 @@ class FeeIntelligenceManager:
             Dict with result status
         """
         # Rate limit check
-        if not self._check_rate_limit(
-            sender_id, self._fee_intel_snapshot_rate, FEE_INTELLIGENCE_SNAPSHOT_RATE_LIMIT
-        ):
+        if not self._fee_intel_snapshot_rate.check(sender_id):
             self._log(f"Rate limited fee intelligence snapshot from {sender_id[:16]}...")
             return {"error": "rate_limited"}
 
@@ -318,7 +282,7 @@ class FeeIntelligenceManager:
             return {"error": "verification_failed"}
 
         # Record for rate limiting
-        self._record_message(sender_id, self._fee_intel_snapshot_rate)
+        self._fee_intel_snapshot_rate.record(sender_id)
 
         # Store intelligence for each peer
         peers = payload.get("peers", [])
@@ -348,6 +312,8 @@ class FeeIntelligenceManager:
             )
             stored_count += 1
 
+        self.mark_peers_dirty(p.get("peer_id") for p in peers)
+
         self._log(
             f"Stored fee intelligence snapshot from {reporter_id[:16]}... "
             f"with {stored_count} peer observations"
@@ -359,85 +325,136 @@ class FeeIntelligenceManager:
     # FEE PROFILE AGGREGATION
     # =========================================================================
 
-    def aggregate_fee_profiles(self) -> int:
+    def mark_peers_dirty(self, peer_ids: Iterable[str]) -> None:
+        """
+        Flag peers whose fee profile must be recomputed on the next pass.
+
+        Args:
+            peer_ids: External peer IDs with new fee intelligence
         """
-        Aggregate all fee intelligence into peer fee profiles.
+        with self._dirty_lock:
+            self._dirty_peers.update(p for p in peer_ids if p)
+
+    def aggregate_fee_profiles(self, full: bool = False) -> int:
+        """
+        Aggregate fee intelligence into peer fee profiles.
 
         Calculates averages, estimates elasticity, and determines
         optimal fee recommendations.
 
+        Incremental: only peers marked dirty since the last pass are
+        recomputed. A full pass over every peer in the window runs on the
+        first call, every FEE_PROFILE_FULL_REFRESH_SECONDS (so confidence
+        decay and expiring reports are reflected), or when requested.
+
+        Args:
+            full: Recompute every peer with reports in the window
+
         Returns:
             Number of profiles updated
         """
-        # Get all recent fee intelligence
-        intel_reports = self.db.get_all_fee_intelligence(max_age_hours=24)
-
-        # Group by target peer
-        by_peer: Dict[str, List[Dict[str, Any]]] = {}
-        for report in intel_reports:
-            peer_id = report.get("target_peer_id")
-            if peer_id not in by_peer:
-                by_peer[peer_id] = []
-            by_peer[peer_id].append(report)
-
-        updated = 0
-        for peer_id, reports in by_peer.items():
-            if not reports:
-                continue
+        now = time.time()
+        with self._dirty_lock:
+            dirty = self._dirty_peers
+            self._dirty_peers = set()
+        full = full or now - self._last_full_aggregation >= FEE_PROFILE_FULL_REFRESH_SECONDS
 
-            # Get unique reporters
-            reporters = list(set(r.get("reporter_id") for r in reports))
+        if not full and not dirty:
+            return 0
 
-            # Calculate fee statistics
-            fees = [r.get("our_fee_ppm", 0) for r in reports if r.get("our_fee_ppm", 0) > 0]
-            if fees:
-                avg_fee = sum(fees) / len(fees)
-                min_fee = min(fees)
-                max_fee = max(fees)
+        try:
+            if full:
+                intel_reports = self.db.get_all_fee_intelligence(
+                    max_age_hours=FEE_PROFILE_WINDOW_HOURS
+                )
             else:
-                avg_fee = DEFAULT_BASE_FEE
-                min_fee = 0
-                max_fee = 0
+                intel_reports = self.db.get_fee_intelligence_for_peers(
+                    list(dirty), max_age_hours=FEE_PROFILE_WINDOW_HOURS
+                )
+
+            # Group by target peer
+            by_peer: Dict[str, List[Dict[str, Any]]] = {}
+            for report in intel_reports:
+                by_peer.setdefault(report.get("target_peer_id"), []).append(report)
+
+            profiles = [
+                self._build_fee_profile(peer_id, reports)
+                for peer_id, reports in by_peer.items() if reports
+            ]
+
+            # One transaction for all profiles
+            if profiles:
+                self.db.update_peer_fee_profiles(profiles)
+        except Exception:
+            # Keep the dirty peers for the next pass
+            self.mark_peers_dirty(dirty)
+            raise
+
+        if full:
+            self._last_full_aggregation = now
+
+        self._log(
+            f"Aggregated {len(profiles)} peer fee profiles from {len(intel_reports)} reports "
+            f"({'full' if full else 'incremental'})"
+        )
+        return len(profiles)
+
+    def _build_fee_profile(self, peer_id: str,
+                           reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Compute the aggregated fee profile for one peer.
+
+        Args:
+            peer_id: External peer ID
+            reports: Fee intelligence reports for this peer
 
-            # Calculate volume and revenue totals
-            total_volume = sum(r.get("forward_volume_sats", 0) for r in reports)
-            total_revenue = sum(r.get("revenue_sats", 0) for r in reports)
+        Returns:
+            Keyword arguments for update_peer_fee_profile
+        """
+        # Get unique reporters
+        reporter_count = len(set(r.get("reporter_id") for r in reports))
 
-            # Calculate average utilization
-            utils = [r.get("utilization_pct", 0) for r in reports]
-            avg_util = sum(utils) / len(utils) if utils else 0
+        # Calculate fee statistics
+        fees = [r.get("our_fee_ppm", 0) for r in reports if r.get("our_fee_ppm", 0) > 0]
+        if fees:
+            avg_fee = sum(fees) / len(fees)
+            min_fee = min(fees)
+            max_fee = max(fees)
+        else:
+            avg_fee = DEFAULT_BASE_FEE
+            min_fee = 0
+            max_fee = 0
 
-            # Estimate elasticity from volume delta observations
-            elasticity = self._estimate_elasticity(reports)
+        # Calculate volume and revenue totals
+        total_volume = sum(r.get("forward_volume_sats", 0) for r in reports)
+        total_revenue = sum(r.get("revenue_sats", 0) for r in reports)
 
+        # Calculate average utilization
+        utils = [r.get("utilization_pct", 0) for r in reports]
+        avg_util = sum(utils) / len(utils) if utils else 0
+
+        # Estimate elasticity from volume delta observations
+        elasticity = self._estimate_elasticity(reports)
+
+        return {
+            "peer_id": peer_id,
+            "reporter_count": reporter_count,
+            "avg_fee_charged": avg_fee,
+            "min_fee_charged": min_fee,
+            "max_fee_charged": max_fee,
+            "total_hive_volume": total_volume,
+            "total_hive_revenue": total_revenue,
+            "avg_utilization": avg_util,
+            "estimated_elasticity": elasticity,
             # Calculate optimal fee estimate
-            optimal_fee = self._calculate_optimal_fee(
+            "optimal_fee_estimate": self._calculate_optimal_fee(
                 avg_fee=avg_fee,
                 elasticity=elasticity,
-                reporter_count=len(reporters)
-            )
-
-            # Calculate confidence based on reporter count and data freshness
-            confidence = self._calculate_confidence(reports, len(reporters))
-
-            # Update the profile in database
-            self.db.update_peer_fee_profile(
-                peer_id=peer_id,
-                reporter_count=len(reporters),
-                avg_fee_charged=avg_fee,
-                min_fee_charged=min_fee,
-                max_fee_charged=max_fee,
-                total_hive_volume=total_volume,
-                total_hive_revenue=total_revenue,
-                avg_utilization=avg_util,
-                estimated_elasticity=elasticity,
-                optimal_fee_estimate=optimal_fee,
-                confidence=confidence
-            )
-            updated += 1
-
-        self._log(f"Aggregated {updated} peer fee profiles from {len(intel_reports)} reports")
-        return updated
+                reporter_count=reporter_count
+            ),
+            # Confidence based on reporter count and data freshness
+            "confidence": self._calculate_confidence(reports, reporter_count),
+        }
 
     def _estimate_elasticity(self, reports: List[Dict[str, Any]]) -> float:
         """
@@ -723,9 +740,7 @@ class FeeIntelligenceManager:
             Dict with result status
         """
         # Rate limit check
-        if not self._check_rate_limit(
-            sender_id, self._health_report_rate, HEALTH_REPORT_RATE_LIMIT
-        ):
+        if not self._health_report_rate.check(sender_id):
             self._log(f"Rate limited health report from {sender_id[:16]}...")
             return {"error": "rate_limited"}
 
@@ -765,7 +780,7 @@ class FeeIntelligenceManager:
             return {"error": "verification_failed"}
 
         # Record for rate limiting
-        self._record_message(sender_id, self._health_report_rate)
+        self._health_report_rate.record(sender_id)
 
         # Determine tier from health score
         overall_health = payload.get("overall_health", 50)
@@ -1164,6 +1179,8 @@ class FeeIntelligenceManager:
             days_observed=1
         )
 
+        self.mark_peers_dirty([target_peer_id])
+
         self._log(
             f"Stored local observation for {target_peer_id[:16]}... "
             f"(fee={our_fee_ppm}, volume={forward_volume_sats}, forwards={forward_count})",
@@ -0,0 +1,316 @@
+"""
+Forward Event Pipeline Module for cl-hive
+
+Moves forward_event processing off the notification thread. Events are
+queued and handed to consumers in micro-batches:
+- one channel-map lookup per batch (built by the context factory)
+- one database transaction per batch for the in-transaction consumers
+- after-commit consumers (e.g. fee gossip broadcast) run outside the
+  transaction so network I/O never holds the write lock
+
+Each consumer receives the whole batch and the shared context.
+
+Backpressure: the queue is bounded. When it is full, submit() waits up to
+the enqueue timeout for the worker to make room and then drops the event.
+Drops, queue depth and lag (time from enqueue to processing) are reported
+by get_stats().
+
+Thread-safe: submit() may be called from any thread; batches are processed
+by a single worker running run().
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, Deque, Dict, List, Optional, Tuple
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+# Maximum queued events before submit() applies backpressure
+FORWARD_PIPELINE_MAX_QUEUE = 10000
+
+# Maximum events handed to consumers in one batch
+FORWARD_PIPELINE_MAX_BATCH = 200
+
+# Maximum time an event waits for its batch to fill (seconds)
+FORWARD_PIPELINE_MAX_DELAY = 0.5
+
+# Maximum time submit() blocks on a full queue before dropping (seconds)
+FORWARD_PIPELINE_ENQUEUE_TIMEOUT = 1.0
+
+# Minimum interval between drop warnings (seconds)
+FORWARD_PIPELINE_DROP_LOG_INTERVAL = 60
+
+
+BatchConsumer = Callable[[List[Dict[str, Any]], Any], None]
+
+
+class ForwardEventPipeline:
+    """
+    Bounded queue plus micro-batch worker for forward events.
+
+    Usage:
+        pipeline = ForwardEventPipeline(
+            context_factory=build_channel_map,
+            transaction=database.transaction,
+        )
+        pipeline.add_consumer("contribution", record_contributions)
+        pipeline.add_consumer("fee_gossip", broadcast_fees, after_commit=True)
+        threading.Thread(target=pipeline.run, args=(shutdown_event,)).start()
+
+        pipeline.submit(forward_event)     # from the notification handler
+    """
+
+    def __init__(
+        self,
+        context_factory: Optional[Callable[[], Any]] = None,
+        transaction: Optional[Callable[[], ContextManager]] = None,
+        log: Optional[Callable[[str, str], None]] = None,
+        max_queue: int = FORWARD_PIPELINE_MAX_QUEUE,
+        max_batch: int = FORWARD_PIPELINE_MAX_BATCH,
+        max_delay: float = FORWARD_PIPELINE_MAX_DELAY,
+        enqueue_timeout: float = FORWARD_PIPELINE_ENQUEUE_TIMEOUT
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            context_factory: Called once per batch; its result is passed to
+                every consumer (e.g. a short_channel_id -> peer_id map)
+            transaction: Returns a context manager wrapping the
+                in-transaction consumers of one batch
+            log: Logger function (msg, level)
+            max_queue: Queue bound
+            max_batch: Maximum events per batch
+            max_delay: Maximum time the oldest queued event waits for a batch
+            enqueue_timeout: Maximum time submit() blocks on a full queue
+        """
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1")
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+
+        self.context_factory = context_factory
+        self.transaction = transaction
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.enqueue_timeout = enqueue_timeout
+        self._log_fn = log
+
+        self._consumers: List[Tuple[str, BatchConsumer, bool]] = []
+        self._queue: Deque[Tuple[float, Dict[str, Any]]] = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        # Serializes batch processing between run() and process_pending()
+        self._process_lock = threading.Lock()
+
+        self._submitted = 0
+        self._processed = 0
+        self._dropped = 0
+        self._batches = 0
+        self._consumer_errors: Dict[str, int] = {}
+        self._last_lag = 0.0
+        self._max_lag = 0.0
+        self._last_batch_size = 0
+        self._last_batch_seconds = 0.0
+        self._last_drop_log = 0.0
+
+    def _log(self, msg: str, level: str = "info") -> None:
+        if self._log_fn:
+            self._log_fn(f"[ForwardPipeline] {msg}", level)
+
+    def add_consumer(self, name: str, consumer: BatchConsumer,
+                     after_commit: bool = False) -> None:
+        """
+        Register a batch consumer.
+
+        Consumers run in registration order. In-transaction consumers run
+        inside the batch transaction; after-commit consumers run once it has
+        been committed. A consumer that raises is logged and counted; the
+        others still run.
+
+        Args:
+            name: Name used in logs and stats
+            consumer: Called as consumer(events, context)
+            after_commit: Run outside the batch transaction
+        """
+        self._consumers.append((name, consumer, after_commit))
+        self._consumer_errors.setdefault(name, 0)
+
+    # =========================================================================
+    # INGESTION
+    # =========================================================================
+
+    def submit(self, event: Dict[str, Any], now: Optional[float] = None) -> bool:
+        """
+        Queue a forward event.
+
+        Blocks for at most enqueue_timeout while the queue is full.
+
+        Returns:
+            True if queued, False if dropped
+        """
+        if now is None:
+            now = time.time()
+
+        with self._lock:
+            if len(self._queue) >= self.max_queue and self.enqueue_timeout > 0:
+                deadline = time.monotonic() + self.enqueue_timeout
+                while len(self._queue) >= self.max_queue:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._not_full.wait(remaining)
+
+            if len(self._queue) >= self.max_queue:
+                self._dropped += 1
+                log_drop = now - self._last_drop_log >= FORWARD_PIPELINE_DROP_LOG_INTERVAL
+                if log_drop:
+                    self._last_drop_log = now
+                dropped = self._dropped
+            else:
+                self._queue.append((now, event))
+                self._submitted += 1
+                self._not_empty.notify()
+                return True
+
+        if log_drop:
+            self._log(
+                f"Queue full ({self.max_queue}), dropping forward events "
+                f"({dropped} dropped so far)",
+                level="warn"
+            )
+        return False
+
+    def _take_batch(self) -> List[Tuple[float, Dict[str, Any]]]:
+        """Pop up to max_batch events. Caller holds self._lock."""
+        count = min(len(self._queue), self.max_batch)
+        batch = [self._queue.popleft() for _ in range(count)]
+        if batch:
+            self._not_full.notify_all()
+        return batch
+
+    # =========================================================================
+    # PROCESSING
+    # =========================================================================
+
+    def _process_batch(self, batch: List[Tuple[float, Dict[str, Any]]],
+                       now: Optional[float] = None) -> None:
+        if not batch:
+            return
+        if now is None:
+            now = time.time()
+
+        started = time.monotonic()
+        lag = max(0.0, now - batch[0][0])
+        events = [event for _, event in batch]
+
+        context = None
+        if self.context_factory:
+            try:
+                context = self.context_factory()
+            except Exception as e:
+                self._log(f"Batch context error: {e}", level="warn")
+
+        def run_consumers(after_commit: bool) -> None:
+            for name, consumer, consumer_after_commit in self._consumers:
+                if consumer_after_commit != after_commit:
+                    continue
+                try:
+                    consumer(events, context)
+                except Exception as e:
+                    self._consumer_errors[name] += 1
+                    self._log(f"Consumer {name} error: {e}", level="warn")
+
+        try:
+            with (self.transaction() if self.transaction else nullcontext()):
+                run_consumers(after_commit=False)
+        except Exception as e:
+            self._log(f"Batch transaction error ({len(events)} events): {e}", level="error")
+        run_consumers(after_commit=True)
+
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self._processed += len(events)
+            self._batches += 1
+            self._last_lag = lag
+            self._max_lag = max(self._max_lag, lag)
+            self._last_batch_size = len(events)
+            self._last_batch_seconds = elapsed
+
+    def process_pending(self, now: Optional[float] = None) -> int:
+        """
+        Synchronously process everything currently queued.
+
+        Returns:
+            Number of events processed
+        """
+        total = 0
+        with self._process_lock:
+            while True:
+                with self._lock:
+                    batch = self._take_batch()
+                if not batch:
+                    return total
+                self._process_batch(batch, now)
+                total += len(batch)
+
+    def run(self, shutdown_event: threading.Event) -> None:
+        """
+        Worker loop. Processes batches until shutdown_event is set, then
+        drains whatever is still queued.
+        """
+        while not shutdown_event.is_set():
+            with self._lock:
+                while not self._queue and not shutdown_event.is_set():
+                    self._not_empty.wait(1.0)
+                # Let the batch fill until it is full or its oldest event is due
+                while (self._queue and len(self._queue) < self.max_batch
+                       and not shutdown_event.is_set()):
+                    wait = self._queue[0][0] + self.max_delay - time.time()
+                    if wait <= 0:
+                        break
+                    self._not_empty.wait(wait)
+                batch = self._take_batch()
+
+            if batch:
+                with self._process_lock:
+                    self._process_batch(batch)
+
+        drained = self.process_pending()
+        if drained:
+            self._log(f"Drained {drained} forward events on shutdown", level="info")
+
+    # =========================================================================
+    # STATS
+    # =========================================================================
+
+    def get_stats(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Get queue depth, throughput, lag and drop counters."""
+        if now is None:
+            now = time.time()
+        with self._lock:
+            oldest_age = max(0.0, now - self._queue[0][0]) if self._queue else 0.0
+            return {
+                "queue_depth": len(self._queue),
+                "max_queue": self.max_queue,
+                "submitted": self._submitted,
+                "processed": self._processed,
+                "dropped": self._dropped,
+                "batches": self._batches,
+                "avg_batch_size": (
+                    round(self._processed / self._batches, 1) if self._batches else 0.0
+                ),
+                "last_batch_size": self._last_batch_size,
+                "last_batch_ms": round(self._last_batch_seconds * 1000, 1),
+                "oldest_queued_age_seconds": round(oldest_age, 3),
+                "last_lag_seconds": round(self._last_lag, 3),
+                "max_lag_seconds": round(self._max_lag, 3),
+                "consumer_errors": dict(self._consumer_errors),
+            }
@@ -0,0 +1,217 @@
+"""
+Kalman Filter Bank Module for cl-hive
+
+Tracks (local balance ratio, velocity) for every local channel with one
+constant-velocity Kalman filter per channel, so the node has its own
+velocity estimates instead of relying only on fleet reports from
+cl-revenue-ops or a plain net-flow average.
+
+State for all channels lives in parallel `array('d')` columns (ratio,
+velocity and the three distinct covariance terms), indexed by a per-channel
+slot. A batch of balance observations (one listpeerchannels snapshot) runs
+the predict and update steps for every channel in a single pass with the
+2x2 matrix algebra written out as scalar arithmetic.
+
+Model (time in hours):
+    x = [ratio, velocity]
+    F = [[1, dt], [0, 1]]
+    Q = q * [[dt^3/3, dt^2/2], [dt^2/2, dt]]   (white-noise acceleration)
+    H = [1, 0], R = measurement variance of the observed ratio
+"""
+
+import math
+from array import array
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+# Process noise: variance of velocity change per hour ((fraction/hour)^2 / hour)
+KALMAN_PROCESS_NOISE = 1e-5
+
+# Measurement noise: variance of an observed balance ratio (~1% std)
+KALMAN_MEASUREMENT_NOISE = 1e-4
+
+# Initial velocity variance for a newly tracked channel
+KALMAN_INITIAL_VELOCITY_VARIANCE = 1e-2
+
+# Observations closer together than this are merged into the previous step
+KALMAN_MIN_STEP_SECONDS = 60
+
+
+class KalmanFilterBank:
+    """
+    Constant-velocity Kalman filters for many channels, stored column-wise.
+
+    Usage:
+        bank = KalmanFilterBank()
+        bank.update_batch({"800000x1x0": 0.42, ...}, timestamp)
+        velocity, std = bank.velocity("800000x1x0")
+    """
+
+    def __init__(
+        self,
+        process_noise: float = KALMAN_PROCESS_NOISE,
+        measurement_noise: float = KALMAN_MEASUREMENT_NOISE,
+        initial_velocity_variance: float = KALMAN_INITIAL_VELOCITY_VARIANCE
+    ):
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.initial_velocity_variance = initial_velocity_variance
+
+        self._slots: Dict[str, int] = {}
+        self._channels: list = []
+        self._ratio = array('d')
+        self._velocity = array('d')
+        self._p00 = array('d')
+        self._p01 = array('d')
+        self._p11 = array('d')
+        self._updated_at = array('q')
+        self._updates = array('q')
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def __contains__(self, channel_id: str) -> bool:
+        return channel_id in self._slots
+
+    # =========================================================================
+    # FILTER STEPS
+    # =========================================================================
+
+    def update_batch(self, observations: Mapping[str, float], timestamp: int) -> int:
+        """
+        Run predict + update for every observed channel.
+
+        Channels seen for the first time are initialised at the observed
+        ratio with zero velocity.
+
+        Args:
+            observations: channel_id -> observed local balance ratio (0.0-1.0)
+            timestamp: Observation time (unix seconds)
+
+        Returns:
+            Number of filters stepped (excluding newly initialised ones)
+        """
+        q = self.process_noise
+        r = self.measurement_noise
+        ratio, velocity = self._ratio, self._velocity
+        p00, p01, p11 = self._p00, self._p01, self._p11
+        updated_at, updates = self._updated_at, self._updates
+        stepped = 0
+
+        for channel_id, z in observations.items():
+            i = self._slots.get(channel_id)
+            if i is None:
+                self._add(channel_id, z, timestamp)
+                continue
+
+            elapsed = timestamp - updated_at[i]
+            if elapsed < KALMAN_MIN_STEP_SECONDS:
+                continue
+            dt = elapsed / 3600.0
+
+            # Predict: x = F x, P = F P F' + Q
+            x0 = ratio[i] + velocity[i] * dt
+            x1 = velocity[i]
+            a00 = p00[i] + 2 * dt * p01[i] + dt * dt * p11[i] + q * dt * dt * dt / 3
+            a01 = p01[i] + dt * p11[i] + q * dt * dt / 2
+            a11 = p11[i] + q * dt
+
+            # Update with scalar observation of the ratio
+            s = a00 + r
+            k0 = a00 / s
+            k1 = a01 / s
+            innovation = z - x0
+            ratio[i] = x0 + k0 * innovation
+            velocity[i] = x1 + k1 * innovation
+            p00[i] = (1 - k0) * a00
+            p01[i] = (1 - k0) * a01
+            p11[i] = a11 - k1 * a01
+
+            updated_at[i] = timestamp
+            updates[i] += 1
+            stepped += 1
+
+        return stepped
+
+    def _add(self, channel_id: str, z: float, timestamp: int) -> None:
+        self._slots[channel_id] = len(self._channels)
+        self._channels.append(channel_id)
+        self._ratio.append(z)
+        self._velocity.append(0.0)
+        self._p00.append(self.measurement_noise)
+        self._p01.append(0.0)
+        self._p11.append(self.initial_velocity_variance)
+        self._updated_at.append(timestamp)
+        self._updates.append(0)
+
+    def retain(self, channel_ids: Iterable[str]) -> int:
+        """
+        Drop filters for channels not in channel_ids (e.g. closed channels).
+
+        Returns:
+            Number of filters removed
+        """
+        keep = set(channel_ids)
+        removed = 0
+        for channel_id in [c for c in self._channels if c not in keep]:
+            self._remove(channel_id)
+            removed += 1
+        return removed
+
+    def _remove(self, channel_id: str) -> None:
+        # Swap-remove: move the last slot into the freed one
+        i = self._slots.pop(channel_id)
+        last = len(self._channels) - 1
+        columns = (self._ratio, self._velocity, self._p00, self._p01,
+                   self._p11, self._updated_at, self._updates)
+        if i != last:
+            moved = self._channels[last]
+            self._channels[i] = moved
+            self._slots[moved] = i
+            for column in columns:
+                column[i] = column[last]
+        self._channels.pop()
+        for column in columns:
+            column.pop()
+
+    # =========================================================================
+    # QUERIES
+    # =========================================================================
+
+    def velocity(self, channel_id: str) -> Optional[Tuple[float, float]]:
+        """
+        Get (velocity, velocity std) in fraction of capacity per hour.
+
+        Returns:
+            Tuple, or None if the channel is not tracked
+        """
+        i = self._slots.get(channel_id)
+        if i is None:
+            return None
+        return self._velocity[i], math.sqrt(max(0.0, self._p11[i]))
+
+    def state(self, channel_id: str) -> Optional[Dict[str, float]]:
+        """Get the full filter state for a channel (for diagnostics)."""
+        i = self._slots.get(channel_id)
+        if i is None:
+            return None
+        return {
+            "ratio": self._ratio[i],
+            "velocity_pct_per_hour": self._velocity[i],
+            "ratio_std": math.sqrt(max(0.0, self._p00[i])),
+            "velocity_std": math.sqrt(max(0.0, self._p11[i])),
+            "updates": self._updates[i],
+            "updated_at": self._updated_at[i],
+        }
+
+    def updates(self, channel_id: str) -> int:
+        i = self._slots.get(channel_id)
+        return self._updates[i] if i is not None else 0
+
+    def updated_at(self, channel_id: str) -> int:
+        i = self._slots.get(channel_id)
+        return self._updated_at[i] if i is not None else 0
@@ -19,7 +19,7 @@ Security: All operations use cryptographic signatures.
 
 import time
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
 from collections import defaultdict
 
 from .protocol import (
@@ -38,6 +38,7 @@ from .protocol import (
     create_mcf_assignment_ack,
     create_mcf_completion_report,
 )
+from .rate_limiter import RateLimiter
 
 
 # Urgency levels for liquidity needs
@@ -165,8 +166,8 @@ class LiquidityCoordinator:
         self._member_liquidity_state: Dict[str, Dict[str, Any]] = {}
 
         # Rate limiting
-        self._need_rate: Dict[str, List[float]] = defaultdict(list)
-        self._snapshot_rate: Dict[str, List[float]] = defaultdict(list)
+        self._need_rate = RateLimiter(*LIQUIDITY_NEED_RATE_LIMIT)
+        self._snapshot_rate = RateLimiter(*LIQUIDITY_SNAPSHOT_RATE_LIMIT)
 
         # MCF assignment tracking (Phase 15)
         self._mcf_assignments: Dict[str, MCFAssignment] = {}  # assignment_id -> assignment
@@ -177,32 +178,6 @@ class LiquidityCoordinator:
         self._remote_mcf_needs: Dict[str, Dict[str, Any]] = {}  # reporter_id -> need
         self._max_remote_needs = 500  # Bound cache size
 
-    def _check_rate_limit(
-        self,
-        sender: str,
-        rate_tracker: Dict[str, List[float]],
-        limit: Tuple[int, int]
-    ) -> bool:
-        """Check if sender is within rate limit."""
-        max_count, period = limit
-        now = time.time()
-
-        # Clean old entries
-        rate_tracker[sender] = [
-            ts for ts in rate_tracker[sender]
-            if now - ts < period
-        ]
-
-        return len(rate_tracker[sender]) < max_count
-
-    def _record_message(
-        self,
-        sender: str,
-        rate_tracker: Dict[str, List[float]]
-    ):
-        """Record a message for rate limiting."""
-        rate_tracker[sender].append(time.time())
-
     def create_liquidity_need_message(
         self,
         need_type: str,
@@ -308,11 +283,7 @@ class LiquidityCoordinator:
             return {"error": "reporter not a member"}
 
         # Rate limit check
-        if not self._check_rate_limit(
-            reporter_id,
-            self._need_rate,
-            LIQUIDITY_NEED_RATE_LIMIT
-        ):
+        if not self._need_rate.check(reporter_id):
             return {"error": "rate limited"}
 
         # Verify signature
@@ -333,7 +304,7 @@ class LiquidityCoordinator:
             return {"error": f"signature check failed: {e}"}
 
         # Record rate limit
-        self._record_message(reporter_id, self._need_rate)
+        self._need_rate.record(reporter_id)
 
         # Store the liquidity need
         need = LiquidityNeed(
@@ -415,11 +386,7 @@ class LiquidityCoordinator:
             return {"error": "reporter not a member"}
 
         # Rate limit check for snapshot messages
-        if not self._check_rate_limit(
-            reporter_id,
-            self._snapshot_rate,
-            LIQUIDITY_SNAPSHOT_RATE_LIMIT
-        ):
+        if not self._snapshot_rate.check(reporter_id):
             return {"error": "rate limited"}
 
         # Verify signature
@@ -440,7 +407,7 @@ class LiquidityCoordinator:
             return {"error": f"signature check failed: {e}"}
 
         # Record rate limit
-        self._record_message(reporter_id, self._snapshot_rate)
+        self._snapshot_rate.record(reporter_id)
 
         # Process each need in the snapshot
         needs = payload.get("needs", [])
@@ -519,6 +519,8 @@ class MCFNetwork:
             self.add_node(from_node)
         if to_node not in self.nodes:
             self.add_node(to_node)
+        if from_node not in self.nodes or to_node not in self.nodes:
+            return -1  # Node limit reached
 
         # Forward edge
         forward_idx = len(self.edges)
@@ -1371,6 +1373,17 @@ class MCFCoordinator:
             "can_execute": self._circuit_breaker.can_execute(),
         }
 
+    def get_health_metrics(self) -> Dict[str, Any]:
+        """
+        Get raw health counters without running an election.
+
+        Returns:
+            MCFHealthMetrics dict plus circuit breaker state
+        """
+        metrics = self._health_metrics.to_dict()
+        metrics["circuit_state"] = self._circuit_breaker.state
+        return metrics
+
     def reset_circuit_breaker(self) -> None:
         """Reset circuit breaker to closed state."""
         self._circuit_breaker.reset()
@@ -90,25 +90,20 @@ class MembershipManager:
             self._log("Bridge not enabled, skipping policy sync")
             return 0
 
-        synced = 0
-        members = self.db.get_all_members()
-
-        for member in members:
+        policies = {}
+        for member in self.db.get_all_members():
             peer_id = member.get("peer_id")
-            tier = member.get("tier")
             if not peer_id:
                 continue
-
-            is_full_member = tier == MembershipTier.MEMBER.value
-            try:
-                # Bypass rate limit on startup sync
-                success = self.bridge.set_hive_policy(
-                    peer_id, is_member=is_full_member, bypass_rate_limit=True
-                )
-                if success:
-                    synced += 1
-            except Exception as exc:
-                self._log(f"Failed to sync policy for {peer_id[:16]}...: {exc}", level="warn")
+            policies[peer_id] = member.get("tier") == MembershipTier.MEMBER.value
+
+        try:
+            # Batched on the bridge connection; bypass rate limit on startup sync
+            results = self.bridge.set_hive_policies(policies, bypass_rate_limit=True)
+            synced = sum(1 for success in results.values() if success)
+        except Exception as exc:
+            self._log(f"Failed to sync bridge policies: {exc}", level="warn")
+            synced = 0
 
         if synced > 0:
             self._log(f"Synced bridge policies for {synced} members")
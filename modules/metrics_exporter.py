@@ -0,0 +1,410 @@
+"""
+Metrics Exporter Module for cl-hive
+
+Serves plugin internals in OpenMetrics text format over a local HTTP port
+and/or a unix socket, so Prometheus (or hive-monitor) can scrape a node
+without issuing RPC commands:
+- message counts by type and handler latency (custommsg)
+- background loop durations, RPC command and DB query latency
+- RPC lock wait time
+- relay throughput and dedup hits
+- rate limiter rejections
+- MCF solve time, flow and assignment outcomes
+- pending action counts
+- forward event pipeline depth, drops and lag
+
+Rendering only reads in-memory counters (plus one grouped COUNT query for
+pending actions), so a scrape costs well under a millisecond.
+
+Both listeners are disabled by default and bind to loopback / a local
+socket only; there is no authentication.
+"""
+
+import http.server
+import os
+import socketserver
+import stat
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from modules.rate_limiter import RateLimiter
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+METRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+METRICS_PREFIX = "cl_hive"
+METRICS_PATHS = ("/", "/metrics")
+METRICS_DEFAULT_HOST = "127.0.0.1"
+METRICS_SOCKET_MODE = 0o660
+
+# Perf category -> (metric name, label name, help)
+PERF_METRIC_FAMILIES = {
+    "loop": ("loop_iteration_seconds", "loop", "Background loop iteration duration"),
+    "rpc": ("rpc_command_seconds", "method", "hive-* RPC command duration"),
+    "custommsg": ("custommsg_handler_seconds", "type", "Hive message handler duration"),
+    "db": ("db_query_seconds", "method", "HiveDatabase method duration"),
+    "lock": ("lock_wait_seconds", "lock", "Time spent waiting to acquire a lock"),
+}
+
+PERF_QUANTILES = (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms"))
+
+Labels = Optional[Dict[str, Any]]
+
+
+# =============================================================================
+# OPENMETRICS WRITER
+# =============================================================================
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+class MetricsWriter:
+    """
+    Accumulates metric families in OpenMetrics text format.
+
+    Each family is written once with all its samples; names are prefixed
+    with "cl_hive_".
+    """
+
+    def __init__(self, prefix: str = METRICS_PREFIX):
+        self._prefix = prefix
+        self._lines: List[str] = []
+        self._families = set()
+
+    def _family(self, name: str, mtype: str, help_text: str) -> Optional[str]:
+        full = f"{self._prefix}_{name}"
+        if full in self._families:
+            return None
+        self._families.add(full)
+        self._lines.append(f"# TYPE {full} {mtype}")
+        self._lines.append(f"# HELP {full} {help_text}")
+        return full
+
+    def _sample(self, name: str, labels: Labels, value: float) -> None:
+        self._lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    def gauge(self, name: str, help_text: str,
+              samples: Iterable[Tuple[Labels, float]]) -> None:
+        full = self._family(name, "gauge", help_text)
+        if full:
+            for labels, value in samples:
+                self._sample(full, labels, value)
+
+    def counter(self, name: str, help_text: str,
+                samples: Iterable[Tuple[Labels, float]]) -> None:
+        full = self._family(name, "counter", help_text)
+        if full:
+            for labels, value in samples:
+                self._sample(f"{full}_total", labels, value)
+
+    def summary(self, name: str, help_text: str,
+                samples: Iterable[Tuple[Labels, Dict[str, float]]]) -> None:
+        """
+        Write a summary family.
+
+        Each sample is (labels, {"count", "sum", "quantiles": {q: seconds}}).
+        """
+        full = self._family(name, "summary", help_text)
+        if not full:
+            return
+        for labels, summary in samples:
+            for quantile, value in summary.get("quantiles", {}).items():
+                self._sample(full, {**(labels or {}), "quantile": quantile}, value)
+            self._sample(f"{full}_sum", labels, summary["sum"])
+            self._sample(f"{full}_count", labels, summary["count"])
+
+    def render(self) -> str:
+        return "\n".join(self._lines + ["# EOF"]) + "\n"
+
+
+# =============================================================================
+# COLLECTORS
+# =============================================================================
+
+def write_perf_metrics(writer: MetricsWriter, perf_metrics: Any) -> None:
+    """Latency summaries for every PerfMetrics category, plus message counts."""
+    categories = perf_metrics.get_stats()["categories"]
+
+    for category, entries in sorted(categories.items()):
+        name, label, help_text = PERF_METRIC_FAMILIES.get(
+            category, (f"{category}_seconds", "name", f"{category} duration")
+        )
+        writer.summary(name, help_text, (
+            ({label: entry_name}, {
+                "count": entry["count"],
+                "sum": entry["total_ms"] / 1000,
+                "quantiles": {q: entry[key] / 1000 for q, key in PERF_QUANTILES},
+            })
+            for entry_name, entry in sorted(entries.items())
+        ))
+
+    messages = categories.get("custommsg", {})
+    writer.counter("messages_received", "Hive messages handled, by type", (
+        ({"type": msg_type}, entry["count"])
+        for msg_type, entry in sorted(messages.items())
+    ))
+
+
+def write_relay_stats(writer: MetricsWriter, relay_mgr: Any) -> None:
+    """Relay throughput and deduplication counters."""
+    stats = relay_mgr.stats()
+    writer.counter("relay_messages_processed", "Messages checked for relay",
+                   [(None, stats.get("messages_processed", 0))])
+    writer.counter("relay_messages_relayed", "Messages relayed to other members",
+                   [(None, stats.get("messages_relayed", 0))])
+    writer.counter("relay_messages_deduplicated", "Duplicate messages dropped (dedup hits)",
+                   [(None, stats.get("messages_deduplicated", 0))])
+    writer.counter("relay_failures", "Failed relay sends",
+                   [(None, stats.get("relay_failures", 0))])
+    writer.gauge("relay_dedup_cache_size", "Message IDs held in the dedup cache",
+                 [(None, stats.get("dedup", {}).get("cached_messages", 0))])
+
+
+def find_rate_limiters(sources: Dict[str, Any]) -> Dict[str, RateLimiter]:
+    """
+    Collect RateLimiter instances held as attributes of the given objects.
+
+    Args:
+        sources: name -> manager object (or a RateLimiter itself)
+
+    Returns:
+        Dict of "name.attribute" (or "name") -> RateLimiter
+    """
+    limiters: Dict[str, RateLimiter] = {}
+    for source_name, obj in sources.items():
+        if obj is None:
+            continue
+        if isinstance(obj, RateLimiter):
+            limiters[source_name] = obj
+            continue
+        for attr, value in vars(obj).items():
+            if isinstance(value, RateLimiter):
+                limiters[f"{source_name}.{attr.lstrip('_')}"] = value
+    return limiters
+
+
+def write_rate_limiters(writer: MetricsWriter, limiters: Dict[str, RateLimiter]) -> None:
+    """Rejections and currently limited senders per rate limiter."""
+    stats = {name: limiter.get_stats() for name, limiter in sorted(limiters.items())}
+    writer.counter("rate_limit_rejected", "Messages dropped by a rate limiter", (
+        ({"limiter": name}, s["rejected"]) for name, s in stats.items()
+    ))
+    writer.gauge("rate_limit_limited_keys", "Senders currently over their limit", (
+        ({"limiter": name}, s["limited_keys"]) for name, s in stats.items()
+    ))
+    writer.gauge("rate_limit_tracked_keys", "Senders tracked by a rate limiter", (
+        ({"limiter": name}, s["tracked_keys"]) for name, s in stats.items()
+    ))
+
+
+def write_mcf_health(writer: MetricsWriter, cost_reduction_mgr: Any) -> None:
+    """MCF solver timing, flow and assignment outcomes."""
+    health = cost_reduction_mgr.get_mcf_health_metrics()
+    if not health:
+        return
+    writer.gauge("mcf_solve_seconds", "Duration of the last MCF solve",
+                 [(None, health["last_computation_time_ms"] / 1000)])
+    writer.gauge("mcf_solution_flow_sats", "Total flow of the last MCF solution",
+                 [(None, health["last_solution_flow_sats"])])
+    writer.gauge("mcf_solution_cost_sats", "Total cost of the last MCF solution",
+                 [(None, health["last_solution_cost_sats"])])
+    writer.gauge("mcf_solution_assignments", "Assignments in the last MCF solution",
+                 [(None, health["last_solution_assignments"])])
+    writer.gauge("mcf_solution_age_seconds", "Age of the last MCF solution",
+                 [(None, health["last_solution_age_seconds"])])
+    writer.gauge("mcf_consecutive_stale_cycles", "MCF cycles in a row without fresh data",
+                 [(None, health["consecutive_stale_cycles"])])
+    writer.counter("mcf_assignments", "Completed MCF assignments by result", [
+        ({"result": "success"}, health["successful_assignments"]),
+        ({"result": "failure"}, health["failed_assignments"]),
+    ])
+    writer.counter("mcf_flow_executed_sats", "Flow moved by completed MCF assignments",
+                   [(None, health["total_flow_executed_sats"])])
+    writer.gauge("mcf_circuit_state", "MCF circuit breaker state (1 = current)", (
+        ({"state": state}, int(health["circuit_state"] == state))
+        for state in ("closed", "open", "half_open")
+    ))
+
+
+def write_pending_actions(writer: MetricsWriter, database: Any) -> None:
+    """Pending actions awaiting approval, by action type."""
+    counts = database.count_pending_actions_by_type()
+    writer.gauge("pending_actions", "Pending actions awaiting approval", (
+        ({"type": action_type}, count) for action_type, count in sorted(counts.items())
+    ))
+
+
+def write_forward_pipeline(writer: MetricsWriter, forward_pipeline: Any) -> None:
+    """Forward event pipeline depth, throughput, drops and lag."""
+    stats = forward_pipeline.get_stats()
+    writer.gauge("forward_pipeline_queue_depth", "Forward events waiting to be processed",
+                 [(None, stats["queue_depth"])])
+    writer.counter("forward_pipeline_submitted", "Forward events submitted",
+                   [(None, stats["submitted"])])
+    writer.counter("forward_pipeline_processed", "Forward events processed",
+                   [(None, stats["processed"])])
+    writer.counter("forward_pipeline_dropped", "Forward events dropped under backpressure",
+                   [(None, stats["dropped"])])
+    writer.gauge("forward_pipeline_lag_seconds", "Queueing delay of the last processed batch",
+                 [(None, stats["last_lag_seconds"])])
+
+
+# =============================================================================
+# EXPORTER
+# =============================================================================
+
+class _MetricsRequestHandler(http.server.BaseHTTPRequestHandler):
+    server_version = "cl-hive-metrics"
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in METRICS_PATHS:
+            self.send_error(404)
+            return
+        body = self.server.exporter.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", METRICS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _TcpMetricsServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class _UnixMetricsServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class MetricsExporter:
+    """
+    Renders collector output as OpenMetrics and serves it on demand.
+
+    Each collector writes its metric families; a failing collector is
+    skipped (and counted) without affecting the others.
+
+    Usage:
+        exporter = MetricsExporter([
+            lambda w: write_perf_metrics(w, perf_metrics),
+            lambda w: write_relay_stats(w, relay_mgr),
+        ], log=plugin_log)
+        exporter.start_http(port=9750)
+        exporter.start_unix("/run/cl-hive/metrics.sock")
+    """
+
+    def __init__(self, collectors: Iterable[Callable[[MetricsWriter], None]],
+                 log: Optional[Callable[[str, str], None]] = None):
+        self._collectors = list(collectors)
+        self._log_fn = log
+        self._lock = threading.Lock()
+        self._servers: List[Tuple[socketserver.BaseServer, Optional[str]]] = []
+        self._scrapes = 0
+        self._collect_errors = 0
+        self._last_render = 0.0
+
+    def _log(self, msg: str, level: str = "info") -> None:
+        if self._log_fn:
+            self._log_fn(f"[Metrics] {msg}", level)
+
+    def render(self) -> str:
+        """Run the collectors and return the OpenMetrics text."""
+        started = time.perf_counter()
+        writer = MetricsWriter()
+        errors = 0
+        for collect in self._collectors:
+            try:
+                collect(writer)
+            except Exception as e:
+                errors += 1
+                self._log(f"Collector failed: {e}", level="warn")
+
+        with self._lock:
+            self._scrapes += 1
+            self._collect_errors += errors
+            writer.counter("metrics_scrapes", "Scrapes served", [(None, self._scrapes)])
+            writer.counter("metrics_collect_errors", "Collector failures during scrapes",
+                           [(None, self._collect_errors)])
+            writer.gauge("metrics_render_seconds", "Render time of the previous scrape",
+                         [(None, self._last_render)])
+            self._last_render = time.perf_counter() - started
+        return writer.render()
+
+    def start_http(self, port: int, host: str = METRICS_DEFAULT_HOST) -> Tuple[str, int]:
+        """
+        Serve /metrics over HTTP.
+
+        Returns:
+            Bound (host, port); port 0 picks a free port
+        """
+        server = _TcpMetricsServer((host, port), _MetricsRequestHandler)
+        self._serve(server, "cl-hive-metrics-http")
+        address = server.server_address[:2]
+        self._log(f"Serving OpenMetrics on http://{address[0]}:{address[1]}/metrics")
+        return address
+
+    def start_unix(self, path: str) -> str:
+        """Serve /metrics over HTTP on a unix socket (replacing a stale one)."""
+        path = os.path.expanduser(path)
+        if os.path.exists(path):
+            if not stat.S_ISSOCK(os.stat(path).st_mode):
+                raise FileExistsError(f"{path} exists and is not a socket")
+            os.unlink(path)
+        server = _UnixMetricsServer(path, _MetricsRequestHandler)
+        os.chmod(path, METRICS_SOCKET_MODE)
+        self._serve(server, "cl-hive-metrics-unix", path)
+        self._log(f"Serving OpenMetrics on unix socket {path}")
+        return path
+
+    def _serve(self, server: socketserver.BaseServer, thread_name: str,
+               socket_path: Optional[str] = None) -> None:
+        server.exporter = self
+        with self._lock:
+            self._servers.append((server, socket_path))
+        threading.Thread(
+            target=server.serve_forever, name=thread_name, daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        """Stop all listeners and remove the unix socket."""
+        with self._lock:
+            servers, self._servers = self._servers, []
+        for server, socket_path in servers:
+            server.shutdown()
+            server.server_close()
+            if socket_path:
+                try:
+                    os.unlink(socket_path)
+                except OSError:
+                    pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "listeners": len(self._servers),
+                "scrapes": self._scrapes,
+                "collect_errors": self._collect_errors,
+                "last_render_ms": round(self._last_render * 1000, 3),
+            }
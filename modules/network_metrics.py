@@ -188,6 +188,11 @@ class NetworkMetricsCalculator:
         self._topology_snapshot: Optional[FleetTopologySnapshot] = None
         self._lock = threading.RLock()
 
+        # Recompute as soon as the member set changes instead of waiting
+        # for the TTL
+        if database is not None and hasattr(database, "subscribe_membership"):
+            database.subscribe_membership(self._on_membership_change)
+
     def _log(self, msg: str, level: str = "debug") -> None:
         """Log a message if plugin is available."""
         if self.plugin:
@@ -311,6 +316,12 @@ class NetworkMetricsCalculator:
         with self._lock:
             self._cache_time = 0
 
+    def _on_membership_change(self, event: str, peer_id: str, changes) -> None:
+        """Membership subscriber: drop metrics when members join/leave/change tier."""
+        if event == "updated" and "tier" not in (changes or {}):
+            return
+        self.invalidate_cache()
+
     # =========================================================================
     # INTERNAL CALCULATION
     # =========================================================================
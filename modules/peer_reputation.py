@@ -28,6 +28,7 @@ from .protocol import (
     MAX_WARNINGS_COUNT,
     VALID_WARNINGS,
 )
+from .rate_limiter import RateLimiter
 
 
 # Aggregation thresholds
@@ -113,33 +114,7 @@ class PeerReputationManager:
         self._aggregated: Dict[str, AggregatedReputation] = {}
 
         # Rate limiting for snapshots
-        self._snapshot_rate: Dict[str, List[float]] = defaultdict(list)
-
-    def _check_rate_limit(
-        self,
-        sender: str,
-        rate_tracker: Dict[str, List[float]],
-        limit: tuple
-    ) -> bool:
-        """Check if sender is within rate limit."""
-        max_count, period = limit
-        now = time.time()
-
-        # Clean old entries
-        rate_tracker[sender] = [
-            ts for ts in rate_tracker[sender]
-            if now - ts < period
-        ]
-
-        return len(rate_tracker[sender]) < max_count
-
-    def _record_message(
-        self,
-        sender: str,
-        rate_tracker: Dict[str, List[float]]
-    ):
-        """Record a message for rate limiting."""
-        rate_tracker[sender].append(time.time())
+        self._snapshot_rate = RateLimiter(*PEER_REPUTATION_SNAPSHOT_RATE_LIMIT)
 
     def create_reputation_snapshot_message(
         self,
@@ -259,11 +234,7 @@ class PeerReputationManager:
             return {"error": "reporter not a member"}
 
         # Rate limit check
-        if not self._check_rate_limit(
-            reporter_id,
-            self._snapshot_rate,
-            PEER_REPUTATION_SNAPSHOT_RATE_LIMIT
-        ):
+        if not self._snapshot_rate.check(reporter_id):
             return {"error": "rate limited"}
 
         # Verify signature
@@ -284,7 +255,7 @@ class PeerReputationManager:
             return {"error": f"signature check failed: {e}"}
 
         # Record rate limit
-        self._record_message(reporter_id, self._snapshot_rate)
+        self._snapshot_rate.record(reporter_id)
 
         # Store reputation for each peer
         peers = payload.get("peers", [])
@@ -0,0 +1,350 @@
+"""
+Performance Metrics Module for cl-hive
+
+Lightweight in-process latency instrumentation for hot paths:
+- background loop iterations ("loop")
+- RPC commands ("rpc")
+- custommsg handlers ("custommsg")
+- HiveDatabase methods ("db")
+- waits to acquire the RPC lock ("lock")
+
+Each (category, name) pair keeps a fixed-size log-bucketed histogram, so
+recording is O(1) and memory does not grow with traffic. p50/p95/p99 are
+estimated from the buckets (upper bucket bound, capped at the observed
+maximum; relative error below 19%).
+
+SamplingProfiler writes an on-demand stack-sampling profile of every
+plugin thread to a file in collapsed-stack format (one
+"thread;frame;...;frame count" line per stack), readable by flamegraph.pl
+and speedscope. cProfile only sees the thread that enables it, so
+sampling is used to cover the background loops and hook threads.
+
+Thread-safe: recording and reading may happen from any thread.
+"""
+
+import functools
+import inspect
+import math
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+# Histogram bucket bounds: 10us to ~84s, four buckets per doubling
+PERF_MIN_SECONDS = 0.00001
+PERF_BUCKETS_PER_DOUBLING = 4
+PERF_BUCKET_COUNT = 93
+PERF_BUCKET_BOUNDS = [
+    PERF_MIN_SECONDS * 2 ** (i / PERF_BUCKETS_PER_DOUBLING)
+    for i in range(PERF_BUCKET_COUNT)
+]
+
+# Metric categories used by cl-hive
+PERF_CATEGORIES = ("loop", "rpc", "custommsg", "db", "lock")
+
+# Sampling profiler limits
+PROFILE_DEFAULT_SECONDS = 30
+PROFILE_MAX_SECONDS = 600
+PROFILE_DEFAULT_INTERVAL = 0.01     # 10ms between samples
+PROFILE_MIN_INTERVAL = 0.001
+PROFILE_MAX_STACK_DEPTH = 64
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with count/total/max."""
+
+    __slots__ = ("counts", "count", "total", "max", "last")
+
+    def __init__(self):
+        self.counts = [0] * (PERF_BUCKET_COUNT + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect_left(PERF_BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Estimated q-quantile (0 < q <= 1) in seconds."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                if index >= PERF_BUCKET_COUNT:
+                    return self.max
+                return min(PERF_BUCKET_BOUNDS[index], self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50) * 1000, 3),
+            "p95_ms": round(self.percentile(0.95) * 1000, 3),
+            "p99_ms": round(self.percentile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "last_ms": round(self.last * 1000, 3),
+        }
+
+
+class PerfTimer:
+    """Times one operation; use as a context manager or call stop()."""
+
+    __slots__ = ("_metrics", "_category", "_name", "_started")
+
+    def __init__(self, metrics: "PerfMetrics", category: str, name: str):
+        self._metrics = metrics
+        self._category = category
+        self._name = name
+        self._started = time.perf_counter()
+
+    def stop(self) -> float:
+        elapsed = time.perf_counter() - self._started
+        self._metrics.record(self._category, self._name, elapsed)
+        return elapsed
+
+    def __enter__(self) -> "PerfTimer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+class PerfMetrics:
+    """
+    Registry of latency histograms keyed by (category, name).
+
+    Usage:
+        perf = PerfMetrics()
+
+        with perf.timer("loop", "gossip_loop"):
+            ...
+
+        @perf.timed("rpc", "hive-status")
+        def hive_status(...): ...
+
+        perf.instrument(database, "db")       # every public method
+        perf.get_stats("db")
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[str, LatencyHistogram]] = defaultdict(dict)
+        self._started_at = int(time.time())
+
+    def record(self, category: str, name: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms[category].get(name)
+            if histogram is None:
+                histogram = self._histograms[category][name] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def timer(self, category: str, name: str) -> PerfTimer:
+        return PerfTimer(self, category, name)
+
+    def wrap(self, category: str, name: str, fn: Callable) -> Callable:
+        """Return fn wrapped with a timer (signature preserved for inspection)."""
+        @functools.wraps(fn)
+        def timed_call(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(category, name, time.perf_counter() - started)
+        return timed_call
+
+    def timed(self, category: str, name: Optional[str] = None) -> Callable:
+        """Decorator form of wrap(); name defaults to the function name."""
+        def decorator(fn: Callable) -> Callable:
+            return self.wrap(category, name or fn.__name__, fn)
+        return decorator
+
+    def instrument(self, obj: Any, category: str,
+                   exclude: Iterable[str] = ()) -> int:
+        """
+        Time every public method of obj by shadowing it on the instance.
+
+        Generator functions (including @contextmanager methods) and names in
+        exclude are skipped: their call returns before the work happens.
+
+        Returns:
+            Number of methods instrumented
+        """
+        excluded = set(exclude)
+        count = 0
+        for attr in dir(type(obj)):
+            if attr.startswith("_") or attr in excluded:
+                continue
+            fn = inspect.getattr_static(type(obj), attr)
+            if not inspect.isfunction(fn) or inspect.isgeneratorfunction(inspect.unwrap(fn)):
+                continue
+            setattr(obj, attr, self.wrap(category, attr, getattr(obj, attr)))
+            count += 1
+        return count
+
+    def get_stats(self, category: Optional[str] = None,
+                  limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Histogram summaries grouped by category, slowest total first.
+
+        Args:
+            category: Only this category
+            limit: Keep the top N names per category by total time
+        """
+        with self._lock:
+            categories = [category] if category else sorted(self._histograms)
+            result: Dict[str, Any] = {
+                "since": self._started_at,
+                "enabled": self.enabled,
+                "categories": {},
+            }
+            for cat in categories:
+                histograms = self._histograms.get(cat, {})
+                ranked = sorted(histograms.items(), key=lambda kv: kv[1].total, reverse=True)
+                if limit:
+                    ranked = ranked[:limit]
+                result["categories"][cat] = {name: h.to_dict() for name, h in ranked}
+        return result
+
+    def reset(self, category: Optional[str] = None) -> None:
+        with self._lock:
+            if category:
+                self._histograms.pop(category, None)
+            else:
+                self._histograms.clear()
+                self._started_at = int(time.time())
+
+
+# =============================================================================
+# SAMPLING PROFILER
+# =============================================================================
+
+class SamplingProfiler:
+    """
+    On-demand wall-clock stack sampler for all threads.
+
+    One run at a time; the sampler thread writes the collapsed stacks to
+    the output file when the run ends.
+    """
+
+    def __init__(self, log: Optional[Callable[[str, str], None]] = None):
+        self._log_fn = log
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._status: Dict[str, Any] = {"running": False}
+
+    def _log(self, msg: str, level: str = "info") -> None:
+        if self._log_fn:
+            self._log_fn(f"[Profiler] {msg}", level)
+
+    def start(self, path: str, duration: float = PROFILE_DEFAULT_SECONDS,
+              interval: float = PROFILE_DEFAULT_INTERVAL) -> Dict[str, Any]:
+        """
+        Start sampling for `duration` seconds, writing to `path`.
+
+        Returns:
+            Status dict, or {"error": ...} if a run is in progress
+        """
+        duration = min(max(float(duration), 0.1), PROFILE_MAX_SECONDS)
+        interval = max(float(interval), PROFILE_MIN_INTERVAL)
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return {"error": "Profile already running", **self._status}
+            self._stop.clear()
+            self._status = {
+                "running": True,
+                "path": path,
+                "started_at": int(time.time()),
+                "duration_seconds": duration,
+                "interval_ms": round(interval * 1000, 3),
+                "samples": 0,
+            }
+            self._thread = threading.Thread(
+                target=self._run, args=(path, duration, interval),
+                name="cl-hive-profiler", daemon=True
+            )
+            self._thread.start()
+            return dict(self._status)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread:
+            self._thread.join(timeout)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._status)
+
+    def _run(self, path: str, duration: float, interval: float) -> None:
+        own_ident = threading.get_ident()
+        deadline = time.monotonic() + duration
+        stacks: Dict[str, int] = defaultdict(int)
+        samples = 0
+
+        while time.monotonic() < deadline and not self._stop.is_set():
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stacks[self._collapse(names.get(ident, str(ident)), frame)] += 1
+            samples += 1
+            self._stop.wait(interval)
+
+        error = None
+        try:
+            self._write(path, stacks)
+        except OSError as e:
+            error = str(e)
+            self._log(f"Failed to write profile to {path}: {e}", level="warn")
+        else:
+            self._log(f"Wrote {samples} samples ({len(stacks)} stacks) to {path}")
+
+        with self._lock:
+            self._status.update(running=False, samples=samples,
+                                stacks=len(stacks), finished_at=int(time.time()))
+            if error:
+                self._status["error"] = error
+
+    @staticmethod
+    def _collapse(thread_name: str, frame) -> str:
+        frames: List[str] = []
+        while frame is not None and len(frames) < PROFILE_MAX_STACK_DEPTH:
+            code = frame.f_code
+            frames.append(
+                f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+            )
+            frame = frame.f_back
+        frames.append(thread_name.replace(";", ":"))
+        return ";".join(reversed(frames))
+
+    @staticmethod
+    def _write(path: str, stacks: Dict[str, int]) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            for stack, count in sorted(stacks.items(), key=lambda kv: -kv[1]):
+                f.write(f"{stack} {count}\n")
+        os.replace(tmp_path, path)
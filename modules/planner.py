@@ -29,8 +29,9 @@ Author: Lightning Goats Team
 
 import time
 import secrets
+import threading
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 try:
     from pyln.client import RpcError
@@ -52,6 +53,9 @@ except ImportError:
     def serialize(msg_type, payload):
         return b''
 
+from modules.network_graph import ChannelGraph, ChannelGraphBuilder
+from modules.rpc_socket import resolve_socket_path, stream_rpc_array
+
 try:
     from modules.quality_scorer import PeerQualityScorer
 except ImportError:
@@ -89,6 +93,9 @@ MAX_EXPANSIONS_PER_CYCLE = 1
 MIN_QUALITY_SCORE = 0.45  # Minimum quality score for expansion
 QUALITY_SCORE_DAYS = 90   # Days of history to consider for quality scoring
 
+# Candidate table (precomputed expansion scores)
+CANDIDATE_MAX_AGE_SECONDS = 3600  # Re-score entries at least hourly
+
 # =============================================================================
 # COOPERATION MODULE INTEGRATION (Phase 7)
 # =============================================================================
@@ -122,16 +129,6 @@ REDUNDANCY_PENALTY_OVERSERVED = 0.3   # 70% penalty if already well-owned by ano
 # DATA CLASSES
 # =============================================================================
 
-@dataclass
-class ChannelInfo:
-    """Represents a channel from listchannels."""
-    source: str
-    destination: str
-    short_channel_id: str
-    capacity_sats: int
-    active: bool
-
-
 @dataclass
 class SaturationResult:
     """Result of saturation calculation for a target."""
@@ -155,6 +152,32 @@ class UnderservedResult:
     quality_recommendation: str = "neutral"  # Quality recommendation
 
 
+@dataclass
+class CandidateScore:
+    """Precomputed expansion score for one target (candidate table entry)."""
+    target: str
+    public_capacity_sats: int
+    hive_share_pct: float
+    score: float
+    quality_score: float
+    quality_confidence: float
+    quality_recommendation: str
+    eligible: bool        # Underserved and not majority-covered
+    low_quality: bool     # Filtered unless include_low_quality
+    computed_at: float
+
+    def to_result(self) -> UnderservedResult:
+        return UnderservedResult(
+            target=self.target,
+            public_capacity_sats=self.public_capacity_sats,
+            hive_share_pct=self.hive_share_pct,
+            score=self.score,
+            quality_score=self.quality_score,
+            quality_confidence=self.quality_confidence,
+            quality_recommendation=self.quality_recommendation
+        )
+
+
 @dataclass
 class ChannelSizeResult:
     """Result of intelligent channel sizing calculation."""
@@ -670,9 +693,10 @@ class Planner:
         else:
             self.quality_scorer = None
 
-        # Network cache (refreshed each cycle)
-        self._network_cache: Dict[str, List[ChannelInfo]] = {}
+        # Network cache (refreshed each cycle) - compact array-backed graph
+        self._network_cache: ChannelGraph = ChannelGraph.empty()
         self._network_cache_time: int = 0
+        self._network_cache_source: str = "none"  # "stream" | "rpc"
 
         # Track currently ignored peers (to avoid duplicate ignores)
         self._ignored_peers: Set[str] = set()
@@ -680,6 +704,26 @@ class Planner:
         # Track expansion proposals this cycle (rate limiting)
         self._expansions_this_cycle: int = 0
 
+        # Candidate table: expansion scores precomputed between cycles and
+        # re-scored only for targets whose inputs changed. _candidate_lock
+        # serializes refreshes; the dirty set has its own lock so that
+        # invalidate_candidate() never waits on a rescore.
+        self._candidate_lock = threading.Lock()
+        self._candidate_table: Dict[str, CandidateScore] = {}
+        self._candidate_ranked: List[CandidateScore] = []
+        self._candidate_dirty_lock = threading.Lock()
+        self._candidate_dirty: Set[str] = set()
+        self._candidate_graph: Optional[ChannelGraph] = None
+        self._candidate_graph_sigs: Dict[str, Tuple[int, int]] = {}
+        self._candidate_fleet_sigs: Dict[str, Tuple[frozenset, int]] = {}
+        self._candidate_refresh_seconds: float = 0.0
+        self._candidate_rescored: int = 0
+
+        # Cycle timing
+        self._cycle_count: int = 0
+        self._last_cycle_seconds: float = 0.0
+        self._total_cycle_seconds: float = 0.0
+
     def _log(self, msg: str, level: str = "info") -> None:
         """Log a message if plugin is available."""
         if self.plugin:
@@ -730,7 +774,12 @@ class Planner:
     # COOPERATION MODULE INTEGRATION (Phase 7)
     # =========================================================================
 
-    def _count_hive_members_with_target(self, target: str) -> Tuple[int, int]:
+    def _count_hive_members_with_target(
+        self,
+        target: str,
+        hive_members: Optional[List[str]] = None,
+        all_states: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, int]:
         """
         Count how many distinct hive members have channels to a target.
 
@@ -740,6 +789,8 @@ class Planner:
 
         Args:
             target: Target node pubkey
+            hive_members: Pre-fetched member list (fetched if None)
+            all_states: Pre-fetched peer states by pubkey (fetched if None)
 
         Returns:
             (members_with_channels, total_members)
@@ -747,12 +798,13 @@ class Planner:
         if not self.state_manager:
             return 0, 0
 
-        hive_members = self._get_hive_members()
+        if hive_members is None:
+            hive_members = self._get_hive_members()
         if not hive_members:
             return 0, 0
 
-        all_states_list = self.state_manager.get_all_peer_states()
-        all_states = {s.peer_id: s for s in all_states_list}
+        if all_states is None:
+            all_states = self._get_peer_states_by_id()
 
         members_with_channel = 0
         for member_pubkey in hive_members:
@@ -794,7 +846,7 @@ class Planner:
             # Very high competition (>200 channels) - even bigger discount
             return 0.50, "very_high"
 
-    def _is_bottleneck_peer(self, target: str) -> bool:
+    def _is_bottleneck_peer(self, target: str, bottlenecks=None) -> bool:
         """
         Check if peer is a common bottleneck identified by liquidity_coordinator.
 
@@ -804,10 +856,14 @@ class Planner:
 
         Args:
             target: Target node pubkey
+            bottlenecks: Pre-fetched bottleneck peers (fetched if None)
 
         Returns:
             True if peer is a bottleneck
         """
+        if bottlenecks is not None:
+            return target in bottlenecks
+
         if not self.liquidity_coordinator:
             return False
 
@@ -861,7 +917,7 @@ class Planner:
             self._log(f"Error checking stigmergic redundancy: {e}", level='debug')
             return False, None, 0.0
 
-    def _get_corridor_value_bonus(self, target: str) -> tuple:
+    def _get_corridor_value_bonus(self, target: str, corridors=None) -> tuple:
         """
         Get corridor value bonus from strategic positioning.
 
@@ -873,6 +929,7 @@ class Planner:
 
         Args:
             target: Target node pubkey
+            corridors: Pre-fetched valuable corridors (fetched if None)
 
         Returns:
             Tuple of (bonus_multiplier: float, value_tier: str)
@@ -881,7 +938,8 @@ class Planner:
             return 1.0, "unknown"
 
         try:
-            corridors = self.strategic_positioning_mgr.get_valuable_corridors(min_score=0.01)
+            if corridors is None:
+                corridors = self.strategic_positioning_mgr.get_valuable_corridors(min_score=0.01)
 
             # Find corridors that include this target
             best_tier = "low"
@@ -1066,6 +1124,8 @@ class Planner:
 
         Implements efficient caching to minimize RPC load.
         Deduplicates bidirectional channels (A->B and B->A counted once).
+        Prefers stream-parsing the response straight off the RPC socket so
+        peak memory during refresh stays close to the compact graph size.
 
         Args:
             force: Force refresh even if cache is fresh
@@ -1084,69 +1144,24 @@ class Planner:
             return False
 
         try:
-            # Fetch all public channels
-            result = self.plugin.rpc.listchannels()
-            channels_raw = result.get('channels', [])
-
-            # Build capacity map: target -> list of channels TO that target
-            # Deduplicate: for bidirectional channels, count capacity once
-            capacity_map: Dict[str, List[ChannelInfo]] = {}
-            seen_pairs: Set[str] = set()
-
-            for ch in channels_raw:
-                source = ch.get('source', '')
-                dest = ch.get('destination', '')
-                scid = ch.get('short_channel_id', '')
-
-                if not source or not dest or not scid:
-                    continue
-
-                # Parse capacity (may be int or dict with msat)
-                capacity_raw = ch.get('amount_msat') or ch.get('satoshis', 0)
-                if isinstance(capacity_raw, dict):
-                    capacity_sats = capacity_raw.get('msat', 0) // 1000
-                elif isinstance(capacity_raw, str) and capacity_raw.endswith('msat'):
-                    capacity_sats = int(capacity_raw[:-4]) // 1000
-                elif isinstance(capacity_raw, int):
-                    # Could be msat or sats depending on field
-                    if capacity_raw > 10_000_000_000:  # Likely msat
-                        capacity_sats = capacity_raw // 1000
-                    else:
-                        capacity_sats = capacity_raw
-                else:
-                    capacity_sats = 0
-
-                active = ch.get('active', True)
-
-                # Create normalized pair key for dedup (smaller pubkey first)
-                pair_key = tuple(sorted([source, dest])) + (scid,)
-                if pair_key in seen_pairs:
-                    continue
-                seen_pairs.add(pair_key)
-
-                info = ChannelInfo(
-                    source=source,
-                    destination=dest,
-                    short_channel_id=scid,
-                    capacity_sats=capacity_sats,
-                    active=active
-                )
-
-                # Index by destination (target)
-                if dest not in capacity_map:
-                    capacity_map[dest] = []
-                capacity_map[dest].append(info)
-
-                # Also index by source (for bidirectional lookup)
-                if source not in capacity_map:
-                    capacity_map[source] = []
-                capacity_map[source].append(info)
-
-            self._network_cache = capacity_map
+            graph = self._stream_network_graph()
+            source = "stream"
+            if graph is None:
+                # Fallback: fetch all public channels in one response
+                result = self.plugin.rpc.listchannels()
+                builder = ChannelGraphBuilder()
+                for ch in result.get('channels', []):
+                    builder.add_raw(ch)
+                del result
+                graph = builder.build()
+                source = "rpc"
+
+            self._network_cache = graph
             self._network_cache_time = now
+            self._network_cache_source = source
 
-            self._log(f"Network cache refreshed: {len(seen_pairs)} channels, "
-                     f"{len(capacity_map)} targets", level='debug')
+            self._log(f"Network cache refreshed ({source}): {graph.channel_count} channels, "
+                     f"{graph.node_count} targets", level='debug')
             return True
 
         except RpcError as e:
@@ -1156,6 +1171,31 @@ class Planner:
             self._log(f"Network cache refresh error: {e}", level='warn')
             return False
 
+    def _stream_network_graph(self) -> Optional[ChannelGraph]:
+        """
+        Build the network graph by stream-parsing listchannels.
+
+        Reads the response directly from the lightningd socket and adds each
+        channel to the compact graph as it is decoded, so the raw JSON list is
+        never held in memory. Deduplicates bidirectional channels on the fly.
+
+        Returns:
+            The new graph, or None if streaming is unavailable or failed
+            (caller falls back to a regular listchannels call)
+        """
+        socket_path = resolve_socket_path(getattr(self.plugin, 'rpc', None))
+        if not socket_path:
+            return None
+
+        builder = ChannelGraphBuilder()
+        try:
+            for ch in stream_rpc_array(socket_path, 'listchannels', 'channels'):
+                builder.add_raw(ch)
+        except Exception as e:
+            self._log(f"Streaming listchannels failed, using full RPC: {e}", level='debug')
+            return None
+        return builder.build()
+
     def _get_public_capacity_to_target(self, target: str) -> int:
         """
         Get total public network capacity to a target.
@@ -1166,8 +1206,7 @@ class Planner:
         Returns:
             Total capacity in satoshis (0 if not found)
         """
-        channels = self._network_cache.get(target, [])
-        return sum(ch.capacity_sats for ch in channels if ch.active)
+        return self._network_cache.public_capacity(target)
 
     # =========================================================================
     # SATURATION LOGIC
@@ -1180,42 +1219,14 @@ class Planner:
         members = self.db.get_all_members()
         return [m['peer_id'] for m in members if m.get('tier') == 'member']
 
-    def _has_existing_or_pending_channel(self, target: str) -> Tuple[bool, Optional[str], Optional[int]]:
-        """
-        Check if we already have an existing or pending channel to this target.
-
-        This prevents double-opening channels to the same peer when one is
-        already in CHANNELD_AWAITING_LOCKIN state.
-
-        Args:
-            target: Target node pubkey
-
-        Returns:
-            Tuple of (has_channel, state, capacity_sats)
-            - has_channel: True if we have an active or pending channel
-            - state: Channel state if found (e.g., 'CHANNELD_NORMAL', 'CHANNELD_AWAITING_LOCKIN')
-            - capacity_sats: Channel capacity if found
-        """
-        if not self.plugin:
-            return (False, None, None)
-
-        try:
-            peer_channels = self.plugin.rpc.listpeerchannels(target)
-            channels = peer_channels.get('channels', [])
-            for ch in channels:
-                state = ch.get('state', '')
-                # Check for active or pending channels
-                if state in ('CHANNELD_AWAITING_LOCKIN', 'CHANNELD_NORMAL',
-                             'DUALOPEND_AWAITING_LOCKIN', 'DUALOPEND_OPEN_INIT'):
-                    capacity_sats = ch.get('total_msat', 0) // 1000
-                    return (True, state, capacity_sats)
-        except Exception:
-            # If RPC fails, assume no channel (conservative)
-            pass
-
-        return (False, None, None)
+    def _get_peer_states_by_id(self) -> Dict[str, Any]:
+        """Get all known Hive peer states keyed by pubkey."""
+        if not self.state_manager:
+            return {}
+        return {s.peer_id: s for s in self.state_manager.get_all_peer_states()}
 
-    def _get_hive_capacity_to_target(self, target: str, hive_members: List[str]) -> int:
+    def _get_hive_capacity_to_target(self, target: str, hive_members: List[str],
+                                     all_states: Optional[Dict[str, Any]] = None) -> int:
         """
         Calculate total Hive capacity to a target.
 
@@ -1225,6 +1236,7 @@ class Planner:
         Args:
             target: Target node pubkey
             hive_members: List of Hive member pubkeys
+            all_states: Pre-fetched peer states by pubkey (fetched if None)
 
         Returns:
             Total Hive capacity in satoshis (clamped to public reality)
@@ -1233,26 +1245,8 @@ class Planner:
             return 0
 
         # Get all known Hive peer states (list -> dict for lookup)
-        all_states_list = self.state_manager.get_all_peer_states()
-        all_states = {s.peer_id: s for s in all_states_list}
-
-        # Get public capacity for reality check
-        public_channels = self._network_cache.get(target, [])
-
-        # Build map: (source, dest) -> max public capacity
-        public_capacity_map: Dict[Tuple[str, str], int] = {}
-        for ch in public_channels:
-            key = (ch.source, ch.destination)
-            public_capacity_map[key] = max(
-                public_capacity_map.get(key, 0),
-                ch.capacity_sats
-            )
-            # Also check reverse direction
-            key_rev = (ch.destination, ch.source)
-            public_capacity_map[key_rev] = max(
-                public_capacity_map.get(key_rev, 0),
-                ch.capacity_sats
-            )
+        if all_states is None:
+            all_states = self._get_peer_states_by_id()
 
         total_hive_capacity = 0
 
@@ -1271,10 +1265,8 @@ class Planner:
 
             # SECURITY: Clamp to public reality
             # Look up the actual public capacity for this (member, target) pair
-            public_max = public_capacity_map.get((member_pubkey, target), 0)
-            if public_max == 0:
-                # Also try reverse
-                public_max = public_capacity_map.get((target, member_pubkey), 0)
+            # (either direction, scanned from the graph's adjacency slice)
+            public_max = self._network_cache.max_capacity_between(member_pubkey, target)
 
             if public_max > 0:
                 clamped_capacity = min(claimed_capacity, public_max)
@@ -1286,24 +1278,29 @@ class Planner:
 
         return total_hive_capacity
 
-    def _calculate_hive_share(self, target: str, cfg) -> SaturationResult:
+    def _calculate_hive_share(self, target: str, cfg,
+                              hive_members: Optional[List[str]] = None,
+                              all_states: Optional[Dict[str, Any]] = None) -> SaturationResult:
         """
         Calculate Hive's market share for a target.
 
         Args:
             target: Target node pubkey
             cfg: Config snapshot for thresholds
+            hive_members: Pre-fetched member list (fetched if None)
+            all_states: Pre-fetched peer states by pubkey (fetched if None)
 
         Returns:
             SaturationResult with share calculation
         """
-        hive_members = self._get_hive_members()
+        if hive_members is None:
+            hive_members = self._get_hive_members()
 
         # Get public capacity (denominator)
         public_capacity = self._get_public_capacity_to_target(target)
 
         # Get Hive capacity (numerator, clamped)
-        hive_capacity = self._get_hive_capacity_to_target(target, hive_members)
+        hive_capacity = self._get_hive_capacity_to_target(target, hive_members, all_states)
 
         # Calculate share
         if public_capacity <= 0:
@@ -1553,11 +1550,311 @@ class Planner:
 
         return decisions
 
+    # =========================================================================
+    # CANDIDATE TABLE
+    # =========================================================================
+
+    def invalidate_candidate(self, target: str) -> None:
+        """
+        Mark a target's precomputed expansion score as stale.
+
+        Called when inputs that are not visible in the graph or fleet
+        topology change (new peer events, stigmergic markers). The entry
+        is re-scored on the next refresh_candidates().
+
+        Args:
+            target: Target node pubkey
+        """
+        if not target:
+            return
+        with self._candidate_dirty_lock:
+            self._candidate_dirty.add(target)
+
+    def on_marker_deposited(self, marker) -> None:
+        """
+        Stigmergic marker callback: re-score both ends of the marked route.
+
+        Registered with StigmergicCoordinator.subscribe_markers() so that
+        local deposits and gossiped markers both invalidate candidates.
+        """
+        self.invalidate_candidate(getattr(marker, 'source_peer_id', None))
+        self.invalidate_candidate(getattr(marker, 'destination_peer_id', None))
+
+    def _sync_candidate_inputs(self, hive_members: List[str],
+                               all_states: Dict[str, Any]) -> bool:
+        """
+        Diff graph and fleet inputs against the last refresh and mark the
+        affected targets dirty. Caller holds _candidate_lock.
+
+        Returns:
+            True if targets were dropped from the table
+        """
+        removed = False
+        dirty: Set[str] = set()
+        graph = self._network_cache
+        if graph is not self._candidate_graph:
+            sigs = self._candidate_graph_sigs
+            seen = set()
+            for target in graph.keys():
+                public_capacity = graph.public_capacity(target)
+                if public_capacity < MIN_TARGET_CAPACITY_SATS:
+                    continue
+                seen.add(target)
+                sig = (public_capacity, graph.partner_count(target))
+                if sigs.get(target) != sig:
+                    sigs[target] = sig
+                    dirty.add(target)
+            for target in [t for t in sigs if t not in seen]:
+                del sigs[target]
+                self._candidate_table.pop(target, None)
+                removed = True
+            self._candidate_graph = graph
+
+        fleet_sigs = {}
+        for member in hive_members:
+            state = all_states.get(member)
+            if state is None:
+                continue
+            topology = frozenset(getattr(state, 'topology', []) or [])
+            fleet_sigs[member] = (topology, getattr(state, 'capacity_sats', 0))
+
+        previous = self._candidate_fleet_sigs
+        if set(hive_members) != set(previous):
+            # Membership changed: coverage denominators changed everywhere
+            dirty.update(self._candidate_graph_sigs)
+        else:
+            for member, (topology, capacity) in fleet_sigs.items():
+                old_topology, old_capacity = previous.get(member) or (frozenset(), 0)
+                if capacity != old_capacity:
+                    dirty.update(topology | old_topology)
+                elif topology != old_topology:
+                    dirty.update(topology ^ old_topology)
+            for member in previous:
+                if member not in fleet_sigs:
+                    dirty.update(previous[member][0])
+        self._candidate_fleet_sigs = {m: fleet_sigs.get(m, (frozenset(), 0))
+                                      for m in hive_members}
+        if dirty:
+            with self._candidate_dirty_lock:
+                self._candidate_dirty.update(dirty)
+        return removed
+
+    def _score_candidate(self, target: str, cfg, hive_members: List[str],
+                         all_states: Dict[str, Any], bottlenecks, corridors,
+                         now: float) -> CandidateScore:
+        """Compute the expansion score for one target."""
+        public_capacity = self._get_public_capacity_to_target(target)
+
+        # Calculate Hive share
+        result = self._calculate_hive_share(target, cfg, hive_members, all_states)
+
+        entry = CandidateScore(
+            target=target,
+            public_capacity_sats=public_capacity,
+            hive_share_pct=result.hive_share_pct,
+            score=0.0,
+            quality_score=0.5,  # Default neutral
+            quality_confidence=0.0,
+            quality_recommendation="neutral",
+            eligible=False,
+            low_quality=False,
+            computed_at=now
+        )
+
+        # Check if underserved (< 5% Hive share)
+        if result.hive_share_pct >= UNDERSERVED_THRESHOLD_PCT:
+            return entry
+
+        # Phase 7: Check hive coverage diversity
+        members_with, total_members = self._count_hive_members_with_target(
+            target, hive_members, all_states
+        )
+        hive_coverage_pct = members_with / total_members if total_members > 0 else 0
+
+        # Skip if majority already has channels (diminishing returns)
+        if hive_coverage_pct >= HIVE_COVERAGE_MAJORITY_PCT:
+            self._log(
+                f"Skipping {target[:16]}... - {members_with}/{total_members} "
+                f"hive members already have channels ({hive_coverage_pct:.0%})",
+                level='debug'
+            )
+            return entry
+
+        # Phase 6.2: Get quality score for the target
+        if self.quality_scorer:
+            quality_result = self.quality_scorer.calculate_score(
+                target, days=QUALITY_SCORE_DAYS
+            )
+            entry.quality_score = quality_result.overall_score
+            entry.quality_confidence = quality_result.confidence
+            entry.quality_recommendation = quality_result.recommendation
+
+            # Targets with 'avoid' recommendation, or below minimum score
+            # with sufficient confidence, are only returned on request
+            entry.low_quality = (
+                entry.quality_recommendation == "avoid" or
+                (entry.quality_confidence >= 0.3 and entry.quality_score < MIN_QUALITY_SCORE)
+            )
+
+        # Calculate base score: higher capacity + lower Hive share = more attractive
+        # Score = capacity_btc * (1 - hive_share)
+        capacity_btc = public_capacity / 100_000_000
+        base_score = capacity_btc * (1 - result.hive_share_pct)
+
+        # Phase 7: Apply competition discount
+        competition_factor, competition_level = self._calculate_competition_score(target)
+        adjusted_score = base_score * competition_factor
+
+        if competition_level in ["high", "very_high"]:
+            self._log(
+                f"Discounting {target[:16]}... - high competition "
+                f"({self._get_target_channel_count(target)} channels, -{int((1-competition_factor)*100)}%)",
+                level='debug'
+            )
+
+        # Phase 7: Apply bottleneck bonus
+        if self._is_bottleneck_peer(target, bottlenecks):
+            adjusted_score *= BOTTLENECK_BONUS_MULTIPLIER
+            self._log(
+                f"Boosting {target[:16]}... - bottleneck peer (+50%)",
+                level='debug'
+            )
+
+        # Physarum/Slime mold: Check stigmergic redundancy
+        # Avoid expanding to routes already "owned" by another member
+        is_overserved, owner, owner_strength = self._check_stigmergic_redundancy(target)
+        if is_overserved and owner:
+            adjusted_score *= REDUNDANCY_PENALTY_OVERSERVED
+            self._log(
+                f"Penalizing {target[:16]}... - already owned by {owner[:16]}... "
+                f"(strength={owner_strength:.1f}, -{int((1-REDUNDANCY_PENALTY_OVERSERVED)*100)}%)",
+                level='debug'
+            )
+
+        # Physarum/Slime mold: Boost high-value corridors
+        # Prioritize routes where "nutrients" (fees) flow abundantly
+        corridor_bonus, corridor_tier = self._get_corridor_value_bonus(target, corridors)
+        if corridor_bonus > 1.0:
+            adjusted_score *= corridor_bonus
+            self._log(
+                f"Boosting {target[:16]}... - {corridor_tier} value corridor "
+                f"(+{int((corridor_bonus-1)*100)}%)",
+                level='debug'
+            )
+
+        # Phase 6.2: Factor in quality score
+        # Quality multiplier ranges from 0.5 (avoid) to 1.5 (excellent)
+        if entry.quality_confidence > 0.3:
+            quality_multiplier = 0.5 + entry.quality_score  # 0.5 to 1.5
+        else:
+            # Low confidence - use neutral multiplier
+            quality_multiplier = 1.0
+
+        entry.score = adjusted_score * quality_multiplier
+        entry.eligible = True
+        return entry
+
+    def refresh_candidates(self, cfg, *, now: Optional[float] = None,
+                           refresh_network: bool = False) -> int:
+        """
+        Bring the candidate table up to date.
+
+        Only targets whose inputs changed since the last refresh are
+        re-scored: graph capacity/channel count, fleet topology or capacity,
+        explicit invalidation (peer events, markers), or entries older than
+        CANDIDATE_MAX_AGE_SECONDS. Safe to call from the background loop
+        between planner cycles.
+
+        Args:
+            cfg: Config snapshot
+            now: Current timestamp (for testing)
+            refresh_network: Also refresh the network cache (TTL-gated)
+
+        Returns:
+            Number of targets re-scored
+        """
+        if refresh_network:
+            self._refresh_network_cache()
+
+        start = time.monotonic()
+        if now is None:
+            now = time.time()
+
+        with self._candidate_lock:
+            hive_members = self._get_hive_members()
+            all_states = self._get_peer_states_by_id()
+            removed = self._sync_candidate_inputs(hive_members, all_states)
+
+            stale_before = now - CANDIDATE_MAX_AGE_SECONDS
+            with self._candidate_dirty_lock:
+                for target, entry in self._candidate_table.items():
+                    if entry.computed_at < stale_before:
+                        self._candidate_dirty.add(target)
+
+                dirty = [t for t in self._candidate_dirty if t in self._candidate_graph_sigs]
+                self._candidate_dirty.clear()
+
+            if dirty:
+                bottlenecks = None
+                if self.liquidity_coordinator:
+                    try:
+                        bottlenecks = set(self.liquidity_coordinator._get_common_bottleneck_peers())
+                    except Exception as e:
+                        self._log(f"Error checking bottleneck status: {e}", level='debug')
+                        bottlenecks = set()
+                corridors = None
+                if self.strategic_positioning_mgr:
+                    try:
+                        corridors = self.strategic_positioning_mgr.get_valuable_corridors(min_score=0.01)
+                    except Exception as e:
+                        self._log(f"Error getting corridor value: {e}", level='debug')
+                        corridors = []
+
+                for target in dirty:
+                    self._candidate_table[target] = self._score_candidate(
+                        target, cfg, hive_members, all_states, bottlenecks, corridors, now
+                    )
+
+            if dirty or removed:
+                ranked = [e for e in self._candidate_table.values() if e.eligible]
+                ranked.sort(key=lambda e: e.score, reverse=True)
+                self._candidate_ranked = ranked
+
+            self._candidate_rescored = len(dirty)
+            self._candidate_refresh_seconds = time.monotonic() - start
+
+        return len(dirty)
+
+    def _get_channel_peers(self) -> Set[str]:
+        """
+        Get peers we already have an active or pending channel with.
+
+        Single listpeerchannels call (instead of one per candidate).
+        If RPC fails, assume no channels (conservative, as before).
+        """
+        peers: Set[str] = set()
+        if not self.plugin:
+            return peers
+
+        try:
+            channels = self.plugin.rpc.listpeerchannels().get('channels', [])
+            for ch in channels:
+                if ch.get('state', '') in ('CHANNELD_AWAITING_LOCKIN', 'CHANNELD_NORMAL',
+                                           'DUALOPEND_AWAITING_LOCKIN', 'DUALOPEND_OPEN_INIT'):
+                    peers.add(ch.get('peer_id'))
+        except Exception:
+            pass
+
+        return peers
+
     # =========================================================================
     # EXPANSION LOGIC (Ticket 6-02)
     # =========================================================================
 
-    def get_underserved_targets(self, cfg, include_low_quality: bool = False) -> List[UnderservedResult]:
+    def get_underserved_targets(self, cfg, include_low_quality: bool = False,
+                                limit: Optional[int] = None,
+                                skip_target: Optional[Callable[[str], bool]] = None
+                                ) -> List[UnderservedResult]:
         """
         Get targets with low Hive coverage that are candidates for expansion.
 
@@ -1572,28 +1869,50 @@ class Planner:
         - Applies competition discount for high-channel-count peers
         - Boosts bottleneck peers identified by liquidity_coordinator
 
+        Scores come from the precomputed candidate table; only stale
+        entries are re-scored here, then the ranking is walked until
+        `limit` results pass the live checks (existing channels,
+        remote pending intents).
+
         Args:
             cfg: Config snapshot
             include_low_quality: If True, include targets with low quality scores
                                  (they will be flagged but not filtered)
+            limit: Maximum number of results (None = all)
+            skip_target: Optional extra check applied during the walk, so
+                         skipped targets do not count towards `limit`
 
         Returns:
             List of UnderservedResult sorted by combined score (highest first)
         """
+        self.refresh_candidates(cfg)
+        with self._candidate_lock:
+            ranked = self._candidate_ranked
+
+        channel_peers = self._get_channel_peers()
         underserved = []
 
-        for target in self._network_cache.keys():
-            # Check minimum capacity (anti-Sybil)
-            public_capacity = self._get_public_capacity_to_target(target)
-            if public_capacity < MIN_TARGET_CAPACITY_SATS:
+        for entry in ranked:
+            target = entry.target
+            if entry.low_quality and not include_low_quality:
+                if entry.quality_recommendation == "avoid":
+                    self._log(
+                        f"Skipping {target[:16]}... - quality='avoid' "
+                        f"(score={entry.quality_score:.2f}, confidence={entry.quality_confidence:.2f})",
+                        level='debug'
+                    )
+                else:
+                    self._log(
+                        f"Skipping {target[:16]}... - low quality score "
+                        f"({entry.quality_score:.2f} < {MIN_QUALITY_SCORE})",
+                        level='debug'
+                    )
                 continue
 
             # Skip if we already have an existing or pending channel to this target
-            has_channel, ch_state, ch_capacity = self._has_existing_or_pending_channel(target)
-            if has_channel:
+            if target in channel_peers:
                 self._log(
-                    f"Skipping {target[:16]}... - already have {ch_state} channel "
-                    f"({ch_capacity:,} sats)",
+                    f"Skipping {target[:16]}... - already have active or pending channel",
                     level='debug'
                 )
                 continue
@@ -1612,130 +1931,13 @@ class Planner:
                     )
                     continue
 
-            # Calculate Hive share
-            result = self._calculate_hive_share(target, cfg)
-
-            # Check if underserved (< 5% Hive share)
-            if result.hive_share_pct >= UNDERSERVED_THRESHOLD_PCT:
+            if skip_target is not None and skip_target(target):
                 continue
 
-            # Phase 7: Check hive coverage diversity
-            members_with, total_members = self._count_hive_members_with_target(target)
-            hive_coverage_pct = members_with / total_members if total_members > 0 else 0
-
-            # Skip if majority already has channels (diminishing returns)
-            if hive_coverage_pct >= HIVE_COVERAGE_MAJORITY_PCT:
-                self._log(
-                    f"Skipping {target[:16]}... - {members_with}/{total_members} "
-                    f"hive members already have channels ({hive_coverage_pct:.0%})",
-                    level='debug'
-                )
-                continue
-
-            # Phase 6.2: Get quality score for the target
-            quality_score = 0.5  # Default neutral
-            quality_confidence = 0.0
-            quality_recommendation = "neutral"
-
-            if self.quality_scorer:
-                quality_result = self.quality_scorer.calculate_score(
-                    target, days=QUALITY_SCORE_DAYS
-                )
-                quality_score = quality_result.overall_score
-                quality_confidence = quality_result.confidence
-                quality_recommendation = quality_result.recommendation
-
-                # Filter out low-quality targets unless explicitly included
-                if not include_low_quality:
-                    # Skip targets with 'avoid' recommendation
-                    if quality_recommendation == "avoid":
-                        self._log(
-                            f"Skipping {target[:16]}... - quality='avoid' "
-                            f"(score={quality_score:.2f}, confidence={quality_confidence:.2f})",
-                            level='debug'
-                        )
-                        continue
-
-                    # Skip targets below minimum score with sufficient confidence
-                    if quality_confidence >= 0.3 and quality_score < MIN_QUALITY_SCORE:
-                        self._log(
-                            f"Skipping {target[:16]}... - low quality score "
-                            f"({quality_score:.2f} < {MIN_QUALITY_SCORE})",
-                            level='debug'
-                        )
-                        continue
-
-            # Calculate base score: higher capacity + lower Hive share = more attractive
-            # Score = capacity_btc * (1 - hive_share)
-            capacity_btc = public_capacity / 100_000_000
-            base_score = capacity_btc * (1 - result.hive_share_pct)
-
-            # Phase 7: Apply competition discount
-            competition_factor, competition_level = self._calculate_competition_score(target)
-            adjusted_score = base_score * competition_factor
-
-            if competition_level in ["high", "very_high"]:
-                self._log(
-                    f"Discounting {target[:16]}... - high competition "
-                    f"({self._get_target_channel_count(target)} channels, -{int((1-competition_factor)*100)}%)",
-                    level='debug'
-                )
-
-            # Phase 7: Apply bottleneck bonus
-            is_bottleneck = self._is_bottleneck_peer(target)
-            if is_bottleneck:
-                adjusted_score *= BOTTLENECK_BONUS_MULTIPLIER
-                self._log(
-                    f"Boosting {target[:16]}... - bottleneck peer (+50%)",
-                    level='debug'
-                )
-
-            # Physarum/Slime mold: Check stigmergic redundancy
-            # Avoid expanding to routes already "owned" by another member
-            is_overserved, owner, owner_strength = self._check_stigmergic_redundancy(target)
-            if is_overserved and owner:
-                adjusted_score *= REDUNDANCY_PENALTY_OVERSERVED
-                self._log(
-                    f"Penalizing {target[:16]}... - already owned by {owner[:16]}... "
-                    f"(strength={owner_strength:.1f}, -{int((1-REDUNDANCY_PENALTY_OVERSERVED)*100)}%)",
-                    level='debug'
-                )
-
-            # Physarum/Slime mold: Boost high-value corridors
-            # Prioritize routes where "nutrients" (fees) flow abundantly
-            corridor_bonus, corridor_tier = self._get_corridor_value_bonus(target)
-            if corridor_bonus > 1.0:
-                adjusted_score *= corridor_bonus
-                self._log(
-                    f"Boosting {target[:16]}... - {corridor_tier} value corridor "
-                    f"(+{int((corridor_bonus-1)*100)}%)",
-                    level='debug'
-                )
+            underserved.append(entry.to_result())
+            if limit is not None and len(underserved) >= limit:
+                break
 
-            # Phase 6.2: Factor in quality score
-            # Combined score = adjusted_score * quality_multiplier
-            # Quality multiplier ranges from 0.5 (avoid) to 1.5 (excellent)
-            if quality_confidence > 0.3:
-                # Quality data is meaningful - apply multiplier
-                quality_multiplier = 0.5 + quality_score  # 0.5 to 1.5
-            else:
-                # Low confidence - use neutral multiplier
-                quality_multiplier = 1.0
-
-            combined_score = adjusted_score * quality_multiplier
-
-            underserved.append(UnderservedResult(
-                target=target,
-                public_capacity_sats=public_capacity,
-                hive_share_pct=result.hive_share_pct,
-                score=combined_score,
-                quality_score=quality_score,
-                quality_confidence=quality_confidence,
-                quality_recommendation=quality_recommendation
-            ))
-
-        # Sort by combined score (highest first)
-        underserved.sort(key=lambda r: r.score, reverse=True)
         return underserved
 
     def _get_local_onchain_balance(self) -> int:
@@ -1787,19 +1989,7 @@ class Planner:
         Returns:
             Number of channels the target has
         """
-        if target not in self._network_cache:
-            return 0
-
-        # Count unique partners (each channel has source/destination)
-        partners = set()
-        for channel in self._network_cache.get(target, []):
-            # Add both ends of each channel
-            if channel.source == target:
-                partners.add(channel.destination)
-            else:
-                partners.add(channel.source)
-
-        return len(partners)
+        return self._network_cache.partner_count(target)
 
     def _get_avg_fee_rate(self) -> int:
         """
@@ -2013,35 +2203,30 @@ class Planner:
             )
             return decisions
 
-        # Get underserved targets
-        underserved = self.get_underserved_targets(cfg)
-        if not underserved:
-            self._log("No underserved targets found", level='debug')
-            return decisions
-
         # Get rejection cooldown from config (default 24 hours)
         rejection_cooldown = getattr(cfg, 'rejection_cooldown_seconds', 86400)
 
-        # Find a target without pending intent, pending action, or recent rejection
-        selected_target = None
+        # Find the best target without pending intent, pending action, or
+        # recent rejection, checked while walking the full ranking
         skipped_reasons = {}
-        for candidate in underserved:
-            should_skip, reason = self._should_skip_target(candidate.target, rejection_cooldown)
-            if not should_skip:
-                selected_target = candidate
-                break
-            else:
-                skipped_reasons[candidate.target[:16]] = reason
 
-        if not selected_target:
+        def skip_target(target: str) -> bool:
+            should_skip, reason = self._should_skip_target(target, rejection_cooldown)
+            if should_skip:
+                skipped_reasons[target[:16]] = reason
+            return should_skip
+
+        underserved = self.get_underserved_targets(cfg, limit=1, skip_target=skip_target)
+        if not underserved:
             if skipped_reasons:
                 self._log(
                     f"All underserved targets skipped: {skipped_reasons}",
                     level='debug'
                 )
             else:
-                self._log("All underserved targets have pending intents", level='debug')
+                self._log("No underserved targets found", level='debug')
             return decisions
+        selected_target = underserved[0]
 
         # Create intent and potentially broadcast
         # Phase 6.2: Include quality information in log
@@ -2317,6 +2502,7 @@ class Planner:
 
         self._log(f"Starting planner cycle (run_id={run_id})")
         decisions = []
+        cycle_start = time.monotonic()
 
         # Reset per-cycle counters
         self._expansions_this_cycle = 0
@@ -2361,6 +2547,11 @@ class Planner:
                 result='error',
                 details={'error': str(e), 'run_id': run_id}
             )
+        finally:
+            elapsed = time.monotonic() - cycle_start
+            self._cycle_count += 1
+            self._last_cycle_seconds = elapsed
+            self._total_cycle_seconds += elapsed
 
         return decisions
 
@@ -2372,10 +2563,23 @@ class Planner:
         """Get current planner statistics."""
         return {
             'network_cache_size': len(self._network_cache),
+            'network_cache_channels': self._network_cache.channel_count,
+            'network_cache_bytes': self._network_cache.memory_bytes(),
+            'network_cache_source': self._network_cache_source,
             'network_cache_age_seconds': int(time.time()) - self._network_cache_time,
             'ignored_peers_count': len(self._ignored_peers),
             'ignored_peers': list(self._ignored_peers)[:10],  # Limit for display
             'max_ignores_per_cycle': MAX_IGNORES_PER_CYCLE,
             'saturation_release_threshold_pct': SATURATION_RELEASE_THRESHOLD_PCT,
             'min_target_capacity_sats': MIN_TARGET_CAPACITY_SATS,
+            'cycle_count': self._cycle_count,
+            'last_cycle_seconds': round(self._last_cycle_seconds, 3),
+            'avg_cycle_seconds': round(
+                self._total_cycle_seconds / self._cycle_count, 3
+            ) if self._cycle_count else 0.0,
+            'candidate_table_size': len(self._candidate_table),
+            'candidate_ranked_count': len(self._candidate_ranked),
+            'candidate_dirty_count': len(self._candidate_dirty),
+            'candidate_last_rescored': self._candidate_rescored,
+            'candidate_last_refresh_seconds': round(self._candidate_refresh_seconds, 3),
         }
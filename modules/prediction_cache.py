@@ -0,0 +1,170 @@
+"""
+Prediction Cache Module for cl-hive
+
+Shared memoization for per-channel predictions (liquidity predictions,
+intra-day forecasts, yield velocity predictions, time-based fee
+adjustments). The proactive advisor and opportunity scanner ask for the same
+channel/horizon many times within one cycle; each result is computed once
+and reused until something it depends on changes.
+
+Entries are keyed by (function, channel_id, horizon) and are dropped when:
+- invalidate(channel_id) is called (new flow sample, Kalman report or
+  balance update for that channel)
+- they are older than the TTL (predictions also depend on wall-clock time)
+
+Thread-safe: RPC handlers and background loops share one instance.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+# Maximum age of a cached prediction (seconds)
+PREDICTION_CACHE_TTL_SECONDS = 300
+
+# Expired entries are swept when the cache grows past this size
+PREDICTION_CACHE_MAX_ENTRIES = 20000
+
+
+CacheKey = Tuple[str, str, Hashable]
+
+
+class PredictionCache:
+    """
+    Memoizes prediction results per (function, channel, horizon).
+
+    Usage:
+        cache = PredictionCache()
+        pred = cache.get_or_compute(
+            "predict_liquidity", channel_id, hours,
+            lambda: compute_prediction(channel_id, hours)
+        )
+        cache.invalidate(channel_id)   # on new data for the channel
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = PREDICTION_CACHE_TTL_SECONDS,
+        max_entries: int = PREDICTION_CACHE_MAX_ENTRIES
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._entries: Dict[CacheKey, Tuple[Any, float]] = {}
+        self._by_channel: Dict[str, Set[CacheKey]] = defaultdict(set)
+        # Bumped on every invalidation so a result computed from data that
+        # changed mid-computation is not stored
+        self._generation: Dict[str, int] = defaultdict(int)
+
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get_or_compute(
+        self,
+        function: str,
+        channel_id: str,
+        horizon: Hashable,
+        compute: Callable[[], Any],
+        ttl_seconds: Optional[float] = None
+    ) -> Any:
+        """
+        Return the cached result for the key, computing and storing it on a miss.
+
+        None results are cached too ("insufficient data" is also a result).
+        Exceptions from compute propagate and nothing is stored.
+
+        Args:
+            function: Name of the memoized function
+            channel_id: Channel SCID the result depends on
+            horizon: Remaining key (hours ahead, or a tuple of arguments)
+            compute: Zero-argument callable producing the result
+            ttl_seconds: Override the default TTL for this lookup
+
+        Returns:
+            Cached or freshly computed result
+        """
+        key = (function, channel_id, horizon)
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] < ttl:
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+            generation = self._generation[channel_id]
+
+        # Compute outside the lock; a concurrent miss may compute twice,
+        # which is harmless for these pure-ish functions.
+        value = compute()
+
+        with self._lock:
+            if self._generation[channel_id] != generation:
+                return value
+            if len(self._entries) >= self.max_entries:
+                self._sweep_expired(now)
+            self._entries[key] = (value, now)
+            self._by_channel[channel_id].add(key)
+        return value
+
+    def invalidate(self, channel_id: str) -> int:
+        """
+        Drop every cached result that depends on a channel.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            self._generation[channel_id] += 1
+            keys = self._by_channel.pop(channel_id, None)
+            if not keys:
+                return 0
+            for key in keys:
+                self._entries.pop(key, None)
+            self._invalidations += 1
+            return len(keys)
+
+    def invalidate_all(self) -> int:
+        """Drop all cached results."""
+        with self._lock:
+            count = len(self._entries)
+            for channel_id in self._generation:
+                self._generation[channel_id] += 1
+            self._entries.clear()
+            self._by_channel.clear()
+            self._invalidations += 1
+            return count
+
+    def _sweep_expired(self, now: float) -> None:
+        """Remove expired entries (lock must be held)."""
+        for key, (_, stored_at) in list(self._entries.items()):
+            if now - stored_at >= self.ttl_seconds:
+                del self._entries[key]
+                keys = self._by_channel.get(key[1])
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._by_channel[key[1]]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for diagnostics."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "channels": len(self._by_channel),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "invalidations": self._invalidations,
+                "ttl_seconds": self.ttl_seconds,
+            }
@@ -130,7 +130,22 @@ class PeerQualityScorer:
         """
         # Get aggregated event summary
         summary = self.database.get_peer_event_summary(peer_id, days=days)
+        return self._score_summary(peer_id, summary, days)
 
+    def _score_summary(
+        self, peer_id: str, summary: Dict[str, Any], days: int
+    ) -> PeerQualityResult:
+        """
+        Score a peer from its aggregated event summary.
+
+        Args:
+            peer_id: The external peer's pubkey
+            summary: Output of HiveDatabase.get_peer_event_summary
+            days: Number of days of history the summary covers
+
+        Returns:
+            PeerQualityResult with scores and recommendation
+        """
         factors = {
             "days_analyzed": days,
             "event_count": summary["event_count"],
@@ -512,6 +527,9 @@ class PeerQualityScorer:
         """
         Calculate quality scores for multiple peers.
 
+        Event summaries for all peers are fetched with a single aggregate
+        query rather than one query per peer.
+
         Args:
             peer_ids: List of peer pubkeys to score
             days: Number of days of history to consider
@@ -519,10 +537,11 @@ class PeerQualityScorer:
         Returns:
             List of PeerQualityResult, sorted by overall_score descending
         """
+        summaries = self.database.get_peer_event_summaries(peer_ids, days=days)
         results = []
-        for peer_id in peer_ids:
-            result = self.calculate_score(peer_id, days=days)
-            results.append(result)
+        for peer_id in dict.fromkeys(peer_ids):
+            summary = summaries.get(peer_id) or {"peer_id": peer_id, "event_count": 0}
+            results.append(self._score_summary(peer_id, summary, days))
 
         # Sort by overall score descending
         results.sort(key=lambda r: r.overall_score, reverse=True)
@@ -541,8 +560,12 @@ class PeerQualityScorer:
         Returns:
             List of PeerQualityResult for all peers with data
         """
-        peer_ids = self.database.get_peers_with_events(days=days)
-        results = self.calculate_scores_batch(peer_ids, days=days)
+        summaries = self.database.get_peer_event_summaries(None, days=days)
+        results = [
+            self._score_summary(peer_id, summary, days)
+            for peer_id, summary in summaries.items()
+        ]
+        results.sort(key=lambda r: r.overall_score, reverse=True)
 
         # Filter by confidence if requested
         if min_confidence > 0:
@@ -0,0 +1,204 @@
+"""
+Rate Limiter Module for cl-hive
+
+Shared per-sender rate limiting for incoming gossip messages, replacing the
+per-manager lists of message timestamps.
+
+Uses GCRA (generic cell rate algorithm, the virtual-scheduling form of a
+token bucket): each key stores a single float, its theoretical arrival time
+(TAT). A limit of `max_count` messages per `period_seconds` allows a burst of
+`max_count` and then one message every `period_seconds / max_count`. State and
+work per message are O(1) regardless of how fast a sender floods.
+
+Keys are any hashable: one limiter per message type keyed by sender, or one
+limiter keyed by (sender, message_type).
+
+Thread-safe: keys are spread over several lock stripes so concurrent message
+handlers for different senders rarely contend.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Optional
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+# Number of lock stripes
+RATE_LIMITER_STRIPES = 16
+
+# Idle keys are pruned from a stripe once it holds this many entries
+RATE_LIMITER_PRUNE_THRESHOLD = 1024
+
+
+class _Stripe:
+    __slots__ = ("lock", "tat", "prune_at", "rejected")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tat: Dict[Hashable, float] = {}
+        self.prune_at = RATE_LIMITER_PRUNE_THRESHOLD
+        self.rejected = 0
+
+
+class RateLimiter:
+    """
+    GCRA rate limiter with O(1) state per key.
+
+    Usage:
+        limiter = RateLimiter(max_count=10, period_seconds=60)
+        if not limiter.is_allowed(peer_id):       # check and consume
+            return
+        # or, to only count messages that pass validation:
+        if not limiter.check(peer_id):
+            return
+        ...
+        limiter.record(peer_id)
+    """
+
+    def __init__(
+        self,
+        max_count: int,
+        period_seconds: float,
+        stripes: int = RATE_LIMITER_STRIPES
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            max_count: Maximum messages allowed per period (burst size)
+            period_seconds: Period over which max_count messages are allowed
+            stripes: Number of lock stripes
+        """
+        if max_count < 1:
+            raise ValueError("max_count must be at least 1")
+        if period_seconds <= 0:
+            raise ValueError("period_seconds must be positive")
+
+        self.max_count = max_count
+        self.period_seconds = period_seconds
+        # Emission interval: time one message "costs"
+        self._interval = period_seconds / max_count
+        # A message is allowed while the TAT is at most this far ahead of now
+        self._tolerance = period_seconds - self._interval
+        self._stripes: List[_Stripe] = [_Stripe() for _ in range(max(1, stripes))]
+
+    def _stripe(self, key: Hashable) -> _Stripe:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def check(self, key: Hashable, now: Optional[float] = None) -> bool:
+        """
+        Check whether a message for key would be allowed, without consuming.
+
+        Returns:
+            True if allowed, False if rate limited
+        """
+        if now is None:
+            now = time.time()
+        stripe = self._stripe(key)
+        with stripe.lock:
+            tat = stripe.tat.get(key)
+            if tat is None or tat - now <= self._tolerance:
+                return True
+            stripe.rejected += 1
+            return False
+
+    def record(self, key: Hashable, now: Optional[float] = None) -> None:
+        """Count a message for key, whether or not it was within the limit."""
+        if now is None:
+            now = time.time()
+        stripe = self._stripe(key)
+        with stripe.lock:
+            tat = stripe.tat.get(key, now)
+            stripe.tat[key] = max(tat, now) + self._interval
+            if len(stripe.tat) >= stripe.prune_at:
+                self._prune(stripe, now)
+
+    def is_allowed(self, key: Hashable, now: Optional[float] = None) -> bool:
+        """
+        Check and consume atomically.
+
+        Rejected messages are not counted, so a flooding sender regains
+        capacity at the configured rate.
+
+        Returns:
+            True if allowed (and counted), False if rate limited
+        """
+        if now is None:
+            now = time.time()
+        stripe = self._stripe(key)
+        with stripe.lock:
+            tat = max(stripe.tat.get(key, now), now)
+            if tat - now > self._tolerance:
+                stripe.rejected += 1
+                return False
+            stripe.tat[key] = tat + self._interval
+            if len(stripe.tat) >= stripe.prune_at:
+                self._prune(stripe, now)
+            return True
+
+    def _prune(self, stripe: _Stripe, now: float) -> int:
+        """Drop idle keys (TAT in the past) from a stripe (lock must be held)."""
+        idle = [k for k, tat in stripe.tat.items() if tat <= now]
+        for key in idle:
+            del stripe.tat[key]
+        # Amortize: don't rescan until the stripe has grown again
+        stripe.prune_at = max(RATE_LIMITER_PRUNE_THRESHOLD, 2 * len(stripe.tat))
+        return len(idle)
+
+    def reset(self, key: Hashable) -> None:
+        """Forget all history for a key."""
+        stripe = self._stripe(key)
+        with stripe.lock:
+            stripe.tat.pop(key, None)
+
+    def cleanup(self) -> int:
+        """Remove idle keys. Returns number of keys removed."""
+        now = time.time()
+        removed = 0
+        for stripe in self._stripes:
+            with stripe.lock:
+                removed += self._prune(stripe, now)
+        return removed
+
+    def _used(self, tat: float, now: float) -> int:
+        """Messages currently counted against a key."""
+        backlog = tat - now
+        if backlog <= 0:
+            return 0
+        return min(self.max_count, int(-(-backlog // self._interval)))
+
+    def get_stats(self, key: Hashable = None) -> Dict[str, Any]:
+        """Get rate limiter statistics (for one key, or overall)."""
+        now = time.time()
+        if key is not None:
+            stripe = self._stripe(key)
+            with stripe.lock:
+                tat = stripe.tat.get(key, now)
+            return {
+                "key": key,
+                "messages_in_window": self._used(tat, now),
+                "max_per_window": self.max_count,
+                "window_seconds": self.period_seconds,
+                "allowed": tat - now <= self._tolerance,
+            }
+
+        tracked = 0
+        limited = 0
+        rejected = 0
+        for stripe in self._stripes:
+            with stripe.lock:
+                tracked += len(stripe.tat)
+                rejected += stripe.rejected
+                limited += sum(
+                    1 for tat in stripe.tat.values() if tat - now > self._tolerance
+                )
+        return {
+            "tracked_keys": tracked,
+            "limited_keys": limited,
+            "rejected": rejected,
+            "max_per_window": self.max_count,
+            "window_seconds": self.period_seconds,
+        }
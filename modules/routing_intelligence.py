@@ -13,7 +13,6 @@ Security: All route probes require cryptographic signatures.
 import time
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
-from collections import defaultdict
 
 from .protocol import (
     HiveMessageType,
@@ -29,6 +28,7 @@ from .protocol import (
     MAX_PATH_LENGTH,
     MAX_PROBES_IN_BATCH,
 )
+from .rate_limiter import RateLimiter
 from . import network_metrics
 
 
@@ -107,34 +107,8 @@ class HiveRoutingMap:
         self._path_stats: Dict[Tuple[str, Tuple[str, ...]], PathStats] = {}
 
         # Rate limiting
-        self._probe_rate: Dict[str, List[float]] = defaultdict(list)
-        self._batch_rate: Dict[str, List[float]] = defaultdict(list)
-
-    def _check_rate_limit(
-        self,
-        sender: str,
-        rate_tracker: Dict[str, List[float]],
-        limit: Tuple[int, int]
-    ) -> bool:
-        """Check if sender is within rate limit."""
-        max_count, period = limit
-        now = time.time()
-
-        # Clean old entries
-        rate_tracker[sender] = [
-            ts for ts in rate_tracker[sender]
-            if now - ts < period
-        ]
-
-        return len(rate_tracker[sender]) < max_count
-
-    def _record_message(
-        self,
-        sender: str,
-        rate_tracker: Dict[str, List[float]]
-    ):
-        """Record a message for rate limiting."""
-        rate_tracker[sender].append(time.time())
+        self._probe_rate = RateLimiter(*ROUTE_PROBE_RATE_LIMIT)
+        self._batch_rate = RateLimiter(*ROUTE_PROBE_BATCH_RATE_LIMIT)
 
     def create_route_probe_message(
         self,
@@ -225,11 +199,7 @@ class HiveRoutingMap:
             return {"error": "reporter not a member"}
 
         # Rate limit check
-        if not self._check_rate_limit(
-            reporter_id,
-            self._probe_rate,
-            ROUTE_PROBE_RATE_LIMIT
-        ):
+        if not self._probe_rate.check(reporter_id):
             return {"error": "rate limited"}
 
         # Verify signature
@@ -250,7 +220,7 @@ class HiveRoutingMap:
             return {"error": f"signature check failed: {e}"}
 
         # Record rate limit
-        self._record_message(reporter_id, self._probe_rate)
+        self._probe_rate.record(reporter_id)
 
         # Extract probe data
         destination = payload.get("destination", "")
@@ -335,11 +305,7 @@ class HiveRoutingMap:
             return {"error": "reporter not a member"}
 
         # Rate limit check for batch messages
-        if not self._check_rate_limit(
-            reporter_id,
-            self._batch_rate,
-            ROUTE_PROBE_BATCH_RATE_LIMIT
-        ):
+        if not self._batch_rate.check(reporter_id):
             return {"error": "rate limited"}
 
         # Verify signature
@@ -360,7 +326,7 @@ class HiveRoutingMap:
             return {"error": f"signature check failed: {e}"}
 
         # Record rate limit
-        self._record_message(reporter_id, self._batch_rate)
+        self._batch_rate.record(reporter_id)
 
         # Process each probe in the batch
         probes = payload.get("probes", [])
@@ -11,6 +11,7 @@ Design Pattern:
     - Permission checks are done via check_permission() helper
 """
 
+import os
 import time
 from dataclasses import dataclass, field
 from typing import Any, Callable, Dict, List, Optional
@@ -44,6 +45,9 @@ class HiveContext:
     rationalization_mgr: Any = None  # RationalizationManager (Channel Rationalization)
     strategic_positioning_mgr: Any = None  # StrategicPositioningManager (Phase 5 - Strategic Positioning)
     anticipatory_manager: Any = None  # AnticipatoryLiquidityManager (Phase 7.1 - Anticipatory Liquidity)
+    forward_pipeline: Any = None  # ForwardEventPipeline (batched forward_event processing)
+    perf_metrics: Any = None  # PerfMetrics (hot-path latency histograms)
+    perf_profiler: Any = None  # SamplingProfiler (on-demand stack sampling)
     our_id: str = ""  # Our node pubkey (alias for our_pubkey for consistency)
     log: Callable[[str, str], None] = None  # Logger function: (msg, level) -> None
 
@@ -228,7 +232,7 @@ def status(ctx: HiveContext) -> Dict[str, Any]:
                 "pubkey": ctx.our_pubkey,
             }
 
-    return {
+    result = {
         "status": "active" if members else "no_members",
         "governance_mode": ctx.config.governance_mode if ctx.config else "unknown",
         "membership": our_membership,  # Our own membership for cl-revenue-ops detection
@@ -243,6 +247,9 @@ def status(ctx: HiveContext) -> Dict[str, Any]:
         },
         "version": "0.1.0-dev",
     }
+    if ctx.forward_pipeline:
+        result["forward_pipeline"] = ctx.forward_pipeline.get_stats()
+    return result
 
 
 def get_config(ctx: HiveContext) -> Dict[str, Any]:
@@ -301,6 +308,75 @@ def get_config(ctx: HiveContext) -> Dict[str, Any]:
     }
 
 
+def perf(ctx: HiveContext, category: str = None, limit: int = None,
+         reset: bool = False) -> Dict[str, Any]:
+    """
+    Get hot-path latency histograms (p50/p95/p99 per loop, RPC,
+    custommsg handler, database method and RPC lock wait).
+
+    Args:
+        category: Only this category (loop, rpc, custommsg, db, lock)
+        limit: Top N entries per category by total time
+        reset: Clear the histograms after reading them
+
+    Returns:
+        Dict with per-category timing summaries and profiler status.
+    """
+    if not ctx.perf_metrics:
+        return {"error": "Performance metrics not initialized"}
+
+    result = ctx.perf_metrics.get_stats(category=category, limit=limit)
+    if ctx.perf_profiler:
+        result["profiler"] = ctx.perf_profiler.status()
+    if reset:
+        ctx.perf_metrics.reset(category)
+        result["reset"] = True
+    return result
+
+
+# Profiles may only overwrite earlier profiles in the hive database directory
+PROFILE_FILE_PREFIX = "cl-hive-profile-"
+
+
+def perf_profile(ctx: HiveContext, duration: int = 30, interval_ms: float = 10,
+                 filename: str = None) -> Dict[str, Any]:
+    """
+    Start a stack-sampling profile of all plugin threads.
+
+    The profile is written in collapsed-stack format (flamegraph.pl,
+    speedscope) when the run ends; poll hive-perf for its status.
+
+    Args:
+        duration: Seconds to sample (max 600)
+        interval_ms: Milliseconds between samples
+        filename: Output file name, created in the hive database directory
+                  (default: cl-hive-profile-<timestamp>.txt). Existing files
+                  other than earlier profiles are not overwritten.
+
+    Returns:
+        Dict with profiler status including the output path.
+    """
+    if not ctx.perf_profiler:
+        return {"error": "Profiler not initialized"}
+
+    db_path = ctx.database.db_path if ctx.database else None
+    if not filename:
+        filename = f"{PROFILE_FILE_PREFIX}{int(time.time())}.txt"
+    if (os.path.basename(filename) != filename or filename.startswith(".")
+            or (os.altsep and os.altsep in filename)):
+        return {"error": "filename must be a plain file name without directories"}
+    if db_path and filename.startswith(os.path.basename(db_path)):
+        return {"error": f"Refusing to write over database file {filename}"}
+
+    path = os.path.join(os.path.dirname(db_path) if db_path else ".", filename)
+    if os.path.lexists(path) and not (
+            filename.startswith(PROFILE_FILE_PREFIX) and os.path.isfile(path)
+            and not os.path.islink(path)):
+        return {"error": f"Refusing to overwrite {filename}: not a profile file"}
+    return ctx.perf_profiler.start(path, duration=duration,
+                                   interval=interval_ms / 1000.0)
+
+
 def members(ctx: HiveContext) -> Dict[str, Any]:
     """
     List all Hive members with their tier and stats.
@@ -0,0 +1,439 @@
+"""
+Unix-Socket JSON-RPC Module for cl-hive
+
+Talks to lightningd directly over its JSON-RPC unix socket, bypassing the
+shared (locked) RPC proxy.
+
+Streaming: for responses that are too large to materialize in one piece
+(e.g. `listchannels` on mainnet, ~50k entries / tens of MB of JSON).
+
+Instead of reading the whole reply and calling json.loads() on it, the
+response is decoded incrementally: bytes are read from the socket in fixed
+size chunks and each element of the result array is yielded as soon as it
+is complete. Peak memory stays at roughly one chunk plus one element.
+
+Persistent client (UnixRpcClient): small calls that must not queue behind
+RPC_LOCK or hang the caller (the Bridge's cl-revenue-ops calls). Keeps one
+connection open instead of forking lightning-cli per call, and can
+pipeline a batch of requests on it.
+
+Isolation:
+- Uses its own socket connection, so it never holds RPC_LOCK
+- Hard per-read timeout plus an overall deadline
+
+Author: Lightning Goats Team
+"""
+
+import codecs
+import itertools
+import json
+import re
+import socket
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from pyln.client import RpcError
+except ImportError:
+    # For testing without pyln installed
+    class RpcError(Exception):
+        """Stub RpcError for testing."""
+        def __init__(self, method, payload, error):
+            super().__init__(f"RPC call failed: method: {method}, payload: {payload}, error: {error}")
+            self.method = method
+            self.payload = payload
+            self.error = error
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+# Socket read size (bytes)
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# Per-read socket timeout (seconds)
+STREAM_READ_TIMEOUT_SECONDS = 10
+
+# Overall deadline for a streamed call (seconds)
+STREAM_TOTAL_TIMEOUT_SECONDS = 120
+
+# Default hard deadline for a UnixRpcClient call or batch (seconds)
+RPC_CLIENT_TIMEOUT_SECONDS = 5
+
+# lightningd terminates every JSON-RPC response with a blank line
+RESPONSE_TERMINATOR = b'\n\n'
+
+# Maximum bytes buffered before the result array starts (error replies,
+# envelope). Anything larger is a malformed response.
+MAX_PREFIX_BYTES = 64 * 1024
+
+_WHITESPACE_AND_COMMA = ' \t\r\n,'
+
+_request_ids = itertools.count(1)
+
+
+class RpcStreamError(Exception):
+    """Raised when a streamed RPC response is truncated or malformed."""
+    pass
+
+
+# =============================================================================
+# INCREMENTAL PARSER
+# =============================================================================
+
+def iter_result_array(chunks: Iterable[bytes], key: str,
+                      method: str = "", params: Optional[Dict[str, Any]] = None
+                      ) -> Iterator[Dict[str, Any]]:
+    """
+    Incrementally decode `result[key]` (an array of objects) from a JSON-RPC reply.
+
+    Args:
+        chunks: Iterable of raw response bytes, in order
+        key: Name of the array inside the result object (e.g. "channels")
+        method: Method name (for error reporting)
+        params: Request params (for error reporting)
+
+    Yields:
+        Each array element as a dict, as soon as it has been fully received
+
+    Raises:
+        RpcError: If lightningd returned a JSON-RPC error
+        RpcStreamError: If the response is truncated or malformed
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    marker = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+
+    buf = ''
+    in_array = False
+
+    for chunk in chunks:
+        buf += utf8.decode(chunk)
+
+        if not in_array:
+            match = marker.search(buf)
+            if not match:
+                if '"error"' in buf:
+                    try:
+                        reply = json.loads(buf)
+                    except ValueError:
+                        reply = None
+                    if isinstance(reply, dict) and 'error' in reply:
+                        raise RpcError(method, params or {}, reply['error'])
+                if len(buf) > MAX_PREFIX_BYTES:
+                    raise RpcStreamError(f"{method}: '{key}' array not found in response")
+                continue
+            buf = buf[match.end():]
+            in_array = True
+
+        pos = 0
+        end_of_buf = len(buf)
+        while True:
+            while pos < end_of_buf and buf[pos] in _WHITESPACE_AND_COMMA:
+                pos += 1
+            if pos >= end_of_buf:
+                break
+            if buf[pos] == ']':
+                return
+            try:
+                item, pos_after = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Element not fully received yet - wait for more data
+                break
+            pos = pos_after
+            yield item
+        buf = buf[pos:]
+
+    raise RpcStreamError(f"{method}: response truncated")
+
+
+# =============================================================================
+# SOCKET CLIENT
+# =============================================================================
+
+def stream_rpc_array(socket_path: str, method: str, key: str,
+                     params: Optional[Dict[str, Any]] = None,
+                     read_timeout: float = STREAM_READ_TIMEOUT_SECONDS,
+                     total_timeout: float = STREAM_TOTAL_TIMEOUT_SECONDS,
+                     chunk_bytes: int = STREAM_CHUNK_BYTES
+                     ) -> Iterator[Dict[str, Any]]:
+    """
+    Call a lightningd RPC method and stream the elements of `result[key]`.
+
+    Opens a dedicated connection to the RPC socket; the connection is closed
+    when the generator is exhausted or garbage collected.
+
+    Args:
+        socket_path: Path to lightningd's lightning-rpc socket
+        method: RPC method name (e.g. "listchannels")
+        key: Result array to stream (e.g. "channels")
+        params: Optional named parameters
+        read_timeout: Timeout for each socket read (seconds)
+        total_timeout: Overall deadline for the whole call (seconds)
+        chunk_bytes: Socket read size
+
+    Yields:
+        Array elements as dicts
+
+    Raises:
+        OSError: On connection failure or read timeout
+        RpcError / RpcStreamError: See iter_result_array
+    """
+    request = {
+        "jsonrpc": "2.0",
+        "id": f"cl-hive:{method}#{next(_request_ids)}",
+        "method": method,
+        "params": params or {},
+    }
+    deadline = time.monotonic() + total_timeout
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(read_timeout)
+    try:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode('utf-8'))
+
+        def _chunks() -> Iterator[bytes]:
+            while True:
+                if time.monotonic() > deadline:
+                    raise socket.timeout(f"{method} exceeded {total_timeout}s deadline")
+                data = sock.recv(chunk_bytes)
+                if not data:
+                    return
+                yield data
+
+        yield from iter_result_array(_chunks(), key, method, params)
+    finally:
+        sock.close()
+
+
+# =============================================================================
+# PERSISTENT CLIENT
+# =============================================================================
+
+class UnixRpcClient:
+    """
+    Persistent JSON-RPC client on a dedicated lightningd socket connection.
+
+    The connection is opened lazily and reused across calls. Calls are
+    serialized by an internal lock; every call has a hard deadline that
+    covers waiting for the lock, sending and reading the reply. A call that
+    times out or hits a socket error drops the connection, so a late reply
+    can never be read as the answer to the next request.
+
+    Usage:
+        client = UnixRpcClient(socket_path)
+        client.call("revenue-policy", {"action": "get", "peer_id": peer_id})
+        client.call_batch([("revenue-status", None), ("getinfo", None)])
+    """
+
+    def __init__(self, socket_path: str,
+                 timeout: float = RPC_CLIENT_TIMEOUT_SECONDS,
+                 chunk_bytes: int = STREAM_CHUNK_BYTES):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.chunk_bytes = chunk_bytes
+
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._buf = b''
+
+        self._stats = {
+            "calls": 0,
+            "batches": 0,
+            "errors": 0,
+            "timeouts": 0,
+            "connects": 0,
+        }
+
+    def call(self, method: str, params: Optional[Dict[str, Any]] = None,
+             timeout: Optional[float] = None) -> Any:
+        """
+        Call one RPC method.
+
+        Returns:
+            The "result" member of the reply
+
+        Raises:
+            RpcError: If lightningd returned a JSON-RPC error
+            TimeoutError: If no reply arrived before the deadline
+            OSError: On connection failure
+        """
+        result = self._exchange([(method, params)], timeout)[0]
+        if isinstance(result, RpcError):
+            raise result
+        return result
+
+    def call_batch(self, calls: List[Tuple[str, Optional[Dict[str, Any]]]],
+                   timeout: Optional[float] = None) -> List[Any]:
+        """
+        Pipeline several calls on the connection and wait for all replies.
+
+        The deadline applies to the whole batch. lightningd may answer out
+        of order; replies are matched to requests by id.
+
+        Args:
+            calls: (method, params) pairs
+
+        Returns:
+            One entry per call, in order: the result, or an RpcError
+            instance if that call failed
+
+        Raises:
+            TimeoutError / OSError: The batch as a whole failed
+        """
+        if not calls:
+            return []
+        self._stats["batches"] += 1
+        return self._exchange(calls, timeout)
+
+    def close(self) -> None:
+        """Close the connection (reopened on the next call)."""
+        with self._lock:
+            self._disconnect()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "socket_path": self.socket_path,
+            "connected": self._sock is not None,
+            **self._stats,
+        }
+
+    def _exchange(self, calls: List[Tuple[str, Optional[Dict[str, Any]]]],
+                  timeout: Optional[float]) -> List[Any]:
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        label = calls[0][0] if len(calls) == 1 else f"batch of {len(calls)}"
+
+        if not self._lock.acquire(timeout=timeout):
+            self._stats["timeouts"] += 1
+            raise TimeoutError(f"{label}: RPC client busy for {timeout}s")
+        try:
+            self._stats["calls"] += len(calls)
+            ids = []
+            payload = b''
+            for method, params in calls:
+                request_id = f"cl-hive:{method}#{next(_request_ids)}"
+                ids.append(request_id)
+                payload += json.dumps({
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "method": method,
+                    "params": params or {},
+                }).encode('utf-8')
+
+            try:
+                self._send(payload, deadline)
+                replies = self._read_replies(set(ids), deadline, label)
+            except socket.timeout:
+                self._stats["timeouts"] += 1
+                self._disconnect()
+                raise TimeoutError(f"{label} timed out after {timeout}s")
+            except (OSError, ValueError):
+                self._stats["errors"] += 1
+                self._disconnect()
+                raise
+
+            results = []
+            for (method, params), request_id in zip(calls, ids):
+                reply = replies[request_id]
+                if 'error' in reply:
+                    self._stats["errors"] += 1
+                    results.append(RpcError(method, params or {}, reply['error']))
+                else:
+                    results.append(reply.get('result'))
+            return results
+        finally:
+            self._lock.release()
+
+    def _send(self, payload: bytes, deadline: float) -> None:
+        reused = self._sock is not None
+        try:
+            self._connected(deadline).sendall(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # lightningd closed an idle connection (e.g. restart): nothing
+            # was delivered, so reconnect once and resend
+            self._disconnect()
+            if not reused:
+                raise
+            self._connected(deadline).sendall(payload)
+
+    def _connected(self, deadline: float) -> socket.socket:
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.settimeout(max(deadline - time.monotonic(), 0.001))
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._sock = sock
+            self._buf = b''
+            self._stats["connects"] += 1
+        self._sock.settimeout(max(deadline - time.monotonic(), 0.001))
+        return self._sock
+
+    def _read_replies(self, pending: set, deadline: float,
+                      label: str) -> Dict[str, Dict[str, Any]]:
+        replies: Dict[str, Dict[str, Any]] = {}
+        while pending:
+            end = self._buf.find(RESPONSE_TERMINATOR)
+            if end < 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise socket.timeout(label)
+                self._sock.settimeout(remaining)
+                data = self._sock.recv(self.chunk_bytes)
+                if not data:
+                    raise ConnectionResetError(f"{label}: connection closed by lightningd")
+                self._buf += data
+                continue
+
+            frame, self._buf = self._buf[:end], self._buf[end + len(RESPONSE_TERMINATOR):]
+            if not frame.strip():
+                continue
+            reply = json.loads(frame)
+            request_id = reply.get('id') if isinstance(reply, dict) else None
+            # Replies to other ids (e.g. notifications) are ignored
+            if request_id in pending:
+                pending.discard(request_id)
+                replies[request_id] = reply
+        return replies
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._buf = b''
+
+
+def resolve_socket_path(rpc: Any) -> Optional[str]:
+    """
+    Resolve the lightningd RPC socket path from an RPC object or proxy.
+
+    Accepts a ThreadSafeRpcProxy (get_socket_path()), a raw LightningRpc
+    (socket_path) or a proxy wrapping one (_rpc.socket_path).
+
+    Returns:
+        Socket path, or None if it cannot be determined
+    """
+    if rpc is None:
+        return None
+    if hasattr(rpc, "get_socket_path"):
+        path = rpc.get_socket_path()
+        if isinstance(path, str) and path:
+            return path
+    if hasattr(rpc, "socket_path"):
+        path = rpc.socket_path
+        if isinstance(path, str) and path:
+            return path
+    if hasattr(rpc, "_rpc") and hasattr(rpc._rpc, "socket_path"):
+        path = rpc._rpc.socket_path
+        if isinstance(path, str) and path:
+            return path
+    return None
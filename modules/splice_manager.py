@@ -51,6 +51,7 @@ from .protocol import (
     create_splice_signed,
     create_splice_abort,
 )
+from .rate_limiter import RateLimiter
 
 
 class SpliceManager:
@@ -86,40 +87,14 @@ class SpliceManager:
         self.our_pubkey = our_pubkey
 
         # Rate limiting trackers
-        self._init_rate: Dict[str, List[int]] = {}
-        self._message_rate: Dict[str, List[int]] = {}
+        self._init_rate = RateLimiter(*SPLICE_INIT_REQUEST_RATE_LIMIT)
+        self._message_rate = RateLimiter(*SPLICE_MESSAGE_RATE_LIMIT)
 
     def _log(self, msg: str, level: str = 'info'):
         """Log a message."""
         if self.plugin:
             self.plugin.log(f"cl-hive: SpliceManager: {msg}", level=level)
 
-    def _check_rate_limit(
-        self,
-        sender_id: str,
-        tracker: Dict[str, List[int]],
-        limit: tuple
-    ) -> bool:
-        """Check if sender is within rate limit."""
-        max_count, window_seconds = limit
-        now = int(time.time())
-        cutoff = now - window_seconds
-
-        if sender_id not in tracker:
-            tracker[sender_id] = []
-
-        # Remove old entries
-        tracker[sender_id] = [t for t in tracker[sender_id] if t > cutoff]
-
-        return len(tracker[sender_id]) < max_count
-
-    def _record_message(self, sender_id: str, tracker: Dict[str, List[int]]):
-        """Record a message for rate limiting."""
-        now = int(time.time())
-        if sender_id not in tracker:
-            tracker[sender_id] = []
-        tracker[sender_id].append(now)
-
     def _generate_session_id(self) -> str:
         """Generate a unique session ID."""
         return f"splice_{self.our_pubkey[:8]}_{int(time.time())}_{secrets.token_hex(4)}"
@@ -375,7 +350,7 @@ class SpliceManager:
         self._log(f"Received SPLICE_INIT_REQUEST from {sender_id[:16]}...")
 
         # Rate limit check
-        if not self._check_rate_limit(sender_id, self._init_rate, SPLICE_INIT_REQUEST_RATE_LIMIT):
+        if not self._init_rate.check(sender_id):
             self._log(f"Rate limited splice init from {sender_id[:16]}...")
             return {"error": "rate_limited"}
 
@@ -403,7 +378,7 @@ class SpliceManager:
             return {"error": "invalid_signature"}
 
         # Record for rate limiting
-        self._record_message(sender_id, self._init_rate)
+        self._init_rate.record(sender_id)
 
         session_id = payload.get("session_id")
         channel_id = payload.get("channel_id")
@@ -10,7 +10,7 @@ Author: Lightning Goats Team
 
 import json
 import time
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Optional
 
 from .protocol import (
     HiveMessageType,
@@ -35,6 +35,7 @@ from .protocol import (
     TASK_DEFAULT_DEADLINE_HOURS,
     MAX_PENDING_TASKS,
 )
+from .rate_limiter import RateLimiter
 
 
 class TaskManager:
@@ -67,8 +68,8 @@ class TaskManager:
         self.our_pubkey = our_pubkey
 
         # Rate limiting trackers
-        self._request_rate: Dict[str, List[int]] = {}
-        self._response_rate: Dict[str, List[int]] = {}
+        self._request_rate = RateLimiter(*TASK_REQUEST_RATE_LIMIT)
+        self._response_rate = RateLimiter(*TASK_RESPONSE_RATE_LIMIT)
 
         # Callback for executing tasks
         self._task_executor: Optional[Callable] = None
@@ -92,32 +93,6 @@ class TaskManager:
         if self.plugin:
             self.plugin.log(f"cl-hive: TaskManager: {msg}", level=level)
 
-    def _check_rate_limit(
-        self,
-        sender_id: str,
-        tracker: Dict[str, List[int]],
-        limit: tuple
-    ) -> bool:
-        """Check if sender is within rate limit."""
-        max_count, window_seconds = limit
-        now = int(time.time())
-        cutoff = now - window_seconds
-
-        if sender_id not in tracker:
-            tracker[sender_id] = []
-
-        # Remove old entries
-        tracker[sender_id] = [t for t in tracker[sender_id] if t > cutoff]
-
-        return len(tracker[sender_id]) < max_count
-
-    def _record_message(self, sender_id: str, tracker: Dict[str, List[int]]):
-        """Record a message for rate limiting."""
-        now = int(time.time())
-        if sender_id not in tracker:
-            tracker[sender_id] = []
-        tracker[sender_id].append(now)
-
     # =========================================================================
     # OUTGOING TASK REQUESTS
     # =========================================================================
@@ -297,7 +272,7 @@ class TaskManager:
             Dict with handling result
         """
         # Rate limit check
-        if not self._check_rate_limit(sender_id, self._request_rate, TASK_REQUEST_RATE_LIMIT):
+        if not self._request_rate.check(sender_id):
             self._log(f"Rate limited task request from {sender_id[:16]}...")
             return {"error": "rate_limited"}
 
@@ -335,7 +310,7 @@ class TaskManager:
             return {"error": "verification_failed"}
 
         # Record for rate limiting
-        self._record_message(sender_id, self._request_rate)
+        self._request_rate.record(sender_id)
 
         # Check if we can accept this task
         request_id = payload.get("request_id")
@@ -575,7 +550,7 @@ class TaskManager:
             Dict with handling result
         """
         # Rate limit check
-        if not self._check_rate_limit(sender_id, self._response_rate, TASK_RESPONSE_RATE_LIMIT):
+        if not self._response_rate.check(sender_id):
             self._log(f"Rate limited task response from {sender_id[:16]}...")
             return {"error": "rate_limited"}
 
@@ -607,7 +582,7 @@ class TaskManager:
             return {"error": "verification_failed"}
 
         # Record for rate limiting
-        self._record_message(sender_id, self._response_rate)
+        self._response_rate.record(sender_id)
 
         # Find the original request
         request_id = payload.get("request_id")
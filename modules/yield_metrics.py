@@ -15,7 +15,7 @@ This module bridges cl-hive coordination with cl-revenue-ops profitability data.
 import math
 import time
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 
 # =============================================================================
@@ -33,6 +33,13 @@ SATURATION_RISK_THRESHOLD = 0.85    # >85% local = saturation risk
 # Competition detection
 MIN_CHANNELS_FOR_COMPETITION = 2    # Need at least 2 members with channels
 
+# Peer alias lookups
+ALIAS_CACHE_TTL_SECONDS = 86400     # Aliases rarely change
+ALIAS_BULK_FETCH_THRESHOLD = 20     # More misses than this -> one full listnodes
+
+# Blocks per day (for channel age from SCID block height)
+BLOCKS_PER_DAY = 144
+
 
 # =============================================================================
 # DATA CLASSES
@@ -354,10 +361,20 @@ class YieldMetricsManager:
         self._velocity_cache: Dict[str, Dict] = {}
         self._velocity_cache_ttl = 300  # 5 minutes
 
+        # Shared prediction memo (PredictionCache), set by the plugin
+        self.prediction_cache: Any = None
+
+        # Peer alias cache: peer_id -> (alias, fetched_at)
+        self._alias_cache: Dict[str, Tuple[Optional[str], float]] = {}
+
     def set_our_pubkey(self, pubkey: str) -> None:
         """Set our node's pubkey after initialization."""
         self.our_pubkey = pubkey
 
+    def set_prediction_cache(self, cache: Any) -> None:
+        """Share a PredictionCache so predictions are memoized per channel."""
+        self.prediction_cache = cache
+
     def _log(self, msg: str, level: str = "info") -> None:
         """Log a message if plugin is available."""
         if self.plugin:
@@ -385,106 +402,156 @@ class YieldMetricsManager:
         metrics = []
 
         try:
-            # Get channel list
-            if channel_id:
-                channels_resp = self.plugin.rpc.listpeerchannels()
-                channels = [
-                    ch for ch in channels_resp.get("channels", [])
-                    if ch.get("short_channel_id") == channel_id
-                ]
-            else:
-                channels_resp = self.plugin.rpc.listpeerchannels()
-                channels = channels_resp.get("channels", [])
-
-            # Get profitability data from cl-revenue-ops if available
-            profitability_data = {}
-            if self.bridge and hasattr(self.bridge, 'get_profitability'):
-                try:
-                    prof_result = self.bridge.get_profitability()
-                    if prof_result:
-                        for ch_prof in prof_result.get("channels", []):
-                            profitability_data[ch_prof.get("channel_id")] = ch_prof
-                except Exception:
-                    pass
+            # One pass: channels, profitability, block height and aliases are
+            # each fetched once and joined by SCID / peer id.
+            channels_resp = self.plugin.rpc.listpeerchannels()
+            channels = [
+                ch for ch in channels_resp.get("channels", [])
+                if ch.get("state") == "CHANNELD_NORMAL"
+                and (not channel_id or ch.get("short_channel_id") == channel_id)
+            ]
+            if not channels:
+                return metrics
 
-            for ch in channels:
-                if ch.get("state") != "CHANNELD_NORMAL":
-                    continue
+            profitability_data = self._get_profitability_by_channel()
+            blockheight = self._get_blockheight()
+            aliases = self._get_peer_aliases({ch.get("peer_id", "") for ch in channels})
 
+            for ch in channels:
                 scid = ch.get("short_channel_id", "")
-                peer_id = ch.get("peer_id", "")
-
-                # Get capacity and balance
-                capacity_msat = ch.get("total_msat", 0)
-                local_msat = ch.get("to_us_msat", 0)
-                capacity_sats = capacity_msat // 1000
-                local_sats = local_msat // 1000
-
-                # Get profitability data if available
-                prof = profitability_data.get(scid, {})
-
-                # Get peer alias
-                peer_alias = None
-                try:
-                    nodes = self.plugin.rpc.listnodes(id=peer_id)
-                    if nodes.get("nodes"):
-                        peer_alias = nodes["nodes"][0].get("alias")
-                except Exception:
-                    pass
-
-                # Calculate channel age
-                funding_txid = ch.get("funding_txid")
-                channel_age_days = self._get_channel_age_days(funding_txid)
-
-                # Determine flow direction
-                flow_direction = "balanced"
-                in_sats = prof.get("in_sats", 0)
-                out_sats = prof.get("out_sats", 0)
-                if in_sats > out_sats * 1.5:
-                    flow_direction = "sink"
-                elif out_sats > in_sats * 1.5:
-                    flow_direction = "source"
-
-                yield_metric = ChannelYieldMetrics(
-                    channel_id=scid,
-                    peer_id=peer_id,
-                    peer_alias=peer_alias,
-                    capacity_sats=capacity_sats,
-                    local_balance_sats=local_sats,
-                    routing_revenue_sats=prof.get("fees_earned_sats", 0),
-                    forward_count=prof.get("forward_count", 0),
-                    period_days=period_days,
-                    open_cost_sats=prof.get("open_cost_sats", 0),
-                    rebalance_cost_sats=prof.get("rebalance_cost_sats", 0),
-                    volume_routed_sats=prof.get("volume_routed_sats", 0),
-                    channel_age_days=channel_age_days,
-                    last_forward_timestamp=prof.get("last_forward_timestamp", 0),
-                    flow_direction=flow_direction
-                )
-
-                metrics.append(yield_metric)
+                metrics.append(self._build_yield_metrics(
+                    ch,
+                    prof=profitability_data.get(scid, {}),
+                    peer_alias=aliases.get(ch.get("peer_id", "")),
+                    channel_age_days=self._channel_age_from_scid(scid, blockheight),
+                    period_days=period_days
+                ))
 
         except Exception as e:
             self._log(f"Error getting channel yield metrics: {e}", level="debug")
 
         return metrics
 
-    def _get_channel_age_days(self, funding_txid: str) -> int:
-        """Get channel age in days from funding transaction."""
-        if not funding_txid:
-            return 0
+    def _build_yield_metrics(
+        self,
+        ch: Dict[str, Any],
+        prof: Dict[str, Any],
+        peer_alias: Optional[str],
+        channel_age_days: int,
+        period_days: int
+    ) -> ChannelYieldMetrics:
+        """Build ChannelYieldMetrics for one listpeerchannels entry."""
+        # Get capacity and balance
+        capacity_msat = ch.get("total_msat", 0)
+        local_msat = ch.get("to_us_msat", 0)
+        capacity_sats = capacity_msat // 1000
+        local_sats = local_msat // 1000
+
+        # Determine flow direction
+        flow_direction = "balanced"
+        in_sats = prof.get("in_sats", 0)
+        out_sats = prof.get("out_sats", 0)
+        if in_sats > out_sats * 1.5:
+            flow_direction = "sink"
+        elif out_sats > in_sats * 1.5:
+            flow_direction = "source"
+
+        return ChannelYieldMetrics(
+            channel_id=ch.get("short_channel_id", ""),
+            peer_id=ch.get("peer_id", ""),
+            peer_alias=peer_alias,
+            capacity_sats=capacity_sats,
+            local_balance_sats=local_sats,
+            routing_revenue_sats=prof.get("fees_earned_sats", 0),
+            forward_count=prof.get("forward_count", 0),
+            period_days=period_days,
+            open_cost_sats=prof.get("open_cost_sats", 0),
+            rebalance_cost_sats=prof.get("rebalance_cost_sats", 0),
+            volume_routed_sats=prof.get("volume_routed_sats", 0),
+            channel_age_days=channel_age_days,
+            last_forward_timestamp=prof.get("last_forward_timestamp", 0),
+            flow_direction=flow_direction
+        )
 
+    def _get_profitability_by_channel(self) -> Dict[str, Dict[str, Any]]:
+        """Get cl-revenue-ops profitability data keyed by SCID (one bridge call)."""
+        profitability_data = {}
+        if self.bridge and hasattr(self.bridge, 'get_profitability'):
+            try:
+                prof_result = self.bridge.get_profitability()
+                if prof_result:
+                    for ch_prof in prof_result.get("channels", []):
+                        profitability_data[ch_prof.get("channel_id")] = ch_prof
+            except Exception:
+                pass
+        return profitability_data
+
+    def _get_blockheight(self) -> int:
+        """Get the current block height (0 if unavailable)."""
         try:
-            # Try to get block height from transaction
-            tx = self.plugin.rpc.gettxout(txid=funding_txid, vout=0)
-            if tx and tx.get("height"):
-                current_height = self.plugin.rpc.getinfo().get("blockheight", 0)
-                blocks_old = current_height - tx.get("height")
-                return blocks_old // 144  # ~144 blocks per day
+            return int(self.plugin.rpc.getinfo().get("blockheight", 0))
         except Exception:
-            pass
+            return 0
+
+    @staticmethod
+    def _channel_age_from_scid(scid: str, blockheight: int) -> int:
+        """Channel age in days from the funding block encoded in the SCID."""
+        if not scid or not blockheight:
+            return 0
+        try:
+            funding_height = int(scid.split("x", 1)[0])
+        except ValueError:
+            return 0
+        return max(0, blockheight - funding_height) // BLOCKS_PER_DAY
+
+    def _get_peer_aliases(self, peer_ids: Set[str]) -> Dict[str, Optional[str]]:
+        """
+        Get aliases for a set of peers.
+
+        Served from a daily cache. A handful of misses are fetched with
+        listnodes(id=...); past ALIAS_BULK_FETCH_THRESHOLD a single full
+        listnodes call fills the cache instead of one call per peer.
+        """
+        now = time.time()
+        aliases: Dict[str, Optional[str]] = {}
+        missing = []
+        for peer_id in peer_ids:
+            if not peer_id:
+                continue
+            cached = self._alias_cache.get(peer_id)
+            if cached is not None and now - cached[1] < ALIAS_CACHE_TTL_SECONDS:
+                aliases[peer_id] = cached[0]
+            else:
+                missing.append(peer_id)
+
+        if not missing:
+            return aliases
+
+        # Peers whose lookup completed; only these are cached, so a failed
+        # listnodes call is retried on the next pass instead of caching None
+        fetched: Dict[str, Optional[str]] = {}
+        try:
+            if len(missing) > ALIAS_BULK_FETCH_THRESHOLD:
+                wanted = set(missing)
+                found = {}
+                for node in self.plugin.rpc.listnodes().get("nodes", []):
+                    if node.get("nodeid") in wanted:
+                        found[node["nodeid"]] = node.get("alias")
+                fetched = {peer_id: found.get(peer_id) for peer_id in missing}
+            else:
+                for peer_id in missing:
+                    nodes = self.plugin.rpc.listnodes(id=peer_id)
+                    alias = nodes["nodes"][0].get("alias") if nodes.get("nodes") else None
+                    fetched[peer_id] = alias
+        except Exception as e:
+            self._log(f"Error fetching peer aliases: {e}", level="debug")
 
-        return 0
+        for peer_id in missing:
+            alias = fetched.get(peer_id)
+            aliases[peer_id] = alias
+            if peer_id in fetched:
+                self._alias_cache[peer_id] = (alias, now)
+        return aliases
 
     # =========================================================================
     # VELOCITY PREDICTION
@@ -507,6 +574,19 @@ class YieldMetricsManager:
         Returns:
             ChannelVelocityPrediction or None if insufficient data
         """
+        if self.prediction_cache is None:
+            return self._predict_channel_state(channel_id, hours)
+        return self.prediction_cache.get_or_compute(
+            "predict_channel_state", channel_id, hours,
+            lambda: self._predict_channel_state(channel_id, hours)
+        )
+
+    def _predict_channel_state(
+        self,
+        channel_id: str,
+        hours: int
+    ) -> Optional[ChannelVelocityPrediction]:
+        """Compute a channel state prediction (uncached, see predict_channel_state)."""
         try:
             # Get current channel state
             channels_resp = self.plugin.rpc.listpeerchannels()
@@ -515,10 +595,23 @@ class YieldMetricsManager:
                 if ch.get("short_channel_id") == channel_id:
                     channel = ch
                     break
+        except Exception as e:
+            self._log(f"Error predicting channel state: {e}", level="debug")
+            return None
+
+        return self._predict_from_channel(channel, hours)
 
+    def _predict_from_channel(
+        self,
+        channel: Optional[Dict[str, Any]],
+        hours: int
+    ) -> Optional[ChannelVelocityPrediction]:
+        """Predict channel state from an already-fetched listpeerchannels entry."""
+        try:
             if not channel or channel.get("state") != "CHANNELD_NORMAL":
                 return None
 
+            channel_id = channel.get("short_channel_id", "")
             peer_id = channel.get("peer_id", "")
             capacity_msat = channel.get("total_msat", 0)
             local_msat = channel.get("to_us_msat", 0)
@@ -679,7 +772,15 @@ class YieldMetricsManager:
                 if not scid:
                     continue
 
-                prediction = self.predict_channel_state(scid, hours=threshold_hours)
+                # Reuse this listpeerchannels entry instead of re-listing
+                # channels for every prediction
+                if self.prediction_cache is None:
+                    prediction = self._predict_from_channel(ch, threshold_hours)
+                else:
+                    prediction = self.prediction_cache.get_or_compute(
+                        "predict_channel_state", scid, threshold_hours,
+                        lambda ch=ch: self._predict_from_channel(ch, threshold_hours)
+                    )
                 if not prediction:
                     continue
 
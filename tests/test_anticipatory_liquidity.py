@@ -0,0 +1,372 @@
+"""
+Tests for AnticipatoryLiquidityManager predictions.
+
+Tests cover:
+- Channel snapshot parsing and TTL reuse
+- Fleet-wide prediction sweep costing a single listpeerchannels call
+- Running hour/day flow histograms (add, expire, recalibrate)
+- Batch pattern detection across all channels
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.anticipatory_liquidity import (
+    AnticipatoryLiquidityManager, FlowDirection, FlowHistogram, HourlyFlowSample,
+    FLOW_RECALIBRATION_SECONDS, PATTERN_WINDOW_DAYS,
+)
+
+
+class MockDatabase:
+    def __init__(self):
+        self.rows = []
+        self.reads = 0
+
+    def record_flow_sample(self, **kwargs):
+        self.rows.append(kwargs)
+
+    def get_flow_samples(self, channel_id=None, days=14, **kwargs):
+        self.reads += 1
+        cutoff = int(time.time()) - days * 86400
+        return sorted(
+            (r for r in self.rows if r["channel_id"] == channel_id and r["timestamp"] > cutoff),
+            key=lambda r: r["timestamp"], reverse=True
+        )
+
+    def get_all_flow_samples(self, days=14):
+        self.reads += 1
+        cutoff = int(time.time()) - days * 86400
+        return [r for r in self.rows if r["timestamp"] > cutoff]
+
+    def get_flow_samples_between(self, since, until):
+        self.reads += 1
+        return [r for r in self.rows if since < r["timestamp"] <= until]
+
+    def get_flow_slot_moments(self, since):
+        self.reads += 1
+        slots = {}
+        for r in self.rows:
+            if r["timestamp"] > since:
+                key = (r["channel_id"], r["day_of_week"] * 24 + r["hour"])
+                flow = r["net_flow_sats"]
+                n, total, total_abs, total_sq = slots.get(key, (0, 0, 0, 0))
+                slots[key] = (n + 1, total + flow, total_abs + abs(flow), total_sq + flow * flow)
+        return [key + moments for key, moments in slots.items()]
+
+
+def _channels(n, state="CHANNELD_NORMAL"):
+    return [
+        {
+            "short_channel_id": f"{800000 + i}x1x0",
+            "peer_id": "03" + format(i, "064x"),
+            "state": state,
+            "total_msat": 10_000_000_000,
+            # Alternate str/int formats as returned by different CLN versions
+            "to_us_msat": f"{i * 100_000_000 % 10_000_000_000}msat" if i % 2 else 500_000_000,
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def plugin():
+    plugin = MagicMock()
+    plugin.rpc.listpeerchannels.return_value = {"channels": _channels(20)}
+    return plugin
+
+
+@pytest.fixture
+def manager(plugin):
+    return AnticipatoryLiquidityManager(
+        database=MockDatabase(), plugin=plugin, our_id="03test123"
+    )
+
+
+class TestChannelSnapshot:
+
+    def test_parses_all_channels(self, manager):
+        snapshot = manager.get_channel_snapshot()
+        assert len(snapshot) == 20
+
+        info = snapshot["800003x1x0"]
+        assert info["capacity_sats"] == 10_000_000
+        assert info["local_sats"] == 300_000
+        assert info["local_pct"] == pytest.approx(0.03)
+        assert info["peer_id"] == "03" + format(3, "064x")
+        assert snapshot["800000x1x0"]["local_sats"] == 500_000
+
+    def test_channel_info_reuses_snapshot(self, manager, plugin):
+        for ch in _channels(20):
+            assert manager._get_channel_info(ch["short_channel_id"]) is not None
+        assert manager._get_channel_info("1x1x1") is None
+        assert plugin.rpc.listpeerchannels.call_count == 1
+
+        manager.get_channel_snapshot(force=True)
+        assert plugin.rpc.listpeerchannels.call_count == 2
+
+    def test_rpc_failure_keeps_last_snapshot(self, manager, plugin):
+        manager.get_channel_snapshot()
+        plugin.rpc.listpeerchannels.side_effect = Exception("rpc down")
+        assert len(manager.get_channel_snapshot(force=True)) == 20
+
+    def test_no_plugin(self):
+        manager = AnticipatoryLiquidityManager(database=MockDatabase(), plugin=None)
+        assert manager.get_channel_snapshot() == {}
+        assert manager._get_channel_info("800000x1x0") is None
+
+
+class TestPredictionSweep:
+
+    def test_sweep_is_one_rpc(self, manager, plugin):
+        channels = _channels(50)
+        channels[0]["state"] = "CHANNELD_AWAITING_LOCKIN"
+        plugin.rpc.listpeerchannels.return_value = {"channels": channels}
+
+        manager.get_all_predictions(min_risk=0.0)
+
+        assert plugin.rpc.listpeerchannels.call_count == 1
+        assert len(manager._prediction_cache) == 49
+        assert "800000x1x0" not in manager._prediction_cache
+        assert manager.get_status()["channel_snapshot_fetches"] == 1
+
+    def test_sweep_matches_single_predictions(self, manager):
+        swept = {p.channel_id: p for p in manager.get_all_predictions(min_risk=0.0)}
+        for scid, pred in swept.items():
+            single = manager.predict_liquidity(scid)
+            assert single.current_local_pct == pred.current_local_pct
+            assert single.peer_id == pred.peer_id
+            assert single.depletion_risk == pytest.approx(pred.depletion_risk)
+
+    def test_sweep_sorted_by_risk(self, manager):
+        preds = manager.get_all_predictions(min_risk=0.0)
+        risks = [max(p.depletion_risk, p.saturation_risk) for p in preds]
+        assert risks == sorted(risks, reverse=True)
+        assert all(r >= 0.3 for r in (
+            max(p.depletion_risk, p.saturation_risk)
+            for p in manager.get_all_predictions()
+        ))
+
+
+def _sample(ts, net, channel_id="100x1x0"):
+    dt = time.localtime(ts)
+    return HourlyFlowSample(
+        channel_id=channel_id, hour=dt.tm_hour, day_of_week=dt.tm_wday,
+        inbound_sats=max(0, net), outbound_sats=max(0, -net),
+        net_flow_sats=net, timestamp=ts,
+    )
+
+
+class TestFlowHistogram:
+
+    def test_moments_match_samples(self):
+        rng = random.Random(3)
+        now = int(time.time())
+        samples = [_sample(now - h * 3600, rng.randint(-50000, 50000)) for h in range(300)]
+        histogram = FlowHistogram.from_samples(samples)
+
+        assert histogram.sample_count == 300
+        for hour in range(24):
+            flows = [s.net_flow_sats for s in samples if s.hour == hour]
+            assert histogram.hourly.count[hour] == len(flows)
+            assert histogram.hourly.mean(hour) == pytest.approx(sum(flows) / len(flows))
+            assert histogram.hourly.mean_abs(hour) == pytest.approx(
+                sum(abs(f) for f in flows) / len(flows))
+        assert sum(histogram.slots.count) == sum(histogram.daily.count) == 300
+
+        for sample in samples:
+            histogram.remove(sample)
+        assert histogram.sample_count == 0
+        assert not any(histogram.slots.total_sq)
+
+    def test_record_updates_without_db_reads(self, manager):
+        channel = "100x1x0"
+        now = int(time.time())
+        manager.record_flow_sample(channel, 1000, 0, timestamp=now - 7200)
+        assert manager.get_flow_histogram(channel).sample_count == 1
+        reads = manager.database.reads
+
+        manager.record_flow_sample(channel, 0, 4000, timestamp=now - 3600)
+        manager.record_flow_sample(channel, 500, 0, timestamp=now - 10800)  # out of order
+        histogram = manager.get_flow_histogram(channel)
+
+        assert manager.database.reads == reads
+        assert histogram.sample_count == 3
+        assert histogram.overall.total[0] == 1000 - 4000 + 500
+        timestamps = [s.timestamp for s in manager._flow_history[channel]]
+        assert timestamps == sorted(timestamps)
+        assert manager._flow_timestamps[channel] == timestamps
+
+    def test_old_samples_expire(self, manager):
+        channel = "100x1x0"
+        now = int(time.time())
+        window = PATTERN_WINDOW_DAYS * 86400
+        manager.record_flow_sample(channel, 1000, 0, timestamp=now - window + 60)
+        manager.get_flow_histogram(channel)
+        manager.record_flow_sample(channel, 2000, 0, timestamp=now + 120)
+
+        histogram = manager.get_flow_histogram(channel)
+        assert histogram.sample_count == 1
+        assert histogram.overall.total[0] == 2000
+        assert manager._flow_timestamps[channel] == [now + 120]
+
+    def test_recalibrates_from_database(self, manager, monkeypatch):
+        channel = "100x1x0"
+        now = int(time.time())
+        manager.get_flow_histogram(channel)
+        # Rows written by another process are picked up on recalibration
+        manager.database.rows.append(dict(
+            channel_id=channel, hour=0, day_of_week=0, inbound_sats=0,
+            outbound_sats=0, net_flow_sats=777, timestamp=now - 60))
+        assert manager.get_flow_histogram(channel).sample_count == 0
+
+        monkeypatch.setattr(time, "time", lambda: now + FLOW_RECALIBRATION_SECONDS)
+        assert manager.get_flow_histogram(channel).sample_count == 1
+
+    def test_concurrent_record_and_recalibrate(self, manager):
+        channel = "100x1x0"
+        now = int(time.time())
+        writers = 4
+        per_writer = 200
+        manager.get_flow_histogram(channel)
+        done = threading.Event()
+
+        def write(offset):
+            for i in range(per_writer):
+                ts = now - (i * writers + offset) * 60
+                manager.record_flow_sample(channel, 100, 0, timestamp=ts)
+
+        def recalibrate():
+            while not done.is_set():
+                manager.calibrate_flow_histograms()
+                manager.get_flow_histogram(channel)
+                manager.detect_patterns(channel, force_refresh=True)
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(writers)]
+        reader = threading.Thread(target=recalibrate)
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # interleave threads as often as possible
+        try:
+            reader.start()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            done.set()
+            reader.join()
+            sys.setswitchinterval(interval)
+
+        total = writers * per_writer
+        histogram = manager.get_flow_histogram(channel)
+        timestamps = manager._flow_timestamps[channel]
+        assert histogram.sample_count == total
+        assert histogram.overall.total[0] == 100 * total
+        assert len(timestamps) == len(manager._flow_history[channel]) == total
+        assert timestamps == sorted(timestamps)
+
+    def test_detects_hourly_drain(self, manager):
+        channel = "100x1x0"
+        now = int(time.time())
+        drain_hour = time.localtime(now).tm_hour
+        for h in range(PATTERN_WINDOW_DAYS * 24 - 1):
+            ts = now - h * 3600
+            if time.localtime(ts).tm_hour == drain_hour:
+                manager.record_flow_sample(channel, 0, 200_000, timestamp=ts)
+            else:
+                manager.record_flow_sample(channel, 5_000, 0, timestamp=ts)
+
+        patterns = manager.detect_patterns(channel, force_refresh=True)
+        hourly = [p for p in patterns if p.hour_of_day == drain_hour and p.day_of_week is None]
+        assert len(hourly) == 1
+        assert hourly[0].direction == FlowDirection.OUTBOUND
+        assert hourly[0].avg_flow_sats == 200_000
+        assert hourly[0].samples == PATTERN_WINDOW_DAYS
+
+
+class TestBatchPatternDetection:
+
+    def _store_history(self, manager, channel_ids):
+        now = int(time.time())
+        rng = random.Random(5)
+        for channel_id in channel_ids:
+            drain_hour = rng.randrange(24)
+            for h in range(PATTERN_WINDOW_DAYS * 24 - 1):
+                ts = now - h * 3600
+                out = 150_000 if time.localtime(ts).tm_hour == drain_hour else 0
+                manager.database.record_flow_sample(
+                    channel_id=channel_id, hour=time.localtime(ts).tm_hour,
+                    day_of_week=time.localtime(ts).tm_wday, inbound_sats=4000,
+                    outbound_sats=out, net_flow_sats=4000 - out, timestamp=ts)
+
+    def test_matches_per_channel(self, manager, plugin):
+        channel_ids = [ch["short_channel_id"] for ch in _channels(20)]
+        self._store_history(manager, channel_ids)
+
+        batch = manager.detect_all_patterns()
+        # Slot aggregates plus the samples that expire before recalibration
+        assert manager.database.reads == 2
+        assert set(batch) == set(channel_ids)
+
+        single = AnticipatoryLiquidityManager(database=manager.database, plugin=plugin)
+        for channel_id in channel_ids:
+            expected = single.detect_patterns(channel_id)
+            assert batch[channel_id]
+            assert [(p.hour_of_day, p.day_of_week, p.direction, p.samples, p.avg_flow_sats)
+                    for p in batch[channel_id]] == [
+                   (p.hour_of_day, p.day_of_week, p.direction, p.samples, p.avg_flow_sats)
+                   for p in expected]
+
+    def test_slot_moments_match_samples_and_expire(self, manager, monkeypatch):
+        channel_id = "800001x1x0"
+        self._store_history(manager, [channel_id])
+        manager.detect_all_patterns()
+
+        single = AnticipatoryLiquidityManager(database=manager.database, plugin=None)
+        expected = single.get_flow_histogram(channel_id)
+        batch = manager._flow_histograms[channel_id]
+        for name in ("count", "total", "total_abs", "total_sq"):
+            for level in ("overall", "hourly", "daily", "slots"):
+                assert getattr(getattr(batch, level), name) == \
+                    getattr(getattr(expected, level), name)
+
+        # Oldest samples still leave the histogram until recalibration
+        before = expected.sample_count
+        later = int(time.time()) + 6 * 3600
+        monkeypatch.setattr(time, "time", lambda: later)
+        expired = manager.get_flow_histogram(channel_id)
+        assert expired.slots.count == single.get_flow_histogram(channel_id).slots.count
+        assert expired.sample_count == single.get_flow_histogram(channel_id).sample_count
+        assert expired.sample_count < before
+
+    def test_sample_consumers_load_full_window(self, manager):
+        channel_id = "800001x1x0"
+        self._store_history(manager, [channel_id])
+        manager.detect_all_patterns()
+        assert len(manager._flow_history[channel_id]) < PATTERN_WINDOW_DAYS * 24 - 1
+
+        manager.detect_intraday_patterns(channel_id)
+        assert len(manager._flow_history[channel_id]) == PATTERN_WINDOW_DAYS * 24 - 1
+
+    def test_populates_peer_map_for_sharing(self, manager):
+        self._store_history(manager, ["800001x1x0"])
+        manager.detect_all_patterns()
+
+        shared = manager.get_shareable_patterns(min_confidence=0.0, min_samples=1)
+        assert shared
+        assert all(p["peer_id"] == "03" + format(1, "064x") for p in shared)
+
+    def test_prediction_sweep_calibrates_in_one_query(self, manager):
+        manager.get_all_predictions(min_risk=0.0)
+        assert manager.database.reads == 1
+
+        # Calibrated channels are not re-read on the next sweep
+        manager.get_all_predictions(min_risk=0.0)
+        assert manager.database.reads == 1
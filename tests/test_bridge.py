@@ -437,6 +437,76 @@ class TestRevenueOpsIntegration:
         
         assert result == {"strategy": "hive", "base_fee": 0}
 
+    def test_safe_call_uses_socket_client(self, bridge, mock_rpc):
+        """safe_call goes through the Bridge's own socket connection when available."""
+        bridge._status = BridgeStatus.ENABLED
+        bridge._socket_rpc = MagicMock()
+        bridge._socket_rpc.call.return_value = {"status": "success"}
+
+        assert bridge.set_hive_policy("peer123" * 5, True) is True
+        bridge._socket_rpc.call.assert_called_once()
+        mock_rpc.call.assert_not_called()
+
+    def test_safe_call_socket_timeout_trips_circuit(self, bridge):
+        """Socket client timeouts count as circuit breaker failures."""
+        bridge._status = BridgeStatus.ENABLED
+        bridge._socket_rpc = MagicMock()
+        bridge._socket_rpc.call.side_effect = TimeoutError("timed out")
+
+        for _ in range(MAX_FAILURES):
+            with pytest.raises(TimeoutError):
+                bridge.safe_call("revenue-status")
+        assert bridge._revenue_ops_cb.state == CircuitState.OPEN
+
+    def test_set_hive_policies_batch(self, bridge, mock_rpc):
+        """set_hive_policies pipelines revenue-policy calls in batches."""
+        bridge._status = BridgeStatus.ENABLED
+        bridge._socket_rpc = MagicMock()
+        bridge._socket_rpc.call_batch.side_effect = lambda calls, timeout: [
+            RpcError("boom") if params["peer_id"] == "bad" else {"status": "success"}
+            for _, params in calls
+        ]
+        policies = {f"peer{i}": i % 2 == 0 for i in range(30)}
+        policies["bad"] = True
+
+        results = bridge.set_hive_policies(policies, bypass_rate_limit=True)
+
+        assert results.pop("bad") is False
+        assert all(results.values())
+        assert bridge._socket_rpc.call_batch.call_count == 2
+        first_batch = bridge._socket_rpc.call_batch.call_args_list[0][0][0]
+        assert first_batch[0] == ("revenue-policy", {
+            "action": "set", "peer_id": "peer0",
+            "strategy": "hive", "rebalance": "enabled"
+        })
+        assert first_batch[1][1]["strategy"] == "dynamic"
+        mock_rpc.call.assert_not_called()
+
+        # Rate limited peers are skipped without a call
+        bridge._socket_rpc.call_batch.reset_mock()
+        assert bridge.set_hive_policies({"peer0": True}) == {"peer0": False}
+        bridge._socket_rpc.call_batch.assert_not_called()
+
+    def test_set_hive_policies_without_socket(self, bridge, mock_rpc):
+        """set_hive_policies falls back to one call per peer."""
+        bridge._status = BridgeStatus.ENABLED
+        mock_rpc.call.return_value = {"status": "success"}
+
+        results = bridge.set_hive_policies({"a": True, "b": False}, bypass_rate_limit=True)
+
+        assert results == {"a": True, "b": True}
+        assert mock_rpc.call.call_count == 2
+
+    def test_set_hive_policies_circuit_open(self, bridge):
+        """set_hive_policies sends nothing while the circuit is open."""
+        bridge._status = BridgeStatus.ENABLED
+        bridge._socket_rpc = MagicMock()
+        for _ in range(MAX_FAILURES):
+            bridge._revenue_ops_cb.record_failure()
+
+        assert bridge.set_hive_policies({"a": True}, bypass_rate_limit=True) == {"a": False}
+        bridge._socket_rpc.call_batch.assert_not_called()
+
 
 # =============================================================================
 # CLBOSS INTEGRATION TESTS
@@ -0,0 +1,111 @@
+"""
+Tests for daily contribution rollups.
+
+Tests cover:
+- In-memory daily totals matching the raw ledger
+- Persistence of daily totals and backfill from an existing ledger
+- Leech checks without per-forward ledger scans
+- Pruning of raw and daily rows
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.database import HiveDatabase
+from modules.contribution import ContributionManager, LEECH_WINDOW_DAYS
+
+
+PEER = '03' + 'a' * 64
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = HiveDatabase(str(tmp_path / "test_contrib.db"), MagicMock())
+    db.initialize()
+    return db
+
+
+def _insert_ledger(db, peer_id, direction, amount, age_days):
+    db._get_connection().execute("""
+        INSERT INTO contribution_ledger (peer_id, direction, amount_sats, timestamp)
+        VALUES (?, ?, ?, ?)
+    """, (peer_id, direction, amount, int(time.time()) - int(age_days * 86400)))
+
+
+class TestContributionRollups:
+
+    def test_stats_from_daily_totals(self, database):
+        database.record_contribution(PEER, 'forwarded', 100)
+        database.record_contribution(PEER, 'forwarded', 50)
+        database.record_contribution(PEER, 'received', 300)
+
+        assert database.get_contribution_stats(PEER) == {"forwarded": 150, "received": 300}
+        assert database.get_contribution_ratio(PEER) == pytest.approx(0.5)
+        row = database._get_connection().execute(
+            "SELECT * FROM contribution_daily WHERE peer_id = ?", (PEER,)
+        ).fetchone()
+        assert (row['forwarded_sats'], row['received_sats']) == (150, 300)
+
+    def test_rollback_discards_memory_totals(self, database):
+        database.record_contribution(PEER, 'forwarded', 100)
+        with pytest.raises(RuntimeError):
+            with database.transaction():
+                database.record_contribution(PEER, 'forwarded', 50)
+                database.record_contribution(PEER, 'received', 300)
+                raise RuntimeError("abort")
+
+        assert database.get_contribution_stats(PEER) == {"forwarded": 100, "received": 0}
+        database.record_contribution(PEER, 'received', 20)
+        assert database.get_contribution_stats(PEER) == {"forwarded": 100, "received": 20}
+
+    def test_backfill_and_reload(self, tmp_path):
+        path = str(tmp_path / "legacy.db")
+        db = HiveDatabase(path, MagicMock())
+        db.initialize()
+        conn = db._get_connection()
+        _insert_ledger(db, PEER, 'forwarded', 1000, 2)
+        _insert_ledger(db, PEER, 'received', 400, 3)
+        _insert_ledger(db, PEER, 'received', 700, 20)
+        conn.execute("DELETE FROM contribution_daily")
+
+        reopened = HiveDatabase(path, MagicMock())
+        reopened.initialize()
+        assert reopened.get_contribution_stats(PEER, window_days=7) == {
+            "forwarded": 1000, "received": 400
+        }
+        assert reopened.get_contribution_stats(PEER, window_days=30)["received"] == 1100
+
+    def test_leech_check_reads_memory(self, database):
+        database.add_member(PEER, tier='member')
+        mgr = ContributionManager(MagicMock(), database, MagicMock(), MagicMock())
+        database.record_contribution(PEER, 'forwarded', 10)
+        database.record_contribution(PEER, 'received', 100)
+
+        real_conn = database._get_connection()
+        spy = MagicMock(wraps=real_conn)
+        database._local.conn = spy
+        mgr.get_contribution_stats(PEER, window_days=LEECH_WINDOW_DAYS)
+        assert not any(
+            'contribution_ledger' in str(call) for call in spy.execute.call_args_list
+        )
+        assert mgr.check_leech_status(PEER)["is_leech"] is True
+
+    def test_prune(self, database):
+        _insert_ledger(database, PEER, 'forwarded', 5, 60)
+        database._get_connection().execute(
+            "INSERT INTO contribution_daily VALUES (?, ?, 5, 0)",
+            (PEER, (int(time.time()) - 60 * 86400) // 86400)
+        )
+        database.record_contribution(PEER, 'forwarded', 7)
+
+        assert database.prune_old_contributions(older_than_days=45) == 1
+        assert database.get_contribution_stats(PEER, window_days=90)["forwarded"] == 7
+        assert database._get_connection().execute(
+            "SELECT COUNT(*) FROM contribution_daily"
+        ).fetchone()[0] == 1
@@ -644,6 +644,112 @@ class TestFleetRebalanceRouter:
         assert result["estimated_external_cost_sats"] > 0
 
 
+    def _chain_router(self, n_members):
+        """Router over a chain fleet: member i shares peer i+1 with member i+1."""
+        state_manager = MockStateManager()
+        members = [f"02{i:064x}" for i in range(n_members)]
+        for i, member in enumerate(members):
+            peers = [f"03{i:064x}", f"03{i + 1:064x}"]
+            state_manager.set_peer_state(member, topology=peers)
+        router = FleetRebalanceRouter(plugin=MockPlugin(), state_manager=state_manager)
+        return router, members
+
+    def test_member_graph_built_once_per_version(self):
+        """Member adjacency should be reused until the topology changes."""
+        router, members = self._chain_router(4)
+
+        adjacency, peer_index = router._get_member_graph()
+        assert adjacency[members[1]] == sorted([members[0], members[2]])
+        assert peer_index[f"03{1:064x}"] == {members[0], members[1]}
+
+        version = router._member_graph_version
+        router._get_member_graph()
+        assert router._member_graph_version == version
+
+        # Topology change after cache expiry bumps the version
+        router.state_manager.set_peer_state(members[0], topology=[f"03{3:064x}"])
+        router._topology_cache_time = 0
+        router._get_member_graph()
+        assert router._member_graph_version == version + 1
+
+    def test_find_fleet_path_multi_hop(self):
+        """BFS should follow shared-peer adjacency across members."""
+        router, members = self._chain_router(4)
+
+        path = router.find_fleet_path(
+            from_peer=f"03{0:064x}",
+            to_peer=f"03{4:064x}",
+            amount_sats=100000
+        )
+
+        assert path is not None
+        assert path.path == members
+
+    def test_hub_aware_path_prefers_hub_members(self):
+        """Among equal-length paths, the higher hub score member should win."""
+        state_manager = MockStateManager()
+        src, dst = "03" + "1" * 64, "03" + "2" * 64
+        start, end = "02" + "a" * 64, "02" + "d" * 64
+        hub, leaf = "02" + "b" * 64, "02" + "c" * 64
+        state_manager.set_peer_state(start, topology=[src, "04" + "1" * 64, "04" + "2" * 64])
+        state_manager.set_peer_state(hub, topology=["04" + "1" * 64, "04" + "3" * 64])
+        state_manager.set_peer_state(leaf, topology=["04" + "2" * 64, "04" + "4" * 64])
+        state_manager.set_peer_state(end, topology=[dst, "04" + "3" * 64, "04" + "4" * 64])
+
+        router = FleetRebalanceRouter(plugin=MockPlugin(), state_manager=state_manager)
+        scores = {start: 0.5, hub: 0.9, leaf: 0.1, end: 0.5}
+        with patch.object(router, "get_member_hub_scores", return_value=scores):
+            path = router.find_hub_aware_fleet_path(src, dst, 1_000_000)
+
+        assert path is not None
+        assert path.path == [start, hub, end]
+
+    def test_k_best_paths_match_exhaustive_search(self):
+        """Yen's k-shortest paths should equal the best paths found by brute force."""
+        import itertools
+        import random
+
+        rng = random.Random(7)
+        state_manager = MockStateManager()
+        members = [f"02{i:064x}" for i in range(9)]
+        shared = [f"04{i:064x}" for i in range(12)]
+        src, dst = "03" + "1" * 64, "03" + "2" * 64
+        for i, member in enumerate(members):
+            peers = rng.sample(shared, 2)
+            if i in (0, 1):
+                peers.append(src)
+            if i in (7, 8):
+                peers.append(dst)
+            state_manager.set_peer_state(member, topology=peers)
+
+        router = FleetRebalanceRouter(plugin=MockPlugin(), state_manager=state_manager)
+        hub_scores = {m: rng.random() for m in members}
+        adjacency, peer_index = router._get_member_graph()
+
+        cost_per_hop = router._estimate_fleet_cost(1_000_000, 1) / 1_000_000
+        def path_cost(path):
+            return sum(0.7 * cost_per_hop + 0.3 * (1 - hub_scores[m]) for m in path)
+
+        # Exhaustive enumeration of valid simple paths (<= 4 members)
+        starts, ends = peer_index[src], peer_index[dst]
+        expected = []
+        for length in range(1, 5):
+            for path in itertools.permutations(members, length):
+                if path[0] not in starts or path[-1] not in ends:
+                    continue
+                if any(m in ends for m in path[:-1]):
+                    continue
+                if all(b in adjacency[a] for a, b in zip(path, path[1:])):
+                    expected.append(path_cost(path))
+        expected.sort()
+
+        found = router._find_k_best_fleet_paths(src, dst, 1_000_000, hub_scores, k=5)
+        found_costs = sorted(path_cost(p) for p in found)
+
+        assert len(found) == min(5, len(expected))
+        assert found_costs == pytest.approx(expected[:len(found)])
+
+
 # =============================================================================
 # CIRCULAR FLOW DETECTOR TESTS
 # =============================================================================
@@ -804,6 +910,98 @@ class TestCircularFlowDetector:
         assert status["circular_flows_detected"] == 0
 
 
+    def _record(self, detector, from_peer, to_peer, amount=200000, cost=200):
+        detector.record_rebalance_outcome(
+            from_channel="1x1x0", to_channel="2x1x0",
+            from_peer=from_peer, to_peer=to_peer,
+            amount_sats=amount, cost_sats=cost, success=True
+        )
+
+    def test_detect_two_member_cycle(self):
+        """A -> B -> A is a circular flow."""
+        detector = CircularFlowDetector(plugin=MockPlugin())
+        peer_a, peer_b = "02" + "a" * 64, "02" + "b" * 64
+        self._record(detector, peer_a, peer_b)
+        self._record(detector, peer_b, peer_a)
+
+        flows = detector.detect_circular_flows()
+
+        assert len(flows) == 1
+        assert sorted(flows[0].members) == [peer_a, peer_b]
+        assert flows[0].total_amount_sats == 400000
+
+    def test_low_flow_component_skipped(self):
+        """Cycles whose component carries too little flow are not reported."""
+        detector = CircularFlowDetector(plugin=MockPlugin())
+        peer_a, peer_b = "02" + "a" * 64, "02" + "b" * 64
+        self._record(detector, peer_a, peer_b, amount=1000)
+        self._record(detector, peer_b, peer_a, amount=1000)
+
+        assert detector.detect_circular_flows() == []
+
+    def test_window_expiry_and_trimming(self):
+        """Sliding window aggregates follow expiry and history trimming."""
+        detector = CircularFlowDetector(plugin=MockPlugin())
+        detector._max_history_size = 2
+        peer_a, peer_b, peer_c = ("02" + c * 64 for c in "abc")
+
+        self._record(detector, peer_a, peer_b)
+        self._record(detector, peer_b, peer_a)
+        assert len(detector.detect_circular_flows()) == 1
+
+        # Pushes A -> B out of the history (and the window)
+        self._record(detector, peer_b, peer_c)
+        assert detector.detect_circular_flows() == []
+        assert peer_a not in detector._window_flows
+
+        # Age everything out of the default window
+        for outcome in detector._rebalance_history:
+            outcome.timestamp -= 48 * 3600
+        detector.detect_circular_flows()
+        assert detector._window_flows == {}
+        assert len(detector._window_outcomes) == 0
+
+    def test_custom_window_uses_history(self):
+        """Non-default windows are aggregated from the raw history."""
+        detector = CircularFlowDetector(plugin=MockPlugin())
+        peer_a, peer_b = "02" + "a" * 64, "02" + "b" * 64
+        self._record(detector, peer_a, peer_b)
+        self._record(detector, peer_b, peer_a)
+        detector._rebalance_history[0].timestamp -= 3 * 3600
+
+        assert len(detector.detect_circular_flows(window_hours=24)) == 1
+        assert detector.detect_circular_flows(window_hours=2) == []
+
+    def test_cycle_enumeration_matches_brute_force(self):
+        """Johnson/SCC enumeration finds every bounded elementary cycle."""
+        import itertools
+        import random
+        from modules.cost_reduction import _enumerate_elementary_cycles
+
+        for seed in range(25):
+            rng = random.Random(seed)
+            nodes = [f"n{i}" for i in range(7)]
+            edges = {(a, b) for a in nodes for b in nodes if a != b and rng.random() < 0.3}
+            adjacency = {}
+            for a, b in sorted(edges):
+                adjacency.setdefault(a, []).append(b)
+
+            expected = set()
+            for length in range(2, 6):
+                for combo in itertools.permutations(nodes, length):
+                    if combo[0] != min(combo):
+                        continue
+                    if all((combo[i], combo[(i + 1) % length]) in edges for i in range(length)):
+                        expected.add(combo)
+
+            found = set()
+            for cycle in _enumerate_elementary_cycles(adjacency, length_bound=5, max_cycles=10_000):
+                pivot = cycle.index(min(cycle))
+                found.add(tuple(cycle[pivot:] + cycle[:pivot]))
+
+            assert found == expected
+
+
 # =============================================================================
 # COST REDUCTION MANAGER TESTS
 # =============================================================================
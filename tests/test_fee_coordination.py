@@ -375,6 +375,27 @@ class TestStigmergicCoordinator:
         assert marker.success is True
         assert marker.strength > 0
 
+    def test_marker_listeners_see_local_and_gossip_markers(self):
+        """Subscribers are notified of local deposits and gossiped markers."""
+        seen = []
+        self.coordinator.subscribe_markers(seen.append)
+
+        self.coordinator.deposit_marker("peer1", "peer2", 500, True, 100_000)
+        self.coordinator.receive_marker_from_gossip({
+            "depositor": "02" + "1" * 64,
+            "source_peer_id": "peer3",
+            "destination_peer_id": "peer4",
+            "fee_ppm": 300,
+            "success": True,
+            "volume_sats": 50_000,
+            "timestamp": time.time(),
+        })
+        self.coordinator.receive_marker_from_gossip({"depositor": "x"})
+
+        assert [(m.source_peer_id, m.destination_peer_id) for m in seen] == [
+            ("peer1", "peer2"), ("peer3", "peer4")
+        ]
+
     def test_read_markers(self):
         """Test reading markers for a route."""
         # Deposit some markers
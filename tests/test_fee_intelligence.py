@@ -53,9 +53,16 @@ class MockDatabase:
     def get_fee_intelligence_for_peer(self, target_peer_id, max_age_hours=24):
         return [r for r in self.fee_intelligence if r.get("target_peer_id") == target_peer_id]
 
+    def get_fee_intelligence_for_peers(self, target_peer_ids, max_age_hours=24):
+        return [r for r in self.fee_intelligence if r.get("target_peer_id") in target_peer_ids]
+
     def update_peer_fee_profile(self, peer_id, **kwargs):
         self.fee_profiles[peer_id] = {"peer_id": peer_id, **kwargs}
 
+    def update_peer_fee_profiles(self, profiles):
+        for profile in profiles:
+            self.update_peer_fee_profile(**profile)
+
     def get_peer_fee_profile(self, peer_id):
         return self.fee_profiles.get(peer_id)
 
@@ -379,11 +386,7 @@ class TestRateLimiting:
     def test_rate_limit_allows_initial(self):
         """Test that initial snapshot messages are allowed."""
         sender = "02" + "b" * 64
-        assert self.manager._check_rate_limit(
-            sender,
-            self.manager._fee_intel_snapshot_rate,
-            FEE_INTELLIGENCE_SNAPSHOT_RATE_LIMIT
-        ) is True
+        assert self.manager._fee_intel_snapshot_rate.check(sender) is True
 
     def test_rate_limit_blocks_excess(self):
         """Test that excess snapshot messages are blocked."""
@@ -392,14 +395,10 @@ class TestRateLimiting:
 
         # Fill up to limit
         for _ in range(max_count):
-            self.manager._record_message(sender, self.manager._fee_intel_snapshot_rate)
+            self.manager._fee_intel_snapshot_rate.record(sender)
 
         # Next should be blocked
-        assert self.manager._check_rate_limit(
-            sender,
-            self.manager._fee_intel_snapshot_rate,
-            FEE_INTELLIGENCE_SNAPSHOT_RATE_LIMIT
-        ) is False
+        assert self.manager._fee_intel_snapshot_rate.check(sender) is False
 
 
 class TestDatabaseCleanup:
@@ -536,6 +535,44 @@ class TestFeeProfileAggregationWeighting:
         updated = self.manager.aggregate_fee_profiles()
         assert updated == 1
 
+    def _report(self, target, fee, reporter="02" + "c" * 64):
+        return {
+            "reporter_id": reporter,
+            "target_peer_id": target,
+            "timestamp": int(time.time()),
+            "our_fee_ppm": fee,
+            "forward_count": 5,
+            "forward_volume_sats": 100000,
+            "revenue_sats": 10,
+            "flow_direction": "balanced",
+            "utilization_pct": 0.5,
+        }
+
+    def test_incremental_aggregation_only_dirty_peers(self):
+        """After the first full pass, only peers with new reports are recomputed."""
+        target_a = "03" + "a" * 64
+        target_b = "03" + "b" * 64
+        self.db.fee_intelligence.extend([self._report(target_a, 100), self._report(target_b, 200)])
+
+        assert self.manager.aggregate_fee_profiles() == 2
+        assert self.manager.aggregate_fee_profiles() == 0
+
+        self.db.fee_intelligence.append(self._report(target_a, 300, reporter="02" + "d" * 64))
+        self.manager.mark_peers_dirty([target_a])
+        assert self.manager.aggregate_fee_profiles() == 1
+        assert self.db.get_peer_fee_profile(target_a)["avg_fee_charged"] == 200
+        assert self.db.get_peer_fee_profile(target_b)["avg_fee_charged"] == 200
+
+        # Explicit full pass recomputes everything
+        assert self.manager.aggregate_fee_profiles(full=True) == 2
+
+    def test_local_observation_marks_dirty(self):
+        """Local observations flag the peer for re-aggregation."""
+        self.manager.aggregate_fee_profiles()
+        self.db.store_fee_intelligence = MagicMock(return_value=1)
+        self.manager.store_local_observation(target_peer_id="03" + "e" * 64, our_fee_ppm=100)
+        assert "03" + "e" * 64 in self.manager._dirty_peers
+
 
 class TestFeeRecommendationEdgeCases:
     """Test fee recommendation edge cases."""
@@ -714,18 +751,38 @@ class TestFeeIntelligenceSnapshot:
 
         # Should allow first few messages
         for i in range(FEE_INTELLIGENCE_SNAPSHOT_RATE_LIMIT[0]):
-            allowed = self.manager._check_rate_limit(
-                sender_id,
-                self.manager._fee_intel_snapshot_rate,
-                FEE_INTELLIGENCE_SNAPSHOT_RATE_LIMIT
-            )
-            self.manager._record_message(sender_id, self.manager._fee_intel_snapshot_rate)
+            allowed = self.manager._fee_intel_snapshot_rate.check(sender_id)
+            self.manager._fee_intel_snapshot_rate.record(sender_id)
             assert allowed is True
 
         # Should reject the next one
-        allowed = self.manager._check_rate_limit(
-            sender_id,
-            self.manager._fee_intel_snapshot_rate,
-            FEE_INTELLIGENCE_SNAPSHOT_RATE_LIMIT
-        )
+        allowed = self.manager._fee_intel_snapshot_rate.check(sender_id)
         assert allowed is False
+
+
+class TestFeeProfileStorage:
+    """Test batched fee profile upserts against a real database."""
+
+    def test_batch_upsert_joins_outer_transaction(self, tmp_path):
+        """update_peer_fee_profiles() must not commit or roll back on its own."""
+        from modules.database import HiveDatabase
+
+        db = HiveDatabase(str(tmp_path / "fee_profiles.db"), MagicMock())
+        db.initialize()
+        peer_id = "03" + "a" * 64
+        profile = {
+            "peer_id": peer_id, "reporter_count": 2, "avg_fee_charged": 150,
+            "min_fee_charged": 100, "max_fee_charged": 200,
+            "total_hive_volume": 1_000_000, "total_hive_revenue": 150,
+            "avg_utilization": 0.4,
+        }
+
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.update_peer_fee_profiles([profile])
+                raise RuntimeError("abort")
+        assert db.get_peer_fee_profile(peer_id) is None
+
+        with db.transaction():
+            db.update_peer_fee_profiles([profile])
+        assert db.get_peer_fee_profile(peer_id)["reporter_count"] == 2
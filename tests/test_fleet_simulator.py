@@ -0,0 +1,163 @@
+"""
+Tests for the in-process fleet simulator (tools/fleet_simulator.py).
+
+Tests cover:
+- Bus semantics: unconnected/offline/partitioned peers refused, loss,
+  oversize messages
+- Gossip convergence and relay amplification on a full mesh
+- Partition and heal with anti-entropy
+- FULL_SYNC catch-up after a node was offline
+- MCF coordinator failover and intent tie-breaking
+- Determinism and restoring the real clock
+"""
+
+import os
+import random
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tools'))
+
+from fleet_simulator import (  # noqa: E402
+    ELECTION_CHECK_INTERVAL, FleetSimulator, SimBus, SimLoop, SimSendError,
+)
+from modules.mcf_solver import MAX_GOSSIP_AGE_FOR_MCF  # noqa: E402
+from modules.protocol import HiveMessageType, MAX_MESSAGE_BYTES, serialize  # noqa: E402
+
+
+class TestSimBus:
+
+    @pytest.fixture
+    def bus(self):
+        bus = SimBus(SimLoop(), random.Random(1), latency=0.1)
+        self.received = []
+        for peer in ("a", "b", "c"):
+            bus.attach(peer, lambda src, data, peer=peer: self.received.append((src, peer)))
+        bus.connect("a", "b")
+        return bus
+
+    def test_delivers_after_latency(self, bus):
+        bus.send("a", "b", serialize(HiveMessageType.GOSSIP, {}))
+        assert self.received == []
+        bus.loop.run_for(0.1)
+        assert self.received == [("a", "b")]
+        assert bus.sent_by_type == {"GOSSIP": 1}
+
+    def test_refuses_unreachable_peers(self, bus):
+        msg = serialize(HiveMessageType.GOSSIP, {})
+        with pytest.raises(SimSendError):
+            bus.send("a", "c", msg)           # no link
+        bus.online.discard("b")
+        with pytest.raises(SimSendError):
+            bus.send("a", "b", msg)           # offline
+        bus.online.add("b")
+        bus.partition([["a"]])
+        with pytest.raises(SimSendError):
+            bus.send("a", "b", msg)           # partitioned
+        bus.heal()
+        bus.send("a", "b", msg)
+        assert bus.counters["refused"] == 3
+
+    def test_loss_and_oversize(self, bus):
+        bus.loss = 1.0
+        bus.send("a", "b", serialize(HiveMessageType.GOSSIP, {}))
+        bus.loop.run_for(1)
+        assert self.received == []
+        assert bus.counters["lost"] == 1
+
+        with pytest.raises(SimSendError):
+            bus.send("a", "b", b"HIVE" + b"x" * MAX_MESSAGE_BYTES)
+        assert bus.counters["oversize"] == 1
+
+
+class TestFleetSimulator:
+
+    def test_mesh_gossip_convergence(self):
+        with FleetSimulator(n_nodes=8, topology="mesh", seed=3) as sim:
+            sim.bootstrap()
+            assert sim.is_converged()
+            result = sim.measure_gossip_convergence()
+
+        assert result["converged"]
+        assert result["nodes_reached"] == 7
+        assert result["convergence_seconds"] == pytest.approx(0.05)
+        # Every receiver relays once to everyone but the sender
+        assert result["gossip_delivered"] == 7 + 7 * 6
+        assert result["relay_amplification"] == 7.0
+
+    def test_partition_heals_with_anti_entropy(self):
+        with FleetSimulator(n_nodes=8, topology="mesh", seed=3) as sim:
+            sim.bootstrap()
+            left, right = sim.node_ids[:4], sim.node_ids[4:]
+            sim.partition(left, right)
+            result = sim.measure_gossip_convergence(origin=left[0], timeout=10)
+            assert not result["converged"]
+            assert result["nodes_reached"] == 3
+
+            sim.heal()
+            sim.anti_entropy_round()
+            sim.run_for(10)
+            assert sim.is_converged()
+
+    def test_full_sync_after_offline(self):
+        with FleetSimulator(n_nodes=8, topology="mesh", seed=3) as sim:
+            sim.bootstrap()
+            result = sim.measure_full_sync(peer_id=sim.node_ids[5])
+
+        assert result["stale_states"] == 7
+        assert result["synced"]
+        assert result["full_sync_messages"] == 7
+        assert result["full_sync_bytes"] > 0
+        assert result["oversize_refused"] == 0
+
+    def test_mcf_failover(self):
+        with FleetSimulator(n_nodes=6, topology="mesh", seed=3) as sim:
+            sim.bootstrap()
+            result = sim.measure_mcf_failover()
+            expected = sorted(sim.node_ids)[1]
+
+        assert result["agreed_before"]
+        assert result["new_coordinator"] == expected
+        assert 0 < result["failover_seconds"] <= MAX_GOSSIP_AGE_FOR_MCF + ELECTION_CHECK_INTERVAL
+        assert result["split_brain_seconds"] == 0
+
+    def test_intent_race_lowest_pubkey_wins(self):
+        with FleetSimulator(n_nodes=8, topology="mesh", seed=3) as sim:
+            sim.bootstrap()
+            result = sim.measure_intent_race(initiators=3)
+
+        assert result["resolved"]
+        assert result["survivors"] == [min(result["initiators"])]
+        assert result["abort_messages"] == 2 * 7
+
+    def test_sparse_ring_limits_relay_reach(self):
+        with FleetSimulator(n_nodes=20, topology="ring", degree=2, seed=3) as sim:
+            result = sim.measure_gossip_convergence(origin=sim.node_ids[0], timeout=10)
+        assert not result["converged"]
+        assert 2 <= result["nodes_reached"] < 19
+        assert result["traffic"]["counters"]["refused"] > 0
+
+    def test_deterministic_for_seed(self):
+        def run():
+            with FleetSimulator(n_nodes=10, topology="random", degree=3,
+                                jitter=0.02, loss=0.1, seed=11) as sim:
+                sim.bootstrap()
+                return sim.measure_gossip_convergence(), sim.bus.snapshot()
+
+        assert run() == run()
+
+    def test_restores_clock(self):
+        real_time = time.time
+        with FleetSimulator(n_nodes=2) as sim:
+            assert time.time() == sim.loop.now
+            sim.run_for(3600)
+            assert time.time() == sim.loop.now
+        assert time.time is real_time
+
+    def test_rejects_bad_config(self):
+        with pytest.raises(ValueError):
+            FleetSimulator(n_nodes=1)
+        with pytest.raises(ValueError):
+            FleetSimulator(topology="star")
@@ -0,0 +1,200 @@
+"""
+Tests for the batched forward event pipeline.
+
+Tests cover:
+- Micro-batching with one context lookup and one transaction per batch
+- After-commit consumers run outside the transaction
+- Consumer errors are isolated and counted
+- Backpressure: drops when the queue stays full
+- Lag reporting and the background worker draining on shutdown
+- HiveDatabase.transaction commit/rollback
+"""
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.forward_pipeline import ForwardEventPipeline
+from modules.database import HiveDatabase
+
+
+def _event(i, status="settled"):
+    return {"in_channel": "1x1x1", "out_channel": "2x2x2", "status": status,
+            "fee_msat": 1000 * i, "payment_hash": f"h{i}"}
+
+
+class _Recorder:
+    def __init__(self):
+        self.calls = []
+        self.in_transaction = False
+        self.transactions = 0
+        self.contexts = 0
+
+    @contextmanager
+    def transaction(self):
+        self.transactions += 1
+        self.in_transaction = True
+        try:
+            yield
+        finally:
+            self.in_transaction = False
+
+    def context(self):
+        self.contexts += 1
+        return {"1x1x1": "peer_a", "2x2x2": "peer_b"}
+
+    def consumer(self, name):
+        def consume(events, context):
+            self.calls.append((name, len(events), context, self.in_transaction))
+        return consume
+
+
+class TestForwardEventPipeline:
+
+    def test_batches_share_context_and_transaction(self):
+        rec = _Recorder()
+        pipeline = ForwardEventPipeline(
+            context_factory=rec.context, transaction=rec.transaction, max_batch=50
+        )
+        pipeline.add_consumer("a", rec.consumer("a"))
+        pipeline.add_consumer("gossip", rec.consumer("gossip"), after_commit=True)
+        pipeline.add_consumer("b", rec.consumer("b"))
+
+        for i in range(120):
+            assert pipeline.submit(_event(i))
+        assert pipeline.process_pending() == 120
+
+        # 3 batches (50, 50, 20), each with one lookup and one transaction
+        assert rec.contexts == 3
+        assert rec.transactions == 3
+        sizes = [n for name, n, _, _ in rec.calls if name == "a"]
+        assert sizes == [50, 50, 20]
+        # In-transaction consumers in order, after-commit consumer outside
+        assert [(name, in_txn) for name, _, _, in_txn in rec.calls[:3]] == [
+            ("a", True), ("b", True), ("gossip", False)
+        ]
+        assert rec.calls[0][2] == {"1x1x1": "peer_a", "2x2x2": "peer_b"}
+
+        stats = pipeline.get_stats()
+        assert stats["submitted"] == 120
+        assert stats["processed"] == 120
+        assert stats["batches"] == 3
+        assert stats["queue_depth"] == 0
+
+    def test_consumer_error_is_isolated(self):
+        rec = _Recorder()
+        pipeline = ForwardEventPipeline(transaction=rec.transaction)
+
+        def broken(events, context):
+            raise RuntimeError("boom")
+
+        pipeline.add_consumer("broken", broken)
+        pipeline.add_consumer("ok", rec.consumer("ok"))
+        pipeline.submit(_event(1))
+        pipeline.process_pending()
+
+        assert [name for name, *_ in rec.calls] == ["ok"]
+        assert pipeline.get_stats()["consumer_errors"] == {"broken": 1, "ok": 0}
+
+    def test_context_error_still_runs_consumers(self):
+        rec = _Recorder()
+
+        def failing_context():
+            raise RuntimeError("rpc down")
+
+        pipeline = ForwardEventPipeline(context_factory=failing_context)
+        pipeline.add_consumer("a", rec.consumer("a"))
+        pipeline.submit(_event(1))
+        pipeline.process_pending()
+        assert rec.calls == [("a", 1, None, False)]
+
+    def test_drops_when_queue_full(self):
+        log = MagicMock()
+        pipeline = ForwardEventPipeline(max_queue=5, enqueue_timeout=0, log=log)
+        results = [pipeline.submit(_event(i)) for i in range(8)]
+        assert results == [True] * 5 + [False] * 3
+
+        stats = pipeline.get_stats()
+        assert stats["queue_depth"] == 5
+        assert stats["dropped"] == 3
+        # Drop warnings are rate limited
+        assert log.call_count == 1
+
+    def test_backpressure_waits_for_worker(self):
+        pipeline = ForwardEventPipeline(max_queue=2, enqueue_timeout=5)
+        pipeline.submit(_event(1))
+        pipeline.submit(_event(2))
+
+        timer = threading.Timer(0.05, pipeline.process_pending)
+        timer.start()
+        assert pipeline.submit(_event(3))
+        timer.join()
+        assert pipeline.get_stats()["dropped"] == 0
+
+    def test_lag_reported(self):
+        pipeline = ForwardEventPipeline()
+        pipeline.submit(_event(1), now=1000.0)
+        pipeline.submit(_event(2), now=1002.0)
+        assert pipeline.get_stats(now=1005.0)["oldest_queued_age_seconds"] == 5.0
+
+        pipeline.process_pending(now=1010.0)
+        stats = pipeline.get_stats(now=1010.0)
+        assert stats["last_lag_seconds"] == 10.0
+        assert stats["max_lag_seconds"] == 10.0
+        assert stats["oldest_queued_age_seconds"] == 0.0
+
+    def test_worker_processes_and_drains_on_shutdown(self):
+        rec = _Recorder()
+        pipeline = ForwardEventPipeline(max_batch=10, max_delay=0.01)
+        pipeline.add_consumer("a", rec.consumer("a"))
+        shutdown = threading.Event()
+        worker = threading.Thread(target=pipeline.run, args=(shutdown,), daemon=True)
+        worker.start()
+
+        for i in range(25):
+            pipeline.submit(_event(i))
+        deadline = time.time() + 5
+        while pipeline.get_stats()["processed"] < 25 and time.time() < deadline:
+            time.sleep(0.01)
+        assert pipeline.get_stats()["processed"] == 25
+
+        shutdown.set()
+        worker.join(timeout=5)
+        assert not worker.is_alive()
+        assert sum(n for _, n, _, _ in rec.calls) == 25
+
+
+class TestDatabaseTransaction:
+
+    @pytest.fixture
+    def database(self, tmp_path):
+        db = HiveDatabase(str(tmp_path / "test.db"), MagicMock())
+        db.initialize()
+        return db
+
+    def test_commits_batch(self, database):
+        with database.transaction():
+            database.record_pool_revenue("member", 10)
+            # Nested use joins the outer transaction
+            with database.transaction():
+                database.record_pool_revenue("member", 20)
+        conn = database._get_connection()
+        row = conn.execute("SELECT SUM(amount_sats) AS total FROM pool_revenue").fetchone()
+        assert row["total"] == 30
+
+    def test_rolls_back_on_error(self, database):
+        with pytest.raises(RuntimeError):
+            with database.transaction():
+                database.record_pool_revenue("member", 10)
+                raise RuntimeError("fail")
+        conn = database._get_connection()
+        assert not conn.in_transaction
+        row = conn.execute("SELECT COUNT(*) AS cnt FROM pool_revenue").fetchone()
+        assert row["cnt"] == 0
@@ -0,0 +1,99 @@
+"""
+Tests for the local Kalman filter bank.
+
+Tests cover:
+- Velocity convergence on a constant drain and under measurement noise
+- Swap-remove of closed channels keeps other filters intact
+- Integration with AnticipatoryLiquidityManager channel snapshots
+"""
+
+import random
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.kalman_bank import KalmanFilterBank, KALMAN_MIN_STEP_SECONDS
+from modules.anticipatory_liquidity import (
+    AnticipatoryLiquidityManager, LOCAL_KALMAN_MIN_UPDATES,
+)
+
+
+T0 = 1_700_000_000
+
+
+class TestKalmanFilterBank:
+
+    def test_converges_to_constant_velocity(self):
+        bank = KalmanFilterBank()
+        for h in range(48):
+            bank.update_batch({"a": 0.9 - 0.01 * h, "b": 0.5}, T0 + h * 3600)
+
+        velocity, std = bank.velocity("a")
+        assert velocity == pytest.approx(-0.01, abs=1e-4)
+        assert bank.velocity("b")[0] == pytest.approx(0.0, abs=1e-6)
+        assert std < 0.01
+        assert bank.state("a")["ratio"] == pytest.approx(0.9 - 0.01 * 47, abs=1e-3)
+        assert bank.updates("a") == 47
+
+    def test_noisy_observations(self):
+        rng = random.Random(1)
+        bank = KalmanFilterBank()
+        for h in range(96):
+            bank.update_batch({"a": 0.2 + 0.005 * h + rng.gauss(0, 0.01)}, T0 + h * 3600)
+        assert bank.velocity("a")[0] == pytest.approx(0.005, abs=0.002)
+
+    def test_close_observations_merged(self):
+        bank = KalmanFilterBank()
+        bank.update_batch({"a": 0.5}, T0)
+        assert bank.update_batch({"a": 0.4}, T0 + KALMAN_MIN_STEP_SECONDS - 1) == 0
+        assert bank.update_batch({"a": 0.4}, T0 + KALMAN_MIN_STEP_SECONDS) == 1
+
+    def test_retain_swap_remove(self):
+        bank = KalmanFilterBank()
+        channels = {f"c{i}": i / 10 for i in range(5)}
+        bank.update_batch(channels, T0)
+        before = {c: bank.state(c) for c in channels}
+
+        assert bank.retain(["c1", "c4"]) == 3
+        assert len(bank) == 2
+        assert "c0" not in bank
+        assert bank.state("c4") == before["c4"]
+        assert bank.state("c1") == before["c1"]
+        assert bank.velocity("c0") is None
+
+
+class TestManagerLocalVelocity:
+
+    def test_snapshot_steps_filters(self, monkeypatch):
+        plugin = MagicMock()
+        manager = AnticipatoryLiquidityManager(database=MagicMock(), plugin=plugin)
+        clock = {"now": T0}
+        monkeypatch.setattr(time, "time", lambda: clock["now"])
+
+        for h in range(LOCAL_KALMAN_MIN_UPDATES + 6):
+            clock["now"] = T0 + h * 3600
+            plugin.rpc.listpeerchannels.return_value = {"channels": [{
+                "short_channel_id": "800000x1x0", "peer_id": "03" + "a" * 64,
+                "state": "CHANNELD_NORMAL", "total_msat": 10_000_000_000,
+                "to_us_msat": int((0.8 - 0.02 * h) * 10_000_000_000),
+            }]}
+            manager.get_channel_snapshot(force=True)
+
+        velocity = manager._get_local_kalman_velocity("800000x1x0")
+        assert velocity == pytest.approx(-0.02, abs=0.002)
+        assert manager._calculate_velocity("800000x1x0", 10_000_000) == velocity
+        assert manager.get_kalman_velocity_status()["local_filters_ready"] == 1
+
+        # Stale filter is ignored
+        clock["now"] += 4 * 3600
+        assert manager._get_local_kalman_velocity("800000x1x0") is None
+
+    def test_not_ready_until_min_updates(self):
+        manager = AnticipatoryLiquidityManager(database=MagicMock(), plugin=None)
+        manager._kalman_bank.update_batch({"a": 0.5}, int(time.time()))
+        assert manager._get_local_kalman_velocity("a") is None
@@ -325,11 +325,7 @@ class TestRateLimiting:
     def test_rate_limit_allows_initial(self):
         """Test that initial messages are allowed."""
         sender = "02" + "b" * 64
-        assert self.coordinator._check_rate_limit(
-            sender,
-            self.coordinator._need_rate,
-            LIQUIDITY_NEED_RATE_LIMIT
-        ) is True
+        assert self.coordinator._need_rate.check(sender) is True
 
     def test_rate_limit_blocks_excess(self):
         """Test that excess messages are blocked."""
@@ -338,17 +334,10 @@ class TestRateLimiting:
 
         # Fill up to limit
         for _ in range(max_count):
-            self.coordinator._record_message(
-                sender,
-                self.coordinator._need_rate
-            )
+            self.coordinator._need_rate.record(sender)
 
         # Next should be blocked
-        assert self.coordinator._check_rate_limit(
-            sender,
-            self.coordinator._need_rate,
-            LIQUIDITY_NEED_RATE_LIMIT
-        ) is False
+        assert self.coordinator._need_rate.check(sender) is False
 
 
 class TestNNLBAssistanceStatus:
@@ -660,20 +649,12 @@ class TestLiquiditySnapshot:
 
         # Should allow first few snapshots
         for i in range(LIQUIDITY_SNAPSHOT_RATE_LIMIT[0]):
-            allowed = self.coordinator._check_rate_limit(
-                sender_id,
-                self.coordinator._snapshot_rate,
-                LIQUIDITY_SNAPSHOT_RATE_LIMIT
-            )
-            self.coordinator._record_message(sender_id, self.coordinator._snapshot_rate)
+            allowed = self.coordinator._snapshot_rate.check(sender_id)
+            self.coordinator._snapshot_rate.record(sender_id)
             assert allowed is True
 
         # Should reject the next one
-        allowed = self.coordinator._check_rate_limit(
-            sender_id,
-            self.coordinator._snapshot_rate,
-            LIQUIDITY_SNAPSHOT_RATE_LIMIT
-        )
+        allowed = self.coordinator._snapshot_rate.check(sender_id)
         assert allowed is False
 
     def test_handle_snapshot_valid(self):
@@ -30,6 +30,7 @@ from modules.mcf_solver import (
     HIVE_INTERNAL_COST_PPM,
     DEFAULT_EXTERNAL_COST_PPM,
     INFINITY,
+    MAX_MCF_NODES,
 )
 
 
@@ -373,6 +374,18 @@ class TestMCFNetwork:
         assert forward.reverse_edge_idx == 1
         assert reverse.reverse_edge_idx == 0
 
+    def test_add_edge_at_node_limit(self):
+        """Edges to nodes beyond the node limit are skipped, not KeyErrors."""
+        network = MCFNetwork()
+        for i in range(MAX_MCF_NODES):
+            network.add_node(f"02{i:064x}")
+
+        edge_idx = network.add_edge("02" + "0" * 64, "03" + "f" * 64, 1_000_000, 100)
+
+        assert edge_idx == -1
+        assert network.get_node_count() == MAX_MCF_NODES
+        assert network.get_edge_count() == 0
+
     def test_setup_super_source_sink(self):
         """Test super-source and super-sink setup."""
         network = MCFNetwork()
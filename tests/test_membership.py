@@ -141,6 +141,25 @@ def test_promotion_validation_caps():
     assert validate_promotion(payload) is False
 
 
+def test_sync_bridge_policies_batches():
+    db = MagicMock()
+    db.get_all_members.return_value = [
+        {"peer_id": "02" + "a" * 64, "tier": MembershipTier.MEMBER.value},
+        {"peer_id": "02" + "b" * 64, "tier": MembershipTier.NEOPHYTE.value},
+        {"peer_id": None, "tier": MembershipTier.MEMBER.value},
+    ]
+    bridge = MagicMock()
+    bridge.status.value = "enabled"
+    bridge.set_hive_policies.return_value = {"02" + "a" * 64: True, "02" + "b" * 64: False}
+    mgr = MembershipManager(db, MagicMock(), MagicMock(), bridge, DummyConfig())
+
+    assert mgr.sync_bridge_policies() == 1
+    bridge.set_hive_policies.assert_called_once_with(
+        {"02" + "a" * 64: True, "02" + "b" * 64: False}, bypass_rate_limit=True
+    )
+    bridge.set_hive_policy.assert_not_called()
+
+
 def test_vouch_validation_missing_fields():
     assert validate_vouch({"target_pubkey": "x"}) is False
 
@@ -0,0 +1,232 @@
+"""
+Tests for the HiveDatabase write-through membership cache.
+
+Tests cover:
+- Cached reads matching hive_members / hive_bans after every write path
+- Version counter and subscriber notifications
+- Writers on other threads not deadlocking against an open transaction
+- No SQLite queries on hot reads once loaded
+- NetworkMetricsCalculator invalidation via subscription
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.database import HiveDatabase
+from modules.network_metrics import NetworkMetricsCalculator
+
+
+PEER_A = '03' + 'a' * 64
+PEER_B = '03' + 'b' * 64
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = HiveDatabase(str(tmp_path / "test_members.db"), MagicMock())
+    db.initialize()
+    return db
+
+
+def _sql_members(db):
+    rows = db._get_connection().execute(
+        "SELECT * FROM hive_members ORDER BY tier, joined_at"
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+class TestMembershipCache:
+
+    def test_reads_match_table(self, database):
+        now = int(time.time())
+        database.add_member(PEER_A, tier='member', joined_at=now - 100)
+        database.add_member(PEER_B, joined_at=now - 50)
+        assert database.get_all_members() == _sql_members(database)
+
+        database.update_member(PEER_B, tier='member', promoted_at=now, vouch_count=3)
+        database.update_member(PEER_A, addresses='["1.2.3.4:9735"]')
+        assert database.get_all_members() == _sql_members(database)
+        assert database.get_member(PEER_B)['vouch_count'] == 3
+
+        database.remove_member(PEER_A)
+        assert database.get_member(PEER_A) is None
+        assert database.get_all_members() == _sql_members(database)
+        assert database.get_member_count_by_tier() == {'member': 1}
+
+    def test_existing_rows_loaded(self, tmp_path):
+        path = str(tmp_path / "existing.db")
+        first = HiveDatabase(path, MagicMock())
+        first.initialize()
+        first.add_member(PEER_A, tier='member')
+        first.add_ban(PEER_B, 'test', PEER_A)
+
+        second = HiveDatabase(path, MagicMock())
+        assert second.get_member(PEER_A)['tier'] == 'member'
+        assert second.is_banned(PEER_B)
+        assert second.get_membership_hash() == first.get_membership_hash()
+
+    def test_returned_rows_are_copies(self, database):
+        database.add_member(PEER_A)
+        database.get_member(PEER_A)['tier'] = 'member'
+        database.get_all_members()[0]['tier'] = 'member'
+        assert database.get_member(PEER_A)['tier'] == 'neophyte'
+
+    def test_hot_reads_skip_sqlite(self, database):
+        database.add_member(PEER_A)
+        database.get_all_members()
+        database._local.conn = MagicMock()
+
+        for _ in range(100):
+            assert database.get_member(PEER_A) is not None
+            assert not database.is_banned(PEER_A)
+            database.get_membership_hash()
+        database._local.conn.execute.assert_not_called()
+
+    def test_bans(self, database):
+        database.add_member(PEER_A)
+        assert database.add_ban(PEER_A, 'leech', PEER_B)
+        assert not database.add_ban(PEER_A, 'leech', PEER_B)
+        assert database.is_banned(PEER_A)
+        assert database.remove_ban(PEER_A)
+        assert not database.is_banned(PEER_A)
+
+        database.add_ban(PEER_B, 'temp', PEER_A, expires_days=1)
+        database._ban_cache[PEER_B] = int(time.time()) - 1
+        assert not database.is_banned(PEER_B)
+
+    def test_hash_tracks_tier_changes(self, database):
+        database.add_member(PEER_A)
+        before = database.get_membership_hash()
+        database.update_member(PEER_A, last_seen=1)
+        assert database.get_membership_hash() == before
+        database.update_member(PEER_A, tier='member')
+        assert database.get_membership_hash() != before
+
+
+class TestMembershipNotifications:
+
+    def test_version_and_events(self, database):
+        events = []
+        database.subscribe_membership(lambda e, p, c: events.append((e, p, c)))
+        version = database.get_membership_version()
+
+        database.add_member(PEER_A)
+        database.add_member(PEER_A)  # duplicate: no event
+        database.update_member(PEER_A, tier='member')
+        database.update_member(PEER_B, tier='member')  # unknown: no event
+        database.add_ban(PEER_B, 'x', PEER_A)
+        database.remove_ban(PEER_B)
+        database.remove_member(PEER_A)
+
+        assert [(e, p) for e, p, _ in events] == [
+            ('added', PEER_A), ('updated', PEER_A), ('banned', PEER_B),
+            ('unbanned', PEER_B), ('removed', PEER_A),
+        ]
+        assert events[0][2]['tier'] == 'neophyte'
+        assert events[1][2] == {'tier': 'member'}
+        assert database.get_membership_version() == version + 5
+
+    def test_transaction_defers_events_until_commit(self, database):
+        events = []
+        database.subscribe_membership(lambda e, p, c: events.append((e, p)))
+
+        with database.transaction():
+            database.add_member(PEER_A)
+            database.add_ban(PEER_B, 'x', PEER_A)
+            assert events == []
+        assert events == [('added', PEER_A), ('banned', PEER_B)]
+
+    def test_rollback_resets_cache_without_events(self, database):
+        database.add_member(PEER_A)
+        events = []
+        database.subscribe_membership(lambda e, p, c: events.append((e, p)))
+        version = database.get_membership_version()
+
+        with pytest.raises(RuntimeError):
+            with database.transaction():
+                database.add_member(PEER_B)
+                database.update_member(PEER_A, tier='member')
+                database.remove_ban(PEER_B)
+                database.add_ban(PEER_B, 'x', PEER_A)
+                raise RuntimeError("abort")
+
+        assert events == []
+        assert database.get_all_members() == _sql_members(database)
+        assert database.get_member(PEER_A)['tier'] == 'neophyte'
+        assert database.get_member(PEER_B) is None
+        assert not database.is_banned(PEER_B)
+        assert database.get_membership_version() > version
+
+    @pytest.mark.parametrize("write", [
+        lambda db: db.update_member(PEER_A, last_seen=int(time.time())),
+        lambda db: db.add_ban(PEER_B, 'x', PEER_A),
+        lambda db: db.prune_old_contributions(older_than_days=1),
+        lambda db: db.record_contribution(PEER_A, 'received', 500),
+    ], ids=['update_member', 'add_ban', 'prune_contributions', 'record_contribution'])
+    def test_writer_waits_for_transaction_without_lock(self, database, write):
+        # Batch transaction (as in the forward pipeline) reading the caches
+        # while another thread's write waits for the database lock
+        database.add_member(PEER_A)
+        database.get_contribution_stats(PEER_A)
+        in_transaction = threading.Event()
+        errors = []
+
+        def batch():
+            try:
+                with database.transaction():
+                    database.record_contribution(PEER_A, 'forwarded', 1000)
+                    in_transaction.set()
+                    time.sleep(0.3)  # let the writer block on BEGIN/INSERT
+                    database.get_member(PEER_A)
+                    database.record_contribution(PEER_A, 'forwarded', 1000)
+            except Exception as e:
+                errors.append(e)
+
+        def writer():
+            in_transaction.wait()
+            try:
+                write(database)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=batch), threading.Thread(target=writer)]
+        start = time.time()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=10)
+
+        assert errors == []
+        assert time.time() - start < 3  # sqlite busy timeout is 5s
+        assert database.get_all_members() == _sql_members(database)
+        assert database.get_contribution_stats(PEER_A)['forwarded'] == 2000
+
+    def test_failing_listener_does_not_break_writes(self, database):
+        def broken(*args):
+            raise RuntimeError("boom")
+        database.subscribe_membership(broken)
+        assert database.add_member(PEER_A)
+        database.unsubscribe_membership(broken)
+        assert database.update_member(PEER_A, tier='member')
+
+    def test_network_metrics_invalidated(self, database):
+        calculator = NetworkMetricsCalculator(
+            state_manager=MagicMock(), database=database
+        )
+        calculator._cache_time = int(time.time())
+
+        database.update_member(PEER_A, last_seen=1)
+        database.add_member(PEER_A)
+        assert calculator._cache_time == 0
+
+        calculator._cache_time = int(time.time())
+        database.update_member(PEER_A, last_seen=int(time.time()))
+        assert calculator._cache_time > 0
+        database.update_member(PEER_A, tier='member')
+        assert calculator._cache_time == 0
@@ -0,0 +1,229 @@
+"""
+Tests for the OpenMetrics exporter.
+
+Tests cover:
+- Writer output format (TYPE/HELP, _total counters, summaries, escaping, EOF)
+- Collectors for perf histograms, relay, rate limiters, MCF health,
+  pending actions and the forward pipeline
+- Failing collectors are counted without breaking the scrape
+- Serving over HTTP and a unix socket
+"""
+
+import http.client
+import os
+import socket
+import sys
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.database import HiveDatabase
+from modules.metrics_exporter import (
+    METRICS_CONTENT_TYPE, MetricsExporter, MetricsWriter, find_rate_limiters,
+    write_mcf_health, write_pending_actions, write_perf_metrics,
+    write_rate_limiters, write_relay_stats,
+)
+from modules.mcf_solver import MCFCoordinator
+from modules.perf_metrics import PerfMetrics
+from modules.rate_limiter import RateLimiter
+
+
+def _samples(text):
+    """Parse sample lines into {"name{labels}": value}."""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+class TestMetricsWriter:
+
+    def test_format(self):
+        writer = MetricsWriter()
+        writer.counter("relay_failures", "Failed sends", [(None, 3)])
+        writer.gauge("pending_actions", "Pending", [({"type": 'a"b\\c'}, 2)])
+        writer.summary("db_query_seconds", "DB", [
+            ({"method": "get_member"}, {"count": 4, "sum": 0.5, "quantiles": {"0.5": 0.1}}),
+        ])
+        # A family is only written once
+        writer.gauge("pending_actions", "Pending", [({"type": "x"}, 1)])
+        text = writer.render()
+
+        assert text.endswith("# EOF\n")
+        assert "# TYPE cl_hive_relay_failures counter" in text
+        assert "cl_hive_relay_failures_total 3" in text
+        assert 'cl_hive_pending_actions{type="a\\"b\\\\c"} 2' in text
+        assert 'cl_hive_db_query_seconds{method="get_member",quantile="0.5"} 0.1' in text
+        assert 'cl_hive_db_query_seconds_sum{method="get_member"} 0.5' in text
+        assert 'cl_hive_db_query_seconds_count{method="get_member"} 4' in text
+        assert text.count("# TYPE cl_hive_pending_actions") == 1
+        assert 'type="x"' not in text
+
+
+class TestCollectors:
+
+    def test_perf_metrics(self):
+        metrics = PerfMetrics()
+        metrics.record("custommsg", "GOSSIP", 0.002)
+        metrics.record("custommsg", "GOSSIP", 0.004)
+        metrics.record("lock", "rpc", 0.0001)
+        writer = MetricsWriter()
+        write_perf_metrics(writer, metrics)
+        samples = _samples(writer.render())
+
+        assert samples['cl_hive_messages_received_total{type="GOSSIP"}'] == 2
+        assert samples['cl_hive_custommsg_handler_seconds_count{type="GOSSIP"}'] == 2
+        assert samples['cl_hive_custommsg_handler_seconds_sum{type="GOSSIP"}'] == pytest.approx(0.006)
+        assert samples['cl_hive_lock_wait_seconds_count{lock="rpc"}'] == 1
+        p99 = samples['cl_hive_custommsg_handler_seconds{type="GOSSIP",quantile="0.99"}']
+        assert 0.004 <= p99 <= 0.004 * 1.19
+
+    def test_relay_and_rate_limiters(self):
+        relay_mgr = MagicMock()
+        relay_mgr.stats.return_value = {
+            "messages_processed": 10, "messages_relayed": 6,
+            "messages_deduplicated": 4, "relay_failures": 1,
+            "dedup": {"cached_messages": 9},
+        }
+        limiter = RateLimiter(max_count=1, period_seconds=60)
+        limiter.is_allowed("peer")
+        limiter.is_allowed("peer")
+
+        manager = MagicMock(spec=[])
+        manager._probe_rate = RateLimiter(max_count=5, period_seconds=60)
+        limiters = find_rate_limiters({"peer_available": limiter, "routing": manager,
+                                       "missing": None})
+        assert sorted(limiters) == ["peer_available", "routing.probe_rate"]
+
+        writer = MetricsWriter()
+        write_relay_stats(writer, relay_mgr)
+        write_rate_limiters(writer, limiters)
+        samples = _samples(writer.render())
+
+        assert samples["cl_hive_relay_messages_deduplicated_total"] == 4
+        assert samples["cl_hive_relay_dedup_cache_size"] == 9
+        assert samples['cl_hive_rate_limit_rejected_total{limiter="peer_available"}'] == 1
+        assert samples['cl_hive_rate_limit_limited_keys{limiter="peer_available"}'] == 1
+        assert samples['cl_hive_rate_limit_rejected_total{limiter="routing.probe_rate"}'] == 0
+
+    def test_mcf_health(self):
+        coordinator = MCFCoordinator(MagicMock(), MagicMock(), MagicMock(), MagicMock(),
+                                     "02" + "a" * 64)
+        coordinator._health_metrics.record_solution(
+            flow_sats=500_000, cost_sats=120, assignments=3,
+            computation_time_ms=250, node_count=5, edge_count=8,
+        )
+        cost_reduction_mgr = MagicMock()
+        cost_reduction_mgr.get_mcf_health_metrics.return_value = coordinator.get_health_metrics()
+
+        writer = MetricsWriter()
+        write_mcf_health(writer, cost_reduction_mgr)
+        samples = _samples(writer.render())
+
+        assert samples["cl_hive_mcf_solve_seconds"] == 0.25
+        assert samples["cl_hive_mcf_solution_flow_sats"] == 500_000
+        assert samples['cl_hive_mcf_circuit_state{state="closed"}'] == 1
+        assert samples['cl_hive_mcf_circuit_state{state="open"}'] == 0
+
+        # MCF disabled: nothing written
+        cost_reduction_mgr.get_mcf_health_metrics.return_value = None
+        writer = MetricsWriter()
+        write_mcf_health(writer, cost_reduction_mgr)
+        assert writer.render() == "# EOF\n"
+
+    def test_pending_actions(self, tmp_path):
+        db = HiveDatabase(str(tmp_path / "metrics.db"), MagicMock())
+        db.initialize()
+        db.add_pending_action("channel_open", {"target": "a"})
+        db.add_pending_action("channel_open", {"target": "b"})
+        db.add_pending_action("ban", {"target": "c"})
+        expired = db.add_pending_action("ban", {"target": "d"}, expires_hours=1)
+        db._get_connection().execute(
+            "UPDATE pending_actions SET expires_at = ? WHERE id = ?",
+            (int(time.time()) - 1, expired)
+        )
+
+        writer = MetricsWriter()
+        write_pending_actions(writer, db)
+        samples = _samples(writer.render())
+        assert samples['cl_hive_pending_actions{type="channel_open"}'] == 2
+        assert samples['cl_hive_pending_actions{type="ban"}'] == 1
+
+
+class TestMetricsExporter:
+
+    def _exporter(self):
+        metrics = PerfMetrics()
+        metrics.record("loop", "gossip_loop", 0.01)
+
+        def broken(writer):
+            raise RuntimeError("boom")
+
+        return MetricsExporter([
+            lambda w: write_perf_metrics(w, metrics),
+            broken,
+        ])
+
+    def test_failing_collector_is_counted(self):
+        exporter = self._exporter()
+        samples = _samples(exporter.render())
+        assert samples['cl_hive_loop_iteration_seconds_count{loop="gossip_loop"}'] == 1
+        assert samples["cl_hive_metrics_collect_errors_total"] == 1
+        assert samples["cl_hive_metrics_scrapes_total"] == 1
+        assert exporter.get_stats()["collect_errors"] == 1
+
+    def test_serves_http(self):
+        exporter = self._exporter()
+        host, port = exporter.start_http(0)
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=5)
+            conn.request("GET", "/metrics")
+            response = conn.getresponse()
+            body = response.read().decode()
+            assert response.status == 200
+            assert response.getheader("Content-Type") == METRICS_CONTENT_TYPE
+            assert "cl_hive_loop_iteration_seconds_count" in body
+
+            conn.request("GET", "/other")
+            response = conn.getresponse()
+            response.read()
+            assert response.status == 404
+        finally:
+            exporter.stop()
+        assert exporter.get_stats()["listeners"] == 0
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="unix sockets unavailable")
+    def test_serves_unix_socket(self, tmp_path):
+        path = str(tmp_path / "metrics.sock")
+        # A stale socket from a previous run is replaced
+        stale = socket.socket(socket.AF_UNIX)
+        stale.bind(path)
+        stale.close()
+
+        exporter = self._exporter()
+        exporter.start_unix(path)
+        try:
+            client = socket.socket(socket.AF_UNIX)
+            client.settimeout(5)
+            client.connect(path)
+            client.sendall(b"GET /metrics HTTP/1.0\r\n\r\n")
+            data = b""
+            while chunk := client.recv(65536):
+                data += chunk
+            client.close()
+            assert data.startswith(b"HTTP/1.0 200")
+            assert data.rstrip().endswith(b"# EOF")
+        finally:
+            exporter.stop()
+        assert not os.path.exists(path)
+
+    def test_refuses_non_socket_path(self, tmp_path):
+        path = tmp_path / "metrics.sock"
+        path.write_text("not a socket")
+        with pytest.raises(FileExistsError):
+            MetricsExporter([]).start_unix(str(path))
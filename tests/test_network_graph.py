@@ -0,0 +1,130 @@
+"""
+Tests for the compact network graph used by the Planner.
+
+Tests cover:
+- Pubkey interning and bidirectional dedup
+- CSR adjacency / per-node capacity queries
+- SCID encoding round-trip (standard and non-standard ids)
+- Capacity parsing across CLN formats
+"""
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.network_graph import (
+    ChannelGraph, ChannelGraphBuilder, ChannelInfo,
+    encode_scid, decode_scid, parse_capacity_sats,
+)
+
+
+NODE_A = '02' + 'a' * 64
+NODE_B = '02' + 'b' * 64
+NODE_C = '02' + 'c' * 64
+
+
+def _build(channels):
+    builder = ChannelGraphBuilder()
+    for ch in channels:
+        builder.add_channel(*ch)
+    return builder.build()
+
+
+class TestChannelGraphBuilder:
+
+    def test_bidirectional_dedup(self):
+        builder = ChannelGraphBuilder()
+        assert builder.add_channel(NODE_A, NODE_B, '100x1x0', 1_000_000) is True
+        assert builder.add_channel(NODE_B, NODE_A, '100x1x0', 1_000_000) is False
+        graph = builder.build()
+
+        assert graph.channel_count == 1
+        assert graph.node_count == 2
+        assert graph.public_capacity(NODE_A) == 1_000_000
+        assert graph.public_capacity(NODE_B) == 1_000_000
+
+    def test_parallel_channels_kept(self):
+        graph = _build([
+            (NODE_A, NODE_B, '100x1x0', 1_000_000, True),
+            (NODE_A, NODE_B, '101x1x0', 3_000_000, True),
+        ])
+        assert graph.channel_count == 2
+        assert graph.max_capacity_between(NODE_A, NODE_B) == 3_000_000
+        assert graph.max_capacity_between(NODE_B, NODE_A) == 3_000_000
+        assert graph.partner_count(NODE_A) == 1
+
+    def test_missing_fields_rejected(self):
+        builder = ChannelGraphBuilder()
+        assert builder.add_channel('', NODE_B, '100x1x0', 1) is False
+        assert builder.add_raw({'source': NODE_A}) is False
+        assert len(builder) == 0
+
+
+class TestChannelGraphQueries:
+
+    def test_inactive_excluded_from_capacity(self):
+        graph = _build([
+            (NODE_A, NODE_B, '100x1x0', 1_000_000, True),
+            (NODE_C, NODE_B, '100x2x0', 5_000_000, False),
+        ])
+        assert graph.public_capacity(NODE_B) == 1_000_000
+        assert graph.degree(NODE_B) == 2
+        assert graph.partner_count(NODE_B) == 2
+
+    def test_mapping_compatibility(self):
+        graph = _build([(NODE_A, NODE_B, '100x1x0', 1_000_000, True)])
+        assert len(graph) == 2
+        assert NODE_A in graph
+        assert NODE_C not in graph
+        assert set(graph.keys()) == {NODE_A, NODE_B}
+        assert graph.get(NODE_C, []) == []
+
+        channels = graph.get(NODE_A)
+        assert channels == [ChannelInfo(
+            source=NODE_A, destination=NODE_B, short_channel_id='100x1x0',
+            capacity_sats=1_000_000, active=True,
+        )]
+
+    def test_unknown_node(self):
+        graph = ChannelGraph.empty()
+        assert len(graph) == 0
+        assert graph.public_capacity(NODE_A) == 0
+        assert graph.max_capacity_between(NODE_A, NODE_B) == 0
+        assert graph.channels(NODE_A) == []
+
+    def test_csr_slices(self):
+        graph = _build([
+            (NODE_A, NODE_B, '100x1x0', 1, True),
+            (NODE_A, NODE_C, '100x2x0', 2, True),
+            (NODE_B, NODE_C, '100x3x0', 4, True),
+        ])
+        for pubkey in (NODE_A, NODE_B, NODE_C):
+            nid = graph.node_id(pubkey)
+            assert len(graph.incident_edges(nid)) == 2
+        assert graph.public_capacity(NODE_C) == 6
+        assert graph.memory_bytes() > 0
+
+
+class TestScidAndCapacity:
+
+    def test_scid_roundtrip(self):
+        value = encode_scid('800000x1234x1')
+        assert value is not None
+        assert decode_scid(value) == '800000x1234x1'
+
+    def test_nonstandard_scid_preserved(self):
+        graph = _build([(NODE_A, NODE_B, 'scid-test', 1, True)])
+        assert encode_scid('scid-test') is None
+        assert graph.channels(NODE_A)[0].short_channel_id == 'scid-test'
+
+    @pytest.mark.parametrize('raw,expected', [
+        ({'satoshis': 1_000_000}, 1_000_000),
+        ({'amount_msat': 20_000_000_000}, 20_000_000),
+        ({'amount_msat': '3000000000msat'}, 3_000_000),
+        ({'amount_msat': {'msat': 4_000_000_000}}, 4_000_000),
+        ({}, 0),
+    ])
+    def test_parse_capacity(self, raw, expected):
+        assert parse_capacity_sats(raw) == expected
@@ -602,18 +602,10 @@ class TestPeerReputationSnapshot:
 
         # Should allow first few snapshots
         for i in range(PEER_REPUTATION_SNAPSHOT_RATE_LIMIT[0]):
-            allowed = mgr._check_rate_limit(
-                sender_id,
-                mgr._snapshot_rate,
-                PEER_REPUTATION_SNAPSHOT_RATE_LIMIT
-            )
-            mgr._record_message(sender_id, mgr._snapshot_rate)
+            allowed = mgr._snapshot_rate.check(sender_id)
+            mgr._snapshot_rate.record(sender_id)
             assert allowed is True
 
         # Should reject the next one
-        allowed = mgr._check_rate_limit(
-            sender_id,
-            mgr._snapshot_rate,
-            PEER_REPUTATION_SNAPSHOT_RATE_LIMIT
-        )
+        allowed = mgr._snapshot_rate.check(sender_id)
         assert allowed is False
@@ -0,0 +1,203 @@
+"""
+Tests for hot-path performance metrics and the sampling profiler.
+
+Tests cover:
+- Histogram percentiles, bounded memory and summaries
+- Timers, wrap/timed decorators and recording on exceptions
+- Instrumenting HiveDatabase methods (context managers skipped)
+- get_stats ordering/limit and reset
+- SamplingProfiler output in collapsed-stack format
+- hive-perf / hive-perf-profile RPC handlers
+"""
+
+import inspect
+import os
+import sys
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.database import HiveDatabase
+from modules.perf_metrics import (
+    PERF_BUCKET_COUNT, LatencyHistogram, PerfMetrics, SamplingProfiler,
+)
+from modules.rpc_commands import HiveContext, perf, perf_profile
+
+
+class TestLatencyHistogram:
+
+    def test_percentiles_within_bucket_error(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 101):
+            histogram.record(ms / 1000)
+
+        assert histogram.count == 100
+        assert histogram.max == pytest.approx(0.1)
+        for q, exact in ((0.50, 0.050), (0.95, 0.095), (0.99, 0.099)):
+            estimate = histogram.percentile(q)
+            assert exact <= estimate <= exact * 1.19
+
+        summary = histogram.to_dict()
+        assert summary["mean_ms"] == pytest.approx(50.5)
+        assert summary["p99_ms"] <= summary["max_ms"]
+
+    def test_out_of_range_values(self):
+        histogram = LatencyHistogram()
+        histogram.record(0.0)
+        histogram.record(10_000.0)
+        assert len(histogram.counts) == PERF_BUCKET_COUNT + 1
+        assert histogram.percentile(1.0) == 10_000.0
+        assert LatencyHistogram().percentile(0.5) == 0.0
+
+
+class TestPerfMetrics:
+
+    def test_timer_and_wrap(self):
+        metrics = PerfMetrics()
+        with metrics.timer("loop", "gossip_loop"):
+            pass
+        metrics.timer("loop", "gossip_loop").stop()
+
+        @metrics.timed("rpc")
+        def hive_status(plugin, verbose=False):
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            hive_status(None)
+
+        stats = metrics.get_stats()["categories"]
+        assert stats["loop"]["gossip_loop"]["count"] == 2
+        # Failures are timed too; the wrapper keeps the name and signature
+        assert stats["rpc"]["hive_status"]["count"] == 1
+        assert hive_status.__name__ == "hive_status"
+        assert list(inspect.signature(hive_status).parameters) == ["plugin", "verbose"]
+
+    def test_stats_order_limit_and_reset(self):
+        metrics = PerfMetrics()
+        metrics.record("db", "fast", 0.001)
+        metrics.record("db", "slow", 0.5)
+        metrics.record("rpc", "hive-status", 0.01)
+
+        db = metrics.get_stats("db")["categories"]["db"]
+        assert list(db) == ["slow", "fast"]
+        assert list(metrics.get_stats("db", limit=1)["categories"]["db"]) == ["slow"]
+
+        metrics.reset("db")
+        assert list(metrics.get_stats()["categories"]) == ["rpc"]
+        metrics.reset()
+        assert metrics.get_stats()["categories"] == {}
+
+    def test_disabled_records_nothing(self):
+        metrics = PerfMetrics(enabled=False)
+        metrics.record("db", "x", 1.0)
+        assert metrics.get_stats()["categories"] == {}
+
+    def test_instrument_database(self, tmp_path):
+        db = HiveDatabase(str(tmp_path / "perf.db"), MagicMock())
+        db.initialize()
+        metrics = PerfMetrics()
+        count = metrics.instrument(db, "db")
+        assert count > 50
+
+        # transaction() is a context manager and stays unwrapped
+        assert "transaction" not in vars(db)
+        with db.transaction():
+            db.add_member("02" + "a" * 64, tier="member")
+        assert db.get_member("02" + "a" * 64)["tier"] == "member"
+
+        stats = metrics.get_stats("db")["categories"]["db"]
+        assert stats["add_member"]["count"] == 1
+        assert stats["get_member"]["count"] >= 1
+
+
+class TestSamplingProfiler:
+
+    def test_writes_collapsed_stacks(self, tmp_path):
+        stop = threading.Event()
+
+        def busy_worker():
+            while not stop.is_set():
+                sum(range(1000))
+
+        worker = threading.Thread(target=busy_worker, name="cl-hive-busy", daemon=True)
+        worker.start()
+        path = str(tmp_path / "profile.txt")
+        profiler = SamplingProfiler()
+        try:
+            status = profiler.start(path, duration=0.3, interval=0.005)
+            assert status["running"]
+            assert "error" in profiler.start(path)   # one run at a time
+            profiler.join(timeout=5)
+        finally:
+            stop.set()
+            worker.join()
+
+        status = profiler.status()
+        assert not status["running"]
+        assert status["samples"] > 0
+        with open(path) as f:
+            lines = f.read().splitlines()
+        assert any(line.startswith("cl-hive-busy;") and "busy_worker" in line
+                   for line in lines)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+        assert not any("cl-hive-profiler" in line for line in lines)
+
+
+class TestPerfRpc:
+
+    def _ctx(self, **kwargs):
+        return HiveContext(database=None, config=None, safe_plugin=None,
+                           our_pubkey="02" + "0" * 64, **kwargs)
+
+    def test_perf_not_initialized(self):
+        assert "error" in perf(self._ctx())
+        assert "error" in perf_profile(self._ctx())
+
+    def test_perf_reports_and_resets(self):
+        metrics = PerfMetrics()
+        metrics.record("custommsg", "GOSSIP", 0.002)
+        ctx = self._ctx(perf_metrics=metrics, perf_profiler=SamplingProfiler())
+
+        result = perf(ctx, category="custommsg", reset=True)
+        assert result["categories"]["custommsg"]["GOSSIP"]["count"] == 1
+        assert result["profiler"] == {"running": False}
+        assert result["reset"]
+        assert perf(ctx)["categories"] == {}
+
+    def test_perf_profile_default_path(self, tmp_path):
+        database = MagicMock()
+        database.db_path = str(tmp_path / "cl_hive.db")
+        profiler = SamplingProfiler()
+        ctx = self._ctx(perf_metrics=PerfMetrics(), perf_profiler=profiler)
+        ctx.database = database
+
+        status = perf_profile(ctx, duration=0.1, interval_ms=5)
+        profiler.join(timeout=5)
+        assert os.path.dirname(status["path"]) == str(tmp_path)
+        assert os.path.exists(status["path"])
+
+    def test_perf_profile_confined_to_database_dir(self, tmp_path):
+        database = MagicMock()
+        database.db_path = str(tmp_path / "cl_hive.db")
+        (tmp_path / "cl_hive.db").write_text("db")
+        (tmp_path / "config").write_text("conf")
+        (tmp_path / "cl-hive-profile-old.txt").write_text("old 1\n")
+        profiler = SamplingProfiler()
+        ctx = self._ctx(perf_metrics=PerfMetrics(), perf_profiler=profiler)
+        ctx.database = database
+
+        for name in ("../escape.txt", str(tmp_path / "abs.txt"), "sub/x.txt",
+                     ".hidden", "..", "cl_hive.db", "cl_hive.db-wal", "config"):
+            assert "error" in perf_profile(ctx, duration=0.1, filename=name), name
+        assert profiler.status() == {"running": False}
+        assert (tmp_path / "cl_hive.db").read_text() == "db"
+        assert (tmp_path / "config").read_text() == "conf"
+
+        status = perf_profile(ctx, duration=0.1, interval_ms=5,
+                              filename="cl-hive-profile-old.txt")
+        profiler.join(timeout=5)
+        assert status["path"] == str(tmp_path / "cl-hive-profile-old.txt")
+        assert (tmp_path / "cl-hive-profile-old.txt").read_text() != "old 1\n"
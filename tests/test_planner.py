@@ -20,10 +20,11 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from modules.network_graph import ChannelInfo
 from modules.planner import (
-    Planner, ChannelInfo, SaturationResult, RpcError, ExpansionRecommendation,
+    Planner, SaturationResult, RpcError, ExpansionRecommendation,
     MAX_IGNORES_PER_CYCLE, SATURATION_RELEASE_THRESHOLD_PCT,
-    MIN_TARGET_CAPACITY_SATS, NETWORK_CACHE_TTL_SECONDS,
+    MIN_TARGET_CAPACITY_SATS, NETWORK_CACHE_TTL_SECONDS, CANDIDATE_MAX_AGE_SECONDS,
     # Cooperation module constants (Phase 7)
     HIVE_COVERAGE_MAJORITY_PCT, LOW_COMPETITION_CHANNELS,
     MEDIUM_COMPETITION_CHANNELS, HIGH_COMPETITION_CHANNELS,
@@ -32,6 +33,14 @@ from modules.planner import (
 )
 
 
+def _underserved_stub(results):
+    """Stand-in for get_underserved_targets that honours skip_target and limit."""
+    def get_underserved_targets(cfg, include_low_quality=False, limit=None, skip_target=None):
+        kept = [r for r in results if not (skip_target and skip_target(r.target))]
+        return kept[:limit] if limit is not None else kept
+    return get_underserved_targets
+
+
 # =============================================================================
 # FIXTURES
 # =============================================================================
@@ -683,14 +692,14 @@ class TestExpansionLogic:
         # Mock underserved targets
         from modules.planner import UnderservedResult
         with patch.object(planner, 'get_underserved_targets') as mock_get_underserved:
-            mock_get_underserved.return_value = [
+            mock_get_underserved.side_effect = _underserved_stub([
                 UnderservedResult(
                     target=target,
                     public_capacity_sats=200_000_000,
                     hive_share_pct=0.02,
                     score=2.0
                 )
-            ]
+            ])
 
             # Mock no pending intents
             mock_database.get_pending_intents.return_value = []
@@ -725,14 +734,14 @@ class TestExpansionLogic:
         # Mock underserved targets
         from modules.planner import UnderservedResult
         with patch.object(planner, 'get_underserved_targets') as mock_get_underserved:
-            mock_get_underserved.return_value = [
+            mock_get_underserved.side_effect = _underserved_stub([
                 UnderservedResult(
                     target=target,
                     public_capacity_sats=200_000_000,
                     hive_share_pct=0.02,
                     score=2.0
                 )
-            ]
+            ])
 
             # Mock existing pending intent for target
             mock_database.get_pending_intents.return_value = [
@@ -761,14 +770,14 @@ class TestExpansionLogic:
         # Mock underserved targets
         from modules.planner import UnderservedResult
         with patch.object(planner, 'get_underserved_targets') as mock_get_underserved:
-            mock_get_underserved.return_value = [
+            mock_get_underserved.side_effect = _underserved_stub([
                 UnderservedResult(
                     target=target,
                     public_capacity_sats=200_000_000,
                     hive_share_pct=0.02,
                     score=2.0
                 )
-            ]
+            ])
 
             # Mock no pending intents
             mock_database.get_pending_intents.return_value = []
@@ -799,14 +808,14 @@ class TestExpansionLogic:
         # Mock underserved targets
         from modules.planner import UnderservedResult
         with patch.object(planner, 'get_underserved_targets') as mock_get_underserved:
-            mock_get_underserved.return_value = [
+            mock_get_underserved.side_effect = _underserved_stub([
                 UnderservedResult(
                     target=target,
                     public_capacity_sats=200_000_000,
                     hive_share_pct=0.02,
                     score=2.0
                 )
-            ]
+            ])
 
             # Mock no pending intents
             mock_database.get_pending_intents.return_value = []
@@ -860,14 +869,14 @@ class TestExpansionLogic:
 
         from modules.planner import UnderservedResult
         with patch.object(planner, 'get_underserved_targets') as mock_get_underserved:
-            mock_get_underserved.return_value = [
+            mock_get_underserved.side_effect = _underserved_stub([
                 UnderservedResult(
                     target=target,
                     public_capacity_sats=200_000_000,
                     hive_share_pct=0.02,
                     score=2.0
                 )
-            ]
+            ])
 
             mock_database.get_pending_intents.return_value = []
 
@@ -931,14 +940,14 @@ class TestPlannerGovernanceIntegration:
 
         from modules.planner import UnderservedResult
         with patch.object(planner, 'get_underserved_targets') as mock_get_underserved:
-            mock_get_underserved.return_value = [
+            mock_get_underserved.side_effect = _underserved_stub([
                 UnderservedResult(
                     target=target,
                     public_capacity_sats=200_000_000,
                     hive_share_pct=0.02,
                     score=2.0
                 )
-            ]
+            ])
             mock_database.get_pending_intents.return_value = []
 
             decisions = planner._propose_expansion(mock_config, 'test-gov-integration')
@@ -993,14 +1002,14 @@ class TestPlannerGovernanceIntegration:
 
         from modules.planner import UnderservedResult
         with patch.object(planner, 'get_underserved_targets') as mock_get_underserved:
-            mock_get_underserved.return_value = [
+            mock_get_underserved.side_effect = _underserved_stub([
                 UnderservedResult(
                     target=target,
                     public_capacity_sats=200_000_000,
                     hive_share_pct=0.03,
                     score=1.9
                 )
-            ]
+            ])
             mock_database.get_pending_intents.return_value = []
 
             decisions = planner._propose_expansion(mock_config, 'test-gov-queued')
@@ -1069,6 +1078,113 @@ class TestUnderservedTargets:
         # Should not find the target (too small)
         assert len(underserved) == 0
 
+    def _big_target_graph(self, planner, mock_plugin, targets):
+        mock_plugin.rpc.listchannels.return_value = {
+            'channels': [
+                {
+                    'source': '03' + format(i, '064x'),
+                    'destination': target,
+                    'short_channel_id': f'{100 + i}x1x0',
+                    'satoshis': 200_000_000,
+                    'active': True
+                }
+                for i, target in enumerate(targets)
+            ]
+        }
+        planner._refresh_network_cache(force=True)
+
+    def test_candidate_table_rescores_only_dirty(self, planner, mock_config, mock_plugin):
+        """Unchanged inputs should not re-score; invalidation re-scores one target."""
+        targets = ['02' + c * 64 for c in 'pqr']
+        self._big_target_graph(planner, mock_plugin, targets)
+        planner.quality_scorer = MagicMock()
+        planner.quality_scorer.calculate_score.return_value = MagicMock(
+            overall_score=0.5, confidence=0.0, recommendation='neutral'
+        )
+
+        # Both channel endpoints are above the capacity floor
+        assert planner.refresh_candidates(mock_config) == 6
+        assert planner.refresh_candidates(mock_config) == 0
+        calls = planner.quality_scorer.calculate_score.call_count
+
+        planner.invalidate_candidate(targets[1])
+        assert planner.refresh_candidates(mock_config) == 1
+        assert planner.quality_scorer.calculate_score.call_count == calls + 1
+
+        # Entries older than the max age are re-scored
+        later = time.time() + CANDIDATE_MAX_AGE_SECONDS + 1
+        assert planner.refresh_candidates(mock_config, now=later) == 6
+
+    def test_invalidate_does_not_wait_for_refresh(self, planner, mock_config, mock_plugin):
+        """Invalidation and marker callbacks only touch the dirty set."""
+        targets = ['02' + c * 64 for c in 'pq']
+        self._big_target_graph(planner, mock_plugin, targets)
+        planner.refresh_candidates(mock_config)
+
+        # Simulate a refresh in progress on another thread
+        with planner._candidate_lock:
+            planner.invalidate_candidate(targets[0])
+            planner.on_marker_deposited(MagicMock(
+                source_peer_id=targets[1], destination_peer_id=None
+            ))
+        assert planner.refresh_candidates(mock_config) == 2
+
+    def test_candidate_table_tracks_fleet_topology(
+        self, planner, mock_config, mock_plugin, mock_database, mock_state_manager
+    ):
+        """A member opening to a target should drop it from the ranking."""
+        targets = ['02' + c * 64 for c in 'pq']
+        member = '02' + 'a' * 64
+        self._big_target_graph(planner, mock_plugin, targets)
+        mock_database.get_all_members.return_value = [{'peer_id': member, 'tier': 'member'}]
+        state = MagicMock(peer_id=member, topology=[], capacity_sats=0)
+        mock_state_manager.get_all_peer_states.return_value = [state]
+
+        found = {u.target for u in planner.get_underserved_targets(mock_config)}
+        assert set(targets) <= found
+
+        state.topology = [targets[0]]
+        assert planner.refresh_candidates(mock_config) == 1
+        found = {u.target for u in planner.get_underserved_targets(mock_config)}
+        assert targets[0] not in found
+        assert targets[1] in found
+
+    def test_underserved_skips_existing_channel_and_limit(self, planner, mock_config, mock_plugin):
+        """Existing channels come from one listpeerchannels call; limit caps results."""
+        targets = ['02' + c * 64 for c in 'pqr']
+        self._big_target_graph(planner, mock_plugin, targets)
+        mock_plugin.rpc.listpeerchannels.return_value = {
+            'channels': [{'peer_id': targets[0], 'state': 'CHANNELD_AWAITING_LOCKIN'}]
+        }
+
+        found = [u.target for u in planner.get_underserved_targets(mock_config)]
+        assert targets[0] not in found
+        assert len(planner.get_underserved_targets(mock_config, limit=1)) == 1
+        mock_plugin.rpc.listpeerchannels.assert_called_with()
+
+    def test_skip_target_does_not_count_towards_limit(self, planner, mock_config, mock_plugin):
+        """Targets skipped by the caller's check must not use up the limit."""
+        targets = ['02' + c * 64 for c in 'pqr']
+        self._big_target_graph(planner, mock_plugin, targets)
+        ranked = [u.target for u in planner.get_underserved_targets(mock_config)]
+
+        skipped = set(ranked[:-1])
+        found = planner.get_underserved_targets(
+            mock_config, limit=1, skip_target=lambda t: t in skipped
+        )
+        assert [u.target for u in found] == ranked[-1:]
+
+    def test_cycle_time_in_stats(self, planner, mock_config, mock_plugin):
+        """Planner cycle wall-time should be reported in stats."""
+        mock_plugin.rpc.listchannels.return_value = {'channels': []}
+        mock_config.planner_enable_expansions = False
+        planner.run_cycle(mock_config, run_id='timing')
+
+        stats = planner.get_planner_stats()
+        assert stats['cycle_count'] == 1
+        assert stats['last_cycle_seconds'] >= 0
+        assert 'candidate_table_size' in stats
+
 
 # =============================================================================
 # COOPERATION MODULE INTEGRATION TESTS (Phase 7)
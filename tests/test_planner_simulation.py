@@ -29,6 +29,14 @@ from modules.planner import (
 from modules.intent_manager import IntentManager, Intent, IntentType
 
 
+def _underserved_stub(results):
+    """Stand-in for get_underserved_targets that honours skip_target and limit."""
+    def get_underserved_targets(cfg, include_low_quality=False, limit=None, skip_target=None):
+        kept = [r for r in results if not (skip_target and skip_target(r.target))]
+        return kept[:limit] if limit is not None else kept
+    return get_underserved_targets
+
+
 # =============================================================================
 # FIXTURES
 # =============================================================================
@@ -346,8 +354,8 @@ class TestTheStalemate:
             score=2.0
         )
 
-        with patch.object(alice_planner, 'get_underserved_targets', return_value=[underserved_result]):
-            with patch.object(bob_planner, 'get_underserved_targets', return_value=[underserved_result]):
+        with patch.object(alice_planner, 'get_underserved_targets', side_effect=_underserved_stub([underserved_result])):
+            with patch.object(bob_planner, 'get_underserved_targets', side_effect=_underserved_stub([underserved_result])):
                 # Alice proposes first
                 alice_decisions = alice_planner._propose_expansion(mock_config, 'alice-run')
 
@@ -491,7 +499,6 @@ class TestTheFlap:
         # Initialize network cache
         mock_plugin.rpc.listchannels.return_value = {'channels': []}
         planner._refresh_network_cache(force=True)
-        planner._network_cache[target] = []
 
         ignore_count = 0
         unignore_count = 0
@@ -568,7 +575,6 @@ class TestTheFlap:
 
         mock_plugin.rpc.listchannels.return_value = {'channels': []}
         planner._refresh_network_cache(force=True)
-        planner._network_cache[target] = []
 
         # At exactly 20% - should NOT be ignored (not strictly greater)
         with patch.object(planner, 'get_saturated_targets') as mock_saturated:
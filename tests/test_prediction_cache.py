@@ -0,0 +1,158 @@
+"""
+Tests for the shared prediction memo.
+
+Tests cover:
+- Hit/miss accounting, TTL expiry and per-channel invalidation
+- Results computed across an invalidation are not stored
+- Invalidation from flow samples, Kalman reports and balance changes
+- Time-based fee adjustments sharing the anticipatory manager's memo
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.prediction_cache import PredictionCache
+from modules.anticipatory_liquidity import AnticipatoryLiquidityManager
+from modules.fee_coordination import TimeBasedFeeAdjuster
+
+
+class TestPredictionCache:
+
+    def test_hits_and_misses(self):
+        cache = PredictionCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return None
+
+        for _ in range(3):
+            assert cache.get_or_compute("f", "a", 12, compute) is None
+        cache.get_or_compute("f", "a", 24, compute)
+        cache.get_or_compute("g", "a", 12, compute)
+
+        stats = cache.get_stats()
+        assert len(calls) == 3
+        assert stats["hits"] == 2
+        assert stats["misses"] == 3
+        assert stats["entries"] == 3
+
+    def test_invalidate_channel_only(self):
+        cache = PredictionCache()
+        cache.get_or_compute("f", "a", 12, lambda: 1)
+        cache.get_or_compute("g", "a", 6, lambda: 2)
+        cache.get_or_compute("f", "b", 12, lambda: 3)
+
+        assert cache.invalidate("a") == 2
+        assert cache.get_or_compute("f", "a", 12, lambda: 10) == 10
+        assert cache.get_or_compute("f", "b", 12, lambda: 30) == 3
+
+    def test_ttl(self, monkeypatch):
+        cache = PredictionCache(ttl_seconds=60)
+        now = [1000.0]
+        monkeypatch.setattr(time, "time", lambda: now[0])
+        cache.get_or_compute("f", "a", 1, lambda: "old")
+        now[0] += 61
+        assert cache.get_or_compute("f", "a", 1, lambda: "new") == "new"
+        assert cache.get_or_compute("f", "a", 1, lambda: "x", ttl_seconds=0) == "x"
+
+    def test_invalidated_during_compute_not_stored(self):
+        cache = PredictionCache()
+
+        def compute():
+            cache.invalidate("a")
+            return "stale"
+
+        assert cache.get_or_compute("f", "a", 1, compute) == "stale"
+        assert cache.get_or_compute("f", "a", 1, lambda: "fresh") == "fresh"
+
+    def test_sweep_when_full(self, monkeypatch):
+        cache = PredictionCache(ttl_seconds=10, max_entries=3)
+        now = [0.0]
+        monkeypatch.setattr(time, "time", lambda: now[0])
+        for i in range(3):
+            cache.get_or_compute("f", f"c{i}", 1, lambda: i)
+        now[0] = 20.0
+        cache.get_or_compute("f", "new", 1, lambda: 0)
+        assert cache.get_stats()["entries"] == 1
+        assert cache.get_stats()["channels"] == 1
+
+
+def _channel(local_msat):
+    return {
+        "short_channel_id": "800000x1x0", "peer_id": "03" + "a" * 64,
+        "state": "CHANNELD_NORMAL", "total_msat": 10_000_000_000,
+        "to_us_msat": local_msat,
+    }
+
+
+@pytest.fixture
+def manager():
+    plugin = MagicMock()
+    plugin.rpc.listpeerchannels.return_value = {"channels": [_channel(5_000_000_000)]}
+    db = MagicMock()
+    db.get_flow_samples.return_value = []
+    return AnticipatoryLiquidityManager(database=db, plugin=plugin)
+
+
+class TestAnticipatoryInvalidation:
+
+    def _misses(self, manager):
+        return manager.prediction_cache.get_stats()["misses"]
+
+    def test_predict_memoized(self, manager):
+        first = manager.predict_liquidity("800000x1x0")
+        assert manager.predict_liquidity("800000x1x0") is first
+        assert manager.get_status()["prediction_cache"]["hits"] == 1
+
+    def test_flow_sample_invalidates(self, manager):
+        first = manager.predict_liquidity("800000x1x0")
+        manager.record_flow_sample("800000x1x0", 1000, 0)
+        assert manager.predict_liquidity("800000x1x0") is not first
+
+    def test_kalman_report_invalidates(self, manager):
+        first = manager.predict_liquidity("800000x1x0")
+        manager.receive_kalman_velocity(
+            channel_id="800000x1x0", peer_id="03" + "a" * 64, reporter_id="02" + "b" * 64,
+            velocity_pct_per_hour=-0.01, uncertainty=0.01, flow_ratio=-0.2, confidence=0.9)
+        second = manager.predict_liquidity("800000x1x0")
+        assert second is not first
+        assert second.velocity_pct_per_hour == pytest.approx(-0.01)
+
+    def test_balance_change_invalidates(self, manager):
+        first = manager.predict_liquidity("800000x1x0")
+
+        # Same balance on refresh keeps the memo
+        manager.get_channel_snapshot(force=True)
+        assert manager.predict_liquidity("800000x1x0") is first
+
+        manager.plugin.rpc.listpeerchannels.return_value = {"channels": [_channel(1_000_000_000)]}
+        manager.get_channel_snapshot(force=True)
+        second = manager.predict_liquidity("800000x1x0")
+        assert second is not first
+        assert second.current_local_pct == pytest.approx(0.1)
+
+
+class TestTimeAdjustmentSharing:
+
+    def test_uses_anticipatory_memo(self, manager):
+        adjuster = TimeBasedFeeAdjuster(plugin=None)
+        adjuster.set_anticipatory_manager(manager)
+        manager.detect_patterns = MagicMock(return_value=[])
+
+        adjuster.get_time_adjustment("800000x1x0", 100)
+        adjuster.get_time_adjustment("800000x1x0", 100)
+        assert manager.detect_patterns.call_count == 1
+
+        manager.record_flow_sample("800000x1x0", 1000, 0)
+        adjuster.get_time_adjustment("800000x1x0", 100)
+        assert manager.detect_patterns.call_count == 2
+
+        adjuster.get_time_adjustment("800000x1x0", 100, use_cache=False)
+        assert manager.detect_patterns.call_count == 3
@@ -0,0 +1,200 @@
+"""
+Tests for peer event summaries and batch quality scoring.
+
+Tests cover:
+- SQL-side aggregation matching a straightforward per-event reference
+- Per-reporter score breakdown
+- Daily rollups (maintenance on insert, backfill, pruning)
+- Batch scoring (one aggregate query for N peers)
+"""
+
+import random
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.database import HiveDatabase
+from modules.quality_scorer import PeerQualityScorer
+
+
+EVENT_TYPES = ['channel_open', 'remote_close', 'local_close', 'mutual_close']
+CLOSERS = {'remote_close': 'remote', 'local_close': 'local', 'mutual_close': 'mutual'}
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = HiveDatabase(str(tmp_path / "test_quality.db"), MagicMock())
+    db.initialize()
+    return db
+
+
+def _store_random_events(db, peers, reporters, n, seed=7):
+    rng = random.Random(seed)
+    now = int(time.time())
+    events = []
+    for _ in range(n):
+        event_type = rng.choice(EVENT_TYPES)
+        event = dict(
+            peer_id=rng.choice(peers),
+            reporter_id=rng.choice(reporters),
+            event_type=event_type,
+            timestamp=now - rng.randint(0, 120) * 86400 - 43200,
+            duration_days=rng.choice([0, 10, 45, 200]),
+            total_revenue_sats=rng.randint(0, 5000),
+            total_rebalance_cost_sats=rng.randint(0, 1000),
+            net_pnl_sats=rng.randint(-1000, 4000),
+            forward_count=rng.randint(0, 300),
+            routing_score=rng.choice([0.0, 0.2, 0.5, 0.9]),
+            profitability_score=rng.choice([0.0, 0.3, 0.7]),
+            closer=CLOSERS.get(event_type),
+        )
+        db.store_peer_event(**event)
+        events.append(event)
+    return events
+
+
+def _reference_summary(events, peer_id, days):
+    """Per-event aggregation (the pre-SQL implementation)."""
+    cutoff = int(time.time()) - days * 86400
+    events = [e for e in events if e['peer_id'] == peer_id and e['timestamp'] > cutoff]
+    closes = [e for e in events if e['event_type'].endswith('_close')]
+    routing = [e['routing_score'] for e in events if e['routing_score']]
+    profit = [e['profitability_score'] for e in events if e['profitability_score']]
+    durations = [e['duration_days'] for e in closes if e['duration_days']]
+    return {
+        'event_count': len(events),
+        'open_count': len([e for e in events if e['event_type'] == 'channel_open']),
+        'close_count': len(closes),
+        'remote_close_count': len([e for e in closes if e['closer'] == 'remote']),
+        'mutual_close_count': len([e for e in closes if e['closer'] == 'mutual']),
+        'total_revenue_sats': sum(e['total_revenue_sats'] for e in closes),
+        'total_net_pnl_sats': sum(e['net_pnl_sats'] for e in closes),
+        'total_forward_count': sum(e['forward_count'] for e in closes),
+        'avg_routing_score': sum(routing) / len(routing) if routing else 0.5,
+        'avg_profitability_score': sum(profit) / len(profit) if profit else 0.5,
+        'avg_duration_days': sum(durations) / len(durations) if durations else 0,
+        'reporters': sorted(set(e['reporter_id'] for e in events)),
+    }
+
+
+class TestPeerEventSummary:
+
+    def test_matches_reference(self, database):
+        peers = ['03' + c * 64 for c in 'abcd']
+        reporters = ['02' + c * 64 for c in 'xyz']
+        events = _store_random_events(database, peers, reporters, 300)
+
+        for days in (30, 90):
+            summaries = database.get_peer_event_summaries(peers, days=days)
+            for peer_id in peers:
+                expected = _reference_summary(events, peer_id, days)
+                got = summaries[peer_id]
+                for key, value in expected.items():
+                    if key == 'reporters':
+                        assert sorted(got[key]) == value
+                    elif isinstance(value, float):
+                        assert got[key] == pytest.approx(value)
+                    else:
+                        assert got[key] == value, key
+                assert got == database.get_peer_event_summary(peer_id, days=days)
+
+    def test_reporter_scores(self, database):
+        peer = '03' + 'a' * 64
+        now = int(time.time())
+        database.store_peer_event(peer, '02' + 'x' * 64, 'channel_open', now, routing_score=0.9)
+        database.store_peer_event(peer, '02' + 'y' * 64, 'channel_open', now, routing_score=0.1)
+
+        summary = database.get_peer_event_summary(peer)
+        scores = summary['reporter_scores']
+        assert scores['02' + 'x' * 64]['avg_routing_score'] == pytest.approx(0.9)
+        assert scores['02' + 'y' * 64]['avg_routing_score'] == pytest.approx(0.1)
+        assert summary['avg_routing_score'] == pytest.approx(0.5)
+
+    def test_unknown_peer(self, database):
+        summary = database.get_peer_event_summary('03' + 'f' * 64)
+        assert summary['event_count'] == 0
+        assert summary['reporters'] == []
+        assert database.get_peer_event_summaries(['03' + 'f' * 64]) == {}
+
+
+class TestPeerEventRollups:
+
+    def _rollups(self, db):
+        conn = db._get_connection()
+        return [dict(r) for r in conn.execute(
+            "SELECT * FROM peer_event_daily ORDER BY peer_id, reporter_id, day"
+        ).fetchall()]
+
+    def test_one_row_per_peer_reporter_day(self, database):
+        peer = '03' + 'a' * 64
+        reporter = '02' + 'x' * 64
+        day_start = (int(time.time()) // 86400 - 5) * 86400
+        for offset in (100, 200, 300):
+            database.store_peer_event(peer, reporter, 'remote_close', day_start + offset,
+                                      total_revenue_sats=10, closer='remote')
+
+        rows = self._rollups(database)
+        assert len(rows) == 1
+        assert rows[0]['event_count'] == 3
+        assert rows[0]['remote_close_count'] == 3
+        assert rows[0]['revenue_sum'] == 30
+
+    def test_rebuild_matches_incremental(self, database):
+        peers = ['03' + c * 64 for c in 'abc']
+        _store_random_events(database, peers, ['02' + c * 64 for c in 'xy'], 150)
+        incremental = self._rollups(database)
+
+        assert database.rebuild_peer_event_rollups() == len(incremental)
+        rebuilt = self._rollups(database)
+        assert [r['event_count'] for r in rebuilt] == [r['event_count'] for r in incremental]
+        for a, b in zip(rebuilt, incremental):
+            assert a['routing_sum'] == pytest.approx(b['routing_sum'])
+            assert a['pnl_sum'] == b['pnl_sum']
+
+    def test_store_and_rebuild_join_outer_transaction(self, database):
+        peer = '03' + 'a' * 64
+        reporter = '02' + 'x' * 64
+        now = int(time.time())
+        with pytest.raises(RuntimeError):
+            with database.transaction():
+                assert database.store_peer_event(peer, reporter, 'channel_open', now) > 0
+                assert database.rebuild_peer_event_rollups() == 1
+                raise RuntimeError("abort")
+
+        assert database.get_peer_events(peer_id=peer) == []
+        assert self._rollups(database) == []
+
+    def test_prune_drops_old_rollups(self, database):
+        peers = ['03' + c * 64 for c in 'ab']
+        _store_random_events(database, peers, ['02' + 'x' * 64], 100)
+        database.prune_peer_events(older_than_days=60)
+
+        oldest_day = (int(time.time()) - 60 * 86400) // 86400
+        assert all(r['day'] >= oldest_day for r in self._rollups(database))
+        assert set(database.get_peers_with_events(days=30)) <= set(peers)
+
+
+class TestBatchScoring:
+
+    def test_batch_matches_single(self, database):
+        peers = ['03' + c * 64 for c in 'abcdef']
+        _store_random_events(database, peers[:4], ['02' + c * 64 for c in 'xy'], 200)
+        scorer = PeerQualityScorer(database)
+
+        batch = {r.peer_id: r for r in scorer.calculate_scores_batch(peers)}
+        assert set(batch) == set(peers)
+        for peer_id in peers:
+            single = scorer.calculate_score(peer_id)
+            assert batch[peer_id].overall_score == pytest.approx(single.overall_score)
+            assert batch[peer_id].recommendation == single.recommendation
+
+        scored = scorer.get_scored_peers()
+        assert {r.peer_id for r in scored} == set(peers[:4])
+        assert [r.overall_score for r in scored] == sorted(
+            (r.overall_score for r in scored), reverse=True
+        )
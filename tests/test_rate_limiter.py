@@ -0,0 +1,101 @@
+"""
+Tests for the shared GCRA rate limiter.
+
+Tests cover:
+- Burst of max_count, then one message per emission interval
+- check/record split (only validated messages are counted)
+- Constant state per key under flood
+- Idle key pruning and stats
+- Concurrent use across lock stripes
+"""
+
+import threading
+import time
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.rate_limiter import RateLimiter, RATE_LIMITER_PRUNE_THRESHOLD
+
+
+class TestRateLimiter:
+
+    def test_burst_then_blocked(self):
+        limiter = RateLimiter(max_count=5, period_seconds=3600)
+        now = 1_000_000.0
+        assert [limiter.is_allowed("a", now) for _ in range(6)] == [True] * 5 + [False]
+        # Other keys are independent
+        assert limiter.is_allowed("b", now)
+
+    def test_refills_at_emission_interval(self):
+        limiter = RateLimiter(max_count=4, period_seconds=60)
+        now = 1_000_000.0
+        for _ in range(4):
+            assert limiter.is_allowed("a", now)
+        assert not limiter.is_allowed("a", now + 14)
+        assert limiter.is_allowed("a", now + 15)
+        assert not limiter.is_allowed("a", now + 15)
+        # After a full idle period the whole burst is available again
+        assert all(limiter.is_allowed("a", now + 120) for _ in range(4))
+
+    def test_check_does_not_consume(self):
+        limiter = RateLimiter(max_count=2, period_seconds=3600)
+        now = 1_000_000.0
+        for _ in range(10):
+            assert limiter.check("a", now)
+        limiter.record("a", now)
+        assert limiter.check("a", now)
+        limiter.record("a", now)
+        assert not limiter.check("a", now)
+
+    def test_flood_state_is_constant(self):
+        limiter = RateLimiter(max_count=10, period_seconds=60)
+        now = time.time()
+        allowed = sum(limiter.is_allowed("a", now + i * 0.001) for i in range(100_000))
+        # 10 burst + one per 6s over the ~100s flood
+        assert allowed == 10 + 16
+        assert limiter.get_stats()["tracked_keys"] == 1
+        assert limiter.get_stats()["rejected"] == 100_000 - allowed
+        assert limiter.get_stats("a")["messages_in_window"] == 10
+
+    def test_idle_keys_pruned(self):
+        limiter = RateLimiter(max_count=1, period_seconds=1, stripes=1)
+        now = 1_000_000.0
+        for i in range(RATE_LIMITER_PRUNE_THRESHOLD - 1):
+            limiter.record(f"peer{i}", now)
+        # Growing past the threshold later drops every idle key
+        limiter.record("late", now + 10)
+        assert limiter.get_stats()["tracked_keys"] == 1
+
+        limiter.record("x")
+        assert limiter.cleanup() == 1  # "late", long idle
+        assert limiter.get_stats("x")["messages_in_window"] == 1
+        limiter.reset("x")
+        assert limiter.get_stats("x")["messages_in_window"] == 0
+
+    def test_concurrent_is_allowed(self):
+        limiter = RateLimiter(max_count=50, period_seconds=3600)
+        keys = [f"peer{i}" for i in range(8)]
+        results = []
+        lock = threading.Lock()
+
+        def worker():
+            allowed = sum(limiter.is_allowed(k) for _ in range(100) for k in keys)
+            with lock:
+                results.append(allowed)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sum(results) == 50 * len(keys)
+
+    def test_invalid_limits(self):
+        with pytest.raises(ValueError):
+            RateLimiter(max_count=0, period_seconds=60)
+        with pytest.raises(ValueError):
+            RateLimiter(max_count=1, period_seconds=0)
@@ -901,20 +901,12 @@ class TestRouteProbeBatch:
 
         # Should allow first few batches
         for i in range(ROUTE_PROBE_BATCH_RATE_LIMIT[0]):
-            allowed = self.routing_map._check_rate_limit(
-                sender_id,
-                self.routing_map._batch_rate,
-                ROUTE_PROBE_BATCH_RATE_LIMIT
-            )
-            self.routing_map._record_message(sender_id, self.routing_map._batch_rate)
+            allowed = self.routing_map._batch_rate.check(sender_id)
+            self.routing_map._batch_rate.record(sender_id)
             assert allowed is True
 
         # Should reject the next one
-        allowed = self.routing_map._check_rate_limit(
-            sender_id,
-            self.routing_map._batch_rate,
-            ROUTE_PROBE_BATCH_RATE_LIMIT
-        )
+        allowed = self.routing_map._batch_rate.check(sender_id)
         assert allowed is False
 
     def test_handle_batch_valid(self):
@@ -0,0 +1,305 @@
+"""
+Tests for streaming JSON-RPC over the lightningd unix socket.
+
+Tests cover:
+- Incremental decoding of result arrays across arbitrary chunk boundaries
+- Error replies and truncated responses
+- End-to-end streaming against a local unix socket server
+- Persistent client: connection reuse, errors, pipelined batches, timeouts
+- Planner network cache refresh via the streaming path
+"""
+
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.rpc_socket import (
+    RpcStreamError, UnixRpcClient, iter_result_array, resolve_socket_path,
+    stream_rpc_array,
+)
+from modules.planner import Planner
+
+
+def _channels(n):
+    return [
+        {
+            'source': '02' + format(i, '064x'),
+            'destination': '03' + format(i, '064x'),
+            'short_channel_id': f'{700000 + i}x1x0',
+            'amount_msat': 2_000_000_000,
+            'active': True,
+            'message_flags': 1,
+        }
+        for i in range(n)
+    ]
+
+
+def _reply(channels):
+    return json.dumps({
+        'jsonrpc': '2.0', 'id': 'x', 'result': {'channels': channels}
+    }, indent=1).encode('utf-8') + b'\n\n'
+
+
+def _split(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestIterResultArray:
+
+    @pytest.mark.parametrize('chunk_size', [1, 7, 64, 100_000])
+    def test_any_chunk_boundary(self, chunk_size):
+        channels = _channels(20)
+        items = list(iter_result_array(_split(_reply(channels), chunk_size), 'channels'))
+        assert items == channels
+
+    def test_empty_array(self):
+        assert list(iter_result_array([_reply([])], 'channels')) == []
+
+    def test_multibyte_utf8_split(self):
+        channels = [{'alias': 'café ⚡'}]
+        assert list(iter_result_array(_split(_reply(channels), 1), 'channels')) == channels
+
+    def test_error_reply(self):
+        reply = json.dumps({
+            'jsonrpc': '2.0', 'id': 'x',
+            'error': {'code': -32601, 'message': 'Unknown command'}
+        }).encode()
+        with pytest.raises(Exception) as exc_info:
+            list(iter_result_array([reply], 'channels', 'listchannels'))
+        assert 'Unknown command' in str(exc_info.value)
+
+    def test_truncated(self):
+        data = _reply(_channels(3))
+        with pytest.raises(RpcStreamError):
+            list(iter_result_array([data[:len(data) // 2]], 'channels'))
+
+
+@pytest.fixture
+def rpc_server():
+    """Unix socket server that answers one request per connection."""
+    tmpdir = tempfile.mkdtemp()
+    path = os.path.join(tmpdir, 'lightning-rpc')
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(4)
+    state = {'reply': _reply([]), 'requests': []}
+
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                state['requests'].append(json.loads(conn.recv(65536)))
+                for chunk in _split(state['reply'], 4096):
+                    conn.sendall(chunk)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield path, state
+    server.close()
+    os.unlink(path)
+    os.rmdir(tmpdir)
+
+
+class TestStreamRpcArray:
+
+    def test_stream_over_socket(self, rpc_server):
+        path, state = rpc_server
+        state['reply'] = _reply(_channels(500))
+        items = list(stream_rpc_array(path, 'listchannels', 'channels'))
+        assert len(items) == 500
+        assert state['requests'][0]['method'] == 'listchannels'
+
+    def test_connect_failure(self):
+        with pytest.raises(OSError):
+            list(stream_rpc_array('/nonexistent/lightning-rpc', 'listchannels', 'channels'))
+
+    def test_resolve_socket_path(self):
+        rpc = MagicMock()
+        rpc.get_socket_path.return_value = '/tmp/lightning-rpc'
+        assert resolve_socket_path(rpc) == '/tmp/lightning-rpc'
+        assert resolve_socket_path(None) is None
+        assert resolve_socket_path(MagicMock()) is None
+
+
+@pytest.fixture
+def persistent_rpc_server():
+    """
+    Unix socket server that keeps connections open like lightningd.
+
+    Requests read together are answered in reverse order; methods named
+    "fail" get an error reply and "hang" gets no reply at all.
+    """
+    tmpdir = tempfile.mkdtemp()
+    path = os.path.join(tmpdir, 'lightning-rpc')
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(4)
+    state = {'connections': [], 'requests': []}
+    decoder = json.JSONDecoder()
+
+    def handle(conn):
+        buf = ''
+        with conn:
+            while True:
+                try:
+                    data = conn.recv(65536)
+                except OSError:
+                    return
+                if not data:
+                    return
+                buf += data.decode()
+                requests = []
+                while buf.strip():
+                    try:
+                        request, end = decoder.raw_decode(buf.lstrip())
+                    except ValueError:
+                        break
+                    buf = buf.lstrip()[end:]
+                    requests.append(request)
+                state['requests'].extend(requests)
+                for request in reversed(requests):
+                    if request['method'] == 'hang':
+                        continue
+                    if request['method'] == 'fail':
+                        reply = {'jsonrpc': '2.0', 'id': request['id'],
+                                 'error': {'code': -1, 'message': 'nope'}}
+                    else:
+                        reply = {'jsonrpc': '2.0', 'id': request['id'],
+                                 'result': {'method': request['method'],
+                                            'params': request['params']}}
+                    conn.sendall(json.dumps(reply).encode() + b'\n\n')
+
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            state['connections'].append(conn)
+            threading.Thread(target=handle, args=(conn,), daemon=True).start()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield path, state
+    server.close()
+    os.unlink(path)
+    os.rmdir(tmpdir)
+
+
+class TestUnixRpcClient:
+
+    def test_call_reuses_connection(self, persistent_rpc_server):
+        path, state = persistent_rpc_server
+        client = UnixRpcClient(path)
+        try:
+            assert client.call('getinfo') == {'method': 'getinfo', 'params': {}}
+            result = client.call('revenue-policy', {'action': 'get'})
+            assert result['params'] == {'action': 'get'}
+            assert len(state['connections']) == 1
+            assert client.get_stats()['calls'] == 2
+        finally:
+            client.close()
+
+    def test_error_reply(self, persistent_rpc_server):
+        path, _ = persistent_rpc_server
+        client = UnixRpcClient(path)
+        try:
+            with pytest.raises(Exception) as exc_info:
+                client.call('fail')
+            assert 'nope' in str(exc_info.value)
+            # The connection stays usable after a JSON-RPC error
+            assert client.call('getinfo')['method'] == 'getinfo'
+        finally:
+            client.close()
+
+    def test_batch_matches_replies_by_id(self, persistent_rpc_server):
+        path, state = persistent_rpc_server
+        client = UnixRpcClient(path)
+        try:
+            results = client.call_batch([
+                ('a', {'n': 1}), ('fail', None), ('b', {'n': 2}),
+            ])
+            assert results[0] == {'method': 'a', 'params': {'n': 1}}
+            assert isinstance(results[1], Exception)
+            assert results[2] == {'method': 'b', 'params': {'n': 2}}
+            assert client.call_batch([]) == []
+        finally:
+            client.close()
+
+    def test_timeout_drops_connection(self, persistent_rpc_server):
+        path, state = persistent_rpc_server
+        client = UnixRpcClient(path)
+        try:
+            with pytest.raises(TimeoutError):
+                client.call('hang', timeout=0.2)
+            assert not client.get_stats()['connected']
+            assert client.get_stats()['timeouts'] == 1
+
+            assert client.call('getinfo')['method'] == 'getinfo'
+            assert len(state['connections']) == 2
+        finally:
+            client.close()
+
+    def test_reconnects_after_server_closes(self, persistent_rpc_server):
+        path, state = persistent_rpc_server
+        client = UnixRpcClient(path)
+        try:
+            client.call('getinfo')
+            # lightningd closed the idle connection: resent on a new one
+            state['connections'][0].shutdown(socket.SHUT_RDWR)
+            time.sleep(0.05)
+            assert client.call('getinfo')['method'] == 'getinfo'
+            assert len(state['connections']) == 2
+        finally:
+            client.close()
+
+    def test_connect_failure(self):
+        with pytest.raises(OSError):
+            UnixRpcClient('/nonexistent/lightning-rpc').call('getinfo')
+
+
+class TestPlannerStreamingRefresh:
+
+    def _planner(self, plugin):
+        db = MagicMock()
+        db.get_all_members.return_value = []
+        return Planner(
+            state_manager=MagicMock(), database=db, bridge=MagicMock(),
+            clboss_bridge=MagicMock(), plugin=plugin,
+        )
+
+    def test_refresh_uses_stream(self, rpc_server):
+        path, state = rpc_server
+        state['reply'] = _reply(_channels(50))
+        plugin = MagicMock()
+        plugin.rpc.get_socket_path.return_value = path
+
+        planner = self._planner(plugin)
+        assert planner._refresh_network_cache(force=True) is True
+
+        assert planner._network_cache.channel_count == 50
+        assert planner.get_planner_stats()['network_cache_source'] == 'stream'
+        plugin.rpc.listchannels.assert_not_called()
+
+    def test_refresh_falls_back_to_rpc(self):
+        plugin = MagicMock()
+        plugin.rpc.get_socket_path.return_value = '/nonexistent/lightning-rpc'
+        plugin.rpc.listchannels.return_value = {'channels': _channels(5)}
+
+        planner = self._planner(plugin)
+        assert planner._refresh_network_cache(force=True) is True
+
+        assert planner._network_cache.channel_count == 5
+        assert planner.get_planner_stats()['network_cache_source'] == 'rpc'
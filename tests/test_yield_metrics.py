@@ -7,6 +7,7 @@ Tests cover:
 - InternalCompetition detection
 - FleetYieldSummary
 - YieldMetricsManager
+- Batch yield computation (constant RPC count per pass)
 """
 
 import pytest
@@ -23,6 +24,7 @@ from modules.yield_metrics import (
     FLOW_INTENSITY_LOW,
     DEPLETION_RISK_THRESHOLD,
     SATURATION_RISK_THRESHOLD,
+    ALIAS_BULK_FETCH_THRESHOLD,
 )
 
 
@@ -474,6 +476,99 @@ class TestYieldMetricsManager:
         assert summary.total_capacity_sats == 30_000_000  # 10M + 20M
 
 
+class TestBatchYield:
+    """Yield passes fetch channels, profitability, height and aliases once."""
+
+    def _manager(self, n_channels):
+        plugin = MagicMock()
+        plugin.rpc.listpeerchannels.return_value = {"channels": [
+            {
+                "short_channel_id": f"{800000 + i}x1x0",
+                "peer_id": "03" + format(i, "064x"),
+                "total_msat": 10_000_000_000,
+                "to_us_msat": 4_000_000_000,
+                "state": "CHANNELD_NORMAL",
+            }
+            for i in range(n_channels)
+        ]}
+        plugin.rpc.getinfo.return_value = {"blockheight": 800000 + 144 * 30}
+        plugin.rpc.listnodes.side_effect = lambda id=None: {"nodes": [
+            {"nodeid": "03" + format(i, "064x"), "alias": f"node{i}"}
+            for i in range(n_channels)
+            if id is None or id == "03" + format(i, "064x")
+        ]}
+        bridge = MagicMock()
+        bridge.get_profitability.return_value = {"channels": [
+            {"channel_id": "800001x1x0", "fees_earned_sats": 500, "in_sats": 10, "out_sats": 100}
+        ]}
+        mgr = YieldMetricsManager(database=MockDatabase(), plugin=plugin, bridge=bridge)
+        return mgr, plugin, bridge
+
+    def test_constant_rpc_count(self):
+        n = ALIAS_BULK_FETCH_THRESHOLD * 2
+        mgr, plugin, bridge = self._manager(n)
+
+        metrics = mgr.get_channel_yield_metrics()
+
+        assert len(metrics) == n
+        assert plugin.rpc.listpeerchannels.call_count == 1
+        assert plugin.rpc.getinfo.call_count == 1
+        assert plugin.rpc.listnodes.call_count == 1
+        assert bridge.get_profitability.call_count == 1
+        plugin.rpc.gettxout.assert_not_called()
+
+        by_id = {m.channel_id: m for m in metrics}
+        assert by_id["800001x1x0"].routing_revenue_sats == 500
+        assert by_id["800001x1x0"].flow_direction == "source"
+        assert by_id["800001x1x0"].peer_alias == "node1"
+        assert by_id["800000x1x0"].channel_age_days == 30
+
+    def test_aliases_cached_between_passes(self):
+        mgr, plugin, _ = self._manager(3)
+        mgr.get_fleet_yield_summary()
+        mgr.get_shareable_yield_metrics()
+
+        # Few misses use per-peer lookups, and only on the first pass
+        assert plugin.rpc.listnodes.call_count == 3
+        assert plugin.rpc.listpeerchannels.call_count == 2
+
+    def test_alias_lookup_failure_not_cached(self):
+        n = ALIAS_BULK_FETCH_THRESHOLD * 2
+        mgr, plugin, _ = self._manager(n)
+        lookup = plugin.rpc.listnodes.side_effect
+        plugin.rpc.listnodes.side_effect = RuntimeError("rpc unavailable")
+
+        metrics = mgr.get_channel_yield_metrics()
+        assert all(m.peer_alias is None for m in metrics)
+        assert mgr._alias_cache == {}
+
+        # The next pass retries instead of serving cached misses
+        plugin.rpc.listnodes.side_effect = lookup
+        by_id = {m.channel_id: m for m in mgr.get_channel_yield_metrics()}
+        assert by_id["800001x1x0"].peer_alias == "node1"
+        assert plugin.rpc.listnodes.call_count == 2
+
+    def test_partial_alias_lookup_caches_fetched_peers(self):
+        mgr, plugin, _ = self._manager(3)
+        lookup = plugin.rpc.listnodes.side_effect
+        calls = []
+
+        def flaky(id=None):
+            calls.append(id)
+            if len(calls) > 1:
+                raise RuntimeError("rpc unavailable")
+            return lookup(id=id)
+
+        plugin.rpc.listnodes.side_effect = flaky
+        mgr.get_channel_yield_metrics()
+        assert list(mgr._alias_cache) == [calls[0]]
+
+    def test_critical_channels_single_listing(self):
+        mgr, plugin, _ = self._manager(10)
+        mgr.get_critical_velocity_channels()
+        assert plugin.rpc.listpeerchannels.call_count == 1
+
+
 class TestConstants:
     """Test constant values."""
 
@@ -0,0 +1,914 @@
+#!/usr/bin/env python3
+"""
+In-process fleet simulator for cl-hive.
+
+Runs N hive nodes in one process without lightningd or docker. Every node
+owns the same managers the plugin wires together in init() (HiveDatabase,
+StateManager, GossipManager, RelayManager, IntentManager, MCFCoordinator)
+and the nodes talk through a simulated sendcustommsg bus with configurable
+latency, jitter, loss, connectivity and partitions.
+
+The simulation is a single-threaded discrete-event loop on a virtual clock
+(time.time() is patched while the simulator is open), so runs are
+deterministic for a given seed and simulated hours take seconds.
+
+Measurements:
+- gossip: time until every online node holds a new gossip version, and
+  relay amplification (deliveries per node that had to learn it)
+- full_sync: FULL_SYNC messages and bytes needed to bring a node that was
+  offline back in sync via STATE_HASH anti-entropy
+- mcf_failover: time until all online nodes agree on a new MCF coordinator
+  after the elected one goes offline
+- intent_race: how many of k simultaneous intents for the same target
+  survive tie-breaking, and the messages it took
+
+cl-hive.py cannot be imported outside lightningd, so SimNode replays the
+steps of its custommsg handlers (handle_gossip, handle_state_hash,
+handle_full_sync, handle_intent, handle_intent_abort) against the modules.
+All simulated nodes are honest: signatures are placeholders and
+checkmessage is not consulted.
+
+Usage:
+    python3 tools/fleet_simulator.py --nodes 100 --topology random --degree 6
+    python3 tools/fleet_simulator.py --nodes 50 --latency 0.2 --loss 0.05 --json
+
+    from fleet_simulator import FleetSimulator
+
+    with FleetSimulator(n_nodes=20, topology="ring", degree=4, seed=7) as sim:
+        sim.bootstrap()
+        print(sim.measure_gossip_convergence())
+"""
+
+import argparse
+import heapq
+import json
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from unittest.mock import patch
+
+# Add parent directory for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.database import HiveDatabase  # noqa: E402
+from modules.gossip import DEFAULT_HEARTBEAT_INTERVAL, GossipManager  # noqa: E402
+from modules.intent_manager import Intent, IntentManager, IntentType  # noqa: E402
+from modules.mcf_solver import MAX_GOSSIP_AGE_FOR_MCF, MCFCoordinator  # noqa: E402
+from modules.protocol import (  # noqa: E402
+    HiveMessageType, MAX_MESSAGE_BYTES, compute_states_hash, deserialize,
+    serialize, validate_full_sync, validate_gossip, validate_intent_abort,
+    validate_state_hash,
+)
+from modules.relay import RelayManager, is_relayed_message  # noqa: E402
+from modules.state_manager import StateManager  # noqa: E402
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+SIM_START_TIME = 1_700_000_000.0    # Virtual clock epoch
+SIM_SIGNATURE = "sim" + "0" * 101   # Placeholder zbase signature
+TOPOLOGIES = ("mesh", "ring", "random")
+DEFAULT_LATENCY = 0.05              # seconds per message
+DEFAULT_TOPOLOGY_SIZE = 2           # external peers advertised per node
+ELECTION_CHECK_INTERVAL = 30        # seconds between coordinator checks
+
+_TYPE_RE = re.compile(rb'\{"type":(\d+)')
+
+
+def _node_id(i: int) -> str:
+    return f"02{i:064x}"
+
+
+def _external_id(i: int) -> str:
+    return f"03{i:064x}"
+
+
+def _message_type_name(data: bytes) -> str:
+    """Message type from the envelope prefix, without a full JSON parse."""
+    match = _TYPE_RE.match(data, 4)
+    if not match:
+        return "unknown"
+    try:
+        return HiveMessageType(int(match.group(1))).name
+    except ValueError:
+        return "unknown"
+
+
+class SimSendError(Exception):
+    """Raised by the bus when sendcustommsg would fail (peer not connected)."""
+
+
+# =============================================================================
+# EVENT LOOP AND BUS
+# =============================================================================
+
+class SimLoop:
+    """Virtual clock plus a time-ordered queue of callbacks."""
+
+    def __init__(self, start: float = SIM_START_TIME):
+        self.now = start
+        self._queue: List[Tuple[float, int, Callable, tuple]] = []
+        self._seq = 0
+
+    def time(self) -> float:
+        return self.now
+
+    def call_at(self, when: float, fn: Callable, *args) -> None:
+        self._seq += 1
+        heapq.heappush(self._queue, (max(when, self.now), self._seq, fn, args))
+
+    def call_later(self, delay: float, fn: Callable, *args) -> None:
+        self.call_at(self.now + delay, fn, *args)
+
+    def run_until(self, until: float,
+                  stop: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Run callbacks due up to `until`, advancing the clock.
+
+        Returns:
+            True if `stop` returned True (the clock stays at that moment)
+        """
+        while self._queue and self._queue[0][0] <= until:
+            when, _, fn, args = heapq.heappop(self._queue)
+            self.now = when
+            fn(*args)
+            if stop and stop():
+                return True
+        self.now = max(self.now, until)
+        return bool(stop and stop())
+
+    def run_for(self, seconds: float,
+                stop: Optional[Callable[[], bool]] = None) -> bool:
+        return self.run_until(self.now + seconds, stop)
+
+
+class SimBus:
+    """
+    Simulated sendcustommsg transport.
+
+    send() fails like sendcustommsg to an unconnected peer when the nodes
+    have no link, either is offline, or a partition separates them. Lost
+    messages are accepted by send() and silently never delivered.
+    """
+
+    def __init__(self, loop: SimLoop, rng: random.Random,
+                 latency: float = DEFAULT_LATENCY, jitter: float = 0.0,
+                 loss: float = 0.0):
+        self.loop = loop
+        self.rng = rng
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.links: Dict[str, Set[str]] = defaultdict(set)
+        self.online: Set[str] = set()
+        self.receivers: Dict[str, Callable[[str, bytes], None]] = {}
+        self._partition: Optional[Dict[str, int]] = None
+
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.sent_by_type: Dict[str, int] = defaultdict(int)
+        self.bytes_by_type: Dict[str, int] = defaultdict(int)
+        self.delivered_by_type: Dict[str, int] = defaultdict(int)
+
+    def attach(self, peer_id: str, receiver: Callable[[str, bytes], None]) -> None:
+        self.receivers[peer_id] = receiver
+        self.online.add(peer_id)
+
+    def connect(self, a: str, b: str) -> None:
+        if a != b:
+            self.links[a].add(b)
+            self.links[b].add(a)
+
+    def partition(self, groups: Iterable[Iterable[str]]) -> None:
+        """Split the network; nodes not listed form one more group."""
+        self._partition = {}
+        for index, group in enumerate(groups):
+            for peer_id in group:
+                self._partition[peer_id] = index + 1
+
+    def heal(self) -> None:
+        self._partition = None
+
+    def can_reach(self, src: str, dst: str) -> bool:
+        if src not in self.online or dst not in self.online:
+            return False
+        if dst not in self.links[src]:
+            return False
+        if self._partition is not None:
+            return self._partition.get(src, 0) == self._partition.get(dst, 0)
+        return True
+
+    def send(self, src: str, dst: str, data: bytes) -> None:
+        if len(data) > MAX_MESSAGE_BYTES:
+            self.counters["oversize"] += 1
+            raise SimSendError(f"message too large ({len(data)} bytes)")
+        if not self.can_reach(src, dst):
+            self.counters["refused"] += 1
+            raise SimSendError(f"peer {dst[:16]}... not connected")
+
+        msg_type = _message_type_name(data)
+        self.counters["sent"] += 1
+        self.counters["bytes"] += len(data)
+        self.sent_by_type[msg_type] += 1
+        self.bytes_by_type[msg_type] += len(data)
+
+        if self.loss and self.rng.random() < self.loss:
+            self.counters["lost"] += 1
+            return
+        delay = self.latency
+        if self.jitter:
+            delay = max(0.0, delay + self.rng.uniform(-self.jitter, self.jitter))
+        self.loop.call_later(delay, self._deliver, src, dst, data, msg_type)
+
+    def _deliver(self, src: str, dst: str, data: bytes, msg_type: str) -> None:
+        # Links that went down while the message was in flight drop it
+        if not self.can_reach(src, dst):
+            self.counters["lost"] += 1
+            return
+        self.counters["delivered"] += 1
+        self.delivered_by_type[msg_type] += 1
+        self.receivers[dst](src, data)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "counters": dict(self.counters),
+            "sent_by_type": dict(self.sent_by_type),
+            "bytes_by_type": dict(self.bytes_by_type),
+            "delivered_by_type": dict(self.delivered_by_type),
+        }
+
+    def delta(self, before: Dict[str, Any]) -> Dict[str, Any]:
+        """Traffic since an earlier snapshot()."""
+        after = self.snapshot()
+        result = {}
+        for section, values in after.items():
+            old = before[section]
+            result[section] = {
+                key: value - old.get(key, 0)
+                for key, value in values.items() if value - old.get(key, 0)
+            }
+        return result
+
+
+# =============================================================================
+# SIMULATED NODE
+# =============================================================================
+
+class _SimRpc:
+    """The RPC surface the managers use, routed to the simulated bus."""
+
+    def __init__(self, node: "SimNode"):
+        self._node = node
+
+    def call(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if method == "sendcustommsg":
+            self._node.bus.send(self._node.pubkey, params["node_id"],
+                                bytes.fromhex(params["msg"]))
+            return {"status": "Message sent"}
+        raise SimSendError(f"RPC {method} not available in the simulator")
+
+    def getinfo(self) -> Dict[str, Any]:
+        return {"id": self._node.pubkey}
+
+    def signmessage(self, message: str) -> Dict[str, Any]:
+        return {"zbase": SIM_SIGNATURE}
+
+    def listpeerchannels(self, *args, **kwargs) -> Dict[str, Any]:
+        return {"channels": []}
+
+
+class _SimPlugin:
+    """Plugin stand-in; logs are discarded unless verbose."""
+
+    def __init__(self, node: "SimNode", verbose: bool = False):
+        self.rpc = _SimRpc(node)
+        self._prefix = node.pubkey[:8]
+        self._verbose = verbose
+
+    def log(self, msg: str, level: str = "info") -> None:
+        if self._verbose:
+            print(f"[{self._prefix}] {level}: {msg}", file=sys.stderr)
+
+
+class SimNode:
+    """One hive member: real managers, simulated plugin and transport."""
+
+    def __init__(self, pubkey: str, bus: SimBus, db_path: str,
+                 topology: List[str], verbose: bool = False):
+        self.pubkey = pubkey
+        self.bus = bus
+        self.topology = topology
+        self.plugin = _SimPlugin(self, verbose)
+
+        self.database = HiveDatabase(db_path, self.plugin)
+        self.database.initialize()
+        # Simulated nodes never outlive the process; skip per-commit fsyncs
+        self.database._get_connection().execute("PRAGMA synchronous=OFF")
+        self.state_manager = StateManager(self.database, self.plugin)
+        self.gossip_mgr = GossipManager(
+            self.state_manager, self.plugin,
+            get_membership_hash=self.database.get_membership_hash
+        )
+        self.relay_mgr = RelayManager(
+            our_pubkey=pubkey,
+            send_message=self._relay_send,
+            get_members=self._member_ids,
+        )
+        self.intent_mgr = IntentManager(self.database, self.plugin, pubkey)
+        self.mcf_coordinator = MCFCoordinator(
+            self.plugin, self.database, self.state_manager, None, pubkey
+        )
+
+        self._handlers = {
+            HiveMessageType.GOSSIP: self._handle_gossip,
+            HiveMessageType.STATE_HASH: self._handle_state_hash,
+            HiveMessageType.FULL_SYNC: self._handle_full_sync,
+            HiveMessageType.INTENT: self._handle_intent,
+            HiveMessageType.INTENT_ABORT: self._handle_intent_abort,
+        }
+        self.received: Dict[str, int] = defaultdict(int)
+
+    # -------------------------------------------------------------------------
+    # Transport
+    # -------------------------------------------------------------------------
+
+    def _member_ids(self) -> List[str]:
+        return [m["peer_id"] for m in self.database.get_all_members()
+                if m.get("tier") == "member"]
+
+    def _send(self, peer_id: str, data: bytes) -> bool:
+        # Skip the hex round trip for sends the bus would refuse anyway
+        if not self.bus.can_reach(self.pubkey, peer_id):
+            self.bus.counters["refused"] += 1
+            return False
+        try:
+            self.plugin.rpc.call("sendcustommsg", {"node_id": peer_id, "msg": data.hex()})
+            return True
+        except SimSendError:
+            return False
+
+    def _relay_send(self, peer_id: str, data: bytes) -> bool:
+        return self._send(peer_id, data)
+
+    def broadcast(self, data: bytes) -> int:
+        """Send to every other member, as _broadcast_to_members does."""
+        return sum(1 for peer_id in self._member_ids()
+                   if peer_id != self.pubkey and self._send(peer_id, data))
+
+    def _relay(self, msg_type: HiveMessageType, payload: Dict[str, Any],
+               peer_id: str) -> int:
+        # Same steps as cl-hive's _relay_message
+        if not self.relay_mgr.should_relay(payload):
+            return 0
+        relay_payload = self.relay_mgr.prepare_for_relay(payload, peer_id)
+        if not relay_payload:
+            return 0
+        return self.relay_mgr.relay(relay_payload, peer_id,
+                                    lambda p: serialize(msg_type, p))
+
+    # -------------------------------------------------------------------------
+    # Outgoing messages
+    # -------------------------------------------------------------------------
+
+    def broadcast_gossip(self, capacity_sats: int = 100_000_000,
+                         available_sats: int = 50_000_000) -> int:
+        """Create the next gossip version and broadcast it. Returns the version."""
+        payload = self.gossip_mgr.create_gossip_payload(
+            our_pubkey=self.pubkey,
+            capacity_sats=capacity_sats,
+            available_sats=available_sats,
+            fee_policy={"base_fee": 1000, "fee_rate": 100},
+            topology=self.topology,
+        )
+        payload["sender_id"] = self.pubkey
+        payload["signature"] = SIM_SIGNATURE
+        self.broadcast(serialize(HiveMessageType.GOSSIP, payload))
+        return payload["version"]
+
+    def send_state_hash(self, peer_id: str) -> bool:
+        payload = self.gossip_mgr.create_state_hash_payload()
+        payload["sender_id"] = self.pubkey
+        payload["signature"] = SIM_SIGNATURE
+        return self._send(peer_id, serialize(HiveMessageType.STATE_HASH, payload))
+
+    def _full_sync_message(self) -> bytes:
+        payload = self.gossip_mgr.create_full_sync_payload()
+        payload["members"] = [
+            {"peer_id": m["peer_id"], "tier": m.get("tier", "neophyte"),
+             "joined_at": m.get("joined_at", 0)}
+            for m in self.database.get_all_members()
+        ]
+        payload["sender_id"] = self.pubkey
+        payload["timestamp"] = int(self.bus.loop.time())
+        payload["signature"] = SIM_SIGNATURE
+        return serialize(HiveMessageType.FULL_SYNC, payload)
+
+    def announce_intent(self, target: str,
+                        intent_type: str = IntentType.CHANNEL_OPEN.value) -> Intent:
+        intent = self.intent_mgr.create_intent(intent_type, target)
+        self.broadcast(serialize(HiveMessageType.INTENT,
+                                 self.intent_mgr.create_intent_message(intent)))
+        return intent
+
+    def _broadcast_intent_abort(self, target: str, intent_type: str) -> None:
+        payload = {
+            "intent_type": intent_type,
+            "target": target,
+            "initiator": self.pubkey,
+            "timestamp": int(self.bus.loop.time()),
+            "reason": "tie_breaker_loss",
+            "signature": SIM_SIGNATURE,
+        }
+        self.broadcast(serialize(HiveMessageType.INTENT_ABORT, payload))
+
+    # -------------------------------------------------------------------------
+    # Incoming messages
+    # -------------------------------------------------------------------------
+
+    def on_custommsg(self, peer_id: str, data: bytes) -> None:
+        msg_type, payload = deserialize(data)
+        if msg_type is None:
+            return
+        self.received[msg_type.name] += 1
+        handler = self._handlers.get(msg_type)
+        if handler:
+            handler(peer_id, payload)
+
+    def _handle_gossip(self, peer_id: str, payload: Dict[str, Any]) -> None:
+        if not self.relay_mgr.should_process(payload):
+            return
+        if not validate_gossip(payload):
+            return
+        sender_id = payload["sender_id"]
+        if sender_id != peer_id and not is_relayed_message(payload):
+            return
+        if self.database.get_member(sender_id):
+            self.gossip_mgr.process_gossip(sender_id, payload)
+        self._relay(HiveMessageType.GOSSIP, payload, peer_id)
+
+    def _handle_state_hash(self, peer_id: str, payload: Dict[str, Any]) -> None:
+        if not validate_state_hash(payload) or payload["sender_id"] != peer_id:
+            return
+        if not self.gossip_mgr.process_state_hash(peer_id, payload):
+            self._send(peer_id, self._full_sync_message())
+
+    def _handle_full_sync(self, peer_id: str, payload: Dict[str, Any]) -> None:
+        if not validate_full_sync(payload) or payload["sender_id"] != peer_id:
+            return
+        states = payload.get("states", [])
+        fleet_hash = payload.get("fleet_hash", "")
+        if states and fleet_hash and compute_states_hash(states) != fleet_hash:
+            return
+        if self.database.get_member(peer_id):
+            self.gossip_mgr.process_full_sync(peer_id, payload)
+
+    def _handle_intent(self, peer_id: str, payload: Dict[str, Any]) -> None:
+        if not self.database.get_member(peer_id) or payload.get("initiator") != peer_id:
+            return
+        remote_intent = Intent.from_dict(payload)
+        self.intent_mgr.record_remote_intent(remote_intent)
+        has_conflict, we_win = self.intent_mgr.check_conflicts(remote_intent)
+        if has_conflict and not we_win:
+            self.intent_mgr.abort_local_intent(
+                target=remote_intent.target, intent_type=remote_intent.intent_type
+            )
+            self._broadcast_intent_abort(remote_intent.target, remote_intent.intent_type)
+
+    def _handle_intent_abort(self, peer_id: str, payload: Dict[str, Any]) -> None:
+        if not validate_intent_abort(payload):
+            return
+        self.intent_mgr.record_remote_abort(
+            payload["intent_type"], payload["target"], payload["initiator"]
+        )
+
+    # -------------------------------------------------------------------------
+    # Views
+    # -------------------------------------------------------------------------
+
+    def known_version(self, peer_id: str) -> int:
+        state = self.state_manager.get_peer_state(peer_id)
+        return state.version if state else 0
+
+    def pending_intents(self, target: str,
+                        intent_type: str = IntentType.CHANNEL_OPEN.value) -> List[Dict]:
+        return self.database.get_conflicting_intents(target, intent_type)
+
+
+# =============================================================================
+# FLEET SIMULATOR
+# =============================================================================
+
+class FleetSimulator:
+    """
+    N simulated nodes on a shared bus.
+
+    Must be used as a context manager: entering patches time.time() with
+    the virtual clock and creates the per-node databases; leaving restores
+    the clock and removes the databases.
+    """
+
+    def __init__(self, n_nodes: int = 20, topology: str = "mesh", degree: int = 4,
+                 latency: float = DEFAULT_LATENCY, jitter: float = 0.0,
+                 loss: float = 0.0, seed: int = 1,
+                 heartbeat_interval: int = DEFAULT_HEARTBEAT_INTERVAL,
+                 topology_size: int = DEFAULT_TOPOLOGY_SIZE,
+                 workdir: Optional[str] = None, verbose: bool = False):
+        if n_nodes < 2:
+            raise ValueError("n_nodes must be at least 2")
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"topology must be one of {TOPOLOGIES}")
+
+        self.n_nodes = n_nodes
+        self.topology = topology
+        self.degree = degree
+        self.heartbeat_interval = heartbeat_interval
+        self.topology_size = topology_size
+        self.verbose = verbose
+        self.rng = random.Random(seed)
+        self.loop = SimLoop()
+        self.bus = SimBus(self.loop, self.rng, latency, jitter, loss)
+        self.node_ids = [_node_id(i) for i in range(n_nodes)]
+        self.nodes: Dict[str, SimNode] = {}
+
+        self._workdir = workdir
+        self._owns_workdir = workdir is None
+        self._clock_patch = None
+        self._heartbeats_started = False
+
+    def __enter__(self) -> "FleetSimulator":
+        if self._owns_workdir:
+            self._workdir = tempfile.mkdtemp(prefix="hive-fleet-sim-")
+        self._clock_patch = patch("time.time", self.loop.time)
+        self._clock_patch.start()
+        try:
+            self._build()
+        except Exception:
+            self.__exit__(None, None, None)
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._clock_patch:
+            self._clock_patch.stop()
+            self._clock_patch = None
+        if self._owns_workdir and self._workdir:
+            shutil.rmtree(self._workdir, ignore_errors=True)
+
+    def _build(self) -> None:
+        joined_at = int(self.loop.time()) - 86400 * 30
+        for index, pubkey in enumerate(self.node_ids):
+            topology = [_external_id(index * self.topology_size + k)
+                        for k in range(self.topology_size)]
+            node = SimNode(pubkey, self.bus, os.path.join(self._workdir, f"node{index}.db"),
+                           topology, self.verbose)
+            with node.database.transaction():
+                for member_id in self.node_ids:
+                    node.database.add_member(member_id, tier="member", joined_at=joined_at)
+            self.nodes[pubkey] = node
+            self.bus.attach(pubkey, node.on_custommsg)
+        self._connect()
+
+    def _connect(self) -> None:
+        ids = self.node_ids
+        n = len(ids)
+        if self.topology == "mesh":
+            for i in range(n):
+                for j in range(i + 1, n):
+                    self.bus.connect(ids[i], ids[j])
+            return
+        if self.topology == "ring":
+            # Each node linked to its `degree` nearest neighbours on a ring
+            for i in range(n):
+                for k in range(1, max(1, self.degree // 2) + 1):
+                    self.bus.connect(ids[i], ids[(i + k) % n])
+            return
+        # random: a ring for connectivity plus random chords up to `degree`
+        for i in range(n):
+            self.bus.connect(ids[i], ids[(i + 1) % n])
+        for node_id in ids:
+            while len(self.bus.links[node_id]) < min(self.degree, n - 1):
+                self.bus.connect(node_id, self.rng.choice(ids))
+
+    # -------------------------------------------------------------------------
+    # Control
+    # -------------------------------------------------------------------------
+
+    def online_ids(self) -> List[str]:
+        return [p for p in self.node_ids if p in self.bus.online]
+
+    def set_online(self, peer_id: str, online: bool) -> None:
+        if online:
+            self.bus.online.add(peer_id)
+        else:
+            self.bus.online.discard(peer_id)
+
+    def partition(self, *groups: Iterable[str]) -> None:
+        self.bus.partition(groups)
+
+    def heal(self) -> None:
+        self.bus.heal()
+
+    def run_for(self, seconds: float,
+                stop: Optional[Callable[[], bool]] = None) -> bool:
+        return self.loop.run_for(seconds, stop)
+
+    def start_heartbeats(self) -> None:
+        """Every node re-gossips each heartbeat interval, at a random phase."""
+        if self._heartbeats_started:
+            return
+        self._heartbeats_started = True
+        for peer_id in self.node_ids:
+            self.loop.call_later(self.rng.uniform(0, self.heartbeat_interval),
+                                 self._heartbeat, peer_id)
+
+    def _heartbeat(self, peer_id: str) -> None:
+        if peer_id in self.bus.online:
+            self.nodes[peer_id].broadcast_gossip()
+        self.loop.call_later(self.heartbeat_interval, self._heartbeat, peer_id)
+
+    def bootstrap(self, settle: float = 60.0, max_rounds: int = 20) -> int:
+        """
+        Every node gossips once, then anti-entropy rounds (the STATE_HASH a
+        node sends when a member connects) fill in what relay did not reach,
+        until the fleet converges or a round makes no progress.
+
+        Returns:
+            Anti-entropy rounds run
+        """
+        for peer_id in self.online_ids():
+            self.nodes[peer_id].broadcast_gossip()
+        self.run_for(settle)
+        rounds = 0
+        known = self._known_states()
+        while rounds < max_rounds and not self.is_converged():
+            self.anti_entropy_round()
+            self.run_for(settle)
+            rounds += 1
+            previous, known = known, self._known_states()
+            if known == previous:
+                break
+        return rounds
+
+    def anti_entropy_round(self) -> int:
+        """Every online node sends STATE_HASH to each reachable neighbour."""
+        sent = 0
+        for peer_id in self.online_ids():
+            for neighbour in sorted(self.bus.links[peer_id]):
+                if self.nodes[peer_id].send_state_hash(neighbour):
+                    sent += 1
+        return sent
+
+    # -------------------------------------------------------------------------
+    # Views
+    # -------------------------------------------------------------------------
+
+    def _known_states(self) -> int:
+        return sum(len(self.nodes[p].state_manager.get_all_peer_states())
+                   for p in self.node_ids)
+
+    def nodes_with_version(self, origin: str, version: int) -> int:
+        return sum(1 for p in self.online_ids()
+                   if p != origin and self.nodes[p].known_version(origin) >= version)
+
+    def is_converged(self) -> bool:
+        """Every online node knows the current version of every online node."""
+        online = self.online_ids()
+        latest = {p: self.nodes[p].known_version(p) for p in online}
+        return all(self.nodes[p].known_version(q) >= latest[q]
+                   for p in online for q in online)
+
+    def elected_coordinators(self) -> Dict[str, str]:
+        return {p: self.nodes[p].mcf_coordinator.elect_coordinator()
+                for p in self.online_ids()}
+
+    # -------------------------------------------------------------------------
+    # Scenarios
+    # -------------------------------------------------------------------------
+
+    def measure_gossip_convergence(self, origin: Optional[str] = None,
+                                   timeout: float = 60.0) -> Dict[str, Any]:
+        """Broadcast one new gossip version and time its spread."""
+        origin = origin or self.rng.choice(self.online_ids())
+        node = self.nodes[origin]
+        target = len(self.online_ids()) - 1
+        before = self.bus.snapshot()
+        started = self.loop.time()
+
+        version = node.broadcast_gossip()
+        converged = self.loop.run_for(
+            timeout, lambda: self.nodes_with_version(origin, version) >= target
+        )
+        elapsed = self.loop.time() - started
+        # Let in-flight relays land so amplification counts the whole wave
+        if converged:
+            self.loop.run_for(timeout - elapsed)
+
+        traffic = self.bus.delta(before)
+        deliveries = traffic["delivered_by_type"].get("GOSSIP", 0)
+        return {
+            "origin": origin,
+            "version": version,
+            "converged": converged,
+            "convergence_seconds": round(elapsed, 3) if converged else None,
+            "nodes_reached": self.nodes_with_version(origin, version),
+            "nodes_expected": target,
+            "gossip_sent": traffic["sent_by_type"].get("GOSSIP", 0),
+            "gossip_delivered": deliveries,
+            "relay_amplification": round(deliveries / target, 2) if target else 0.0,
+            "traffic": traffic,
+        }
+
+    def measure_full_sync(self, peer_id: Optional[str] = None,
+                          offline_seconds: Optional[float] = None,
+                          timeout: float = 60.0) -> Dict[str, Any]:
+        """
+        Take a node offline while the fleet keeps gossiping, bring it back,
+        and measure the STATE_HASH/FULL_SYNC exchange that catches it up.
+        """
+        peer_id = peer_id or self.rng.choice(self.online_ids())
+        node = self.nodes[peer_id]
+        self.set_online(peer_id, False)
+        self.start_heartbeats()
+        self.run_for(offline_seconds or self.heartbeat_interval * 2)
+        stale = sum(1 for q in self.online_ids()
+                    if node.known_version(q) < self.nodes[q].known_version(q))
+
+        self.set_online(peer_id, True)
+        before = self.bus.snapshot()
+        started = self.loop.time()
+        # Caught up = knows at least what its reachable neighbours knew
+        neighbours = [q for q in sorted(self.bus.links[peer_id])
+                      if self.bus.can_reach(peer_id, q)]
+        wanted = {q: max(self.nodes[n].known_version(q) for n in neighbours)
+                  for q in self.online_ids() if q != peer_id} if neighbours else {}
+        for neighbour in neighbours:
+            node.send_state_hash(neighbour)
+
+        def caught_up() -> bool:
+            return all(node.known_version(q) >= v for q, v in wanted.items())
+
+        synced = self.loop.run_for(timeout, caught_up)
+        traffic = self.bus.delta(before)
+        return {
+            "node": peer_id,
+            "stale_states": stale,
+            "synced": synced,
+            "sync_seconds": round(self.loop.time() - started, 3) if synced else None,
+            "full_sync_messages": traffic["sent_by_type"].get("FULL_SYNC", 0),
+            "full_sync_bytes": traffic["bytes_by_type"].get("FULL_SYNC", 0),
+            "state_hash_messages": traffic["sent_by_type"].get("STATE_HASH", 0),
+            "oversize_refused": traffic["counters"].get("oversize", 0),
+            "traffic": traffic,
+        }
+
+    def measure_mcf_failover(self, timeout: float = 3600.0) -> Dict[str, Any]:
+        """
+        Take the elected MCF coordinator offline and time until every online
+        node elects the same replacement.
+        """
+        self.start_heartbeats()
+        # Fresh gossip from everyone before the failure
+        self.run_for(self.heartbeat_interval)
+        elected = self.elected_coordinators()
+        old = min(self.online_ids())
+        agreed_before = set(elected.values()) == {old}
+
+        self.set_online(old, False)
+        started = self.loop.time()
+        split_checks = 0
+        checks = 0
+        new = None
+        while self.loop.time() - started < timeout:
+            self.run_for(ELECTION_CHECK_INTERVAL)
+            checks += 1
+            choices = set(self.elected_coordinators().values())
+            if len(choices) > 1:
+                split_checks += 1
+            elif old not in choices:
+                new = choices.pop()
+                break
+
+        return {
+            "old_coordinator": old,
+            "agreed_before": agreed_before,
+            "new_coordinator": new,
+            "failover_seconds": round(self.loop.time() - started, 1) if new else None,
+            "gossip_staleness_limit": MAX_GOSSIP_AGE_FOR_MCF,
+            "split_brain_seconds": split_checks * ELECTION_CHECK_INTERVAL,
+            "checks": checks,
+        }
+
+    def measure_intent_race(self, initiators: int = 3, target: Optional[str] = None,
+                            timeout: float = 30.0) -> Dict[str, Any]:
+        """Several nodes announce an intent for the same target at once."""
+        target = target or _external_id(10 ** 6 + self.rng.randrange(10 ** 6))
+        racers = sorted(self.rng.sample(self.online_ids(), initiators))
+        before = self.bus.snapshot()
+        for peer_id in racers:
+            self.nodes[peer_id].announce_intent(target)
+        self.loop.run_for(timeout)
+
+        survivors = [p for p in racers if self.nodes[p].pending_intents(target)]
+        traffic = self.bus.delta(before)
+        return {
+            "target": target,
+            "initiators": racers,
+            "survivors": survivors,
+            "resolved": survivors == [racers[0]],
+            "intent_messages": traffic["sent_by_type"].get("INTENT", 0),
+            "abort_messages": traffic["sent_by_type"].get("INTENT_ABORT", 0),
+            "refused": traffic["counters"].get("refused", 0),
+        }
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def run_scenarios(args: argparse.Namespace) -> Dict[str, Any]:
+    results: Dict[str, Any] = {
+        "config": {
+            "nodes": args.nodes, "topology": args.topology, "degree": args.degree,
+            "latency": args.latency, "jitter": args.jitter, "loss": args.loss,
+            "seed": args.seed,
+        }
+    }
+    with FleetSimulator(n_nodes=args.nodes, topology=args.topology, degree=args.degree,
+                        latency=args.latency, jitter=args.jitter, loss=args.loss,
+                        seed=args.seed, verbose=args.verbose) as sim:
+        results["bootstrap_rounds"] = sim.bootstrap()
+        results["bootstrap_converged"] = sim.is_converged()
+        if "gossip" in args.scenarios:
+            results["gossip"] = sim.measure_gossip_convergence()
+        if "intent_race" in args.scenarios:
+            results["intent_race"] = sim.measure_intent_race(args.intent_initiators)
+        if "full_sync" in args.scenarios:
+            results["full_sync"] = sim.measure_full_sync()
+        if "mcf_failover" in args.scenarios:
+            results["mcf_failover"] = sim.measure_mcf_failover()
+        results["bus"] = sim.bus.snapshot()["counters"]
+    return results
+
+
+def _print_summary(results: Dict[str, Any]) -> None:
+    config = results["config"]
+    print(f"Fleet: {config['nodes']} nodes, {config['topology']} topology "
+          f"(degree {config['degree']}), latency {config['latency']}s, loss {config['loss']}")
+    print(f"Bootstrap converged: {results['bootstrap_converged']} "
+          f"after {results['bootstrap_rounds']} anti-entropy rounds")
+    if "gossip" in results:
+        g = results["gossip"]
+        print(f"Gossip: converged={g['converged']} in {g['convergence_seconds']}s, "
+              f"reached {g['nodes_reached']}/{g['nodes_expected']}, "
+              f"{g['gossip_delivered']} deliveries (amplification {g['relay_amplification']}x)")
+    if "intent_race" in results:
+        r = results["intent_race"]
+        print(f"Intent race: {len(r['initiators'])} initiators, "
+              f"{len(r['survivors'])} survivors, resolved={r['resolved']}, "
+              f"{r['intent_messages']} INTENT + {r['abort_messages']} ABORT")
+    if "full_sync" in results:
+        f = results["full_sync"]
+        print(f"Full sync: {f['stale_states']} stale states, synced={f['synced']} "
+              f"in {f['sync_seconds']}s, {f['full_sync_messages']} FULL_SYNC "
+              f"({f['full_sync_bytes']} bytes), {f['oversize_refused']} oversize")
+    if "mcf_failover" in results:
+        m = results["mcf_failover"]
+        print(f"MCF failover: {m['failover_seconds']}s to elect a new coordinator "
+              f"(staleness limit {m['gossip_staleness_limit']}s), "
+              f"split brain for {m['split_brain_seconds']}s")
+    print(f"Bus: {results['bus']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="In-process cl-hive fleet simulator")
+    parser.add_argument("--nodes", type=int, default=100)
+    parser.add_argument("--topology", choices=TOPOLOGIES, default="random")
+    parser.add_argument("--degree", type=int, default=6,
+                        help="Links per node for ring/random topologies")
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--loss", type=float, default=0.0, help="Message loss rate (0-1)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--scenarios", default="gossip,intent_race,full_sync,mcf_failover",
+                        type=lambda s: [x.strip() for x in s.split(",") if x.strip()])
+    parser.add_argument("--intent-initiators", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Print node logs to stderr")
+    args = parser.parse_args()
+
+    results = run_scenarios(args)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_summary(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -52,10 +52,11 @@ import os
 import ssl
 import sys
 import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import httpx
 
@@ -82,6 +83,46 @@ GOAT_FEEDER_PATTERN = "⚡CyberHerd Treats⚡"
 LNBITS_URL = "http://127.0.0.1:3002"
 LNBITS_INVOICE_KEY = "ac0dcb0cdab94f72b757d0f3aa85d08a"
 
+# Fleet fan-out: per-node deadline for fleet-wide calls and the maximum
+# number of node RPCs in flight at once across all handlers
+FLEET_CALL_TIMEOUT = float(os.environ.get('HIVE_FLEET_CALL_TIMEOUT', '30'))
+FLEET_MAX_CONCURRENCY = int(os.environ.get('HIVE_FLEET_MAX_CONCURRENCY', '8'))
+
+# Docker mode: deadline per call and concurrent `docker exec` processes
+# allowed per container (lightning-cli mode only)
+DOCKER_CALL_TIMEOUT = 30
+DOCKER_MAX_EXEC_PER_CONTAINER = int(os.environ.get('HIVE_DOCKER_MAX_EXEC', '4'))
+
+# Relay run inside the container by docker_rpc="relay": reads one JSON-RPC
+# request per stdin line, forwards it to lightningd's unix socket (responses
+# end with a blank line) and writes the response as one stdout line
+DOCKER_RPC_RELAY = r"""
+import json, socket, sys
+path, sock, buf = sys.argv[1], None, b""
+for line in sys.stdin:
+    request = json.loads(line)
+    try:
+        if sock is None:
+            sock, buf = socket.socket(socket.AF_UNIX), b""
+            sock.connect(path)
+        sock.sendall(json.dumps(request).encode())
+        while b"\n\n" not in buf:
+            chunk = sock.recv(65536)
+            if not chunk:
+                raise ConnectionError("lightningd closed the RPC socket")
+            buf += chunk
+        raw, buf = buf.split(b"\n\n", 1)
+        response = json.loads(raw)
+    except Exception as e:
+        if sock is not None:
+            sock.close()
+        sock = None
+        response = {"jsonrpc": "2.0", "id": request.get("id"),
+                    "error": {"code": -1, "message": f"relay: {e}"}}
+    sys.stdout.write(json.dumps(response) + "\n")
+    sys.stdout.flush()
+"""
+
 # =============================================================================
 # Strategy Prompt Loading
 # =============================================================================
@@ -122,6 +163,95 @@ def load_strategy(name: str) -> str:
 # Node Connection
 # =============================================================================
 
+_docker_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def _docker_semaphore(container: str) -> asyncio.Semaphore:
+    """Limit concurrent `docker exec` processes per container."""
+    if container not in _docker_semaphores:
+        _docker_semaphores[container] = asyncio.Semaphore(DOCKER_MAX_EXEC_PER_CONTAINER)
+    return _docker_semaphores[container]
+
+
+async def _kill_process(proc: asyncio.subprocess.Process):
+    """Kill a child process (if still running) and reap it."""
+    if proc.returncode is None:
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+        await proc.wait()
+
+
+class DockerRpcSession:
+    """
+    Persistent JSON-RPC channel into a container.
+
+    One long-lived `docker exec -i <container> python3 -c <relay>` process
+    forwards requests to lightningd's unix socket, instead of forking
+    `docker exec lightning-cli` for every call. Requests are serialized; a
+    call that times out or is cancelled kills the relay (its output would
+    be out of step) and the next call starts a new one.
+    """
+
+    def __init__(self, container: str, rpc_path: str):
+        self.container = container
+        self.rpc_path = rpc_path
+        self.responses = 0
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._lock = asyncio.Lock()
+        self._next_id = 0
+
+    async def _start(self):
+        self._proc = await asyncio.create_subprocess_exec(
+            "docker", "exec", "-i", self.container,
+            "python3", "-u", "-c", DOCKER_RPC_RELAY, self.rpc_path,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=64 * 1024 * 1024
+        )
+
+    async def call(self, method: str, params: Dict = None,
+                   timeout: float = DOCKER_CALL_TIMEOUT) -> Dict:
+        """
+        Send one request and wait for its response.
+
+        Raises:
+            ConnectionError: The relay exited (e.g. no python3 in the container)
+            asyncio.TimeoutError: No response within timeout
+        """
+        async with self._lock:
+            if self._proc is None or self._proc.returncode is not None:
+                await self._start()
+            self._next_id += 1
+            request = {"jsonrpc": "2.0", "id": self._next_id,
+                       "method": method, "params": params or {}}
+            try:
+                self._proc.stdin.write(json.dumps(request).encode() + b"\n")
+                await self._proc.stdin.drain()
+                line = await asyncio.wait_for(self._proc.stdout.readline(), timeout)
+                if not line:
+                    raise ConnectionError("RPC relay exited")
+            except BaseException:
+                await self.close()
+                raise
+            self.responses += 1
+
+        response = json.loads(line)
+        if "error" in response:
+            error = response["error"]
+            if isinstance(error, dict):
+                return {"error": error.get("message", str(error)), "code": error.get("code")}
+            return {"error": str(error)}
+        return response.get("result", {})
+
+    async def close(self):
+        proc, self._proc = self._proc, None
+        if proc:
+            await _kill_process(proc)
+
+
 @dataclass
 class NodeConnection:
     """Connection to a CLN node via REST API or Docker exec (for Polar)."""
@@ -134,11 +264,18 @@ class NodeConnection:
     docker_container: Optional[str] = None
     lightning_dir: str = "/home/clightning/.lightning"
     network: str = "regtest"
+    # "relay": persistent JSON-RPC session, falling back to "cli" (one
+    # `docker exec lightning-cli` per call) if the relay cannot start
+    docker_rpc: str = "relay"
+    docker_session: Optional[DockerRpcSession] = None
+    # Fleet-wide limit on in-flight RPCs (shared by all nodes)
+    semaphore: Optional[asyncio.Semaphore] = None
 
     async def connect(self):
         """Initialize the HTTP client (if using REST)."""
         if self.docker_container:
-            logger.info(f"Using docker exec for {self.name} ({self.docker_container})")
+            logger.info(f"Using docker exec for {self.name} ({self.docker_container}, "
+                        f"rpc={self.docker_rpc})")
             return
 
         ssl_context = None
@@ -155,12 +292,20 @@ class NodeConnection:
         logger.info(f"Connected to {self.name} at {self.rest_url}")
 
     async def close(self):
-        """Close the HTTP client."""
+        """Close the HTTP client or docker RPC session."""
         if self.client:
             await self.client.aclose()
+        if self.docker_session:
+            await self.docker_session.close()
 
     async def call(self, method: str, params: Dict = None) -> Dict:
         """Call a CLN RPC method via REST or docker exec."""
+        if self.semaphore:
+            async with self.semaphore:
+                return await self._call(method, params)
+        return await self._call(method, params)
+
+    async def _call(self, method: str, params: Dict = None) -> Dict:
         # Docker exec mode (for Polar)
         if self.docker_container:
             return await self._call_docker(method, params)
@@ -182,8 +327,27 @@ class NodeConnection:
 
     async def _call_docker(self, method: str, params: Dict = None) -> Dict:
         """Call CLN via docker exec (for Polar testing)."""
-        import subprocess
-
+        if self.docker_rpc == "relay":
+            if not self.docker_session:
+                rpc_path = f"{self.lightning_dir}/{self.network}/lightning-rpc"
+                self.docker_session = DockerRpcSession(self.docker_container, rpc_path)
+            try:
+                return await self.docker_session.call(method, params)
+            except asyncio.TimeoutError:
+                return {"error": "Command timed out"}
+            except (ConnectionError, OSError, ValueError) as e:
+                if self.docker_session.responses:
+                    return {"error": str(e)}
+                # Never answered: relay unsupported here, use lightning-cli
+                logger.warning(f"RPC relay unavailable on {self.name} ({e}), "
+                               "falling back to lightning-cli")
+                self.docker_rpc = "cli"
+                self.docker_session = None
+
+        return await self._call_docker_cli(method, params)
+
+    async def _call_docker_cli(self, method: str, params: Dict = None) -> Dict:
+        """Call CLN by running lightning-cli in the container."""
         # Build command
         cmd = [
             "docker", "exec", self.docker_container,
@@ -205,29 +369,45 @@ class NodeConnection:
                 else:
                     cmd.append(f"{key}={json.dumps(value)}")
 
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            if result.returncode != 0:
-                return {"error": result.stderr.strip()}
-            return json.loads(result.stdout) if result.stdout.strip() else {}
-        except subprocess.TimeoutExpired:
-            return {"error": "Command timed out"}
-        except json.JSONDecodeError as e:
-            return {"error": f"Invalid JSON response: {e}"}
-        except Exception as e:
-            return {"error": str(e)}
+        async with _docker_semaphore(self.docker_container):
+            proc = None
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                stdout, stderr = await asyncio.wait_for(
+                    proc.communicate(), DOCKER_CALL_TIMEOUT
+                )
+                if proc.returncode != 0:
+                    return {"error": stderr.decode().strip() or stdout.decode().strip()}
+                return json.loads(stdout) if stdout.strip() else {}
+            except asyncio.TimeoutError:
+                return {"error": "Command timed out"}
+            except json.JSONDecodeError as e:
+                return {"error": f"Invalid JSON response: {e}"}
+            except Exception as e:
+                return {"error": str(e)}
+            finally:
+                # Also runs on cancellation: never leave lightning-cli behind
+                if proc:
+                    await _kill_process(proc)
 
 
 class HiveFleet:
     """Manages connections to multiple Hive nodes."""
 
-    def __init__(self):
+    def __init__(self, max_concurrency: int = FLEET_MAX_CONCURRENCY,
+                 call_timeout: float = FLEET_CALL_TIMEOUT):
         self.nodes: Dict[str, NodeConnection] = {}
+        self.call_timeout = call_timeout
+        self.semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    def add_node(self, node: NodeConnection):
+        """Register a node; its RPCs share the fleet concurrency limit."""
+        node.semaphore = self.semaphore
+        self.nodes[node.name] = node
 
     def load_config(self, config_path: str):
         """Load node configuration from JSON file.
@@ -251,6 +431,7 @@ class HiveFleet:
         global_mode = config.get("mode", "rest")
         global_network = config.get("network", "regtest")
         global_lightning_dir = config.get("lightning_dir", "/home/clightning/.lightning")
+        global_docker_rpc = config.get("docker_rpc", "relay")
 
         for node_config in config.get("nodes", []):
             # Per-node mode overrides global mode
@@ -262,7 +443,8 @@ class HiveFleet:
                     name=node_config["name"],
                     docker_container=node_config.get("docker_container"),
                     lightning_dir=node_config.get("lightning_dir", global_lightning_dir),
-                    network=node_config.get("network", global_network)
+                    network=node_config.get("network", global_network),
+                    docker_rpc=node_config.get("docker_rpc", global_docker_rpc)
                 )
             else:
                 # REST mode (default)
@@ -272,18 +454,20 @@ class HiveFleet:
                     rune=node_config.get("rune"),
                     ca_cert=node_config.get("ca_cert")
                 )
-            self.nodes[node.name] = node
+            self.add_node(node)
 
         logger.info(f"Loaded {len(self.nodes)} nodes from config (global_mode={global_mode})")
 
     async def connect_all(self):
         """Connect to all nodes."""
-        for node in self.nodes.values():
+        async def connect(node: NodeConnection):
             try:
                 await node.connect()
             except Exception as e:
                 logger.error(f"Failed to connect to {node.name}: {e}")
 
+        await asyncio.gather(*(connect(node) for node in self.nodes.values()))
+
     async def close_all(self):
         """Close all connections."""
         for node in self.nodes.values():
@@ -293,11 +477,72 @@ class HiveFleet:
         """Get a node by name."""
         return self.nodes.get(name)
 
-    async def call_all(self, method: str, params: Dict = None) -> Dict[str, Any]:
-        """Call an RPC method on all nodes."""
-        results = {}
-        for name, node in self.nodes.items():
-            results[name] = await node.call(method, params)
+    async def gather(
+        self,
+        fn: Callable[[NodeConnection], Awaitable[Any]],
+        timeout: Optional[float] = None,
+        node_names: Optional[List[str]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Run fn(node) on every node concurrently, with partial results.
+
+        A node that raises or misses its deadline gets {"error": ...} in its
+        slot; the other nodes' results are returned as usual.
+
+        Args:
+            fn: Coroutine function taking a NodeConnection
+            timeout: Per-node deadline in seconds (default: call_timeout;
+                0: no deadline)
+            node_names: Subset of nodes (default: all)
+
+        Returns:
+            (results by node name, fleet meta with per-node latency_ms and
+            the names of failed / timed out nodes)
+        """
+        if timeout is None:
+            timeout = self.call_timeout
+        deadline = timeout or None
+        names = list(node_names) if node_names is not None else list(self.nodes)
+        latency_ms: Dict[str, float] = {}
+        failed: List[str] = []
+        timed_out: List[str] = []
+
+        async def run(name: str) -> Any:
+            started = time.monotonic()
+            try:
+                return await asyncio.wait_for(fn(self.nodes[name]), deadline)
+            except asyncio.TimeoutError:
+                timed_out.append(name)
+                return {"error": f"Timed out after {timeout}s"}
+            except Exception as e:
+                logger.error(f"Fleet call failed on {name}: {e}")
+                failed.append(name)
+                return {"error": str(e)}
+            finally:
+                latency_ms[name] = round((time.monotonic() - started) * 1000, 1)
+
+        started = time.monotonic()
+        values = await asyncio.gather(*(run(name) for name in names))
+        meta = {
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+            "latency_ms": latency_ms,
+            "failed": sorted(failed),
+            "timed_out": sorted(timed_out),
+        }
+        return dict(zip(names, values)), meta
+
+    async def call_all(self, method: str, params: Dict = None,
+                       timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Call an RPC method on all nodes concurrently.
+
+        Returns:
+            Results by node name, plus "_fleet" with per-node latency
+        """
+        results, meta = await self.gather(
+            lambda node: node.call(method, params), timeout=timeout
+        )
+        results["_fleet"] = meta
         return results
 
 
@@ -3703,10 +3948,7 @@ async def handle_pending_actions(args: Dict) -> Dict:
         result = await node.call("hive-pending-actions")
         return {node_name: result}
     else:
-        results = {}
-        for name, node in fleet.nodes.items():
-            results[name] = await node.call("hive-pending-actions")
-        return results
+        return await fleet.call_all("hive-pending-actions")
 
 
 async def handle_approve_action(args: Dict) -> Dict:
@@ -3781,9 +4023,11 @@ async def handle_onboard_new_members(args: Dict) -> Dict:
 
     # Gather required data
     try:
-        members_data = await node.call("hive-members")
-        node_info = await node.call("getinfo")
-        channels_data = await node.call("listpeerchannels")
+        members_data, node_info, channels_data = await asyncio.gather(
+            node.call("hive-members"),
+            node.call("getinfo"),
+            node.call("listpeerchannels")
+        )
     except Exception as e:
         return {"error": f"Failed to gather node data: {e}"}
 
@@ -4146,15 +4390,20 @@ async def handle_topology_analysis(args: Dict) -> Dict:
         return {"error": f"Unknown node: {node_name}"}
 
     # Get planner log, topology info, and expansion recommendations
-    planner_log = await node.call("hive-planner-log", {"limit": 10})
-    topology = await node.call("hive-topology")
+    planner_log, topology, expansion_recs = await asyncio.gather(
+        node.call("hive-planner-log", {"limit": 10}),
+        node.call("hive-topology"),
+        node.call("hive-expansion-recommendations", {"limit": 10}),
+        return_exceptions=True
+    )
+    for result in (planner_log, topology):
+        if isinstance(result, Exception):
+            raise result
 
-    # Get expansion recommendations with cooperation module intelligence
-    try:
-        expansion_recs = await node.call("hive-expansion-recommendations", {"limit": 10})
-    except Exception as e:
+    # Expansion recommendations (cooperation module intelligence) are optional
+    if isinstance(expansion_recs, Exception):
         # Graceful fallback if RPC not available
-        expansion_recs = {"error": str(e), "recommendations": []}
+        expansion_recs = {"error": str(expansion_recs), "recommendations": []}
 
     return {
         "planner_log": planner_log,
@@ -4928,11 +5177,11 @@ async def read_resource(uri: str) -> str:
 
             if resource_type == "status":
                 # Get status from all nodes
-                results = {}
-                for name, node in fleet.nodes.items():
-                    status = await node.call("hive-status")
-                    info = await node.call("getinfo")
-                    results[name] = {
+                async def node_status(node: NodeConnection) -> Dict:
+                    status, info = await asyncio.gather(
+                        node.call("hive-status"), node.call("getinfo")
+                    )
+                    return {
                         "hive_status": status,
                         "node_info": {
                             "alias": info.get("alias", "unknown"),
@@ -4940,14 +5189,19 @@ async def read_resource(uri: str) -> str:
                             "blockheight": info.get("blockheight", 0)
                         }
                     }
+
+                results, meta = await fleet.gather(node_status)
+                results["_fleet"] = meta
                 return json.dumps(results, indent=2)
 
             elif resource_type == "pending-actions":
                 # Get all pending actions
+                pending_by_node, meta = await fleet.gather(
+                    lambda node: node.call("hive-pending-actions")
+                )
                 results = {}
                 total_pending = 0
-                for name, node in fleet.nodes.items():
-                    pending = await node.call("hive-pending-actions")
+                for name, pending in pending_by_node.items():
                     actions = pending.get("actions", [])
                     results[name] = {
                         "count": len(actions),
@@ -4956,7 +5210,8 @@ async def read_resource(uri: str) -> str:
                     total_pending += len(actions)
                 return json.dumps({
                     "total_pending": total_pending,
-                    "by_node": results
+                    "by_node": results,
+                    "_fleet": meta
                 }, indent=2)
 
             elif resource_type == "summary":
@@ -4972,10 +5227,20 @@ async def read_resource(uri: str) -> str:
                     "nodes": {}
                 }
 
-                for name, node in fleet.nodes.items():
-                    status = await node.call("hive-status")
-                    funds = await node.call("listfunds")
-                    pending = await node.call("hive-pending-actions")
+                async def node_summary(node: NodeConnection) -> Dict:
+                    status, funds, pending = await asyncio.gather(
+                        node.call("hive-status"),
+                        node.call("listfunds"),
+                        node.call("hive-pending-actions")
+                    )
+                    return {"status": status, "funds": funds, "pending": pending}
+
+                data_by_node, meta = await fleet.gather(node_summary)
+                for name, data in data_by_node.items():
+                    # A failed or timed out node only has {"error": ...}
+                    status = data.get("status", data)
+                    funds = data.get("funds", {})
+                    pending = data.get("pending", {})
 
                     channels = funds.get("channels", [])
                     outputs = funds.get("outputs", [])
@@ -5006,6 +5271,7 @@ async def read_resource(uri: str) -> str:
                     summary["total_pending_actions"] += pending_count
 
                 summary["total_capacity_btc"] = summary["total_capacity_sats"] / 100_000_000
+                summary["_fleet"] = meta
                 return json.dumps(summary, indent=2)
 
     # Per-node resources
@@ -5019,10 +5285,12 @@ async def read_resource(uri: str) -> str:
                 raise ValueError(f"Unknown node: {node_name}")
 
             if resource_type == "status":
-                status = await node.call("hive-status")
-                info = await node.call("getinfo")
-                funds = await node.call("listfunds")
-                pending = await node.call("hive-pending-actions")
+                status, info, funds, pending = await asyncio.gather(
+                    node.call("hive-status"),
+                    node.call("getinfo"),
+                    node.call("listfunds"),
+                    node.call("hive-pending-actions")
+                )
 
                 channels = funds.get("channels", [])
                 outputs = funds.get("outputs", [])
@@ -5196,17 +5464,18 @@ async def handle_revenue_dashboard(args: Dict) -> Dict:
     if not node:
         return {"error": f"Unknown node: {node_name}"}
 
-    # Get base dashboard from cl-revenue-ops (routing P&L)
-    dashboard = await node.call("revenue-dashboard", {"window_days": window_days})
-
-    if "error" in dashboard:
-        return dashboard
-
     import time
     since_timestamp = int(time.time()) - (window_days * 86400)
 
-    # Fetch goat feeder revenue from LNbits
-    goat_feeder = await get_goat_feeder_revenue(since_timestamp)
+    # Base dashboard from cl-revenue-ops (routing P&L) and goat feeder
+    # revenue from LNbits are independent; fetch them together
+    dashboard, goat_feeder = await asyncio.gather(
+        node.call("revenue-dashboard", {"window_days": window_days}),
+        get_goat_feeder_revenue(since_timestamp)
+    )
+
+    if "error" in dashboard:
+        return dashboard
 
     # Extract routing P&L data from cl-revenue-ops dashboard structure
     # Data is in "period" and "financial_health", not "pnl_summary"
@@ -5502,7 +5771,7 @@ async def get_goat_feeder_revenue(since_timestamp: int) -> Dict[str, Any]:
     import urllib.request
     import json
 
-    try:
+    def fetch_payments():
         # Query LNbits payments API using urllib (no external dependencies)
         req = urllib.request.Request(
             f"{LNBITS_URL}/api/v1/payments",
@@ -5510,8 +5779,14 @@ async def get_goat_feeder_revenue(since_timestamp: int) -> Dict[str, Any]:
         )
         with urllib.request.urlopen(req, timeout=30) as response:
             if response.status != 200:
-                return {"total_sats": 0, "payment_count": 0, "error": f"API error: {response.status}"}
-            payments = json.loads(response.read())
+                return response.status, None
+            return response.status, json.loads(response.read())
+
+    try:
+        # Blocking urllib runs in a thread so other fleet calls keep going
+        status, payments = await asyncio.to_thread(fetch_payments)
+        if payments is None:
+            return {"total_sats": 0, "payment_count": 0, "error": f"API error: {status}"}
 
         total_sats = 0
         payment_count = 0
@@ -5811,15 +6086,20 @@ async def handle_advisor_record_snapshot(args: Dict) -> Dict:
 
     # Gather data from the node
     try:
-        hive_status = await node.call("hive-status")
-        funds = await node.call("listfunds")
-        pending = await node.call("hive-pending-actions")
+        hive_status, funds, pending, channels_data = await asyncio.gather(
+            node.call("hive-status"),
+            node.call("listfunds"),
+            node.call("hive-pending-actions"),
+            node.call("listpeerchannels")
+        )
 
         # Try to get revenue data if plugin is installed
         try:
-            dashboard = await node.call("revenue-dashboard", {"window_days": 30})
-            profitability = await node.call("revenue-profitability")
-            history = await node.call("revenue-history")
+            dashboard, profitability, history = await asyncio.gather(
+                node.call("revenue-dashboard", {"window_days": 30}),
+                node.call("revenue-profitability"),
+                node.call("revenue-history")
+            )
         except Exception:
             dashboard = {}
             profitability = {}
@@ -5858,7 +6138,6 @@ async def handle_advisor_record_snapshot(args: Dict) -> Dict:
         }
 
         # Process channel details for history
-        channels_data = await node.call("listpeerchannels")
         prof_data = profitability.get("channels", [])
         prof_by_id = {c.get("channel_id"): c for c in prof_data}
 
@@ -6247,9 +6526,14 @@ async def handle_advisor_get_peer_intel(args: Dict) -> Dict:
 
         if node:
             try:
-                # Query listnodes for peer info
+                # Query listnodes (peer info), listchannels (peer's channels)
+                # and listpeers (existing channel with us) together
                 # NOTE: Requires listnodes, listchannels, listpeers permissions in rune
-                nodes_result = await node.call("listnodes", {"id": peer_id})
+                nodes_result, channels_result, peers_result = await asyncio.gather(
+                    node.call("listnodes", {"id": peer_id}),
+                    node.call("listchannels", {"source": peer_id}),
+                    node.call("listpeers", {"id": peer_id})
+                )
                 if nodes_result.get("error"):
                     graph_data["rpc_errors"] = graph_data.get("rpc_errors", [])
                     graph_data["rpc_errors"].append(f"listnodes: {nodes_result['error']}")
@@ -6258,8 +6542,6 @@ async def handle_advisor_get_peer_intel(args: Dict) -> Dict:
                     graph_data["alias"] = node_info.get("alias", "")
                     graph_data["last_timestamp"] = node_info.get("last_timestamp", 0)
 
-                # Query listchannels for peer's channels
-                channels_result = await node.call("listchannels", {"source": peer_id})
                 if channels_result.get("error"):
                     graph_data["rpc_errors"] = graph_data.get("rpc_errors", [])
                     graph_data["rpc_errors"].append(f"listchannels: {channels_result['error']}")
@@ -6292,7 +6574,6 @@ async def handle_advisor_get_peer_intel(args: Dict) -> Dict:
                     graph_data["is_well_connected"] = len(channels) >= 15
 
                 # Check if we already have a channel with this peer
-                peers_result = await node.call("listpeers", {"id": peer_id})
                 if peers_result.get("error"):
                     graph_data["rpc_errors"] = graph_data.get("rpc_errors", [])
                     graph_data["rpc_errors"].append(f"listpeers: {peers_result['error']}")
@@ -6443,21 +6724,23 @@ async def handle_advisor_run_cycle_all(args: Dict) -> Dict:
     if not advisor:
         return {"error": "Proactive advisor modules not available"}
 
-    # Get all node names
-    node_names = list(fleet.nodes.keys())
-    if not node_names:
+    if not fleet.nodes:
         return {"error": "No nodes configured in fleet"}
 
-    # Run cycles in parallel
-    async def run_node_cycle(node_name: str) -> Dict:
+    # Run cycles in parallel; node RPCs share the fleet concurrency limit.
+    # No deadline: cancelling a cycle midway could leave actions half-applied.
+    async def run_node_cycle(node: NodeConnection) -> Dict:
         try:
-            result = await advisor.run_cycle(node_name)
-            return {"node": node_name, "success": True, "result": result.to_dict()}
+            result = await advisor.run_cycle(node.name)
+            return {"node": node.name, "success": True, "result": result.to_dict()}
         except Exception as e:
-            logger.exception(f"Error running advisor cycle on {node_name}")
-            return {"node": node_name, "success": False, "error": str(e)}
+            logger.exception(f"Error running advisor cycle on {node.name}")
+            return {"node": node.name, "success": False, "error": str(e)}
 
-    results = await asyncio.gather(*[run_node_cycle(name) for name in node_names])
+    results_by_node, meta = await fleet.gather(run_node_cycle, timeout=0)
+    results = list(results_by_node.values())
+    for r in results:
+        r["latency_ms"] = meta["latency_ms"].get(r["node"])
 
     # Aggregate results
     successful = [r for r in results if r.get("success")]
@@ -6504,7 +6787,8 @@ async def handle_advisor_run_cycle_all(args: Dict) -> Dict:
             "strategy_adjustments": all_adjustments
         },
         "node_results": results,
-        "failed_nodes": [r.get("node") for r in failed] if failed else []
+        "failed_nodes": [r.get("node") for r in failed] if failed else [],
+        "elapsed_ms": meta["elapsed_ms"]
     }
 
 